@@ -0,0 +1,70 @@
+#!python
+"""
+Re-extract all module versions that were extracted using a previous extraction version.
+
+Stale module versions are added to the module import queue and processed by a pool of worker threads,
+with the number of concurrent re-extractions for each namespace limited by MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY.
+Progress is stored in the database, so an interrupted re-index can be resumed by running the script again.
+The published state of each module version is retained.
+"""
+
+from argparse import ArgumentParser
+import datetime
+import sys
+
+sys.path.append('.')
+
+from terrareg.bulk_reindex import BulkReindex
+from terrareg.config import Config, ModuleVersionReindexMode
+from terrareg.database import Database
+from terrareg.server import Server
+
+
+parser = ArgumentParser('bulk_reindex')
+parser.add_argument('--namespace', dest='namespace', default=None,
+                    help='Only re-index module versions in namespace')
+parser.add_argument('--workers', dest='workers', type=int, default=4,
+                    help='Number of worker threads that re-extract module versions')
+parser.add_argument('--report-interval', dest='report_interval', type=int, default=60,
+                    help='Interval (in seconds) at which progress is reported')
+parser.add_argument('--dry-run', dest='dry_run', action='store_true', default=False,
+                    help='Report stale module versions and provider versions, without re-indexing them')
+parser.add_argument('--queue-only', dest='queue_only', action='store_true', default=False,
+                    help='Add stale module versions to the module import queue, without processing the queue')
+args = parser.parse_args()
+
+# Parse all configs on startup, failing for invalid configuration
+Config.reload()
+
+if Config().MODULE_VERSION_REINDEX_MODE is ModuleVersionReindexMode.PROHIBIT:
+    print('Re-indexing module versions is prohibited. Set MODULE_VERSION_REINDEX_MODE to allow re-indexing.')
+    sys.exit(1)
+
+Database.get().initialise()
+app = Server()._app
+
+bulk_reindex = BulkReindex(app=app, namespace=args.namespace)
+
+stale_provider_version_count = bulk_reindex.get_stale_provider_version_count()
+if stale_provider_version_count:
+    print(f'{stale_provider_version_count} provider versions were extracted using a previous extraction version. '
+          'Re-indexing existing provider versions is not supported, so these must be deleted and re-indexed.')
+
+if args.dry_run:
+    print(f'{len(bulk_reindex.get_stale_module_versions())} module versions were extracted using a previous extraction version')
+    sys.exit(0)
+
+start_time = datetime.datetime.now()
+enqueue_result = bulk_reindex.enqueue_stale_module_versions()
+print(f'Queued {enqueue_result["queued"]} module versions for re-indexing, '
+      f'skipping {enqueue_result["skipped"]} module versions that are not imported from git')
+
+if args.queue_only:
+    sys.exit(0)
+
+progress = bulk_reindex.run(workers=max(args.workers, 1), report_interval=max(args.report_interval, 1))
+
+for failed_job in bulk_reindex.get_failed_jobs(since=start_time):
+    print(f'Failed to re-index {failed_job["id"]}: {failed_job["error"]}')
+
+sys.exit(1 if progress['failed'] else 0)
@@ -0,0 +1,31 @@
+#!python
+"""
+Aggregate module and provider download analytics into daily rollup tables.
+
+The first run backfills the rollup tables from all existing analytics.
+Subsequent runs aggregate any analytics recorded since the previous run.
+"""
+
+from argparse import ArgumentParser
+import sys
+
+sys.path.append('.')
+
+from terrareg.config import Config
+from terrareg.database import Database
+from terrareg.analytics import AnalyticsRollup
+
+
+parser = ArgumentParser('compact_analytics')
+parser.add_argument('--batch-size', dest='batch_size', type=int, default=10000,
+                    help='Number of analytics rows to aggregate in each database transaction')
+args = parser.parse_args()
+
+# Parse all configs on startup, failing for invalid configuration
+Config.reload()
+
+Database.get().initialise()
+
+for rollup in AnalyticsRollup.get_rollups():
+    count = rollup.compact_all(batch_size=args.batch_size)
+    print(f'Aggregated {count} rows of {rollup.SOURCE_TABLE}')
@@ -0,0 +1,43 @@
+#!python
+"""
+Process queued module version imports.
+
+Requires MODULE_IMPORT_QUEUE to be set to 'database'.
+Any number of workers can be run, alongside the worker threads
+started by each Terrareg instance (see MODULE_IMPORT_QUEUE_WORKERS).
+"""
+
+from argparse import ArgumentParser
+import sys
+
+sys.path.append('.')
+
+from terrareg.config import Config
+from terrareg.database import Database
+from terrareg.module_import_queue import ModuleImportQueue
+from terrareg.server import Server
+
+
+parser = ArgumentParser('module_import_worker')
+parser.add_argument('--once', dest='once', action='store_true', default=False,
+                    help='Process all runnable jobs and exit, rather than continually processing the queue')
+args = parser.parse_args()
+
+# Parse all configs on startup, failing for invalid configuration
+Config.reload()
+
+queue = ModuleImportQueue.get()
+if queue is None:
+    print('Module import queue is not enabled. Set MODULE_IMPORT_QUEUE to enable it.')
+    sys.exit(1)
+
+Database.get().initialise()
+app = Server()._app
+
+if args.once:
+    count = 0
+    while queue.process_next_job(app=app):
+        count += 1
+    print(f'Processed {count} module import jobs')
+else:
+    queue.run_worker(app=app)
@@ -0,0 +1,38 @@
+#!python
+"""
+Re-encode text blobs stored in the database using the current blob compression settings.
+
+See BLOB_COMPRESSION_MIN_SIZE and BLOB_COMPRESSION_LEVEL configurations.
+This can be run whilst Terrareg is running.
+"""
+
+from argparse import ArgumentParser
+import sys
+
+sys.path.append('.')
+
+from terrareg.config import Config
+from terrareg.database import Database
+from terrareg.blob_reencoder import BlobReencoder
+
+
+parser = ArgumentParser('reencode_blobs')
+parser.add_argument('--batch-size', dest='batch_size', type=int, default=100,
+                    help='Number of rows to re-encode in each database transaction')
+parser.add_argument('--table', dest='tables', action='append', choices=list(BlobReencoder.TABLE_COLUMNS),
+                    help='Table to re-encode. May be provided multiple times. Defaults to all tables')
+args = parser.parse_args()
+
+# Parse all configs on startup, failing for invalid configuration
+Config.reload()
+
+Database.get().initialise()
+
+for table_name in (args.tables or BlobReencoder.TABLE_COLUMNS):
+    total_count = 0
+    total_size_difference = 0
+    for progress in BlobReencoder.reencode_table(table_name, batch_size=args.batch_size):
+        total_count += progress['reencoded_count']
+        total_size_difference += progress['size_difference']
+        print(f'{table_name}: re-encoded {total_count} blobs, up to ID {progress["last_id"]}')
+    print(f'Re-encoded {total_count} blobs of {table_name}, changing size by {total_size_difference} bytes')
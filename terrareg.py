@@ -5,6 +5,9 @@ from terrareg.server import Server
 import terrareg.config
 
 
+# Parse all configs on startup, failing for invalid configuration
+terrareg.config.Config.reload()
+
 parser = ArgumentParser('terrareg')
 config = terrareg.config.Config()
 
@@ -0,0 +1,25 @@
+"""Add bulk_reindex column to module_import_job
+
+Revision ID: 3f7a9c1e5b2d
+Revises: 8c2e4f6a1b3d
+Create Date: 2026-10-18 18:22:47.902113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f7a9c1e5b2d'
+down_revision = '8c2e4f6a1b3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('module_import_job', sa.Column('bulk_reindex', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade():
+    with op.batch_alter_table('module_import_job') as module_import_job_op:
+        module_import_job_op.drop_column('bulk_reindex')
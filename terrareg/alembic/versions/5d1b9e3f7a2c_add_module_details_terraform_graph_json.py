@@ -0,0 +1,25 @@
+"""Add module_details column for pre-computed terraform graph JSON
+
+Revision ID: 5d1b9e3f7a2c
+Revises: a0d369baa462
+Create Date: 2026-10-18 16:12:41.508233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '5d1b9e3f7a2c'
+down_revision = 'a0d369baa462'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('module_details', sa.Column('terraform_graph_json', sa.LargeBinary(length=16777215).with_variant(mysql.MEDIUMBLOB(), 'mysql'), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('module_details') as module_details_op:
+        module_details_op.drop_column('terraform_graph_json')
@@ -0,0 +1,56 @@
+"""Add analytics daily rollup tables
+
+Revision ID: 700111984d3d
+Revises: 6dd8adb5e1e3
+Create Date: 2026-10-18 09:12:41.530912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '700111984d3d'
+down_revision = '6dd8adb5e1e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('analytics_daily_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('module_version_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=True),
+    sa.Column('download_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_analytics_daily_rollup_module_version_id_day', 'analytics_daily_rollup', ['module_version_id', 'day'], unique=False)
+
+    op.create_table('provider_analytics_daily_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('provider_version_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=True),
+    sa.Column('download_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_provider_analytics_daily_rollup_provider_version_id_day', 'provider_analytics_daily_rollup', ['provider_version_id', 'day'], unique=False)
+
+    op.create_table('analytics_rollup_checkpoint',
+    sa.Column('name', sa.String(length=128), nullable=False),
+    sa.Column('last_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Add indexes for counting downloads in the first day of an interval
+    op.create_index('ix_analytics_parent_module_version_timestamp', 'analytics', ['parent_module_version', 'timestamp'], unique=False)
+    op.create_index('ix_provider_analytics_provider_version_id_timestamp', 'provider_analytics', ['provider_version_id', 'timestamp'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_provider_analytics_provider_version_id_timestamp', table_name='provider_analytics')
+    op.drop_index('ix_analytics_parent_module_version_timestamp', table_name='analytics')
+    op.drop_table('analytics_rollup_checkpoint')
+    op.drop_index('ix_provider_analytics_daily_rollup_provider_version_id_day', table_name='provider_analytics_daily_rollup')
+    op.drop_table('provider_analytics_daily_rollup')
+    op.drop_index('ix_analytics_daily_rollup_module_version_id_day', table_name='analytics_daily_rollup')
+    op.drop_table('analytics_daily_rollup')
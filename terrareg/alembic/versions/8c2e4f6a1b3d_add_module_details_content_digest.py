@@ -0,0 +1,27 @@
+"""Add module_details content digest column
+
+Revision ID: 8c2e4f6a1b3d
+Revises: 5d1b9e3f7a2c
+Create Date: 2026-10-18 17:05:12.314159
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2e4f6a1b3d'
+down_revision = '5d1b9e3f7a2c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('module_details', sa.Column('content_digest', sa.String(length=128), nullable=True))
+    op.create_index('ix_module_details_content_digest', 'module_details', ['content_digest'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_module_details_content_digest', table_name='module_details')
+    with op.batch_alter_table('module_details') as module_details_op:
+        module_details_op.drop_column('content_digest')
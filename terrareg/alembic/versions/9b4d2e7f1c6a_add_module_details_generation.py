@@ -0,0 +1,25 @@
+"""Add module_details generation column
+
+Revision ID: 9b4d2e7f1c6a
+Revises: 3f7a9c1e5b2d
+Create Date: 2026-10-18 21:14:36.528190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b4d2e7f1c6a'
+down_revision = '3f7a9c1e5b2d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('module_details', sa.Column('generation', sa.String(length=128), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('module_details') as module_details_op:
+        module_details_op.drop_column('generation')
@@ -0,0 +1,44 @@
+"""Add module import job table
+
+Revision ID: a0d369baa462
+Revises: caa750a80902
+Create Date: 2026-10-18 13:41:05.620117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from terrareg.alembic.versions import Enum
+
+
+# revision identifiers, used by Alembic.
+revision = 'a0d369baa462'
+down_revision = 'caa750a80902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('module_import_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('module_provider_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.String(length=128), nullable=False),
+    sa.Column('status', Enum('PENDING', 'RUNNING', 'SUCCEEDED', 'FAILED', name='moduleimportjobstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=128), nullable=True),
+    sa.Column('error', sa.String(length=1024), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['module_provider_id'], ['module_provider.id'], name='fk_module_import_job_module_provider_id_module_provider_id', onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_module_import_job_status_run_after', 'module_import_job', ['status', 'run_after'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_module_import_job_status_run_after', table_name='module_import_job')
+    op.drop_table('module_import_job')
+    if op.get_bind().engine.name == 'postgresql':
+        op.execute('DROP TYPE moduleimportjobstatus')
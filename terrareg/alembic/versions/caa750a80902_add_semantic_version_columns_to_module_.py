@@ -0,0 +1,69 @@
+"""Add semantic version columns to module_version and provider_version tables
+
+Revision ID: caa750a80902
+Revises: 700111984d3d
+Create Date: 2026-10-18 11:02:17.183204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from terrareg.version_sort_key import VersionSortKey
+
+
+# revision identifiers, used by Alembic.
+revision = 'caa750a80902'
+down_revision = '700111984d3d'
+branch_labels = None
+depends_on = None
+
+
+_VERSION_TABLES = [
+    ('module_version', 'ix_module_version_module_provider_id_version_key', 'module_provider_id'),
+    ('provider_version', 'ix_provider_version_provider_id_version_key', 'provider_id'),
+]
+
+
+def upgrade():
+    c = op.get_bind()
+
+    for table_name, index_name, parent_column in _VERSION_TABLES:
+        # Add columns, allowing nullable values
+        op.add_column(table_name, sa.Column('version_major', sa.Integer(), nullable=True))
+        op.add_column(table_name, sa.Column('version_minor', sa.Integer(), nullable=True))
+        op.add_column(table_name, sa.Column('version_patch', sa.Integer(), nullable=True))
+        op.add_column(table_name, sa.Column('version_prerelease', sa.String(length=128), nullable=True))
+
+        # Populate columns for pre-existing versions
+        res = c.execute(f"SELECT id, version FROM {table_name}")
+        for row in res.fetchall():
+            c.execute(
+                sa.sql.text(
+                    f"""
+                    UPDATE {table_name}
+                    SET version_major=:version_major, version_minor=:version_minor,
+                        version_patch=:version_patch, version_prerelease=:version_prerelease
+                    WHERE id=:id
+                    """
+                ),
+                id=row[0],
+                **VersionSortKey.get_column_values(row[1] or '')
+            )
+
+        # Disable nullable flag in numeric columns
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column('version_major', existing_type=sa.Integer(), nullable=False)
+            batch_op.alter_column('version_minor', existing_type=sa.Integer(), nullable=False)
+            batch_op.alter_column('version_patch', existing_type=sa.Integer(), nullable=False)
+
+        op.create_index(index_name, table_name, [parent_column, 'version_major', 'version_minor', 'version_patch'], unique=False)
+
+
+def downgrade():
+    for table_name, index_name, _ in _VERSION_TABLES:
+        op.drop_index(index_name, table_name=table_name)
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column('version_prerelease')
+            batch_op.drop_column('version_patch')
+            batch_op.drop_column('version_minor')
+            batch_op.drop_column('version_major')
@@ -1,7 +1,11 @@
 
+import atexit
+import collections
 import re
 import datetime
-from typing import Union, List, Optional
+import threading
+import time
+from typing import Dict, Union, List, Optional, Tuple
 
 import sqlalchemy
 
@@ -11,6 +15,455 @@ import terrareg.models
 import terrareg.provider_version_model
 import terrareg.provider_model
 import terrareg.database
+import terrareg.file_storage
+import terrareg.config
+import terrareg.provider_source.github_api_client
+
+
+class AnalyticsWriteBuffer:
+    """
+    Write-behind buffer for analytics records.
+
+    Records are held in memory and inserted into the database in batches
+    by a background thread, once the batch size is reached or the flush interval has elapsed.
+    """
+
+    _INSTANCE: Optional['AnalyticsWriteBuffer'] = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    @classmethod
+    def get(cls) -> Optional['AnalyticsWriteBuffer']:
+        """Return instance of write buffer, if analytics write buffering is enabled."""
+        config = Config()
+        if config.ANALYTICS_WRITE_BUFFER_SIZE <= 0:
+            return None
+
+        with cls._INSTANCE_LOCK:
+            if cls._INSTANCE is None:
+                cls._INSTANCE = cls(
+                    max_size=config.ANALYTICS_WRITE_BUFFER_SIZE,
+                    batch_size=config.ANALYTICS_WRITE_BUFFER_BATCH_SIZE,
+                    flush_interval=config.ANALYTICS_WRITE_BUFFER_FLUSH_INTERVAL,
+                    overflow_policy=config.ANALYTICS_WRITE_BUFFER_OVERFLOW_POLICY,
+                )
+                # Write any remaining records on shutdown
+                atexit.register(cls._INSTANCE.stop)
+            return cls._INSTANCE
+
+    @classmethod
+    def reset(cls):
+        """Stop and remove write buffer instance, writing any buffered records."""
+        with cls._INSTANCE_LOCK:
+            if cls._INSTANCE is not None:
+                cls._INSTANCE.stop()
+                atexit.unregister(cls._INSTANCE.stop)
+            cls._INSTANCE = None
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: int,
+                 overflow_policy: 'terrareg.config.AnalyticsWriteBufferOverflowPolicy'):
+        """Store member variables"""
+        self._max_size = max_size
+        self._batch_size = max(1, min(batch_size, max_size))
+        self._flush_interval = flush_interval
+        self._overflow_policy = overflow_policy
+
+        self._records: collections.deque = collections.deque()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        self._flushed_count = 0
+        self._dropped_count = 0
+        self._last_flush_duration: Optional[float] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Return number of records waiting to be written."""
+        return len(self._records)
+
+    @property
+    def flushed_count(self) -> int:
+        """Return number of records written to the database."""
+        return self._flushed_count
+
+    @property
+    def dropped_count(self) -> int:
+        """Return number of records that were discarded."""
+        return self._dropped_count
+
+    @property
+    def last_flush_duration(self) -> Optional[float]:
+        """Return duration (in seconds) of most recent write to the database."""
+        return self._last_flush_duration
+
+    def add(self, table_name: str, values: Dict) -> None:
+        """Add record to buffer, to be inserted into the given table."""
+        with self._condition:
+            if not self._stopped and len(self._records) < self._max_size:
+                self._records.append((table_name, values))
+
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name='analytics-write-buffer', daemon=True)
+                    self._thread.start()
+
+                # Wake up background thread if a full batch is available
+                if len(self._records) >= self._batch_size:
+                    self._condition.notify()
+                return
+
+            # Handle records that cannot be buffered
+            if self._overflow_policy is terrareg.config.AnalyticsWriteBufferOverflowPolicy.DROP:
+                self._dropped_count += 1
+                return
+
+        self._insert_records([(table_name, values)])
+
+    def _run(self) -> None:
+        """Write buffered records until the buffer is stopped."""
+        while True:
+            with self._condition:
+                if not self._stopped and len(self._records) < self._batch_size:
+                    self._condition.wait(timeout=self._flush_interval)
+                stopped = self._stopped
+
+            self.flush()
+
+            if stopped:
+                return
+
+    @staticmethod
+    def _insert_records(records: List[Tuple[str, Dict]]) -> None:
+        """Insert records into database, grouping inserts by table."""
+        records_by_table: Dict[str, List[Dict]] = {}
+        for table_name, values in records:
+            records_by_table.setdefault(table_name, []).append(values)
+
+        # Use new connection, rather than any current transaction,
+        # as this may be called from the background thread.
+        db = Database.get()
+        with db.get_engine().connect() as conn:
+            with conn.begin():
+                for table_name, rows in records_by_table.items():
+                    conn.execute(getattr(db, table_name).insert(), rows)
+
+    def flush(self) -> int:
+        """Write all buffered records to the database, returning number of records written."""
+        with self._flush_lock:
+            with self._condition:
+                records = list(self._records)
+                self._records.clear()
+
+            if not records:
+                return 0
+
+            start_time = time.time()
+            try:
+                self._insert_records(records)
+            except Exception as exc:
+                with self._condition:
+                    self._dropped_count += len(records)
+                print(f'Failed to write {len(records)} analytics records: {str(exc)}')
+                return 0
+
+            self._last_flush_duration = time.time() - start_time
+            self._flushed_count += len(records)
+            return len(records)
+
+    def stop(self) -> None:
+        """Stop background thread and write any remaining records."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join()
+
+        self.flush()
+
+    def get_prometheus_metrics(self) -> List['PrometheusMetric']:
+        """Return Prometheus metrics for write buffer."""
+        metrics = []
+        for name, type_, help, value in [
+                ('analytics_write_buffer_queue_depth', 'gauge',
+                 'Number of analytics records waiting to be written', self.queue_depth),
+                ('analytics_write_buffer_written_count', 'counter',
+                 'Total number of buffered analytics records written', self.flushed_count),
+                ('analytics_write_buffer_dropped_count', 'counter',
+                 'Total number of analytics records discarded', self.dropped_count),
+                ('analytics_write_buffer_flush_duration_seconds', 'gauge',
+                 'Duration of most recent write of buffered analytics records', self.last_flush_duration or 0)]:
+            metric = PrometheusMetric(name=name, type_=type_, help=help)
+            metric.add_data_row(value=value)
+            metrics.append(metric)
+        return metrics
+
+
+class AnalyticsRollup:
+    """
+    Daily download counts, aggregated from an analytics table.
+
+    Rows of the analytics table, up to the checkpoint ID, are aggregated
+    into the rollup table by compact. Download counts are calculated from the
+    rollup table, along with any rows of the analytics table that have not yet
+    been aggregated and rows for the partial first day of each interval,
+    so that counts match those calculated from the analytics table alone.
+    """
+
+    # Name of checkpoint
+    NAME: str = None
+    # Name of analytics table and column containing version ID
+    SOURCE_TABLE: str = None
+    SOURCE_VERSION_COLUMN: str = None
+    # Name of rollup table and column containing version ID
+    ROLLUP_TABLE: str = None
+    ROLLUP_VERSION_COLUMN: str = None
+
+    # Minimum age of analytics rows before they are aggregated,
+    # ensuring that any inserts with earlier IDs have been committed
+    COMPACTION_DELAY = datetime.timedelta(minutes=10)
+
+    _compaction_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def _get_checkpoint_query(cls, db: 'terrareg.database.Database'):
+        """Return scalar query for ID of last analytics row that has been aggregated."""
+        return sqlalchemy.select(
+            [sqlalchemy.func.coalesce(sqlalchemy.func.max(db.analytics_rollup_checkpoint.c.last_id), 0)]
+        ).where(
+            db.analytics_rollup_checkpoint.c.name == cls.NAME
+        ).scalar_subquery()
+
+    @classmethod
+    def get_download_counts(cls, version_id_query, intervals: List[Tuple[Optional[int], str]]) -> Dict[str, int]:
+        """
+        Return number of downloads for each interval.
+
+        Each interval is a tuple of the number of days (or None for all downloads) and name of the interval.
+        If provided, version_id_query must select the IDs of versions to count downloads for.
+        """
+        db = Database.get()
+        source = getattr(db, cls.SOURCE_TABLE)
+        rollup = getattr(db, cls.ROLLUP_TABLE)
+        checkpoint = cls._get_checkpoint_query(db)
+        now = AnalyticsEngine.get_datetime_now()
+
+        rollup_columns = []
+        source_columns = []
+        source_partial_days = []
+        for days, _ in intervals:
+            if days is None:
+                rollup_columns.append(sqlalchemy.func.sum(rollup.c.download_count))
+                source_columns.append(sqlalchemy.func.sum(
+                    sqlalchemy.case((source.c.id > checkpoint, 1), else_=0)
+                ))
+                continue
+
+            # Rollup rows contain whole days, so the first day of the interval,
+            # which is only partially included, is counted from the analytics table.
+            from_timestamp = now - datetime.timedelta(days=days)
+            first_whole_day = from_timestamp.date() + datetime.timedelta(days=1)
+            first_whole_day_start = datetime.datetime.combine(first_whole_day, datetime.time())
+            partial_day = sqlalchemy.and_(
+                source.c.timestamp >= from_timestamp,
+                source.c.timestamp < first_whole_day_start
+            )
+            source_partial_days.append(partial_day)
+
+            rollup_columns.append(sqlalchemy.func.sum(
+                sqlalchemy.case((rollup.c.day >= first_whole_day, rollup.c.download_count), else_=0)
+            ))
+            source_columns.append(sqlalchemy.func.sum(
+                sqlalchemy.case(
+                    (sqlalchemy.and_(
+                        source.c.timestamp >= from_timestamp,
+                        sqlalchemy.or_(source.c.id > checkpoint, partial_day)
+                    ), 1),
+                    else_=0
+                )
+            ))
+
+        rollup_select = sqlalchemy.select(rollup_columns).select_from(rollup)
+        source_select = sqlalchemy.select(source_columns).select_from(source).where(
+            sqlalchemy.or_(source.c.id > checkpoint, *source_partial_days)
+        )
+        if version_id_query is not None:
+            rollup_select = rollup_select.where(rollup.c[cls.ROLLUP_VERSION_COLUMN].in_(version_id_query))
+            source_select = source_select.where(source.c[cls.SOURCE_VERSION_COLUMN].in_(version_id_query))
+
+        # Query rollup and analytics tables in a single statement,
+        # so both are consistent with the same checkpoint
+        with db.get_connection() as conn:
+            rows = conn.execute(sqlalchemy.union_all(rollup_select, source_select)).fetchall()
+
+        return {
+            name: sum(int(row[itx] or 0) for row in rows)
+            for itx, (_, name) in enumerate(intervals)
+        }
+
+    @classmethod
+    def get_total_downloads_by_version(cls, version_ids: List[int]) -> Dict[int, int]:
+        """Return total number of downloads for each of the given version IDs."""
+        db = Database.get()
+        source = getattr(db, cls.SOURCE_TABLE)
+        rollup = getattr(db, cls.ROLLUP_TABLE)
+        checkpoint = cls._get_checkpoint_query(db)
+        rollup_version = rollup.c[cls.ROLLUP_VERSION_COLUMN]
+        source_version = source.c[cls.SOURCE_VERSION_COLUMN]
+
+        rollup_select = sqlalchemy.select(
+            [rollup_version.label('version_id'), sqlalchemy.func.sum(rollup.c.download_count).label('downloads')]
+        ).where(
+            rollup_version.in_(version_ids)
+        ).group_by(rollup_version)
+        source_select = sqlalchemy.select(
+            [source_version.label('version_id'), sqlalchemy.func.count().label('downloads')]
+        ).where(
+            source_version.in_(version_ids),
+            source.c.id > checkpoint
+        ).group_by(source_version)
+
+        downloads = {version_id: 0 for version_id in version_ids}
+        with db.get_connection() as conn:
+            for row in conn.execute(sqlalchemy.union_all(rollup_select, source_select)):
+                downloads[row['version_id']] += int(row['downloads'] or 0)
+        return downloads
+
+    @classmethod
+    def compact(cls, batch_size: int=10000) -> int:
+        """
+        Aggregate a batch of analytics rows, after the checkpoint, into the rollup table.
+
+        Returns the number of analytics rows that have been aggregated.
+        """
+        # Use new connection, rather than a global transaction,
+        # as this is called from the background compaction thread,
+        # whilst requests are being handled.
+        db = Database.get()
+        with db.get_engine().connect() as conn:
+            with conn.begin():
+                return cls._compact_batch(conn=conn, batch_size=batch_size)
+
+    @classmethod
+    def _compact_batch(cls, conn: sqlalchemy.engine.Connection, batch_size: int) -> int:
+        """Aggregate a batch of analytics rows using the given connection, within a transaction."""
+        db = Database.get()
+        source = getattr(db, cls.SOURCE_TABLE)
+        rollup = getattr(db, cls.ROLLUP_TABLE)
+        checkpoint = db.analytics_rollup_checkpoint
+
+        row = conn.execute(sqlalchemy.select([checkpoint.c.last_id]).where(checkpoint.c.name == cls.NAME)).fetchone()
+        if row is None:
+            conn.execute(checkpoint.insert().values(name=cls.NAME, last_id=0))
+            last_id = 0
+        else:
+            last_id = row['last_id']
+
+        # Obtain ID of last row in batch
+        batch_ids = sqlalchemy.select(
+            [source.c.id]
+        ).where(
+            source.c.id > last_id,
+            source.c.timestamp < (AnalyticsEngine.get_datetime_now() - cls.COMPACTION_DELAY)
+        ).order_by(source.c.id).limit(batch_size).subquery()
+        new_last_id = conn.execute(sqlalchemy.select([sqlalchemy.func.max(batch_ids.c.id)])).scalar()
+        if new_last_id is None:
+            return 0
+
+        # Update checkpoint, ensuring that the batch has not been
+        # aggregated by another process
+        res = conn.execute(checkpoint.update().where(
+            checkpoint.c.name == cls.NAME,
+            checkpoint.c.last_id == last_id
+        ).values(last_id=new_last_id))
+        if res.rowcount != 1:
+            return 0
+
+        day_column = sqlalchemy.func.date(source.c.timestamp)
+        version_column = source.c[cls.SOURCE_VERSION_COLUMN]
+        rows = conn.execute(sqlalchemy.select(
+            [version_column.label('version_id'), day_column.label('day'), sqlalchemy.func.count().label('count')]
+        ).where(
+            source.c.id > last_id,
+            source.c.id <= new_last_id
+        ).group_by(version_column, day_column)).fetchall()
+
+        total = 0
+        for row in rows:
+            day = row['day']
+            # SQLite returns dates as strings
+            if isinstance(day, str):
+                day = datetime.date.fromisoformat(day)
+
+            res = conn.execute(rollup.update().where(
+                rollup.c[cls.ROLLUP_VERSION_COLUMN] == row['version_id'],
+                rollup.c.day == day
+            ).values(download_count=rollup.c.download_count + row['count']))
+            if res.rowcount == 0:
+                conn.execute(rollup.insert().values(**{
+                    cls.ROLLUP_VERSION_COLUMN: row['version_id'],
+                    'day': day,
+                    'download_count': row['count'],
+                }))
+            total += row['count']
+
+        return total
+
+    @classmethod
+    def compact_all(cls, batch_size: int=10000) -> int:
+        """Aggregate all analytics rows after the checkpoint, returning the number of rows aggregated."""
+        total = 0
+        while (count := cls.compact(batch_size=batch_size)):
+            total += count
+        return total
+
+
+    @staticmethod
+    def get_rollups() -> List[type]:
+        """Return all rollup classes"""
+        return [ModuleAnalyticsRollup, ProviderAnalyticsRollup]
+
+    @staticmethod
+    def start_scheduled_compaction():
+        """Start background thread to periodically aggregate analytics into rollup tables, if configured."""
+        interval = Config().ANALYTICS_ROLLUP_COMPACTION_INTERVAL
+        if interval <= 0 or AnalyticsRollup._compaction_thread is not None:
+            return
+
+        def run_compaction():
+            while True:
+                time.sleep(interval)
+                for rollup in AnalyticsRollup.get_rollups():
+                    try:
+                        rollup.compact_all()
+                    except Exception as exc:
+                        print(f'Failed to aggregate {rollup.SOURCE_TABLE} into rollup table: {str(exc)}')
+
+        AnalyticsRollup._compaction_thread = threading.Thread(
+            target=run_compaction, name='analytics-rollup-compaction', daemon=True)
+        AnalyticsRollup._compaction_thread.start()
+
+
+class ModuleAnalyticsRollup(AnalyticsRollup):
+    """Daily download counts of module versions"""
+
+    NAME = 'analytics'
+    SOURCE_TABLE = 'analytics'
+    SOURCE_VERSION_COLUMN = 'parent_module_version'
+    ROLLUP_TABLE = 'analytics_daily_rollup'
+    ROLLUP_VERSION_COLUMN = 'module_version_id'
+
+
+class ProviderAnalyticsRollup(AnalyticsRollup):
+    """Daily download counts of provider versions"""
+
+    NAME = 'provider_analytics'
+    SOURCE_TABLE = 'provider_analytics'
+    SOURCE_VERSION_COLUMN = 'provider_version_id'
+    ROLLUP_TABLE = 'provider_analytics_daily_rollup'
+    ROLLUP_VERSION_COLUMN = 'provider_version_id'
 
 
 class AnalyticsEngine:
@@ -152,32 +605,40 @@ class AnalyticsEngine:
         environment = AnalyticsEngine.get_environment_from_token(auth_token)
 
         # Insert analytics details into DB
-        db = Database.get()
-        insert_statement = db.analytics.insert().values(
-            parent_module_version=module_version.pk,
-            timestamp=AnalyticsEngine.get_datetime_now(),
-            terraform_version=terraform_version,
-            analytics_token=analytics_token,
-            auth_token=auth_token,
-            environment=environment,
-            namespace_name=namespace_name,
-            module_name=module_name,
-            provider_name=provider_name
+        AnalyticsEngine.insert_analytics_record(
+            table_name='analytics',
+            values=dict(
+                parent_module_version=module_version.pk,
+                timestamp=AnalyticsEngine.get_datetime_now(),
+                terraform_version=terraform_version,
+                analytics_token=analytics_token,
+                auth_token=auth_token,
+                environment=environment,
+                namespace_name=namespace_name,
+                module_name=module_name,
+                provider_name=provider_name
+            )
         )
+
+    @staticmethod
+    def insert_analytics_record(table_name: str, values: Dict):
+        """Insert analytics row into table, using write buffer, if enabled."""
+        write_buffer = AnalyticsWriteBuffer.get()
+        if write_buffer is not None:
+            write_buffer.add(table_name=table_name, values=values)
+            return
+
+        db = Database.get()
+        insert_statement = getattr(db, table_name).insert().values(**values)
         with db.get_connection() as conn:
             conn.execute(insert_statement)
 
     def get_total_downloads():
         """Return number of downloads for a given module version."""
-        db = Database.get()
-        select = sqlalchemy.select(
-            [sqlalchemy.func.count()]
-        ).select_from(
-            db.analytics
-        )
-        with db.get_connection() as conn:
-            res = conn.execute(select)
-            return res.scalar()
+        return ModuleAnalyticsRollup.get_download_counts(
+            version_id_query=None,
+            intervals=[(None, 'total')]
+        )['total']
 
     @staticmethod
     def get_global_module_usage_base_query(include_empty_auth_token=False):
@@ -257,47 +718,37 @@ class AnalyticsEngine:
     def get_module_version_total_downloads(module_version):
         """Return number of downloads for a given module version."""
         db = Database.get()
-        select = sqlalchemy.select(
-            [sqlalchemy.func.count()]
-        ).select_from(
-            db.analytics
-        ).join(
-            db.module_version,
-            db.module_version.c.id == db.analytics.c.parent_module_version
+        version_id_query = sqlalchemy.select(
+            [db.module_version.c.id]
         ).where(
             db.module_version.c.id == module_version.pk
         )
-        with db.get_connection() as conn:
-            res = conn.execute(select)
-            return res.scalar()
+        return ModuleAnalyticsRollup.get_download_counts(
+            version_id_query=version_id_query,
+            intervals=[(None, 'total')]
+        )['total']
 
     @staticmethod
     def get_module_provider_download_stats(module_provider):
         """Return number of downloads for intervals."""
         db = Database.get()
-        stats = {}
-        for i in [(7, 'week'), (31, 'month'), (365, 'year'), (None, 'total')]:
-
-            select = sqlalchemy.select(
-                [sqlalchemy.func.count()]
-            ).select_from(
-                db.analytics
-            )
-            select = AnalyticsEngine._join_filter_analytics_table_by_module_provider(
-                db=db, query=select, module_provider=module_provider)
-
-            # If a checking a given time frame, limit by number of days
-            if i[0]:
-                from_timestamp = AnalyticsEngine.get_datetime_now() - datetime.timedelta(days=i[0])
-                select = select.where(
-                    db.analytics.c.timestamp >= from_timestamp
-                )
-
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                stats[i[1]] = res.scalar()
-
-        return stats
+        version_id_query = sqlalchemy.select(
+            [db.module_version.c.id]
+        ).select_from(
+            db.module_version
+        ).join(
+            db.module_provider,
+            db.module_version.c.module_provider_id == db.module_provider.c.id
+        ).join(
+            db.namespace,
+            db.module_provider.c.namespace_id == db.namespace.c.id
+        ).where(
+            db.module_provider.c.id == module_provider.pk
+        )
+        return ModuleAnalyticsRollup.get_download_counts(
+            version_id_query=version_id_query,
+            intervals=[(7, 'week'), (31, 'month'), (365, 'year'), (None, 'total')]
+        )
 
     @staticmethod
     def check_module_provider_redirect_usage(module_provider_redirect):
@@ -464,6 +915,9 @@ class AnalyticsEngine:
             conn.execute(db.analytics.delete().where(
                 db.analytics.c.parent_module_version == module_version.pk
             ))
+            conn.execute(db.analytics_daily_rollup.delete().where(
+                db.analytics_daily_rollup.c.module_version_id == module_version.pk
+            ))
 
     @classmethod
     def migrate_analytics_to_new_module_version(cls, old_version_version_pk, new_module_version):
@@ -476,6 +930,11 @@ class AnalyticsEngine:
             ).values(
                 parent_module_version=new_module_version.pk
             ))
+            conn.execute(db.analytics_daily_rollup.update().where(
+                db.analytics_daily_rollup.c.module_version_id == old_version_version_pk
+            ).values(
+                module_version_id=new_module_version.pk
+            ))
 
     @classmethod
     def get_module_provider_version_statistics(cls):
@@ -513,6 +972,58 @@ class AnalyticsEngine:
         # Return all 3 counts
         return major_count, minor_count, patch_count
 
+    @staticmethod
+    def get_file_storage_prometheus_metrics() -> List['PrometheusMetric']:
+        """Return Prometheus metrics for latency of file storage operations."""
+        operation_stats = terrareg.file_storage.FileStorageMetrics.get_operation_stats()
+        if not operation_stats:
+            return []
+
+        metrics = []
+        for name, type_, help, stat in [
+                ('file_storage_operation_count', 'counter',
+                 'Total number of file storage operations', 'count'),
+                ('file_storage_operation_error_count', 'counter',
+                 'Total number of file storage operations that raised an error', 'error_count'),
+                ('file_storage_operation_duration_seconds_total', 'counter',
+                 'Total duration of file storage operations', 'duration_total'),
+                ('file_storage_operation_duration_seconds_max', 'gauge',
+                 'Maximum duration of a file storage operation', 'duration_max')]:
+            metric = PrometheusMetric(name=name, type_=type_, help=help)
+            for (storage_type, operation), stats in sorted(operation_stats.items()):
+                metric.add_data_row(value=stats[stat], labels={'storage_type': storage_type, 'operation': operation})
+            metrics.append(metric)
+        return metrics
+
+    @staticmethod
+    def get_github_api_prometheus_metrics() -> List['PrometheusMetric']:
+        """Return Prometheus metrics for requests to the Github API by provider sources."""
+        stats = terrareg.provider_source.github_api_client.GithubApiClient.get_stats()
+        if not stats:
+            return []
+
+        metrics = []
+        for name, type_, help, stat in [
+                ('github_api_request_count', 'counter',
+                 'Total number of requests to the Github API', 'request_count'),
+                ('github_api_not_modified_count', 'counter',
+                 'Total number of Github API requests answered from the response cache', 'not_modified_count'),
+                ('github_api_rate_limited_count', 'counter',
+                 'Total number of Github API requests rejected by a rate limit', 'rate_limited_count'),
+                ('github_api_rate_limit_wait_seconds_total', 'counter',
+                 'Total duration of waits for Github API rate limits', 'rate_limit_wait_seconds_total')]:
+            metric = PrometheusMetric(name=name, type_=type_, help=help)
+            metric.add_data_row(value=stats.get(stat, 0))
+            metrics.append(metric)
+
+        if 'rate_limit_remaining' in stats:
+            metric = PrometheusMetric(
+                name='github_api_rate_limit_remaining', type_='gauge',
+                help='Remaining Github API rate limit, from the most recent response')
+            metric.add_data_row(value=stats['rate_limit_remaining'])
+            metrics.append(metric)
+        return metrics
+
     @classmethod
     def get_prometheus_metrics(cls):
         """Return Prometheus metrics for modules and usage."""
@@ -572,28 +1083,22 @@ class AnalyticsEngine:
             )
         prometheus_generator.add_metric(module_provider_usage_metric)
 
+        if (write_buffer := AnalyticsWriteBuffer.get()) is not None:
+            for metric in write_buffer.get_prometheus_metrics():
+                prometheus_generator.add_metric(metric)
+
+        for metric in cls.get_file_storage_prometheus_metrics():
+            prometheus_generator.add_metric(metric)
+
+        for metric in cls.get_github_api_prometheus_metrics():
+            prometheus_generator.add_metric(metric)
+
         return prometheus_generator.generate()
 
 
 class ProviderAnalytics:
     """Interface to record and obtain information about provider downloads"""
 
-    @staticmethod
-    def _join_filter_analytics_table_by_provider(db: 'terrareg.database.Database', query, provider: 'terrareg.provider_model.Provider'):
-        """Join query to provider table and filter by provider_version."""
-        return query.join(
-            db.provider_version,
-            db.provider_version.c.id == db.provider_analytics.c.provider_version_id
-        ).join(
-            db.provider,
-            db.provider_version.c.provider_id == db.provider.c.id
-        ).join(
-            db.namespace,
-            db.provider.c.namespace_id == db.namespace.c.id
-        ).where(
-            db.provider.c.id == provider.pk
-        )
-
     @staticmethod
     def record_provider_version_download(
         namespace_name: str,
@@ -616,34 +1121,30 @@ class ProviderAnalytics:
             return
 
         # Insert analytics details into DB
-        db = Database.get()
-        insert_statement = db.provider_analytics.insert().values(
-            provider_version_id=provider_version.pk,
-            timestamp=AnalyticsEngine.get_datetime_now(),
-            terraform_version=terraform_version,
-            namespace_name=namespace_name,
-            provider_name=provider_name
+        AnalyticsEngine.insert_analytics_record(
+            table_name='provider_analytics',
+            values=dict(
+                provider_version_id=provider_version.pk,
+                timestamp=AnalyticsEngine.get_datetime_now(),
+                terraform_version=terraform_version,
+                namespace_name=namespace_name,
+                provider_name=provider_name
+            )
         )
-        with db.get_connection() as conn:
-            conn.execute(insert_statement)
 
     @staticmethod
     def get_provider_version_total_downloads(provider_version: 'terrareg.provider_version_model.ProviderVersion'):
         """Return number of downloads for a given provider version."""
         db = Database.get()
-        select = sqlalchemy.select(
-            [sqlalchemy.func.count()]
-        ).select_from(
-            db.provider_analytics
-        ).join(
-            db.provider_version,
-            db.provider_version.c.id == db.provider_analytics.c.provider_version_id
+        version_id_query = sqlalchemy.select(
+            [db.provider_version.c.id]
         ).where(
             db.provider_version.c.id == provider_version.pk
         )
-        with db.get_connection() as conn:
-            res = conn.execute(select)
-            return res.scalar()
+        return ProviderAnalyticsRollup.get_download_counts(
+            version_id_query=version_id_query,
+            intervals=[(None, 'total')]
+        )['total']
 
     @staticmethod
     def get_provider_total_downloads(provider: 'terrareg.provider_model.Provider'):
@@ -654,33 +1155,26 @@ class ProviderAnalytics:
     def get_provider_download_stats(provider: 'terrareg.provider_model.Provider', stat_types: Union[None, List[Union[int, str]]]=None):
         """Return number of downloads for intervals."""
         db = Database.get()
-        stats = {}
         if stat_types is None:
             stat_types = [(7, 'week'), (31, 'month'), (365, 'year'), (None, 'total')]
 
-        for i in stat_types:
-
-            select = sqlalchemy.select(
-                [sqlalchemy.func.count()]
-            ).select_from(
-                db.provider_analytics
-            )
-            select = ProviderAnalytics._join_filter_analytics_table_by_provider(
-                db=db, query=select, provider=provider
-            )
-
-            # If a checking a given time frame, limit by number of days
-            if i[0]:
-                from_timestamp = AnalyticsEngine.get_datetime_now() - datetime.timedelta(days=i[0])
-                select = select.where(
-                    db.provider_analytics.c.timestamp >= from_timestamp
-                )
-
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                stats[i[1]] = res.scalar()
-
-        return stats
+        version_id_query = sqlalchemy.select(
+            [db.provider_version.c.id]
+        ).select_from(
+            db.provider_version
+        ).join(
+            db.provider,
+            db.provider_version.c.provider_id == db.provider.c.id
+        ).join(
+            db.namespace,
+            db.provider.c.namespace_id == db.namespace.c.id
+        ).where(
+            db.provider.c.id == provider.pk
+        )
+        return ProviderAnalyticsRollup.get_download_counts(
+            version_id_query=version_id_query,
+            intervals=stat_types
+        )
 
 
 class PrometheusMetric:
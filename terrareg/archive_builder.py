@@ -0,0 +1,142 @@
+
+import os
+import stat
+import tarfile
+import time
+from typing import BinaryIO, Iterator, Optional, Tuple
+import zipfile
+
+import pathspec
+
+
+class _TeeReader:
+    """File-like reader, that writes all data read to a second file handle"""
+
+    def __init__(self, source_fh: BinaryIO, target_fh: BinaryIO):
+        """Store member variables"""
+        self._source_fh = source_fh
+        self._target_fh = target_fh
+
+    def read(self, size: int=-1) -> bytes:
+        """Read data from source, writing to target"""
+        data = self._source_fh.read(size)
+        self._target_fh.write(data)
+        return data
+
+
+class ModuleArchiveBuilder:
+    """
+    Generate tar.gz and zip archives of a module source directory.
+
+    The source directory is walked once, with the contents of each file being
+    read once and streamed into each of the requested archives.
+
+    The following are excluded from the archives:
+     * the .git directory and ignore file in the root of the source directory;
+     * files and directories matching the patterns of the ignore file.
+       Contents of excluded directories are also excluded.
+
+    Symlinks are stored as symlinks in both archive types.
+    Files in the zip archive retain their permissions, but use the zip epoch
+    (1980-01-01) as their modification time.
+    """
+
+    # Size of chunks read from source files
+    READ_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, source_directory: str, ignore_file: str,
+                 pathspec_filter: Optional[pathspec.PathSpec], compression_level: int):
+        """Store member variables"""
+        self._source_directory = source_directory
+        self._ignore_file = ignore_file
+        self._pathspec_filter = pathspec_filter
+        self._compression_level = compression_level
+
+    def _is_excluded(self, relative_path: str) -> bool:
+        """Whether path, relative to the source directory, is excluded from archives"""
+        if relative_path in ['.git', self._ignore_file]:
+            return True
+        if self._pathspec_filter and self._pathspec_filter.match_file(relative_path):
+            return True
+        return False
+
+    def _walk(self, relative_directory: str='') -> Iterator[Tuple[str, str]]:
+        """Yield full path and relative path of all included files and directories, in sorted order"""
+        directory = os.path.join(self._source_directory, relative_directory)
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            relative_path = f'{relative_directory}/{entry.name}' if relative_directory else entry.name
+            if self._is_excluded(relative_path):
+                continue
+
+            yield entry.path, relative_path
+
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._walk(relative_path)
+
+    def _get_zip_info(self, relative_path: str, stat_result: os.stat_result) -> zipfile.ZipInfo:
+        """Create zip member info for directory or symlink"""
+        if stat.S_ISDIR(stat_result.st_mode):
+            relative_path += '/'
+        # Clamp modification time to range supported by zip
+        date_time = time.localtime(stat_result.st_mtime)[0:6]
+        date_time = max(min(date_time, (2107, 12, 31, 23, 59, 59)), (1980, 1, 1, 0, 0, 0))
+        zip_info = zipfile.ZipInfo(relative_path, date_time=date_time)
+        zip_info.external_attr = (stat_result.st_mode & 0xFFFF) << 16
+        if stat.S_ISDIR(stat_result.st_mode):
+            # Set MS-DOS directory flag
+            zip_info.external_attr |= 0x10
+        return zip_info
+
+    def build(self, tar_gz_fh: Optional[BinaryIO]=None, zip_fh: Optional[BinaryIO]=None):
+        """Write archives to provided binary file handles, generating only the archive types provided"""
+        tar_fh = tarfile.open(mode='w:gz', fileobj=tar_gz_fh, compresslevel=self._compression_level) if tar_gz_fh else None
+        zip_file = zipfile.ZipFile(
+            zip_fh, mode='w',
+            compression=zipfile.ZIP_DEFLATED,
+            compresslevel=self._compression_level
+        ) if zip_fh else None
+        try:
+            for path, relative_path in self._walk():
+                stat_result = os.lstat(path)
+                # Skip special files, such as sockets and FIFOs
+                if not (stat.S_ISREG(stat_result.st_mode) or stat.S_ISDIR(stat_result.st_mode) or stat.S_ISLNK(stat_result.st_mode)):
+                    continue
+
+                if zip_file and not stat.S_ISREG(stat_result.st_mode):
+                    zip_info = self._get_zip_info(relative_path, stat_result)
+                    # Directories and symlinks are stored without compression,
+                    # with the link target stored as the content of symlink members
+                    zip_file.writestr(
+                        zip_info,
+                        os.readlink(path) if stat.S_ISLNK(stat_result.st_mode) else b'',
+                        compress_type=zipfile.ZIP_STORED
+                    )
+
+                tar_info = tar_fh.gettarinfo(path, arcname=relative_path) if tar_fh else None
+
+                if not stat.S_ISREG(stat_result.st_mode):
+                    if tar_info:
+                        tar_fh.addfile(tar_info)
+                    continue
+
+                with open(path, 'rb') as source_fh:
+                    if zip_file:
+                        # Members opened by name are compressed using the
+                        # compression and level of the zip file
+                        with zip_file.open(relative_path, mode='w') as zip_member_fh:
+                            if tar_info:
+                                # Stream file into zip member whilst it is read into the tar archive
+                                tar_fh.addfile(tar_info, _TeeReader(source_fh, zip_member_fh))
+                            else:
+                                while data := source_fh.read(self.READ_CHUNK_SIZE):
+                                    zip_member_fh.write(data)
+                        # Permissions are only stored in the central directory,
+                        # which is written when the zip file is closed
+                        zip_file.getinfo(relative_path).external_attr = (stat_result.st_mode & 0xFFFF) << 16
+                    else:
+                        tar_fh.addfile(tar_info, source_fh)
+        finally:
+            if tar_fh:
+                tar_fh.close()
+            if zip_file:
+                zip_file.close()
@@ -15,6 +15,7 @@ from .terraform_oidc_auth_method import TerraformOidcAuthMethod
 from .terraform_analytics_auth_key_auth_method import TerraformAnalyticsAuthKeyAuthMethod
 from .terraform_ignore_analytics_auth_method import TerraformIgnoreAnalyticsAuthMethod
 from .terraform_internal_extraction import TerraformInternalExtractionAuthMethod
+from .module_import_job_auth_method import ModuleImportJobAuthMethod
 from .not_authenticated import NotAuthenticated
 from .authentication_type import AuthenticationType
 
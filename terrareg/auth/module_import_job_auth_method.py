@@ -0,0 +1,42 @@
+
+from .base_auth_method import BaseAuthMethod
+
+
+class ModuleImportJobAuthMethod(BaseAuthMethod):
+    """
+    Auth method used whilst processing queued module version imports.
+
+    This is never obtained from a request - it is set by the module import queue
+    worker, so that audit events are recorded against the user that queued the import.
+    """
+
+    def __init__(self, username):
+        """Store username of user that queued the import"""
+        self._username = username
+
+    @property
+    def requires_csrf_tokens(self):
+        """Whether auth type requires CSRF tokens"""
+        return False
+
+    @classmethod
+    def is_enabled(cls):
+        """Auth method cannot be used for requests"""
+        return False
+
+    @classmethod
+    def check_auth_state(cls):
+        """Auth method cannot be used for requests"""
+        return False
+
+    def check_namespace_access(self, permission_type, namespace):
+        """Permissions were checked when the import was queued"""
+        return False
+
+    def get_username(self):
+        """Return username of user that queued the import"""
+        return self._username
+
+    def can_access_read_api(self):
+        """Whether the user can access 'read' APIs"""
+        return False
@@ -0,0 +1,87 @@
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import sqlalchemy
+
+from terrareg.database import Database
+
+
+class BlobReencoder:
+    """
+    Re-encode text blobs stored in the database using the current blob encoding settings.
+
+    This compresses existing uncompressed (legacy) blobs that exceed the compression
+    threshold and decompresses blobs when compression has been disabled.
+    Rows are processed in batches, ordered by ID, with each batch in a separate transaction.
+    """
+
+    # Tables and their blob columns that are encoded using Database.encode_blob
+    TABLE_COLUMNS = {
+        'module_details': ['readme_content', 'terraform_docs', 'tfsec', 'infracost',
+                           'terraform_graph', 'terraform_modules', 'terraform_version',
+                           'terraform_graph_json'],
+        'module_version_file': ['content'],
+        'example_file': ['content'],
+        'provider_version_documentation': ['description', 'content'],
+    }
+
+    @classmethod
+    def _reencode_batch(cls, table_name: str, columns: List[str], last_id: int, batch_size: int) -> Tuple[Optional[int], int, int]:
+        """
+        Re-encode blobs for batch of rows after last_id.
+
+        Returns the ID of the last row processed (or None if there were no rows), the number of blobs
+        that were re-encoded and the change in total size of the blobs.
+        """
+        db = Database.get()
+        table = getattr(db, table_name)
+
+        with db.start_transaction() as transaction:
+            conn = transaction.connection
+            rows = conn.execute(sqlalchemy.select(
+                [table.c.id] + [table.c[column] for column in columns]
+            ).where(
+                table.c.id > last_id
+            ).order_by(table.c.id).limit(batch_size)).fetchall()
+
+            reencoded_count = 0
+            size_difference = 0
+            for row in rows:
+                updates = {}
+                for column in columns:
+                    if row[column] is None:
+                        continue
+                    new_value = Database.encode_blob(Database.decode_blob(row[column]))
+                    if new_value != row[column]:
+                        updates[column] = new_value
+                        size_difference += len(new_value) - len(row[column])
+
+                if updates:
+                    # Only update if values have not been modified since being read
+                    conn.execute(table.update().where(
+                        table.c.id == row['id'],
+                        *[table.c[column] == row[column] for column in updates]
+                    ).values(**updates))
+                    reencoded_count += len(updates)
+
+        return (rows[-1]['id'] if rows else None), reencoded_count, size_difference
+
+    @classmethod
+    def reencode_table(cls, table_name: str, batch_size: int=100) -> Iterator[Dict[str, int]]:
+        """
+        Re-encode all blobs in table, yielding progress after each batch.
+
+        Progress contains the ID of the last processed row, the number of blobs
+        re-encoded and the change in total size of blobs.
+        """
+        last_id = 0
+        while True:
+            last_id, reencoded_count, size_difference = cls._reencode_batch(
+                table_name=table_name,
+                columns=cls.TABLE_COLUMNS[table_name],
+                last_id=last_id,
+                batch_size=batch_size
+            )
+            if last_id is None:
+                return
+            yield {'last_id': last_id, 'reencoded_count': reencoded_count, 'size_difference': size_difference}
@@ -0,0 +1,266 @@
+
+import datetime
+import threading
+import time
+from typing import Dict, List, Optional
+
+import flask
+import sqlalchemy
+
+from terrareg.config import Config
+from terrareg.constants import EXTRACTION_VERSION, PROVIDER_EXTRACTION_VERSION
+from terrareg.database import Database
+from terrareg.module_import_job_status import ModuleImportJobStatus
+from terrareg.module_import_queue import ModuleImportQueue
+import terrareg.auth
+import terrareg.models
+
+
+class BulkReindex:
+    """
+    Re-extract module versions that were extracted using a previous extraction version.
+
+    Stale module versions are added to the module import queue as bulk re-index jobs,
+    which retain the published state of the module versions.
+    The jobs are stored in the database, so an interrupted re-index can be resumed,
+    with only module versions that have not been re-extracted being queued again.
+    Jobs are processed by a pool of worker threads, along with any other workers processing
+    the queue, with the number of concurrent jobs for each namespace limited by
+    MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY.
+
+    Only module versions that are imported from git can be re-extracted.
+    Re-indexing of existing provider versions is not supported, so stale provider versions are only reported.
+    """
+
+    # Username that bulk re-index jobs are queued and audited as
+    USERNAME = 'Bulk re-index'
+
+    def __init__(self, app: flask.Flask, namespace: Optional[str]=None):
+        """Store member variables"""
+        self._app = app
+        self._namespace = namespace
+        self._queue = ModuleImportQueue()
+
+    def _get_stale_module_version_rows(self) -> List[sqlalchemy.engine.Row]:
+        """Return module provider ID and version of stale module versions, that do not have an active import job"""
+        db = Database.get()
+        active_job_exists = sqlalchemy.select(
+            db.module_import_job.c.id
+        ).where(
+            db.module_import_job.c.module_provider_id == db.module_version.c.module_provider_id,
+            db.module_import_job.c.version == db.module_version.c.version,
+            db.module_import_job.c.status.in_([ModuleImportJobStatus.PENDING, ModuleImportJobStatus.RUNNING])
+        ).exists()
+
+        select = sqlalchemy.select(
+            db.module_version.c.module_provider_id,
+            db.module_version.c.version
+        ).select_from(
+            db.module_version
+        ).join(
+            db.module_provider,
+            db.module_version.c.module_provider_id == db.module_provider.c.id
+        ).join(
+            db.namespace,
+            db.module_provider.c.namespace_id == db.namespace.c.id
+        ).where(
+            sqlalchemy.or_(
+                db.module_version.c.extraction_version == None,
+                db.module_version.c.extraction_version != EXTRACTION_VERSION
+            ),
+            ~active_job_exists
+        ).order_by(
+            db.module_version.c.module_provider_id,
+            db.module_version.c.id
+        )
+        if self._namespace:
+            select = select.where(db.namespace.c.namespace == self._namespace)
+
+        with db.get_connection() as conn:
+            return conn.execute(select).fetchall()
+
+    def get_stale_module_versions(self) -> List['terrareg.models.ModuleVersion']:
+        """Return module versions that were extracted using a previous extraction version and do not have an active import job"""
+        rows = self._get_stale_module_version_rows()
+        module_providers = {
+            module_provider.pk: module_provider
+            for module_provider in terrareg.models.ModuleProvider.get_batch(list(set(row['module_provider_id'] for row in rows)))
+        }
+        return [
+            terrareg.models.ModuleVersion(module_provider=module_providers[row['module_provider_id']], version=row['version'])
+            for row in rows
+            if row['module_provider_id'] in module_providers
+        ]
+
+    def get_stale_provider_version_count(self) -> int:
+        """Return number of provider versions that were extracted using a previous provider extraction version"""
+        db = Database.get()
+        select = sqlalchemy.select(
+            sqlalchemy.func.count()
+        ).select_from(
+            db.provider_version
+        ).join(
+            db.provider,
+            db.provider_version.c.provider_id == db.provider.c.id
+        ).join(
+            db.namespace,
+            db.provider.c.namespace_id == db.namespace.c.id
+        ).where(
+            sqlalchemy.or_(
+                db.provider_version.c.extraction_version == None,
+                db.provider_version.c.extraction_version != PROVIDER_EXTRACTION_VERSION
+            )
+        )
+        if self._namespace:
+            select = select.where(db.namespace.c.namespace == self._namespace)
+
+        with db.get_connection() as conn:
+            return conn.execute(select).scalar()
+
+    def enqueue_stale_module_versions(self) -> Dict[str, int]:
+        """Add bulk re-index job for each stale module version that can be re-extracted, returning number of queued and skipped versions"""
+        queued = 0
+        skipped = 0
+        # Queue jobs within request context, so that jobs are queued
+        # and audited against the bulk re-index user
+        with self._app.test_request_context():
+            setattr(flask.g, terrareg.auth.AuthFactory.FLASK_GLOBALS_AUTH_KEY,
+                    terrareg.auth.ModuleImportJobAuthMethod(username=self.USERNAME))
+
+            for module_version in self.get_stale_module_versions():
+                # Module versions uploaded via the API cannot be re-extracted
+                if not module_version.get_git_clone_url():
+                    skipped += 1
+                    continue
+
+                self._queue.enqueue(module_provider=module_version.module_provider, version=module_version.version, bulk_reindex=True)
+                queued += 1
+
+        return {'queued': queued, 'skipped': skipped}
+
+    def get_progress(self, since: datetime.datetime) -> Dict[str, int]:
+        """Return number of active bulk re-index jobs and number of jobs that have finished since the given time, by status"""
+        db = Database.get()
+        select = sqlalchemy.select(
+            db.module_import_job.c.status,
+            sqlalchemy.func.count()
+        ).select_from(
+            db.module_import_job
+        ).where(
+            db.module_import_job.c.bulk_reindex == True,
+            sqlalchemy.or_(
+                db.module_import_job.c.status.in_([ModuleImportJobStatus.PENDING, ModuleImportJobStatus.RUNNING]),
+                db.module_import_job.c.finished_at >= since
+            )
+        ).group_by(
+            db.module_import_job.c.status
+        )
+        with db.get_connection() as conn:
+            counts = {row[0]: row[1] for row in conn.execute(select).fetchall()}
+
+        return {status.value: counts.get(status, 0) for status in ModuleImportJobStatus}
+
+    @staticmethod
+    def format_progress(progress: Dict[str, int], elapsed: datetime.timedelta) -> str:
+        """Return progress and throughput of bulk re-index as text"""
+        finished = progress[ModuleImportJobStatus.SUCCEEDED.value] + progress[ModuleImportJobStatus.FAILED.value]
+        remaining = progress[ModuleImportJobStatus.PENDING.value] + progress[ModuleImportJobStatus.RUNNING.value]
+        elapsed_minutes = max(elapsed.total_seconds() / 60, 1 / 60)
+        versions_per_minute = finished / elapsed_minutes
+
+        message = (
+            f'{progress[ModuleImportJobStatus.SUCCEEDED.value]} succeeded, '
+            f'{progress[ModuleImportJobStatus.FAILED.value]} failed, '
+            f'{progress[ModuleImportJobStatus.RUNNING.value]} running, '
+            f'{progress[ModuleImportJobStatus.PENDING.value]} pending '
+            f'({versions_per_minute:.1f} versions/min'
+        )
+        if versions_per_minute and remaining:
+            message += f', estimated {datetime.timedelta(minutes=round(remaining / versions_per_minute))} remaining'
+        return message + ')'
+
+    def get_failed_jobs(self, since: datetime.datetime) -> List[Dict[str, str]]:
+        """Return ID of module version and error of bulk re-index jobs that have failed since the given time"""
+        db = Database.get()
+        select = sqlalchemy.select(
+            db.namespace.c.namespace,
+            db.module_provider.c.module,
+            db.module_provider.c.provider,
+            db.module_import_job.c.version,
+            db.module_import_job.c.error
+        ).select_from(
+            db.module_import_job
+        ).join(
+            db.module_provider,
+            db.module_import_job.c.module_provider_id == db.module_provider.c.id
+        ).join(
+            db.namespace,
+            db.module_provider.c.namespace_id == db.namespace.c.id
+        ).where(
+            db.module_import_job.c.bulk_reindex == True,
+            db.module_import_job.c.status == ModuleImportJobStatus.FAILED,
+            db.module_import_job.c.finished_at >= since
+        ).order_by(
+            db.module_import_job.c.id
+        )
+        with db.get_connection() as conn:
+            return [
+                {
+                    'id': f"{row['namespace']}/{row['module']}/{row['provider']}/{row['version']}",
+                    'error': row['error'],
+                }
+                for row in conn.execute(select).fetchall()
+            ]
+
+    def _has_active_jobs(self) -> bool:
+        """Return whether any bulk re-index jobs are pending or running"""
+        progress = self.get_progress(since=datetime.datetime.now())
+        return bool(progress[ModuleImportJobStatus.PENDING.value] or progress[ModuleImportJobStatus.RUNNING.value])
+
+    def _run_worker(self, stop_event: threading.Event):
+        """Process jobs from the queue until there are no active bulk re-index jobs"""
+        while not stop_event.is_set():
+            try:
+                if self._queue.process_next_job(app=self._app):
+                    continue
+                if not self._has_active_jobs():
+                    return
+            except Exception as exc:
+                print(f'Failed to process module import queue: {str(exc)}')
+
+            # Wait for jobs being retried or running in other workers
+            stop_event.wait(Config().MODULE_IMPORT_QUEUE_POLL_INTERVAL)
+
+    def run(self, workers: int, report_interval: int) -> Dict[str, int]:
+        """
+        Process queued jobs using pool of worker threads, until all bulk re-index jobs have finished,
+        printing progress at the report interval (in seconds).
+
+        Returns the number of jobs that finished during the run, by status.
+        """
+        start_time = datetime.datetime.now()
+        stop_event = threading.Event()
+        threads = [
+            threading.Thread(target=self._run_worker, kwargs={'stop_event': stop_event}, name=f'bulk-reindex-worker-{itx}', daemon=True)
+            for itx in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            next_report = time.monotonic() + report_interval
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=max(next_report - time.monotonic(), 0))
+                    if time.monotonic() >= next_report:
+                        print('Bulk re-index progress: ' + self.format_progress(self.get_progress(since=start_time), datetime.datetime.now() - start_time))
+                        next_report = time.monotonic() + report_interval
+        finally:
+            # Stop workers after their current job, if interrupted
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+
+        progress = self.get_progress(since=start_time)
+        print('Bulk re-index finished: ' + self.format_progress(progress, datetime.datetime.now() - start_time))
+        return progress
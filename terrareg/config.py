@@ -39,7 +39,98 @@ class Product(Enum):
     OPENTOFU = "opentofu"
 
 
+class AnalyticsWriteBufferOverflowPolicy(Enum):
+    """Behaviour when the analytics write buffer is full"""
+    SYNCHRONOUS = "synchronous"
+    DROP = "drop"
+
+
+class ModuleSearchIndexType(Enum):
+    """Type of index used for module searches"""
+    DATABASE = "database"
+    MEMORY = "memory"
+
+
+class ModuleImportQueueType(Enum):
+    """Type of queue used for module version imports"""
+    DISABLED = "disabled"
+    DATABASE = "database"
+
+
+class SnapshotConfigProperty(property):
+    """
+    Config property, which is parsed from the environment on first access
+    and read from the config snapshot on subsequent accesses.
+    """
+
+    def __get__(self, instance, owner=None):
+        """Return value from config snapshot, parsing the config if it is not present."""
+        if instance is None:
+            return self
+        return type(instance)._get_snapshot_value(self.fget.__name__, lambda: self.fget(instance))
+
+
+def snapshot_configs(cls):
+    """
+    Class decorator to read config properties from the config snapshot.
+
+    Configs that are derived from other configs are not snapshotted,
+    so that they reflect changes to the configs that they are derived from.
+    """
+    for name, value in list(vars(cls).items()):
+        if type(value) is property and name not in cls._DERIVED_CONFIGS:
+            setattr(cls, name, SnapshotConfigProperty(value.fget))
+    return cls
+
+
+@snapshot_configs
 class Config:
+    """
+    Registry configuration, parsed from environment variables.
+
+    Parsed values are stored in a process-wide snapshot, which is created
+    on first access of each config, or for all configs by reload on startup.
+    The snapshot is discarded if os.environ is replaced. reload must be called
+    after modifying os.environ in-place.
+
+    Values are shared between callers and must not be modified.
+    """
+
+    # Configs that are derived from the values of other configs
+    _DERIVED_CONFIGS = ('UPLOAD_DIRECTORY', 'TERRAFORM_EXAMPLE_VERSION_TEMPLATE_PRE_MAJOR')
+
+    # Parsed config values, by config name
+    _snapshot = {}
+    # Environment that the snapshot was parsed from
+    _snapshot_environ = None
+
+    @classmethod
+    def _get_snapshot_value(cls, name, parse):
+        """Return config value from snapshot, parsing the value if it is not present."""
+        # Discard snapshot if the environment has been replaced
+        if cls._snapshot_environ is not os.environ:
+            cls._snapshot = {}
+            cls._snapshot_environ = os.environ
+
+        snapshot = cls._snapshot
+        if name not in snapshot:
+            snapshot[name] = parse()
+        return snapshot[name]
+
+    @classmethod
+    def reload(cls):
+        """
+        Create new snapshot, parsing all configs from the environment.
+
+        Exceptions for invalid configuration values are raised.
+        """
+        cls._snapshot = {}
+        cls._snapshot_environ = os.environ
+
+        config = cls()
+        for name, value in vars(cls).items():
+            if isinstance(value, property):
+                getattr(config, name)
 
     @property
     def SITE_WARNING(self):
@@ -148,6 +239,81 @@ class Config:
             raise InvalidUploadDirectoryError('UPLOAD_DIRECTORY must be configured with a path, if DATA_DIRECTORY is configured for s3.')
         return upload_directory
 
+    @property
+    def PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY(self):
+        """
+        Number of release artifacts (provider binaries) that are concurrently downloaded, when indexing a provider version.
+        """
+        return max(int(os.environ.get('PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY', '4')), 1)
+
+    @property
+    def PROVIDER_ARTIFACT_DOWNLOAD_ATTEMPTS(self):
+        """
+        Maximum number of attempts to download each release artifact, when indexing a provider version.
+
+        Failed downloads, including downloads that do not match the checksum of the release, are retried with an exponential backoff.
+        """
+        return max(int(os.environ.get('PROVIDER_ARTIFACT_DOWNLOAD_ATTEMPTS', '3')), 1)
+
+    @property
+    def S3_MAX_POOL_CONNECTIONS(self):
+        """
+        Maximum number of connections kept in the connection pool of the S3 client,
+        when `DATA_DIRECTORY` is configured to use S3.
+
+        A single S3 client is shared by all threads, so this should be at least
+        the number of threads that concurrently access S3.
+        """
+        return int(os.environ.get('S3_MAX_POOL_CONNECTIONS', '50'))
+
+    @property
+    def S3_MULTIPART_PART_SIZE(self):
+        """
+        Size (in MB) of parts used when uploading files to S3.
+
+        Files larger than this size are uploaded using multipart uploads,
+        reading a limited number of parts into memory at once (see `S3_MULTIPART_CONCURRENCY`).
+        Generated module archives are streamed to S3 as they are written, holding a single part in memory.
+
+        The minimum value is `5`, as required by S3.
+        """
+        return max(int(os.environ.get('S3_MULTIPART_PART_SIZE', '8')), 5)
+
+    @property
+    def S3_MULTIPART_CONCURRENCY(self):
+        """
+        Number of parts of a single file that are concurrently uploaded to S3, when using multipart uploads.
+        """
+        return max(int(os.environ.get('S3_MULTIPART_CONCURRENCY', '4')), 1)
+
+    @property
+    def FILE_STORAGE_UPLOAD_CONCURRENCY(self):
+        """
+        Number of files that are concurrently uploaded to file storage, when uploading multiple files,
+        such as the binaries of a provider version.
+        """
+        return max(int(os.environ.get('FILE_STORAGE_UPLOAD_CONCURRENCY', '4')), 1)
+
+    @property
+    def S3_PRESIGNED_DOWNLOAD_REDIRECT(self):
+        """
+        Whether module source downloads redirect to a time-limited presigned S3 URL,
+        when `DATA_DIRECTORY` is configured to use S3.
+
+        This avoids module archives being proxied through Terrareg.
+        Clients must be able to access the S3 endpoint.
+
+        When disabled, or when using local storage, archives are streamed from storage by Terrareg.
+        """
+        return self.convert_boolean(os.environ.get('S3_PRESIGNED_DOWNLOAD_REDIRECT', 'False'))
+
+    @property
+    def S3_PRESIGNED_DOWNLOAD_EXPIRY_SECONDS(self):
+        """
+        Number of seconds that presigned S3 download URLs are valid for (see `S3_PRESIGNED_DOWNLOAD_REDIRECT`).
+        """
+        return int(os.environ.get('S3_PRESIGNED_DOWNLOAD_EXPIRY_SECONDS', '300'))
+
     @property
     def DATABASE_URL(self):
         """
@@ -297,7 +463,12 @@ class Config:
 
     @property
     def DEBUG(self):
-        """Whether Flask and SQLalchemy is setup in debug mode."""
+        """
+        Whether Flask and SQLalchemy is setup in debug mode.
+
+        When enabled, the number of database queries performed by each request
+        is returned in the `X-Terrareg-Query-Count` response header.
+        """
         return self.convert_boolean(os.environ.get('DEBUG', 'False'))
 
     @property
@@ -420,6 +591,65 @@ class Config:
         """URL of logo to be used in web interface."""
         return os.environ.get('LOGO_URL', '/static/images/logo.png')
 
+    @property
+    def ANALYTICS_WRITE_BUFFER_SIZE(self):
+        """
+        Maximum number of module and provider download analytics records that are held in memory,
+        before being written to the database.
+
+        When set to a value greater than `0`, download analytics are written to the database in batches
+        by a background thread, rather than during each download request.
+        Any records held in memory are written when Terrareg is shut down.
+
+        Set to `0` to write analytics to the database during each download request.
+        """
+        return int(os.environ.get('ANALYTICS_WRITE_BUFFER_SIZE', '0'))
+
+    @property
+    def ANALYTICS_WRITE_BUFFER_BATCH_SIZE(self):
+        """
+        Number of buffered analytics records that triggers a write to the database.
+
+        This is only used when `ANALYTICS_WRITE_BUFFER_SIZE` is greater than `0`.
+        """
+        return int(os.environ.get('ANALYTICS_WRITE_BUFFER_BATCH_SIZE', '100'))
+
+    @property
+    def ANALYTICS_WRITE_BUFFER_FLUSH_INTERVAL(self):
+        """
+        Maximum time (in seconds) that buffered analytics records are held in memory before being written to the database.
+
+        This is only used when `ANALYTICS_WRITE_BUFFER_SIZE` is greater than `0`.
+        """
+        return int(os.environ.get('ANALYTICS_WRITE_BUFFER_FLUSH_INTERVAL', '5'))
+
+    @property
+    def ANALYTICS_WRITE_BUFFER_OVERFLOW_POLICY(self):
+        """
+        Behaviour when the analytics write buffer is full.
+
+        This can be set to one of:
+
+         * 'synchronous' - The analytics record is written to the database during the download request.
+         * 'drop' - The analytics record is discarded.
+
+        This is only used when `ANALYTICS_WRITE_BUFFER_SIZE` is greater than `0`.
+        """
+        return AnalyticsWriteBufferOverflowPolicy(os.environ.get('ANALYTICS_WRITE_BUFFER_OVERFLOW_POLICY', AnalyticsWriteBufferOverflowPolicy.SYNCHRONOUS.value).lower())
+
+    @property
+    def ANALYTICS_ROLLUP_COMPACTION_INTERVAL(self):
+        """
+        Interval (in seconds) at which download analytics are aggregated into daily rollup tables.
+
+        Download statistics are calculated from the rollup tables, along with any analytics that have
+        not yet been aggregated, so aggregating analytics regularly reduces the time taken to calculate them.
+
+        Set to `0` to disable aggregation by Terrareg. Analytics can instead be aggregated by periodically
+        running `python scripts/compact_analytics.py`.
+        """
+        return int(os.environ.get('ANALYTICS_ROLLUP_COMPACTION_INTERVAL', '0'))
+
     @property
     def ANALYTICS_AUTH_KEYS(self):
         """
@@ -516,6 +746,34 @@ class Config:
         """
         return ModuleVersionReindexMode(os.environ.get('MODULE_VERSION_REINDEX_MODE', 'legacy'))
 
+    @property
+    def MODULE_SEARCH_INDEX(self):
+        """
+        Index used to find module providers that match a module search query.
+
+        This can be set to one of:
+
+         * 'database' - Each search term is matched against every module provider by the database.
+         * 'memory' - An in-process n-gram index of module names, provider names, namespaces, descriptions and owners is used to find matching module providers, before relevance is calculated by the database. This avoids scanning all module providers for each search, which is recommended for registries containing a large number of modules.
+
+        Search results and ordering are the same for both index types.
+
+        The in-memory index is updated when module versions are published or deleted.
+        When running multiple instances of Terrareg, changes made by other instances are picked up when the index is refreshed (see `MODULE_SEARCH_INDEX_REFRESH_INTERVAL`).
+        """
+        return ModuleSearchIndexType(os.environ.get('MODULE_SEARCH_INDEX', ModuleSearchIndexType.DATABASE.value).lower())
+
+    @property
+    def MODULE_SEARCH_INDEX_REFRESH_INTERVAL(self):
+        """
+        Interval (in seconds) at which the in-memory module search index is rebuilt from the database.
+
+        This is only used when `MODULE_SEARCH_INDEX` is set to `memory`.
+
+        Set to `0` to disable periodic rebuilds, which is only recommended when running a single instance of Terrareg.
+        """
+        return int(os.environ.get('MODULE_SEARCH_INDEX_REFRESH_INTERVAL', '300'))
+
     @property
     def AUTO_CREATE_MODULE_PROVIDER(self):
         """
@@ -572,6 +830,78 @@ class Config:
         val = os.environ.get('GIT_CLONE_TIMEOUT', '300')
         return None if val is None else int(val)
 
+    @property
+    def MODULE_ARCHIVE_COMPRESSION_LEVEL(self):
+        """
+        Compression level (`0`-`9`) used when generating module archives (see `DELETE_EXTERNALLY_HOSTED_ARTIFACTS`).
+
+        Higher values produce smaller archives, but take longer to generate.
+        `0` stores files without compression.
+        """
+        return min(max(int(os.environ.get('MODULE_ARCHIVE_COMPRESSION_LEVEL', '6')), 0), 9)
+
+    @property
+    def BLOB_COMPRESSION_MIN_SIZE(self):
+        """
+        Minimum size, in bytes, of text blobs (such as READMEs, terraform-docs output, security scan results and module files)
+        that are compressed when stored in the database.
+
+        Smaller values are stored uncompressed, as the overhead of compression outweighs the saving.
+
+        Blobs that have been compressed are always readable, irrespective of this setting.
+        Existing blobs can be re-encoded using the current settings by running `python scripts/reencode_blobs.py`.
+
+        Set to `0` to disable compression.
+        """
+        return max(int(os.environ.get('BLOB_COMPRESSION_MIN_SIZE', '1024')), 0)
+
+    @property
+    def BLOB_COMPRESSION_LEVEL(self):
+        """
+        Compression level (`1`-`9`) used when compressing blobs stored in the database (see `BLOB_COMPRESSION_MIN_SIZE`).
+
+        Higher values produce smaller blobs, but take longer to compress.
+        """
+        return min(max(int(os.environ.get('BLOB_COMPRESSION_LEVEL', '6')), 1), 9)
+
+    @property
+    def MODULE_SPECS_CACHE_SIZE(self):
+        """
+        Maximum number of modules (root modules, submodules and examples) for which parsed terraform-docs output,
+        sanitised inputs/outputs and rendered README/example file HTML are cached in memory by each Terrareg process.
+
+        The least recently used entries are removed when the cache is full.
+
+        Set to `0` to disable the cache.
+        """
+        return max(int(os.environ.get('MODULE_SPECS_CACHE_SIZE', '1000')), 0)
+
+    @property
+    def GIT_MIRROR_CACHE_DIRECTORY(self):
+        """
+        Directory used to cache bare mirrors of module git repositories.
+
+        When set, each import of a module version from git only fetches objects that are not already present in the mirror of the repository,
+        before performing a shallow clone of the tag from the mirror.
+        This avoids downloading the history of a repository for each version that is indexed.
+
+        The directory can be shared between multiple instances of Terrareg, as mirrors are locked whilst in use.
+
+        Leave empty to perform a full clone of the repository for each import.
+        """
+        return os.environ.get('GIT_MIRROR_CACHE_DIRECTORY', '')
+
+    @property
+    def GIT_MIRROR_CACHE_MAX_SIZE(self):
+        """
+        Maximum size (in MB) of the git mirror cache.
+
+        When exceeded, the least recently used mirrors are removed, after a module version is imported.
+
+        This is only used when `GIT_MIRROR_CACHE_DIRECTORY` is set.
+        """
+        return int(os.environ.get('GIT_MIRROR_CACHE_MAX_SIZE', '10240'))
+
     @property
     def GIT_PROVIDER_CONFIG(self):
         """
@@ -938,6 +1268,27 @@ class Config:
         """
         return os.environ.get("TERRAFORM_ARCHIVE_MIRROR", "")
 
+    @property
+    def TERRAFORM_BINARY_CACHE_DIRECTORY(self):
+        """
+        Directory used to cache Terraform/OpenTofu binaries, containing one binary for each version
+        that is required by extracted modules.
+
+        Each extraction uses the binary of the version required by the module, allowing modules to be extracted concurrently.
+
+        The directory can be shared between multiple instances of Terrareg, as installation of versions is locked.
+        """
+        return os.environ.get("TERRAFORM_BINARY_CACHE_DIRECTORY", os.path.join(tempfile.gettempdir(), "terrareg-terraform-binaries"))
+
+    @property
+    def TERRAFORM_BINARY_CACHE_MAX_VERSIONS(self):
+        """
+        Maximum number of Terraform/OpenTofu versions retained in the binary cache.
+
+        When exceeded, the least recently used versions are removed.
+        """
+        return max(int(os.environ.get('TERRAFORM_BINARY_CACHE_MAX_VERSIONS', '10')), 1)
+
     @property
     def MANAGE_TERRAFORM_RC_FILE(self):
         """
@@ -949,9 +1300,129 @@ class Config:
 
         This is disabled by default in the application, meaning that running terrareg locally, by default, will not manage this file.
         The docker container, by default, overrides this to enable the functionality, since it is running in an isolated environment and unlikely to overwrite user's own configurations.
+
+        When enabled, a terraform.rc file is generated for each extraction, which is passed to Terraform using `TF_CLI_CONFIG_FILE`.
+        This also configures Terraform to install providers from the provider mirror (see `PROVIDER_MIRROR_DIRECTORY`).
         """
         return self.convert_boolean(os.environ.get("MANAGE_TERRAFORM_RC_FILE", "False"))
 
+    @property
+    def PROVIDER_MIRROR_DIRECTORY(self):
+        """
+        Directory of filesystem mirror of Terraform providers, used when initialising modules during extraction.
+
+        Providers installed when initialising modules are added to the mirror, so that they are not downloaded again
+        when initialising other modules.
+
+        The directory can be shared between multiple instances of Terrareg, as modifications to the mirror are locked.
+
+        This is only used when `MANAGE_TERRAFORM_RC_FILE` is enabled.
+        """
+        return os.environ.get("PROVIDER_MIRROR_DIRECTORY", os.path.join(tempfile.gettempdir(), "terrareg-provider-mirror"))
+
+    @property
+    def PROVIDER_MIRROR_MAX_SIZE(self):
+        """
+        Maximum size (in MB) of the provider mirror.
+
+        When exceeded, the least recently used providers are removed, after a module is initialised.
+        Providers used within the last hour are not removed.
+        """
+        return max(int(os.environ.get('PROVIDER_MIRROR_MAX_SIZE', '10240')), 0)
+
+    @property
+    def PROVIDER_MIRROR_MAX_VERSIONS(self):
+        """
+        Maximum number of versions of each provider retained in the provider mirror.
+
+        When exceeded, the oldest versions of the provider are removed, after a module is initialised.
+        Providers used within the last hour are not removed.
+        """
+        return max(int(os.environ.get('PROVIDER_MIRROR_MAX_VERSIONS', '5')), 1)
+
+    @property
+    def MODULE_EXTRACTION_CONCURRENCY(self):
+        """
+        Maximum number of analysis steps (terraform-docs, tfsec and Infracost) that are run concurrently
+        when extracting a module version.
+
+        The root module, submodules and examples of a module version are analysed concurrently,
+        up to this limit.
+        Terraform initialisation and graph generation is always performed for one module at a time.
+
+        Set to `1` to analyse each module sequentially.
+        """
+        return max(int(os.environ.get("MODULE_EXTRACTION_CONCURRENCY", "4")), 1)
+
+    @property
+    def MODULE_EXTRACTION_REUSE(self):
+        """
+        Whether to re-use the extraction results of modules, submodules and examples that have not changed
+        since a previous extraction, rather than running terraform-docs, tfsec, Terraform and Infracost against them.
+
+        A digest is generated for each module, from the contents of the module directory, any local modules that it references,
+        the extraction version, versions of the extraction tools and configuration that affects extraction.
+        If the results of a module with the same digest are available, they are copied to the new module version.
+
+        Remote modules and providers used by the module, and Infracost pricing, are not included in the digest,
+        so re-used results may differ from those of a new extraction if these have changed.
+        """
+        return self.convert_boolean(os.environ.get("MODULE_EXTRACTION_REUSE", "False"))
+
+    @property
+    def MODULE_IMPORT_QUEUE(self):
+        """
+        Queue used for importing module versions from git.
+
+        This can be set to one of:
+
+         * 'disabled' - Module versions are imported during the module version import/create API requests and repository webhook requests.
+         * 'database' - Imports are added to a queue, stored in the database, and the request returns with a `202` status, containing the ID of the import job. Jobs are processed by worker threads in each Terrareg instance (see `MODULE_IMPORT_QUEUE_WORKERS`) and/or by running `python scripts/module_import_worker.py`.
+
+        The status of an import job can be obtained from `/v1/terrareg/modules/<namespace>/<module>/<provider>/import-jobs/<job_id>`.
+
+        Module versions uploaded via the upload API are always imported during the upload request.
+        """
+        return ModuleImportQueueType(os.environ.get('MODULE_IMPORT_QUEUE', ModuleImportQueueType.DISABLED.value).lower())
+
+    @property
+    def MODULE_IMPORT_QUEUE_WORKERS(self):
+        """
+        Number of worker threads that process queued module version imports in each Terrareg instance.
+
+        This is only used when `MODULE_IMPORT_QUEUE` is set to `database`.
+
+        Set to `0` to only process jobs using `python scripts/module_import_worker.py`.
+        """
+        return int(os.environ.get('MODULE_IMPORT_QUEUE_WORKERS', '1'))
+
+    @property
+    def MODULE_IMPORT_QUEUE_MAX_ATTEMPTS(self):
+        """
+        Maximum number of times that a queued module version import is attempted, before it is marked as failed.
+
+        Failed attempts are retried after an increasing delay.
+        """
+        return max(int(os.environ.get('MODULE_IMPORT_QUEUE_MAX_ATTEMPTS', '3')), 1)
+
+    @property
+    def MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY(self):
+        """
+        Maximum number of queued module version imports that are processed concurrently for a single namespace,
+        across all workers.
+
+        This also limits the number of module versions in each namespace that are re-extracted concurrently
+        by `python scripts/bulk_reindex.py`.
+        """
+        return max(int(os.environ.get('MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY', '1')), 1)
+
+    @property
+    def MODULE_IMPORT_QUEUE_POLL_INTERVAL(self):
+        """
+        Interval (in seconds) at which idle workers check the queue for pending module version imports.
+        """
+        return max(int(os.environ.get('MODULE_IMPORT_QUEUE_POLL_INTERVAL', '5')), 1)
+
     @property
     def SENTRY_DSN(self):
         """DSN Integration URL for sentry"""
@@ -1121,6 +1592,46 @@ class Config:
         """
         return os.environ.get("GITHUB_API_URL", "https://api.github.com")
 
+    @property
+    def GITHUB_API_CACHE_SIZE(self):
+        """
+        Maximum number of Github API responses cached by Github provider sources.
+
+        Cached responses are re-validated using conditional requests, which do not count against
+        the Github API rate limit when the response has not changed.
+
+        Set to 0 to disable caching of responses.
+        """
+        return max(int(os.environ.get("GITHUB_API_CACHE_SIZE", "1000")), 0)
+
+    @property
+    def GITHUB_API_CACHE_MAX_SIZE(self):
+        """
+        Maximum total size (in MB) of Github API responses cached by Github provider sources.
+
+        When exceeded, the least recently used responses are removed from the cache.
+        Only JSON responses are cached, so release archives and artifacts are never retained in memory.
+        """
+        return max(int(os.environ.get("GITHUB_API_CACHE_MAX_SIZE", "50")), 0)
+
+    @property
+    def GITHUB_API_CONNECTION_POOL_SIZE(self):
+        """
+        Maximum number of connections to the Github API that are kept open for re-use by Github provider sources.
+        """
+        return max(int(os.environ.get("GITHUB_API_CONNECTION_POOL_SIZE", "10")), 1)
+
+    @property
+    def GITHUB_API_MAX_RATE_LIMIT_WAIT(self):
+        """
+        Maximum time (in seconds) that a Github API request is delayed, whilst the Github API rate limit
+        has been exceeded.
+
+        If the rate limit is not reset within this time, or the Github API requests a longer wait
+        for a secondary rate limit, the request fails.
+        """
+        return max(int(os.environ.get("GITHUB_API_MAX_RATE_LIMIT_WAIT", "60")), 0)
+
     @property
     def GITHUB_APP_CLIENT_ID(self):
         """
@@ -1,6 +1,9 @@
 """Provide database class."""
 
 from contextlib import contextmanager
+from typing import Callable
+import zlib
+
 import sqlalchemy
 import sqlalchemy.dialects.mysql
 
@@ -10,9 +13,11 @@ from terrareg.audit_action import AuditAction
 
 import terrareg.config
 from terrareg.errors import DatabaseMustBeIniistalisedError
+from terrareg.identity_map import IdentityMap
 from terrareg.provider_tier import ProviderTier
 from terrareg.user_group_namespace_permission_type import UserGroupNamespacePermissionType
 from terrareg.namespace_type import NamespaceType
+from terrareg.module_import_job_status import ModuleImportJobStatus
 from terrareg.provider_source_type import ProviderSourceType
 import terrareg.provider_documentation_type
 import terrareg.provider_binary_types
@@ -28,19 +33,40 @@ class Database():
     blob_encoding_format = 'utf-8'
     MEDIUM_BLOB_SIZE = ((2 ** 24) - 1)
 
+    # Encoded blobs are prefixed with a marker byte and a codec byte.
+    # The marker byte never occurs in UTF-8 encoded text, so blobs without
+    # the marker are legacy blobs, containing uncompressed UTF-8 text.
+    BLOB_CODEC_MARKER = b'\xff'
+    BLOB_CODEC_ZLIB = b'\x01'
+
     @staticmethod
     def encode_blob(value):
-        """Encode string as a blog value"""
+        """Encode string as a blob value, compressing values that exceed the compression threshold"""
         # Convert any untruthful values to empty string
         if not value:
             value = ''
-        return value.encode(Database.blob_encoding_format)
+        encoded = value.encode(Database.blob_encoding_format)
+
+        config = terrareg.config.Config()
+        if config.BLOB_COMPRESSION_MIN_SIZE and len(encoded) >= config.BLOB_COMPRESSION_MIN_SIZE:
+            compressed = Database.BLOB_CODEC_MARKER + Database.BLOB_CODEC_ZLIB + zlib.compress(
+                encoded, config.BLOB_COMPRESSION_LEVEL)
+            # Only store compressed value if it is smaller than the original
+            if len(compressed) < len(encoded):
+                return compressed
+        return encoded
 
     @staticmethod
     def decode_blob(value):
         """Decode blob as a string."""
         if value is None:
             return None
+        if value[:1] == Database.BLOB_CODEC_MARKER:
+            codec = value[1:2]
+            if codec == Database.BLOB_CODEC_ZLIB:
+                value = zlib.decompress(value[2:])
+            else:
+                raise ValueError(f'Unknown blob codec: {codec!r}')
         return value.decode(Database.blob_encoding_format)
 
     @staticmethod
@@ -76,9 +102,14 @@ class Database():
         self._provider_version_binary = None
         self._analytics = None
         self._provider_analytics = None
+        self._analytics_daily_rollup = None
+        self._provider_analytics_daily_rollup = None
+        self._analytics_rollup_checkpoint = None
+        self._module_import_job = None
         self._example_file = None
         self._module_version_file = None
         self.transaction_connection = None
+        self.transaction_commit_callbacks = None
 
     @property
     def session(self):
@@ -192,6 +223,34 @@ class Database():
             raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
         return self._provider_analytics
 
+    @property
+    def analytics_daily_rollup(self):
+        """Return analytics_daily_rollup table."""
+        if self._analytics_daily_rollup is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._analytics_daily_rollup
+
+    @property
+    def provider_analytics_daily_rollup(self):
+        """Return provider_analytics_daily_rollup table."""
+        if self._provider_analytics_daily_rollup is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._provider_analytics_daily_rollup
+
+    @property
+    def analytics_rollup_checkpoint(self):
+        """Return analytics_rollup_checkpoint table."""
+        if self._analytics_rollup_checkpoint is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._analytics_rollup_checkpoint
+
+    @property
+    def module_import_job(self):
+        """Return module_import_job table."""
+        if self._module_import_job is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._module_import_job
+
     @property
     def example_file(self):
         """Return example_file table."""
@@ -300,6 +359,8 @@ class Database():
                 pool_pre_ping=True,
                 pool_recycle=300
             )
+            sqlalchemy.event.listen(cls._ENGINE, 'after_cursor_execute', IdentityMap.after_cursor_execute)
+            sqlalchemy.event.listen(cls._ENGINE, 'rollback', IdentityMap.on_rollback)
         return cls._ENGINE
 
     def initialise(self):
@@ -487,7 +548,15 @@ class Database():
             sqlalchemy.Column('infracost', Database.medium_blob()),
             sqlalchemy.Column('terraform_graph', Database.medium_blob()),
             sqlalchemy.Column('terraform_modules', Database.medium_blob()),
-            sqlalchemy.Column('terraform_version', Database.medium_blob())
+            sqlalchemy.Column('terraform_version', Database.medium_blob()),
+            # Graph JSON for each combination of full resource/module names
+            sqlalchemy.Column('terraform_graph_json', Database.medium_blob()),
+            # Digest of the inputs of extraction, used to re-use extraction results
+            sqlalchemy.Column('content_digest', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            # Unique value generated when the row is created. Row IDs may be re-used
+            # after rows are deleted, so this identifies cached values derived from the row.
+            sqlalchemy.Column('generation', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Index('ix_module_details_content_digest', 'content_digest'),
         )
 
         self._module_version = sqlalchemy.Table(
@@ -527,7 +596,15 @@ class Database():
             sqlalchemy.Column('variable_template', Database.medium_blob()),
             sqlalchemy.Column('internal', sqlalchemy.Boolean, nullable=False),
             sqlalchemy.Column('published', sqlalchemy.Boolean),
-            sqlalchemy.Column('extraction_version', sqlalchemy.Integer)
+            sqlalchemy.Column('extraction_version', sqlalchemy.Integer),
+            # Semantic version components of version, used for ordering versions
+            sqlalchemy.Column('version_major', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('version_minor', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('version_patch', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('version_prerelease', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+
+            sqlalchemy.Index('ix_module_version_module_provider_id_version_key',
+                             'module_provider_id', 'version_major', 'version_minor', 'version_patch'),
         )
 
         self._sub_module = sqlalchemy.Table(
@@ -571,6 +648,8 @@ class Database():
             sqlalchemy.Column('namespace_name', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
             sqlalchemy.Column('module_name', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
             sqlalchemy.Column('provider_name', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
+
+            sqlalchemy.Index('ix_analytics_parent_module_version_timestamp', 'parent_module_version', 'timestamp'),
         )
 
         self._provider_analytics = sqlalchemy.Table(
@@ -583,6 +662,64 @@ class Database():
             # Columns for providing redirect deletion protection
             sqlalchemy.Column('namespace_name', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
             sqlalchemy.Column('provider_name', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
+
+            sqlalchemy.Index('ix_provider_analytics_provider_version_id_timestamp', 'provider_version_id', 'timestamp'),
+        )
+
+        # Number of downloads per day for each module version,
+        # aggregated from analytics rows, up to the checkpoint ID
+        self._analytics_daily_rollup = sqlalchemy.Table(
+            'analytics_daily_rollup', meta,
+            sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column('module_version_id', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('day', sqlalchemy.Date, nullable=True),
+            sqlalchemy.Column('download_count', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Index('ix_analytics_daily_rollup_module_version_id_day', 'module_version_id', 'day'),
+        )
+
+        # Number of downloads per day for each provider version,
+        # aggregated from provider_analytics rows, up to the checkpoint ID
+        self._provider_analytics_daily_rollup = sqlalchemy.Table(
+            'provider_analytics_daily_rollup', meta,
+            sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column('provider_version_id', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('day', sqlalchemy.Date, nullable=True),
+            sqlalchemy.Column('download_count', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Index('ix_provider_analytics_daily_rollup_provider_version_id_day', 'provider_version_id', 'day'),
+        )
+
+        # Latest ID of analytics tables that have been aggregated into rollup tables
+        self._analytics_rollup_checkpoint = sqlalchemy.Table(
+            'analytics_rollup_checkpoint', meta,
+            sqlalchemy.Column('name', sqlalchemy.String(GENERAL_COLUMN_SIZE), primary_key=True),
+            sqlalchemy.Column('last_id', sqlalchemy.Integer, nullable=False),
+        )
+
+        # Queued imports of module versions from git
+        self._module_import_job = sqlalchemy.Table(
+            'module_import_job', meta,
+            sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column(
+                'module_provider_id',
+                sqlalchemy.ForeignKey(
+                    'module_provider.id',
+                    name='fk_module_import_job_module_provider_id_module_provider_id',
+                    onupdate='CASCADE',
+                    ondelete='CASCADE'),
+                nullable=False
+            ),
+            sqlalchemy.Column('version', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=False),
+            sqlalchemy.Column('status', sqlalchemy.Enum(ModuleImportJobStatus), nullable=False),
+            sqlalchemy.Column('attempts', sqlalchemy.Integer, nullable=False, default=0),
+            sqlalchemy.Column('username', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('error', sqlalchemy.String(LARGE_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('created_at', sqlalchemy.DateTime, nullable=False),
+            sqlalchemy.Column('run_after', sqlalchemy.DateTime, nullable=False),
+            sqlalchemy.Column('started_at', sqlalchemy.DateTime, nullable=True),
+            sqlalchemy.Column('finished_at', sqlalchemy.DateTime, nullable=True),
+            # Whether the job re-extracts an existing module version as part of a bulk re-index
+            sqlalchemy.Column('bulk_reindex', sqlalchemy.Boolean, nullable=False, default=False, server_default=sqlalchemy.false()),
+            sqlalchemy.Index('ix_module_import_job_status_run_after', 'status', 'run_after'),
         )
 
         self._example_file = sqlalchemy.Table(
@@ -754,6 +891,14 @@ class Database():
             sqlalchemy.Column('published_at', sqlalchemy.DateTime),
             sqlalchemy.Column('extraction_version', sqlalchemy.Integer),
             sqlalchemy.Column('protocol_versions', self.medium_blob()),
+            # Semantic version components of version, used for ordering versions
+            sqlalchemy.Column('version_major', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('version_minor', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('version_patch', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('version_prerelease', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+
+            sqlalchemy.Index('ix_provider_version_provider_id_version_key',
+                             'provider_id', 'version_major', 'version_minor', 'version_patch'),
         )
 
         self._provider_version_documentation = sqlalchemy.Table(
@@ -874,6 +1019,21 @@ class Database():
         conn = Database.get().get_connection()
         return Transaction(conn)
 
+    @classmethod
+    def call_after_commit(cls, callback: Callable[[], None]) -> None:
+        """
+        Call callback once the current transaction has been committed,
+        or immediately, if not within a transaction.
+
+        Callbacks are discarded if the transaction is rolled back.
+        """
+        if cls.get_current_transaction() is None:
+            callback()
+        elif has_request_context():
+            flask.g.database_transaction_commit_callbacks.append(callback)
+        else:
+            cls.get().transaction_commit_callbacks.append(callback)
+
     @classmethod
     @contextmanager
     def get_new_transaction_or_nested(cls):
@@ -950,17 +1110,31 @@ class Transaction:
         # returned by any get_connection methods
         if has_request_context():
             flask.g.database_transaction_connection = self._connection
+            flask.g.database_transaction_commit_callbacks = []
         else:
             Database.get().transaction_connection = self._connection
+            Database.get().transaction_commit_callbacks = []
 
         return self
 
-    def __exit__(self, *args, **kwargs):
-        """End transaction and remove from current context."""
+    def __exit__(self, exc_type, *args, **kwargs):
+        """End transaction and remove from current context, calling any commit callbacks once committed."""
         if has_request_context():
             flask.g.database_transaction_connection = None
+            commit_callbacks = flask.g.database_transaction_commit_callbacks
+            flask.g.database_transaction_commit_callbacks = None
         else:
             Database.get().transaction_connection = None
+            commit_callbacks = Database.get().transaction_commit_callbacks
+            Database.get().transaction_commit_callbacks = None
+
+        # The transaction is only committed on exit if it has not
+        # been rolled back and no exception has been raised
+        committed = exc_type is None and self._transaction_outer.is_active
+
+        self._transaction_outer.__exit__(exc_type, *args, **kwargs)
 
-        self._transaction_outer.__exit__(*args, **kwargs)
+        if committed:
+            for callback in commit_callbacks:
+                callback()
 
@@ -186,12 +186,6 @@ class InvalidUserGroupNameError(TerraregError):
     pass
 
 
-class UnableToGetGlobalTerraformLockError(TerraregError):
-    """Unable to acquire thread lock whilst switching Terraform"""
-
-    pass
-
-
 class TerraformVersionSwitchError(TerraregError):
     """An error occurred whilst switching Terraform versions"""
 
@@ -384,6 +378,18 @@ class InvalidReleaseArtifactChecksumError(TerraregError):
     pass
 
 
+class ReleaseArtifactDownloadError(TerraregError):
+    """Error response returned whilst downloading release artifact, which may succeed if retried"""
+
+    pass
+
+
+class ReleaseArtifactDownloadRejectedError(ReleaseArtifactDownloadError):
+    """Request to download release artifact was rejected, e.g. due to invalid credentials, and should not be retried"""
+
+    pass
+
+
 class NonExistentNamespaceError(TerraregError):
     """A namespace cannot be found for a given provider owner"""
 
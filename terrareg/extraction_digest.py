@@ -0,0 +1,143 @@
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+from typing import Dict, List, Optional
+
+from terrareg.config import Config
+from terrareg.constants import EXTRACTION_VERSION
+
+
+class ExtractionDigest:
+    """
+    Generate digests of the inputs of the extraction of modules, submodules and examples.
+
+    The digest of a module covers:
+     * the extraction version and the versions of the tools used for extraction;
+     * configuration that modifies the results of extraction;
+     * the path of the module, relative to the extraction directory;
+     * the path and content of all files within the module directory, as tfsec scans
+       the module recursively;
+     * the files in the directories of local modules that are referenced by the module
+       (e.g. examples that reference the root module), as these are included in the
+       Terraform graph and modules of the module.
+
+    Modules with the same digest produce the same extraction results, so the results
+    of a previous extraction can be re-used.
+    Remote modules and providers, which are resolved during terraform init, are not included.
+    """
+
+    # Tools that are run during extraction, that produce the results stored for each module
+    TOOLS = ['terraform-docs', 'tfsec', 'tfswitch']
+
+    # Directories that are excluded from the digest, which are generated during extraction
+    IGNORE_DIRECTORIES = ['.git', '.terraform']
+
+    LOCAL_MODULE_SOURCE_RE = re.compile(r'^\s*source\s*=\s*"(\.\.?/[^"]*)"', re.MULTILINE)
+
+    _tool_versions_lock = threading.Lock()
+    # Version output of tools, by tool name, which are obtained once per process
+    _tool_versions = {}
+
+    @classmethod
+    def get_tool_version(cls, tool: str) -> Optional[str]:
+        """Return version output of tool, returning None if it cannot be obtained"""
+        with cls._tool_versions_lock:
+            if tool not in cls._tool_versions:
+                try:
+                    cls._tool_versions[tool] = subprocess.check_output([tool, '--version'], stderr=subprocess.STDOUT).decode('utf-8').strip()
+                except (OSError, subprocess.CalledProcessError) as exc:
+                    print(f'Unable to obtain version of {tool}:', str(exc))
+                    cls._tool_versions[tool] = None
+            return cls._tool_versions[tool]
+
+    def __init__(self, extract_directory: str):
+        """Store member variables"""
+        self._extract_directory = extract_directory
+        # Digests of file contents, by file path
+        self._file_digests = {}
+
+    def _get_file_digest(self, file_path: str) -> str:
+        """Return digest of content of file"""
+        if file_path not in self._file_digests:
+            file_hash = hashlib.sha256()
+            if os.path.islink(file_path):
+                file_hash.update(b'link:' + os.readlink(file_path).encode('utf-8'))
+            if os.path.isfile(file_path):
+                with open(file_path, 'rb') as fh:
+                    for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+                        file_hash.update(chunk)
+            self._file_digests[file_path] = file_hash.hexdigest()
+        return self._file_digests[file_path]
+
+    def _get_local_module_sources(self, directory: str) -> List[str]:
+        """Return directories of local modules referenced by Terraform files in directory"""
+        sources = []
+        for file_name in sorted(os.listdir(directory)):
+            file_path = os.path.join(directory, file_name)
+            if not file_name.endswith('.tf') or not os.path.isfile(file_path):
+                continue
+            with open(file_path, 'r', errors='replace') as fh:
+                content = fh.read()
+            for source in self.LOCAL_MODULE_SOURCE_RE.findall(content):
+                source_directory = os.path.normpath(os.path.join(directory, source))
+                # Ignore modules outside of the extraction directory,
+                # which cannot be initialised
+                if ((source_directory == os.path.normpath(self._extract_directory) or
+                        source_directory.startswith(os.path.join(self._extract_directory, ''))) and
+                        os.path.isdir(source_directory)):
+                    sources.append(source_directory)
+        return sources
+
+    def _get_directory_files(self, directory: str, recursive: bool) -> Dict[str, str]:
+        """Return digest of each file in directory, by path relative to the extraction directory"""
+        files = {}
+        for root, dirs, file_names in os.walk(directory):
+            dirs[:] = [dir_ for dir_ in dirs if dir_ not in self.IGNORE_DIRECTORIES] if recursive else []
+            # Directory symlinks are not descended into, so record the symlink
+            for name in file_names + [dir_ for dir_ in dirs if os.path.islink(os.path.join(root, dir_))]:
+                file_path = os.path.join(root, name)
+                files[os.path.relpath(file_path, self._extract_directory)] = self._get_file_digest(file_path)
+        return files
+
+    def get_digest(self, module_path: str, run_infracost: bool) -> Optional[str]:
+        """
+        Return digest of module, before any modifications are made to the module during extraction.
+
+        Returns None if the versions of the tools used for extraction cannot be determined.
+        """
+        tools = self.TOOLS + (['infracost'] if run_infracost else [])
+        tool_versions = {tool: self.get_tool_version(tool) for tool in tools}
+        if None in tool_versions.values():
+            return None
+
+        config = Config()
+        module_path = os.path.normpath(module_path)
+        files = self._get_directory_files(module_path, recursive=True)
+
+        # Include files of local modules that are referenced by the module,
+        # and any local modules that they reference
+        to_process = [module_path]
+        processed = set()
+        while to_process:
+            directory = to_process.pop(0)
+            if directory in processed:
+                continue
+            processed.add(directory)
+            if directory != module_path:
+                files.update(self._get_directory_files(directory, recursive=False))
+            to_process += self._get_local_module_sources(directory)
+
+        digest_content = {
+            'extraction_version': EXTRACTION_VERSION,
+            'tool_versions': tool_versions,
+            'product': config.PRODUCT.value,
+            'default_terraform_version': config.DEFAULT_TERRAFORM_VERSION,
+            'terraform_archive_mirror': config.TERRAFORM_ARCHIVE_MIRROR,
+            'path': os.path.relpath(module_path, self._extract_directory),
+            'files': files,
+        }
+        return hashlib.sha256(json.dumps(digest_content, sort_keys=True).encode('utf-8')).hexdigest()
@@ -1,25 +1,142 @@
 
 import re
-from typing import TextIO, Tuple
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
 import abc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import functools
+import inspect
+import io
 from io import BytesIO, TextIOWrapper
 import os
 import shutil
+import tempfile
+import threading
+import time
 
 import boto3
+import boto3.s3.transfer
+import botocore.config
 import botocore.exceptions
 
 import terrareg.config
 from terrareg.errors import FileUploadError, InvalidDataDirectoryError
 
 
+class FileStorageMetrics:
+    """Process-wide latency metrics of file storage operations, by storage type and operation"""
+
+    _LOCK = threading.Lock()
+    # Count, error count, total duration and maximum duration, by storage type and operation
+    _OPERATIONS: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    @classmethod
+    def record(cls, storage_type: str, operation: str, duration: float, error: bool) -> None:
+        """Record call of file storage operation"""
+        with cls._LOCK:
+            stats = cls._OPERATIONS.setdefault(
+                (storage_type, operation),
+                {'count': 0, 'error_count': 0, 'duration_total': 0.0, 'duration_max': 0.0}
+            )
+            stats['count'] += 1
+            if error:
+                stats['error_count'] += 1
+            stats['duration_total'] += duration
+            stats['duration_max'] = max(stats['duration_max'], duration)
+
+    @classmethod
+    def get_operation_stats(cls) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """Return copy of statistics, by storage type and operation"""
+        with cls._LOCK:
+            return {
+                key: dict(stats)
+                for key, stats in cls._OPERATIONS.items()
+            }
+
+    @classmethod
+    def reset(cls) -> None:
+        """Remove all recorded statistics"""
+        with cls._LOCK:
+            cls._OPERATIONS = {}
+
+
+def record_latency(func: Callable) -> Callable:
+    """
+    Record latency of file storage method in FileStorageMetrics.
+
+    For generator methods (including those wrapped with contextmanager),
+    the duration covers the full iteration of the generator.
+    """
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(self, *args, **kwargs):
+            start_time = time.monotonic()
+            error = False
+            try:
+                yield from func(self, *args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                FileStorageMetrics.record(self.STORAGE_TYPE, func.__name__, time.monotonic() - start_time, error)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        start_time = time.monotonic()
+        error = False
+        try:
+            return func(self, *args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            FileStorageMetrics.record(self.STORAGE_TYPE, func.__name__, time.monotonic() - start_time, error)
+    return wrapper
+
+
+class FileDetails:
+    """Details of file in file storage"""
+
+    def __init__(self, size: int, etag: str):
+        """Store member variables"""
+        self.size = size
+        self.etag = etag
+
+
 class BaseFileStorage(abc.ABC):
 
+    # Name of storage type, used for metrics
+    STORAGE_TYPE = None
+
+    # Size of chunks yielded when streaming files from storage
+    STREAM_CHUNK_SIZE = 64 * 1024
+
     @abc.abstractmethod
     def upload_file(self, source_path: str, dest_directory: str, dest_filename: str) -> None:
         """Upload file to storage"""
         ...
 
+    @record_latency
+    def upload_files(self, uploads: List[Tuple[str, str, str]]) -> None:
+        """
+        Upload multiple files concurrently.
+
+        Each upload is a tuple of source path, destination directory and destination filename.
+        Raises the first error encountered, once all uploads have completed.
+        """
+        if not uploads:
+            return
+
+        max_workers = min(terrareg.config.Config().FILE_STORAGE_UPLOAD_CONCURRENCY, len(uploads))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='file-storage-upload') as executor:
+            futures = [
+                executor.submit(self.upload_file, source_path=source_path, dest_directory=dest_directory, dest_filename=dest_filename)
+                for source_path, dest_directory, dest_filename in uploads
+            ]
+        for future in futures:
+            future.result()
+
     @abc.abstractmethod
     def file_exists(self, path: str) -> bool:
         """Check if file exists"""
@@ -50,15 +167,41 @@ class BaseFileStorage(abc.ABC):
         """Recursively create directory"""
         ...
 
+    @abc.abstractmethod
+    def get_file_details(self, path: str) -> Optional[FileDetails]:
+        """Return size and ETag of file, or None if it does not exist"""
+        ...
+
+    @abc.abstractmethod
+    def stream_file(self, path: str, start: int=0, end: Optional[int]=None) -> Iterator[bytes]:
+        """Yield chunks of content of file, from start offset up to (but excluding) end offset"""
+        ...
+
+    def get_presigned_download_url(self, path: str, expiry: int, download_name: str) -> Optional[str]:
+        """Return time-limited URL to download file directly from storage, if supported"""
+        return None
+
     @abc.abstractmethod
     def write_file(self, path: str, content: any, binary: bool):
         """Write file to file storage from content"""
         ...
 
+    @abc.abstractmethod
+    @contextmanager
+    def open_write(self, path: str) -> Iterator[BinaryIO]:
+        """
+        Yield binary file handle to write file to storage.
+
+        The file is only stored if the context exits without an exception.
+        """
+        ...
+
 
 class LocalFileStorage(BaseFileStorage):
     """Handle local file storage."""
 
+    STORAGE_TYPE = 'local'
+
     def __init__(self, base_directory: str):
         """Store base directory"""
         self._base_directory = base_directory
@@ -87,11 +230,13 @@ class LocalFileStorage(BaseFileStorage):
 
         return path
 
+    @record_latency
     def make_directory(self, directory: str):
         """Recursively create directory"""
         directory = self._generate_path(directory)
         os.makedirs(directory, exist_ok=True)
 
+    @record_latency
     def upload_file(self, source_path: str, dest_directory: str, dest_filename: str):
         """Upload file"""
         self._check_not_directory(dest_directory, dest_filename)
@@ -112,26 +257,31 @@ class LocalFileStorage(BaseFileStorage):
         if os.path.exists(path) and not os.path.isfile(path):
             raise FileUploadError("Destination already exists, but is not a file")
 
+    @record_latency
     def file_exists(self, path: str) -> bool:
         """Return if a file exists"""
         path = self._generate_path(path)
         return os.path.isfile(path)
 
+    @record_latency
     def directory_exists(self, path: str) -> bool:
         """Return if a directory exists"""
         path = self._generate_path(path)
         return os.path.isdir(path)
 
+    @record_latency
     def delete_file(self, path: str) -> None:
         """Delete path"""
         path = self._generate_path(path)
         os.unlink(path)
 
+    @record_latency
     def delete_directory(self, path: str) -> None:
         """Delete path"""
         path = self._generate_path(path)
         os.rmdir(path)
 
+    @record_latency
     def read_file(self, path: str, bytes_mode: bool=False) -> TextIOWrapper:
         """Return file handler for file"""
         path = self._generate_path(path)
@@ -140,6 +290,34 @@ class LocalFileStorage(BaseFileStorage):
             mode += "b"
         return open(path, mode)
 
+    @record_latency
+    def get_file_details(self, path: str) -> Optional[FileDetails]:
+        """Return size and ETag of file, generated from modification time and size"""
+        path = self._generate_path(path)
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return FileDetails(
+            size=stat_result.st_size,
+            etag=f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
+        )
+
+    @record_latency
+    def stream_file(self, path: str, start: int=0, end: Optional[int]=None) -> Iterator[bytes]:
+        """Yield chunks of content of file"""
+        with open(self._generate_path(path), "rb") as fh:
+            fh.seek(start)
+            remaining = None if end is None else end - start
+            while remaining is None or remaining > 0:
+                chunk = fh.read(self.STREAM_CHUNK_SIZE if remaining is None else min(self.STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    @record_latency
     def write_file(self, path: str, content: any, binary: bool):
         """Write file to file storage from content"""
         # Ensure destination is not a directory
@@ -156,20 +334,151 @@ class LocalFileStorage(BaseFileStorage):
         with open(path, mode) as fh:
             fh.write(content)
 
+    @contextmanager
+    @record_latency
+    def open_write(self, path: str) -> Iterator[BinaryIO]:
+        """Yield file handle to temporary file in destination directory, which replaces the destination file when complete"""
+        self._check_not_directory(path)
+
+        # Create directory to store file
+        self.make_directory(os.path.dirname(path))
+
+        path = self._generate_path(path)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f'.{os.path.basename(path)}.')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                yield fh
+            # Match permissions of files created by write_file
+            current_umask = os.umask(0)
+            os.umask(current_umask)
+            os.chmod(temp_path, 0o666 & ~current_umask)
+            os.replace(temp_path, path)
+        finally:
+            # Remove temporary file, if it was not moved into place
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Write-only file handle that streams content to an s3 object.
+
+    Content is buffered until a full part is available, which is uploaded
+    as part of a multipart upload, so that at most one part is held in memory.
+    Content smaller than a single part is uploaded in a single request when closed.
+    """
+
+    def __init__(self, s3_client, bucket: str, key: str, part_size: int):
+        """Store member variables"""
+        super().__init__()
+        self._s3_client = s3_client
+        self._bucket = bucket
+        self._key = key
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[dict] = []
+
+    def writable(self) -> bool:
+        """Return whether file handle is writable"""
+        return True
+
+    def write(self, data) -> int:
+        """Buffer data, uploading each complete part"""
+        if self.closed:
+            raise ValueError("write to closed file")
+        self._buffer += data
+        while len(self._buffer) >= self._part_size:
+            self._upload_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+        return len(data)
+
+    def _upload_part(self, content: bytes) -> None:
+        """Upload part of multipart upload, starting the upload if required"""
+        if self._upload_id is None:
+            self._upload_id = self._s3_client.create_multipart_upload(Bucket=self._bucket, Key=self._key)['UploadId']
+        part_number = len(self._parts) + 1
+        res = self._s3_client.upload_part(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+            PartNumber=part_number, Body=content
+        )
+        self._parts.append({'ETag': res['ETag'], 'PartNumber': part_number})
+
+    def complete(self) -> None:
+        """Upload remaining content and complete upload"""
+        if self._upload_id is None:
+            self._s3_client.put_object(Bucket=self._bucket, Key=self._key, Body=bytes(self._buffer))
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self._s3_client.complete_multipart_upload(
+                Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+                MultipartUpload={'Parts': self._parts}
+            )
+        self._buffer = bytearray()
+        self.close()
+
+    def abort(self) -> None:
+        """Abort upload, removing any uploaded parts"""
+        self._buffer = bytearray()
+        self.close()
+        if self._upload_id is not None:
+            self._s3_client.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+
 
 class S3FileStorage(BaseFileStorage):
     """Handle file storage in s3"""
 
+    STORAGE_TYPE = 's3'
+
+    # Session and client shared by all instances.
+    # Clients are thread-safe, so a single client (and connection pool)
+    # is used across all threads.
+    _SHARED_SESSION: Optional[boto3.session.Session] = None
+    _SHARED_CLIENT = None
+    _SHARED_CLIENT_LOCK = threading.Lock()
+
+    @classmethod
+    def _get_shared_client(cls) -> Tuple[boto3.session.Session, object]:
+        """Return shared session and s3 client, creating them if they do not exist"""
+        with cls._SHARED_CLIENT_LOCK:
+            if cls._SHARED_CLIENT is None:
+                cls._SHARED_SESSION = boto3.session.Session()
+                cls._SHARED_CLIENT = cls._SHARED_SESSION.client(
+                    's3',
+                    config=botocore.config.Config(
+                        max_pool_connections=terrareg.config.Config().S3_MAX_POOL_CONNECTIONS,
+                        retries={'mode': 'standard'}
+                    )
+                )
+            return cls._SHARED_SESSION, cls._SHARED_CLIENT
+
+    @classmethod
+    def reset_shared_client(cls) -> None:
+        """Remove shared session and client, so that they are re-created on next use"""
+        with cls._SHARED_CLIENT_LOCK:
+            cls._SHARED_SESSION = None
+            cls._SHARED_CLIENT = None
+
     def __init__(self, s3_url) -> None:
         """Store member variables"""
         self._s3_url = s3_url
         self._bucket_name, self._base_s3_path = self._get_path_details(s3_url)
 
-        self._session = boto3.session.Session()
-        self._s3_client = self._session.client('s3')
-        self._s3_resource = self._session.resource('s3')
+        self._session, self._s3_client = self._get_shared_client()
         super().__init__()
 
+    def _get_transfer_config(self) -> boto3.s3.transfer.TransferConfig:
+        """Return transfer config for multipart uploads"""
+        config = terrareg.config.Config()
+        part_size = config.S3_MULTIPART_PART_SIZE * 1024 * 1024
+        return boto3.s3.transfer.TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=config.S3_MULTIPART_CONCURRENCY,
+            use_threads=config.S3_MULTIPART_CONCURRENCY > 1
+        )
+
     def _get_path_details(self, s3_url) -> Tuple[str, str]:
         """Obtain bucket name and base path from s3 path"""
         match = re.match(r"s3://([^/]+)((:?/.*)?)$", s3_url)
@@ -187,10 +496,6 @@ class S3FileStorage(BaseFileStorage):
 
         return bucket, path
 
-    def _get_bucket(self):
-        """Get bucket object"""
-        return self._s3_resource.Bucket(self._bucket_name)
-
     def _generate_key(self, *paths):
         """Generate s3 key"""
         path = "/".join([self._base_s3_path, *paths])
@@ -202,31 +507,56 @@ class S3FileStorage(BaseFileStorage):
         path = path.rstrip('/')
         return path
 
+    @record_latency
     def upload_file(self, source_path: str, dest_directory: str, dest_filename: str) -> None:
-        """Upload file to s3"""
-        with open(source_path, 'rb') as fh:
-            content = fh.read()
-        self.write_file(path=f'{dest_directory}/{dest_filename}', content=content, binary=True)
+        """Upload file to s3, streaming file using multipart upload if it is larger than the part size"""
+        self._s3_client.upload_file(
+            Filename=source_path,
+            Bucket=self._bucket_name,
+            Key=self._generate_key(dest_directory, dest_filename),
+            Config=self._get_transfer_config()
+        )
 
+    @record_latency
     def write_file(self, path: str, content: any, binary: bool):
         """Write file to file storage from content"""
         key = self._generate_key(path)
 
-        self._get_bucket().put_object(
+        self._s3_client.put_object(
+            Bucket=self._bucket_name,
             Key=key,
             Body=content
         )
 
+    @contextmanager
+    @record_latency
+    def open_write(self, path: str) -> Iterator[BinaryIO]:
+        """Yield file handle that streams content to s3, which is stored when complete"""
+        writer = S3MultipartWriter(
+            s3_client=self._s3_client,
+            bucket=self._bucket_name,
+            key=self._generate_key(path),
+            part_size=terrareg.config.Config().S3_MULTIPART_PART_SIZE * 1024 * 1024
+        )
+        try:
+            yield writer
+            writer.complete()
+        except BaseException:
+            writer.abort()
+            raise
+
     def delete_directory(self, path: str) -> None:
         """Delete directory from s3"""
         # There is no method required to delete a directory
         pass
 
+    @record_latency
     def delete_file(self, path: str) -> None:
         """Delete key from s3"""
         path = self._generate_key(path)
         self._s3_client.delete_object(Bucket=self._bucket_name, Key=path)
 
+    @record_latency
     def read_file(self, path: str, bytes_mode: bool = False) -> TextIOWrapper:
         """Obtain FH containing contents of file from s3"""
         if bytes_mode is False:
@@ -237,13 +567,52 @@ class S3FileStorage(BaseFileStorage):
         key = self._generate_key(path)
 
         try:
-            self._get_bucket().download_fileobj(Key=key, Fileobj=content)
+            self._s3_client.download_fileobj(Bucket=self._bucket_name, Key=key, Fileobj=content)
         except botocore.exceptions.ClientError:
             return None
 
         content.seek(0)
         return content
 
+    @record_latency
+    def get_file_details(self, path: str) -> Optional[FileDetails]:
+        """Return size and ETag of object in s3"""
+        key = self._generate_key(path)
+        try:
+            res = self._s3_client.head_object(Bucket=self._bucket_name, Key=key)
+        except botocore.exceptions.ClientError:
+            return None
+        return FileDetails(size=res['ContentLength'], etag=res['ETag'].strip('"'))
+
+    @record_latency
+    def stream_file(self, path: str, start: int=0, end: Optional[int]=None) -> Iterator[bytes]:
+        """Yield chunks of content of object in s3, only requesting the required byte range"""
+        if end is not None and end <= start:
+            return
+
+        kwargs = {}
+        if start or end is not None:
+            kwargs['Range'] = f"bytes={start}-{'' if end is None else end - 1}"
+        body = self._s3_client.get_object(Bucket=self._bucket_name, Key=self._generate_key(path), **kwargs)['Body']
+        try:
+            yield from body.iter_chunks(chunk_size=self.STREAM_CHUNK_SIZE)
+        finally:
+            body.close()
+
+    @record_latency
+    def get_presigned_download_url(self, path: str, expiry: int, download_name: str) -> Optional[str]:
+        """Return presigned URL to download object from s3"""
+        return self._s3_client.generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': self._bucket_name,
+                'Key': self._generate_key(path),
+                'ResponseContentDisposition': f'inline; filename="{download_name}"',
+            },
+            ExpiresIn=expiry
+        )
+
+    @record_latency
     def file_exists(self, path: str) -> bool:
         """Check if object exists in s3"""
         path = self._generate_key(path)
@@ -271,10 +640,25 @@ class S3FileStorage(BaseFileStorage):
 
 class FileStorageFactory:
 
+    # File storage instances, by data directory
+    _INSTANCES: Dict[str, BaseFileStorage] = {}
+    _INSTANCES_LOCK = threading.Lock()
+
+    @classmethod
+    def reset(cls) -> None:
+        """Remove cached file storage instances and shared clients, e.g. after configuration changes"""
+        with cls._INSTANCES_LOCK:
+            cls._INSTANCES = {}
+        S3FileStorage.reset_shared_client()
+
     def get_file_storage(self) -> 'BaseFileStorage':
-        """Generate file storage instance"""
-        config = terrareg.config.Config()
-        if config.DATA_DIRECTORY.startswith("s3://"):
-            return S3FileStorage(config.DATA_DIRECTORY)
-        else:
-            return LocalFileStorage(config.DATA_DIRECTORY)
+        """Return file storage instance for configured data directory, re-using existing instance"""
+        data_directory = terrareg.config.Config().DATA_DIRECTORY
+        with self._INSTANCES_LOCK:
+            if (instance := self._INSTANCES.get(data_directory)) is None:
+                if data_directory.startswith("s3://"):
+                    instance = S3FileStorage(data_directory)
+                else:
+                    instance = LocalFileStorage(data_directory)
+                self._INSTANCES[data_directory] = instance
+            return instance
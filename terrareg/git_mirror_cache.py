@@ -0,0 +1,162 @@
+
+from contextlib import contextmanager
+import fcntl
+import hashlib
+import os
+import shutil
+import subprocess
+from typing import Dict, Optional
+
+from terrareg.config import Config
+
+
+class GitMirrorCache:
+    """
+    Local cache of bare mirrors of module repositories.
+
+    Each import fetches the required tag into the mirror of the repository,
+    which only downloads objects that are not already present, and then performs
+    a shallow clone of the tag from the mirror.
+
+    Mirrors are locked whilst in use, using file locks, so that concurrent imports
+    across threads and processes sharing the cache directory are safe.
+    The least recently used mirrors are removed when the cache exceeds the maximum size.
+    """
+
+    @classmethod
+    def get(cls) -> Optional['GitMirrorCache']:
+        """Return mirror cache, if enabled"""
+        config = Config()
+        if not config.GIT_MIRROR_CACHE_DIRECTORY:
+            return None
+        return cls(directory=config.GIT_MIRROR_CACHE_DIRECTORY, max_size=config.GIT_MIRROR_CACHE_MAX_SIZE * 1024 * 1024)
+
+    def __init__(self, directory: str, max_size: int):
+        """Store member variables"""
+        self._directory = directory
+        self._max_size = max_size
+
+    def _get_mirror_name(self, git_url: str) -> str:
+        """Return name of mirror for git URL"""
+        return hashlib.sha256(git_url.encode('utf-8')).hexdigest()
+
+    def _get_mirror_path(self, mirror_name: str) -> str:
+        """Return path of bare mirror repository"""
+        return os.path.join(self._directory, f'{mirror_name}.git')
+
+    def _get_lock_path(self, mirror_name: str) -> str:
+        """Return path of lock file for mirror"""
+        return os.path.join(self._directory, f'{mirror_name}.lock')
+
+    @contextmanager
+    def _lock_mirror(self, mirror_name: str, blocking: bool=True):
+        """
+        Obtain exclusive lock of mirror, yielding whether the lock was obtained.
+
+        Lock files are never removed, as processes waiting for a removed
+        lock file would not exclude processes using a new lock file.
+        """
+        os.makedirs(self._directory, exist_ok=True)
+        with open(self._get_lock_path(mirror_name), 'a') as lock_fh:
+            try:
+                fcntl.flock(lock_fh, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    def clone(self, git_url: str, fetch_url: str, tag: str, target_directory: str,
+              env: Dict[str, str], timeout: Optional[int]):
+        """
+        Clone tag of repository into target directory, using the mirror of the repository.
+
+        The mirror is identified by git_url, whereas fetch_url is used to fetch from the
+        repository, allowing credentials to be injected, without being stored in the mirror.
+
+        Raises subprocess.CalledProcessError if git commands fail.
+        """
+        mirror_name = self._get_mirror_name(git_url)
+        mirror_path = self._get_mirror_path(mirror_name)
+
+        with self._lock_mirror(mirror_name):
+            if not os.path.isdir(mirror_path):
+                subprocess.check_output(
+                    ['git', 'init', '--bare', '--quiet', mirror_path],
+                    stderr=subprocess.STDOUT,
+                    env=env
+                )
+
+            try:
+                # Fetch tag (or branch) into local tag of the same name,
+                # only downloading objects that are not already present in the mirror
+                subprocess.check_output(
+                    ['git', 'fetch', '--quiet', '--no-tags', '--force', fetch_url, f'+{tag}:refs/tags/{tag}'],
+                    stderr=subprocess.STDOUT,
+                    env=env,
+                    cwd=mirror_path,
+                    timeout=timeout
+                )
+            except subprocess.CalledProcessError:
+                # Remove mirror if it does not contain any refs,
+                # to avoid retaining mirrors of invalid URLs
+                if not subprocess.check_output(['git', 'for-each-ref'], cwd=mirror_path, env=env).strip():
+                    shutil.rmtree(mirror_path)
+                raise
+
+            subprocess.check_output(
+                [
+                    'git', 'clone', '--quiet',
+                    '--depth', '1',
+                    '--single-branch',
+                    '--branch', tag,
+                    f'file://{mirror_path}',
+                    target_directory
+                ],
+                stderr=subprocess.STDOUT,
+                env=env,
+                timeout=timeout
+            )
+
+            # Update modification time of mirror to record last usage
+            os.utime(mirror_path)
+
+        self._evict(exclude_mirror_name=mirror_name)
+
+    def _get_size(self, path: str) -> int:
+        """Return total size of files in directory"""
+        size = 0
+        for root, _, files in os.walk(path):
+            for file_ in files:
+                try:
+                    size += os.lstat(os.path.join(root, file_)).st_size
+                except FileNotFoundError:
+                    pass
+        return size
+
+    def _evict(self, exclude_mirror_name: str):
+        """Remove least recently used mirrors until the cache is within the maximum size"""
+        mirrors = []
+        for entry in os.scandir(self._directory):
+            if entry.is_dir() and entry.name.endswith('.git'):
+                try:
+                    mirrors.append((entry.stat().st_mtime, entry.name[:-len('.git')], self._get_size(entry.path)))
+                except FileNotFoundError:
+                    pass
+
+        total_size = sum(size for _, _, size in mirrors)
+        for _, mirror_name, size in sorted(mirrors):
+            if total_size <= self._max_size:
+                break
+            if mirror_name == exclude_mirror_name:
+                continue
+
+            # Skip mirrors that are currently in use
+            with self._lock_mirror(mirror_name, blocking=False) as locked:
+                if not locked:
+                    continue
+                shutil.rmtree(self._get_mirror_path(mirror_name), ignore_errors=True)
+                total_size -= size
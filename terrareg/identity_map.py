@@ -0,0 +1,88 @@
+"""Request-scoped identity map of database rows for model objects."""
+
+from typing import Any, Optional
+
+import flask
+from flask import has_request_context
+
+import terrareg.database
+
+
+class IdentityMap:
+    """
+    Cache of database rows for model objects, for the duration of a Flask request.
+
+    Rows are keyed by a tuple of model type and natural key, allowing new instances
+    of the same model within a request to share the row that has already been loaded.
+    The cache is cleared whenever a statement that modifies the database is executed,
+    or a transaction is rolled back.
+    """
+
+    @staticmethod
+    def _get_rows() -> Optional[dict]:
+        """Return cached rows for current request, or None if not in a request context"""
+        if not has_request_context():
+            return None
+        if 'identity_map_rows' not in flask.g:
+            flask.g.identity_map_rows = {}
+        return flask.g.identity_map_rows
+
+    @classmethod
+    def get_db_row(cls, key: tuple, select) -> Any:
+        """Return row for key from cache, otherwise execute select to obtain the row and cache it."""
+        rows = cls._get_rows()
+        if rows is not None and key in rows:
+            return rows[key]
+
+        db = terrareg.database.Database.get()
+        with db.get_connection() as conn:
+            row = conn.execute(select).fetchone()
+
+        # Rows that do not exist are not cached, as these may be created during the request
+        if rows is not None and row is not None:
+            rows[key] = row
+        return row
+
+    @classmethod
+    def get_cached(cls, key: tuple) -> Any:
+        """Return cached value for key, without querying the database, or None if it has not been cached."""
+        rows = cls._get_rows()
+        if rows is None:
+            return None
+        return rows.get(key)
+
+    @classmethod
+    def add(cls, key: tuple, row: Any) -> None:
+        """Add row that has been loaded in bulk, to be used for key within the current request."""
+        rows = cls._get_rows()
+        if rows is not None and row is not None:
+            rows[key] = row
+
+    @classmethod
+    def clear(cls) -> None:
+        """Remove all cached rows for current request"""
+        if has_request_context():
+            flask.g.pop('identity_map_rows', None)
+
+    @staticmethod
+    def get_query_count() -> int:
+        """Return number of database queries executed in current request"""
+        if not has_request_context():
+            return 0
+        return flask.g.get('database_query_count', 0)
+
+    @classmethod
+    def after_cursor_execute(cls, conn, cursor, statement, parameters, context, executemany) -> None:
+        """Count queries executed by request and clear cache after any statement that may modify the database"""
+        if not has_request_context():
+            return
+
+        flask.g.database_query_count = flask.g.get('database_query_count', 0) + 1
+
+        if not statement.lstrip()[:6].upper() == 'SELECT':
+            cls.clear()
+
+    @classmethod
+    def on_rollback(cls, conn) -> None:
+        """Clear cache when transaction is rolled back, as cached rows may contain rolled-back changes"""
+        cls.clear()
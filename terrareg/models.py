@@ -10,18 +10,19 @@ import secrets
 from tempfile import mkdtemp
 import tempfile
 import urllib.parse
+import uuid
 import gnupg
-from typing import List, Union
+from typing import Any, Dict, List, Union
 
 import sqlalchemy
 import semantic_version
 import markdown
-import pygraphviz
-import networkx as nx
 
-from terrareg.loose_version import LooseVersion
+from terrareg.version_sort_key import VersionSortKey
 import terrareg.analytics
 from terrareg.database import Database
+from terrareg.identity_map import IdentityMap
+from terrareg.module_specs_cache import ModuleSpecsCache
 import terrareg.config
 import terrareg.audit
 import terrareg.audit_action
@@ -49,6 +50,8 @@ import terrareg.provider_model
 import terrareg.provider_version_model
 import terrareg.registry_resource_type
 import terrareg.file_storage
+import terrareg.module_search_index
+import terrareg.terraform_graph
 
 
 class Session:
@@ -638,9 +641,7 @@ class GitProvider:
             select = db.git_provider.select().where(
                 db.git_provider.c.id == self._id
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                return res.fetchone()
+            self._row_cache = IdentityMap.get_db_row(('git_provider', self._id), select)
         return self._row_cache
 
 
@@ -1095,9 +1096,7 @@ class Namespace(object):
             ).where(
                 db.namespace.c.namespace == self._name
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            self._cache_db_row = IdentityMap.get_db_row(('namespace', self._name), select)
 
         return self._cache_db_row
 
@@ -1167,6 +1166,11 @@ class Namespace(object):
         # Remove cached DB row
         self._cache_db_row = None
 
+        # Rebuild search index if the namespace name
+        # has changed, as it applies to all modules
+        if 'namespace' in kwargs:
+            terrareg.module_search_index.ModuleSearchIndexFactory.get().invalidate()
+
     def get_view_url(self, resource_type: 'terrareg.registry_resource_type.RegistryResourceType'):
         """Return view URL"""
         if resource_type is terrareg.registry_resource_type.RegistryResourceType.MODULE:
@@ -1223,6 +1227,34 @@ class Namespace(object):
             for module in modules
         ]
 
+    def get_module_providers(self, offset: int=0, limit: Optional[int]=None,
+                             include_module_details: bool=False) -> 'terrareg.result_data.ResultData':
+        """
+        Return module providers in namespace, ordered by module and provider name.
+
+        The IDs of all module providers in the namespace are obtained in a single query
+        and the requested page of module providers are loaded using ModuleProvider.get_batch.
+        """
+        db = Database.get()
+        select = sqlalchemy.select(
+            db.module_provider.c.id
+        ).where(
+            db.module_provider.c.namespace_id == self.pk
+        ).order_by(
+            db.module_provider.c.module,
+            db.module_provider.c.provider
+        )
+        with db.get_connection() as conn:
+            module_provider_ids = [row['id'] for row in conn.execute(select)]
+
+        page_ids = module_provider_ids[offset:] if limit is None else module_provider_ids[offset:offset + limit]
+        return terrareg.result_data.ResultData(
+            offset=offset,
+            limit=limit,
+            count=len(module_provider_ids),
+            rows=ModuleProvider.get_batch(page_ids, include_module_details=include_module_details)
+        )
+
     def delete(self):
         """Delete namespace"""
         # Check for any modules in the namespace
@@ -1434,9 +1466,7 @@ class GpgKey:
             ).where(
                 db.gpg_key.c.id == self.pk
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            self._cache_db_row = IdentityMap.get_db_row(('gpg_key', self._pk), select)
 
         return self._cache_db_row
 
@@ -1565,78 +1595,176 @@ class Module(object):
 class ModuleDetails:
     """Object to store common details between root module, submodules and examples."""
 
+    # Columns containing blobs, which are each loaded on first access
+    BLOB_COLUMNS = ('readme_content', 'terraform_docs', 'tfsec', 'infracost',
+                    'terraform_graph', 'terraform_modules', 'terraform_version',
+                    'terraform_graph_json')
+
     @classmethod
     def create(cls):
         """Create instance of object in database."""
         # Create module details row
         db = Database.get()
-        module_details_insert = db.module_details.insert().values()
+        module_details_insert = db.module_details.insert().values(
+            generation=cls._generate_generation()
+        )
         with db.get_connection() as conn:
             insert_res = conn.execute(module_details_insert)
 
         return cls(id=insert_res.inserted_primary_key[0])
 
+    @staticmethod
+    def _generate_generation() -> str:
+        """Return unique generation for new module details row"""
+        return uuid.uuid4().hex
+
+    @classmethod
+    def get_by_content_digest(cls, content_digest: str) -> Optional['ModuleDetails']:
+        """Return latest module details with content digest, if one exists."""
+        db = Database.get()
+        select = sqlalchemy.select(
+            [db.module_details.c.id]
+        ).where(
+            db.module_details.c.content_digest == content_digest
+        ).order_by(
+            db.module_details.c.id.desc()
+        ).limit(1)
+        with db.get_connection() as conn:
+            row = conn.execute(select).fetchone()
+
+        if row is None:
+            return None
+        return cls(id=row['id'])
+
+    def copy(self) -> 'ModuleDetails':
+        """
+        Create new module details row, containing the same data.
+
+        Module details are owned by a single module version, submodule or example
+        and are deleted with it, so rows are copied rather than shared.
+        """
+        self.prefetch('content_digest', *self.BLOB_COLUMNS)
+        db = Database.get()
+        module_details_insert = db.module_details.insert().values(
+            content_digest=self.content_digest,
+            generation=self._generate_generation(),
+            # Copy encoded blob values
+            **{column: self._column_cache[column] for column in self.BLOB_COLUMNS}
+        )
+        with db.get_connection() as conn:
+            insert_res = conn.execute(module_details_insert)
+
+        return self.__class__(id=insert_res.inserted_primary_key[0])
+
     @property
     def pk(self):
         """Return ID of module details row."""
         return self._id
 
+    @property
+    def content_digest(self) -> Optional[str]:
+        """Return digest of the inputs of extraction."""
+        return self._get_column('content_digest')
+
+    @property
+    def generation(self) -> Optional[str]:
+        """
+        Return unique value generated when the row was created.
+
+        Row IDs may be re-used once deleted (e.g. by SQLite), so this is used
+        alongside the ID to identify cached values derived from the module details.
+        """
+        return self._get_column('generation')
+
     @property
     def terraform_docs(self):
         """Return terraform_docs column"""
-        if self._get_db_row():
-            return self._get_db_row()['terraform_docs']
-        return None
+        return self._get_column('terraform_docs')
 
     @property
     def readme_content(self):
         """Return readme_content column"""
-        if self._get_db_row():
-            return self._get_db_row()['readme_content']
-        return None
+        return self._get_column('readme_content')
 
     @property
     def tfsec(self):
         """Return tfsec data."""
         # If module scanning is disabled, do not return the tfsec output
-        if (terrareg.config.Config().ENABLE_SECURITY_SCANNING and
-                self._get_db_row() is not None and
-                self._get_db_row()['tfsec']):
-            return json.loads(self._get_db_row()['tfsec'])
+        if terrareg.config.Config().ENABLE_SECURITY_SCANNING and (tfsec := self._get_column('tfsec')):
+            return json.loads(Database.decode_blob(tfsec))
         return {'results': None}
 
     @property
     def infracost(self):
         """Return Infracost data."""
-        db_row = self._get_db_row()
-        if (db_row is not None and
-                db_row['infracost']):
-            return json.loads(db_row['infracost'])
+        if infracost := self._get_column('infracost'):
+            return json.loads(Database.decode_blob(infracost))
         return {}
 
     @property
     def terraform_graph(self):
         """Return decoded terraform graph data."""
-        db_row = self._get_db_row()
-        if db_row and db_row["terraform_graph"]:
-            return Database.decode_blob(db_row["terraform_graph"])
+        if terraform_graph := self._get_column('terraform_graph'):
+            return Database.decode_blob(terraform_graph)
         return None
 
-    def get_graph_json(self, full_resource_names=False, full_module_names=False):
-        """Return graph JSON for resources."""
-        terraform_graph = self.terraform_graph
+    @staticmethod
+    def _get_graph_json_key(full_resource_names: bool, full_module_names: bool) -> str:
+        """Return key of graph JSON variant in pre-computed graph JSON"""
+        return f'{int(bool(full_resource_names))}{int(bool(full_module_names))}'
+
+    @classmethod
+    def generate_all_graph_json(cls, terraform_graph: str, infracost: Optional[dict]) -> Optional[dict]:
+        """
+        Return graph JSON for each combination of full resource names and full module names,
+        keyed by _get_graph_json_key, for storing in the terraform_graph_json column.
+        """
         if not terraform_graph:
             return None
 
-        # Generate NX graph from terraform graphviz output
-        graph = pygraphviz.AGraph(terraform_graph)
-        nx_graph = nx.nx_agraph.from_agraph(graph)
+        graph = terrareg.terraform_graph.parse_dot(terraform_graph)
+        return {
+            cls._get_graph_json_key(full_resource_names, full_module_names): cls.generate_graph_json(
+                graph=graph,
+                infracost=infracost,
+                full_resource_names=full_resource_names,
+                full_module_names=full_module_names
+            )
+            for full_resource_names in [False, True]
+            for full_module_names in [False, True]
+        }
+
+    def get_graph_json(self, full_resource_names=False, full_module_names=False):
+        """Return graph JSON for resources."""
+        key = self._get_graph_json_key(full_resource_names, full_module_names)
+        return ModuleSpecsCache.get(
+            module_details_id=self.pk,
+            generation=self.generation,
+            extraction_version=None,
+            name=f'graph_json:{key}',
+            factory=lambda: self._load_graph_json(key)
+        )
+
+    def _load_graph_json(self, key: str) -> Optional[dict]:
+        """Return pre-computed graph JSON, generating it for module details extracted before it was stored."""
+        if terraform_graph_json := self._get_column('terraform_graph_json'):
+            return json.loads(Database.decode_blob(terraform_graph_json))[key]
 
-        infracost = self.infracost
+        self.prefetch('terraform_graph', 'infracost')
+        all_graph_json = self.generate_all_graph_json(
+            terraform_graph=self.terraform_graph,
+            infracost=self.infracost
+        )
+        return all_graph_json[key] if all_graph_json else None
+
+    @staticmethod
+    def generate_graph_json(graph: 'terrareg.terraform_graph.DirectedGraph', infracost: Optional[dict],
+                            full_resource_names: bool=False, full_module_names: bool=False) -> dict:
+        """Return graph JSON for resources from parsed terraform graph."""
         resource_costs = {}
         remove_item_iteration_re = re.compile(r'\[[^\]]+\]')
         if infracost:
-            for resource in self.infracost["projects"][0]["breakdown"]["resources"]:
+            for resource in infracost["projects"][0]["breakdown"]["resources"]:
                 if not resource["monthlyCost"]:
                     continue
 
@@ -1678,7 +1806,7 @@ class ModuleDetails:
             if node not in to_remove:
                 to_remove.append(node)
 
-        for node_label in nx_graph.nodes:
+        for node_label in graph.nodes:
             # Remove leading '[root] ' name and expand/close suffices from node names
             name = node_label.replace('[root] ', '').replace(' (expand)', '').replace(' (close)', '')
 
@@ -1744,11 +1872,11 @@ class ModuleDetails:
                     print("Unable to match node to type", name)
 
         # Perform rename of nodes
-        nx_graph = nx.relabel_nodes(nx_graph, renames)
+        graph = graph.relabel_nodes(renames)
 
         # Remove any nodes marked for removal
         for node in to_remove:
-            nx_graph.remove_node(node)
+            graph.remove_node(node)
 
         # Convert to JSON for cytoscape
         cytoscape_json = {
@@ -1756,7 +1884,7 @@ class ModuleDetails:
             "edges": []
         }
 
-        for node in nx_graph.nodes:
+        for node in graph.nodes:
             data = {
                 "id": node,
                 "label": labels.get(node),
@@ -1789,7 +1917,7 @@ class ModuleDetails:
 
         # Add edges to graph
         seen_module_links = []
-        for edge in nx_graph.edges:
+        for edge in graph.edges:
             # Only add edges for module-module links
             if (type_mapping[edge[0]] == "module" and type_mapping[edge[1]] == "module" and
                     # Only link modules in one direction, where module is a sub-module of another,
@@ -1831,9 +1959,8 @@ class ModuleDetails:
     @property
     def terraform_version(self):
         """Return terraform version output"""
-        db_row = self._get_db_row()
-        if db_row and db_row["terraform_version"]:
-            data = Database.decode_blob(db_row["terraform_version"])
+        if terraform_version := self._get_column('terraform_version'):
+            data = Database.decode_blob(terraform_version)
             if data:
                 try:
                     return json.loads(data)
@@ -1844,10 +1971,9 @@ class ModuleDetails:
     @property
     def terraform_modules(self):
         """Return terraform modules output"""
-        db_row = self._get_db_row()
         data = None
-        if db_row and db_row["terraform_modules"]:
-            data = Database.decode_blob(db_row["terraform_modules"])
+        if terraform_modules := self._get_column('terraform_modules'):
+            data = Database.decode_blob(terraform_modules)
             if data:
                 try:
                     data = json.loads(data)
@@ -1860,21 +1986,92 @@ class ModuleDetails:
     def __init__(self, id: int):
         """Store member variables."""
         self._id = id
-        self._cache_db_row = None
+        # Values of columns that have been loaded, by column name
+        self._column_cache = {}
 
-    def _get_db_row(self):
-        """Return database row for module details."""
-        if self._cache_db_row is None:
-            db = Database.get()
-            select = db.module_details.select(
-            ).where(
-                db.module_details.c.id == self.pk
-            )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+    @staticmethod
+    def _get_identity_map_key(id: int, column: str) -> tuple:
+        """Return identity map key for column of module details row"""
+        return ('module_details_column', id, column)
 
-        return self._cache_db_row
+    @classmethod
+    def prefetch_batch(cls, ids: List[int], columns: List[str]) -> None:
+        """
+        Load columns of multiple module details rows in a single query,
+        caching the values for the current request.
+        """
+        if not ids or not columns:
+            return
+
+        db = Database.get()
+        select = sqlalchemy.select(
+            [db.module_details.c.id] + [db.module_details.c[column] for column in columns]
+        ).where(
+            db.module_details.c.id.in_(ids)
+        )
+        with db.get_connection() as conn:
+            rows = conn.execute(select).fetchall()
+
+        for row in rows:
+            for column in columns:
+                # Wrap value, so that NULL values can be distinguished from values that are not cached
+                IdentityMap.add(cls._get_identity_map_key(row['id'], column), (row[column],))
+
+    def _load_columns(self, columns: List[str]) -> Optional[Dict[str, Any]]:
+        """Select columns of module details row, returning None if the row does not exist."""
+        db = Database.get()
+        select = sqlalchemy.select(
+            [db.module_details.c[column] for column in columns]
+        ).where(
+            db.module_details.c.id == self.pk
+        )
+        with db.get_connection() as conn:
+            row = conn.execute(select).fetchone()
+
+        if row is None:
+            return None
+        return {column: row[column] for column in columns}
+
+    def prefetch(self, *columns: str) -> None:
+        """
+        Load columns that have not already been loaded, in a single query.
+
+        Blob columns are otherwise loaded individually on first access,
+        so this should be used by callers that require multiple columns.
+        If no columns are provided, all columns are loaded.
+        """
+        columns = [
+            column
+            for column in (columns or self.BLOB_COLUMNS)
+            if column not in self._column_cache
+        ]
+
+        # Use any values that have already been loaded during the current request
+        to_load = []
+        for column in columns:
+            if (cached := IdentityMap.get_cached(self._get_identity_map_key(self._id, column))) is not None:
+                self._column_cache[column] = cached[0]
+            else:
+                to_load.append(column)
+
+        if not to_load:
+            return
+
+        values = self._load_columns(to_load)
+        for column in to_load:
+            if values is None:
+                # Rows that do not exist are not cached for the request,
+                # as these may be created during the request
+                self._column_cache[column] = None
+            else:
+                self._column_cache[column] = values[column]
+                IdentityMap.add(self._get_identity_map_key(self._id, column), (values[column],))
+
+    def _get_column(self, column: str) -> Any:
+        """Return value of column, loading only the column from the database on first access."""
+        if column not in self._column_cache:
+            self.prefetch(column)
+        return self._column_cache[column]
 
     def get_db_where(self, db: Database, statement):
         """Return DB where statement"""
@@ -1884,10 +2081,13 @@ class ModuleDetails:
 
     def update_attributes(self, **kwargs):
         """Update DB row."""
+        # Remove pre-computed graph JSON if the data it is generated from is modified
+        if ('terraform_graph' in kwargs or 'infracost' in kwargs) and 'terraform_graph_json' not in kwargs:
+            kwargs['terraform_graph_json'] = None
+
         # Check for any blob and encode the values
         for kwarg in kwargs:
-            if kwarg in ['readme_content', 'terraform_docs', 'tfsec', 'infracost',
-                         'terraform_graph', 'terraform_modules', 'terraform_version']:
+            if kwarg in self.BLOB_COLUMNS:
                 kwargs[kwarg] = Database.encode_blob(kwargs[kwarg])
 
         db = Database.get()
@@ -1897,8 +2097,9 @@ class ModuleDetails:
         with db.get_connection() as conn:
             conn.execute(update)
 
-        # Remove cached DB row
-        self._cache_db_row = None
+        # Remove cached column values
+        self._column_cache = {}
+        ModuleSpecsCache.invalidate(self.pk)
 
     def delete(self):
         """Delete from database."""
@@ -1912,6 +2113,8 @@ class ModuleDetails:
             )
             conn.execute(delete_statement)
 
+        ModuleSpecsCache.invalidate(self.pk)
+
 
 class ProviderLogo:
 
@@ -2297,6 +2500,96 @@ class ModuleProvider(object):
         # Otherwise, return object
         return obj
 
+    @classmethod
+    def get_batch(cls, module_provider_ids: List[int], include_module_details: bool=False) -> List['ModuleProvider']:
+        """
+        Return module providers for list of IDs, in the same order.
+
+        The module providers, their namespaces, latest versions, git providers,
+        total downloads of latest versions and, optionally, terraform docs of latest versions
+        are obtained in a fixed number of queries and cached for the current request.
+        """
+        if not module_provider_ids:
+            return []
+
+        db = Database.get()
+        with db.get_connection() as conn:
+            module_provider_rows = {
+                row['id']: row
+                for row in conn.execute(db.module_provider.select().where(
+                    db.module_provider.c.id.in_(module_provider_ids)
+                ))
+            }
+            namespace_rows = {
+                row['id']: row
+                for row in conn.execute(db.namespace.select().where(
+                    db.namespace.c.id.in_({row['namespace_id'] for row in module_provider_rows.values()})
+                ))
+            }
+            module_version_rows = {
+                row['id']: row
+                for row in conn.execute(db.module_version.select().where(
+                    db.module_version.c.id.in_({
+                        row['latest_version_id']
+                        for row in module_provider_rows.values()
+                        if row['latest_version_id']
+                    })
+                ))
+            }
+
+            git_provider_ids = {row['git_provider_id'] for row in module_provider_rows.values() if row['git_provider_id']}
+            git_provider_rows = []
+            if git_provider_ids:
+                git_provider_rows = conn.execute(db.git_provider.select().where(
+                    db.git_provider.c.id.in_(git_provider_ids)
+                )).fetchall()
+
+
+        total_downloads = terrareg.analytics.ModuleAnalyticsRollup.get_total_downloads_by_version(
+            list(module_version_rows)
+        ) if module_version_rows else {}
+
+        for git_provider_row in git_provider_rows:
+            IdentityMap.add(('git_provider', git_provider_row['id']), git_provider_row)
+        if include_module_details:
+            # Only terraform docs are used by listings, to determine compatibility with Terraform versions,
+            # along with the generation, which identifies the cached module specs
+            ModuleDetails.prefetch_batch(
+                [row['module_details_id'] for row in module_version_rows.values() if row['module_details_id']],
+                ['terraform_docs', 'generation']
+            )
+
+        namespaces = {}
+        module_providers = []
+        for module_provider_id in module_provider_ids:
+            module_provider_row = module_provider_rows.get(module_provider_id)
+            if module_provider_row is None:
+                continue
+
+            namespace_row = namespace_rows[module_provider_row['namespace_id']]
+            if (namespace := namespaces.get(namespace_row['id'])) is None:
+                namespace = Namespace(name=namespace_row['namespace'])
+                namespace._cache_db_row = namespace_row
+                namespaces[namespace_row['id']] = namespace
+                IdentityMap.add(('namespace', namespace.name), namespace_row)
+
+            module = Module(namespace=namespace, name=module_provider_row['module'])
+            module_provider = cls(module=module, name=module_provider_row['provider'])
+            module_provider._cache_db_row = module_provider_row
+            IdentityMap.add(('module_provider', namespace_row['id'], module.name, module_provider.name), module_provider_row)
+
+            if (module_version_row := module_version_rows.get(module_provider_row['latest_version_id'])) is not None:
+                IdentityMap.add(('module_version', module_provider_id, module_version_row['version']), module_version_row)
+                IdentityMap.add(('module_provider_latest_version', module_provider_id), {'version': module_version_row['version']})
+                IdentityMap.add(('module_version_total_downloads', module_version_row['id']), total_downloads[module_version_row['id']])
+            else:
+                # Cache absence of latest version, which would otherwise be queried for each module provider
+                IdentityMap.add(('module_provider_latest_version', module_provider_id), {'version': None})
+
+            module_providers.append(module_provider)
+
+        return module_providers
+
     def get_logo(self):
         """Return logo for provider."""
         return ProviderLogo(provider=self.name)
@@ -2558,9 +2851,7 @@ class ModuleProvider(object):
                 db.module_provider.c.module.like(self._module.name),
                 db.module_provider.c.provider.like(self.name)
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            self._cache_db_row = IdentityMap.get_db_row(('module_provider', self._module._namespace.pk, self._module.name, self.name), select)
 
         return self._cache_db_row
 
@@ -2598,6 +2889,9 @@ class ModuleProvider(object):
                 # during normal conditions
                 print(f'An error occured when attempting to remove module provider directory: {str(exc)}')
 
+        # Remove module provider from search index
+        terrareg.module_search_index.ModuleSearchIndexFactory.get().remove_module_provider(self.pk)
+
         with db.get_connection() as conn:
             # Delete module from module_version table
             delete_statement = db.module_provider.delete().where(
@@ -2651,6 +2945,8 @@ class ModuleProvider(object):
 
     def update_attributes(self, **kwargs):
         """Update DB row."""
+        # Obtain primary key before update, as the name may be modified
+        pk = self.pk
         db = Database.get()
         update = self.get_db_where(
             db=db, statement=db.module_provider.update()
@@ -2661,6 +2957,9 @@ class ModuleProvider(object):
         # Remove cached DB row
         self._cache_db_row = None
 
+        # Update search index, as the name or latest version may have changed
+        terrareg.module_search_index.ModuleSearchIndexFactory.get().update_module_provider(pk)
+
     def update_verified(self, verified):
         """Update verified flag of module provider."""
         if verified in [True, False] and verified != self.verified:
@@ -2947,49 +3246,47 @@ class ModuleProvider(object):
         ).where(
             db.module_provider.c.id==self.pk
         )
-        with db.get_connection() as conn:
-            res = conn.execute(select)
-            version = res.fetchone()
+        version = IdentityMap.get_db_row(('module_provider_latest_version', self.pk), select)
 
-        if version is None:
+        if version is None or version['version'] is None:
             return None
 
         return ModuleVersion(module_provider=self, version=version['version'])
 
     def calculate_latest_version(self):
-        """Obtain all versions of module and sort by semantic version numbers to obtain latest version."""
+        """Obtain latest published non-beta version of module, by semantic version."""
         db = Database.get()
-        select = db.select_module_version_joined_module_provider(
+        select = sqlalchemy.select(
             db.module_version.c.version
         ).where(
-            db.module_provider.c.id == self.pk,
+            db.module_version.c.module_provider_id == self.pk,
             db.module_version.c.published == True,
             db.module_version.c.beta == False
-        )
+        ).order_by(
+            *VersionSortKey.get_order_by(db.module_version)
+        ).limit(1)
         with db.get_connection() as conn:
-            res = conn.execute(select)
-
-            # Convert to list
-            rows = [r for r in res]
-
-        # Sort rows by semantic versioning
-        rows.sort(key=lambda x: LooseVersion(x['version']), reverse=True)
+            row = conn.execute(select).first()
 
         # Ensure at least one row
-        if not rows:
+        if not row:
             return None
 
         # Obtain latest row
-        return ModuleVersion(module_provider=self, version=rows[0]['version'])
+        return ModuleVersion(module_provider=self, version=row['version'])
 
     def get_versions(self, include_beta=True, include_unpublished=False):
         """Return all module provider versions."""
         db = Database.get()
 
-        select = db.select_module_version_joined_module_provider(
-            db.module_version.c.version
+        select = sqlalchemy.select(
+            db.module_version.c.version,
+            db.module_version.c.version_major,
+            db.module_version.c.version_minor,
+            db.module_version.c.version_patch,
+            db.module_version.c.version_prerelease
         ).where(
-            db.module_provider.c.id == self.pk
+            db.module_version.c.module_provider_id == self.pk
         )
         # Remove unpublished versions, it not including them
         if not include_unpublished:
@@ -3003,16 +3300,14 @@ class ModuleProvider(object):
             )
 
         with db.get_connection() as conn:
-            res = conn.execute(select)
-            module_versions = [
-                ModuleVersion(module_provider=self, version=r['version'])
-                for r in res
-            ]
-        module_versions.sort(
-            key=lambda x: LooseVersion(x.version),
-            reverse=True
-        )
-        return module_versions
+            rows = conn.execute(select).fetchall()
+
+        # Sort rows by semantic versioning
+        rows.sort(key=VersionSortKey.get_key, reverse=True)
+        return [
+            ModuleVersion(module_provider=self, version=r['version'])
+            for r in rows
+        ]
 
     def get_api_outline(self):
         """Return dict of basic provider details for API response."""
@@ -3254,28 +3549,59 @@ module "{self.module_version.module_provider.module.name}" {{
         return source_url, version_string
 
 
+    def _get_module_details_cached_value(self, name: str, factory):
+        """
+        Return value derived from module details from the process-wide cache,
+        calling factory to generate the value if it is not cached.
+        """
+        if (module_details := self.module_details) is None:
+            return factory()
+        return ModuleSpecsCache.get(
+            module_details_id=module_details.pk,
+            generation=module_details.generation,
+            extraction_version=self.module_version._get_db_row()['extraction_version'],
+            name=name,
+            factory=factory
+        )
+
+    def _load_module_specs(self):
+        """Parse module specs from terraform-docs output"""
+        module_details = self.module_details
+        if module_details:
+            raw_json = Database.decode_blob(module_details.terraform_docs)
+            if raw_json:
+                return json.loads(raw_json)
+        return {}
+
     def get_module_specs(self):
-        """Return module specs"""
+        """Return module specs. The returned specs are shared and must not be modified."""
         if self._module_specs is None:
-            module_specs = {}
-
-            module_details = self.module_details
-            if module_details:
-                raw_json = Database.decode_blob(module_details.terraform_docs)
-                if raw_json:
-                    module_specs = json.loads(raw_json)
-            self._module_specs = module_specs
+            self._module_specs = self._get_module_details_cached_value('specs', self._load_module_specs)
         return self._module_specs
 
     def get_readme_html(self, server_hostname):
         """Replace examples in README and convert readme markdown to HTML"""
-        readme_md = self.get_readme_content(sanitise=False)
-        if readme_md:
-            readme_md = self.replace_source_in_file(
-                readme_md, server_hostname)
-            readme_html = convert_markdown_to_html(file_name='README.md', markdown_html=readme_md)
-            return sanitise_html_content(readme_html, allow_markdown_html=True)
-        return None
+        def render():
+            readme_md = self.get_readme_content(sanitise=False)
+            if readme_md:
+                readme_md = self.replace_source_in_file(
+                    readme_md, server_hostname)
+                readme_html = convert_markdown_to_html(file_name='README.md', markdown_html=readme_md)
+                return sanitise_html_content(readme_html, allow_markdown_html=True)
+            return None
+
+        return self._get_module_details_cached_value(
+            f'readme_html:{self._get_example_source_cache_key(server_hostname)}', render)
+
+    def _get_example_source_cache_key(self, server_hostname):
+        """
+        Return key identifying the source URL and version used when replacing sources in examples.
+
+        This changes whenever the output of replace_source_in_file would change for the same content,
+        such as when a new latest version of the module is published.
+        """
+        source_url, version_string = self.get_terraform_url_and_version_strings(request_domain=server_hostname, module_path='')
+        return f'{source_url}:{version_string}'
 
     @property
     def module_details(self):
@@ -3295,33 +3621,35 @@ module "{self.module_version.module_provider.module.name}" {{
             return content
         return None
 
+    def _get_sanitised_variables(self, spec_type: str, html: bool):
+        """Return copies of module inputs or outputs, with descriptions converted to sanitised HTML"""
+        def render():
+            variables = []
+            # Rewrite variable/output descriptions to use markdown
+            for variable in self.get_module_specs().get(spec_type, []):
+                variable = dict(variable)
+                description = variable.get("description")
+                if description:
+                    if html:
+                        description = convert_markdown_to_html(file_name="", markdown_html=description)
+                    # Always sanitise HTML
+                    description = sanitise_html_content(text=description, allow_markdown_html=True)
+                    variable["description"] = description
+                variables.append(variable)
+            return variables
+
+        return [
+            dict(variable)
+            for variable in self._get_module_details_cached_value(f'{spec_type}_html' if html else spec_type, render)
+        ]
+
     def get_terraform_inputs(self, html: bool=False):
         """Obtain module inputs"""
-        inputs = self.get_module_specs().get('inputs', [])
-        # Rewrite variable/output descriptions to use markdown
-        for input_ in inputs:
-            description = input_.get("description")
-            if description:
-                if html:
-                    description = convert_markdown_to_html(file_name="", markdown_html=description)
-                # Always sanitise HTML
-                description = sanitise_html_content(text=description, allow_markdown_html=True)
-                input_["description"] = description
-        return inputs
+        return self._get_sanitised_variables('inputs', html=html)
 
     def get_terraform_outputs(self, html: bool=False):
         """Obtain module inputs"""
-        outputs = self.get_module_specs().get('outputs', [])
-        # Rewrite variable/output descriptions to use markdown
-        for output in outputs:
-            description = output.get("description")
-            if description:
-                if html:
-                    description = convert_markdown_to_html(file_name="", markdown_html=description)
-                # Always sanitise HTML
-                description = sanitise_html_content(text=description, allow_markdown_html=True)
-                output["description"] = description
-        return outputs
+        return self._get_sanitised_variables('outputs', html=html)
 
     def get_terraform_resources(self):
         """Obtain module resources."""
@@ -3492,6 +3820,8 @@ module "{self.module_version.module_provider.module.name}" {{
 
     def get_api_module_specs(self, html: bool=False):
         """Return module specs for API."""
+        if module_details := self.module_details:
+            module_details.prefetch('readme_content', 'terraform_docs')
         return {
             "path": self.path,
             "readme": self.get_readme_content(),
@@ -3827,9 +4157,7 @@ class ModuleVersion(TerraformSpecsObject):
                 db.module_provider.c.id == self._module_provider.pk,
                 db.module_version.c.version == self.version
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            self._cache_db_row = IdentityMap.get_db_row(('module_version', self._module_provider.pk, self.version), select)
         return self._cache_db_row
 
     def get_terraform_example_version_string(self):
@@ -4067,8 +4395,8 @@ class ModuleVersion(TerraformSpecsObject):
         # Calculate latest version will take beta flag into account and will only match
         # the current version if the current version is latest and is capable of being the
         # latest version.
-        if (self._module_provider.calculate_latest_version() is not None and
-                self._module_provider.calculate_latest_version().version == self.version):
+        latest_version = self._module_provider.calculate_latest_version()
+        if latest_version is not None and latest_version.version == self.version:
             self._module_provider.update_attributes(latest_version_id=self.pk)
 
     def get_api_outline(self, target_terraform_version: Optional[str]=None):
@@ -4095,6 +4423,10 @@ class ModuleVersion(TerraformSpecsObject):
 
     def get_total_downloads(self):
         """Obtain total number of downloads for module version."""
+        # Use total downloads, if obtained in bulk for the current request
+        if (total_downloads := IdentityMap.get_cached(('module_version_total_downloads', self.pk))) is not None:
+            return total_downloads
+
         return terrareg.analytics.AnalyticsEngine.get_module_version_total_downloads(
             module_version=self
         )
@@ -4119,6 +4451,9 @@ class ModuleVersion(TerraformSpecsObject):
         # some versions, which are normally displayed in the Terraform APIs
         versions = api_details['versions']
 
+        if module_details := self.module_details:
+            module_details.prefetch('readme_content', 'terraform_docs', 'terraform_modules')
+
         # Update with API details from the module version
         api_details.update(self.get_api_details(target_terraform_version=target_terraform_version, html=html))
 
@@ -4208,6 +4543,11 @@ class ModuleVersion(TerraformSpecsObject):
         # Clear cached DB row
         self._cache_db_row = None
 
+        # Update search index for searchable attributes, which
+        # are used if the module version is the latest version
+        if 'description' in kwargs or 'owner' in kwargs:
+            terrareg.module_search_index.ModuleSearchIndexFactory.get().update_module_provider(self._module_provider.pk)
+
     def delete(self, delete_related_analytics=True):
         """Delete module version and all associated submodules."""
         for example in self.get_examples():
@@ -4303,7 +4643,8 @@ class ModuleVersion(TerraformSpecsObject):
                 version=self.version,
                 published=False,
                 beta=self._extracted_beta_flag,
-                internal=False
+                internal=False,
+                **VersionSortKey.get_column_values(self.version)
             )
             conn.execute(insert_statement)
 
@@ -4444,9 +4785,7 @@ class BaseSubmodule(TerraformSpecsObject):
                 db.sub_module.c.path == self._module_path,
                 db.sub_module.c.type == self.TYPE
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            self._cache_db_row = IdentityMap.get_db_row(('sub_module', self._module_version.pk, self._module_path, self.TYPE), select)
         return self._cache_db_row
 
     def update_attributes(self, **kwargs):
@@ -4501,6 +4840,9 @@ class BaseSubmodule(TerraformSpecsObject):
 
     def get_terrareg_api_details(self, request_domain):
         """Return dict of submodule details with additional attributes used by terrareg UI."""
+        if module_details := self.module_details:
+            module_details.prefetch('readme_content', 'terraform_docs', 'terraform_modules')
+
         api_details = self.get_api_module_specs()
         source_browse_url = self.get_source_browse_url()
         tfsec_failures = self.get_tfsec_failures()
@@ -4727,12 +5069,24 @@ class ExampleFile(FileObject):
                 return res.fetchone()
         return self._cache_db_row
 
+    def update_attributes(self, **kwargs):
+        """Update DB row and remove cached content"""
+        super(ExampleFile, self).update_attributes(**kwargs)
+        # Example files are only updated during extraction, which creates
+        # new module details for the example, so cached content in other
+        # processes is not used. Remove any content cached by this process.
+        if (module_details := self._example.module_details):
+            ModuleSpecsCache.invalidate(module_details.pk)
+
     def get_content(self, server_hostname):
         """Return content with source replaced"""
         # Replace source lines that use relative paths
-        return self._example.replace_source_in_file(
-            content=super(ExampleFile, self).get_content(),
-            server_hostname=server_hostname)
+        return self._example._get_module_details_cached_value(
+            f'example_file:{self.path}:{self._example._get_example_source_cache_key(server_hostname)}',
+            lambda: self._example.replace_source_in_file(
+                content=super(ExampleFile, self).get_content(),
+                server_hostname=server_hostname)
+        )
 
 
 class ModuleVersionFile(FileObject):
@@ -1,13 +1,14 @@
 """Provide extraction method of modules."""
 
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 import os
 import threading
-from typing import Optional, Type
+import time
+from typing import Dict, List, Optional, Tuple
 import tempfile
 import uuid
 import zipfile
-import tarfile
 import subprocess
 import json
 import datetime
@@ -30,13 +31,17 @@ from terrareg.errors import (
     InvalidTerraregMetadataFileError,
     MetadataDoesNotContainRequiredAttributeError,
     GitCloneError,
-    UnableToGetGlobalTerraformLockError,
     TerraformVersionSwitchError
 )
 import terrareg.terraform_product
 from terrareg.utils import PathDoesNotExistError, get_public_url_details, safe_iglob, safe_join_paths
 from terrareg.config import Config
 from terrareg.constants import EXTRACTION_VERSION
+from terrareg.extraction_digest import ExtractionDigest
+from terrareg.git_mirror_cache import GitMirrorCache
+from terrareg.terraform_binary_cache import TerraformBinaryCache
+from terrareg.provider_mirror import ProviderMirror
+from terrareg.archive_builder import ModuleArchiveBuilder
 import terrareg.file_storage
 
 
@@ -45,24 +50,20 @@ class ModuleExtractor:
 
     TERRAREG_METADATA_FILES = ['terrareg.json', '.terrareg.json']
     IGNORE_FILE = ".tfignore"
-    TERRAFORM_LOCK = threading.Lock()
 
     def __init__(self, module_version: 'terrareg.models.ModuleVersion'):
         """Create temporary directories and store member variables."""
         self._module_version = module_version
         self._extract_directory = tempfile.TemporaryDirectory()  # noqa: R1732
         self._upload_directory = tempfile.TemporaryDirectory()  # noqa: R1732
-
-    @staticmethod
-    def terraform_binary() -> str:
-        """Return path of terraform binary"""
-        product = terrareg.terraform_product.ProductFactory.get_product()
-        return os.path.join(os.getcwd(), "bin", product.get_executable_name())
+        self._terraform_config_directory = tempfile.TemporaryDirectory()  # noqa: R1732
+        self._stage_timings = {}
+        self._stage_timings_lock = threading.Lock()
 
     @property
     def terraform_rc_file(self):
-        """Return path to terraformrc file"""
-        return os.path.join(os.path.expanduser("~"), ".terraformrc")
+        """Return path to terraformrc file generated for extraction"""
+        return os.path.join(self._terraform_config_directory.name, ".terraformrc")
 
     @property
     def extract_directory(self):
@@ -97,12 +98,14 @@ class ModuleExtractor:
         """Run enter of upstream context managers."""
         self._extract_directory.__enter__()
         self._upload_directory.__enter__()
+        self._terraform_config_directory.__enter__()
         return self
 
     def __exit__(self, *args, **kwargs):
         """Run exit of upstream context managers."""
         self._extract_directory.__exit__(*args, **kwargs)
         self._upload_directory.__exit__(*args, **kwargs)
+        self._terraform_config_directory.__exit__(*args, **kwargs)
 
     @staticmethod
     def _run_terraform_docs(module_path):
@@ -126,36 +129,30 @@ class ModuleExtractor:
     @classmethod
     @contextmanager
     def _switch_terraform_versions(cls, module_path):
-        """Switch terraform to required version for module"""
-        # Wait for global lock on terraform, so that only
-        # instance can run terraform at a time
-        if not ModuleExtractor.TERRAFORM_LOCK.acquire(blocking=True, timeout=60):
-            raise UnableToGetGlobalTerraformLockError(
-                "Unable to obtain global Terraform lock in 60 seconds"
-            )
-        try:
-            config = Config()
+        """Obtain binary of the terraform version required by module, yielding the path to the binary"""
+        config = Config()
 
-            default_terraform_version = config.DEFAULT_TERRAFORM_VERSION
-            tfswitch_env = os.environ.copy()
+        default_terraform_version = config.DEFAULT_TERRAFORM_VERSION
+        tfswitch_env = os.environ.copy()
 
-            if default_terraform_version:
-                tfswitch_env["TF_DEFAULT_VERSION"] = default_terraform_version
+        if default_terraform_version:
+            tfswitch_env["TF_DEFAULT_VERSION"] = default_terraform_version
 
-            product = terrareg.terraform_product.ProductFactory.get_product()
-            tfswitch_env["TF_PRODUCT"] = product.get_tfswitch_product_arg()
+        product = terrareg.terraform_product.ProductFactory.get_product()
+        tfswitch_env["TF_PRODUCT"] = product.get_tfswitch_product_arg()
 
-            tfswitch_args = []
-            if config.TERRAFORM_ARCHIVE_MIRROR:
-                tfswitch_args += ["--mirror", config.TERRAFORM_ARCHIVE_MIRROR]
+        tfswitch_args = []
+        if config.TERRAFORM_ARCHIVE_MIRROR:
+            tfswitch_args += ["--mirror", config.TERRAFORM_ARCHIVE_MIRROR]
 
-            # Run tfswitch
+        with ExitStack() as exit_stack:
+            # Run tfswitch, installing the required version into the binary cache
             try:
-                subprocess.check_output(
-                    ["tfswitch", "--bin", cls.terraform_binary(), *tfswitch_args],
-                    env=tfswitch_env,
-                    cwd=module_path
-                )
+                terraform_binary = exit_stack.enter_context(TerraformBinaryCache.get().get_binary(
+                    module_path=module_path,
+                    tfswitch_args=tfswitch_args,
+                    env=tfswitch_env
+                ))
             except subprocess.CalledProcessError as exc:
                 print("An error occured whilst running tfswitch:", str(exc))
                 raise TerraformVersionSwitchError(
@@ -163,9 +160,7 @@ class ModuleExtractor:
                     (f": {str(exc)}: {exc.output.decode('utf-8')}" if Config().DEBUG else "")
                 )
 
-            yield
-        finally:
-            ModuleExtractor.TERRAFORM_LOCK.release()
+            yield terraform_binary
 
     def _run_tfsec(self, module_path):
         """Run tfsec and return output."""
@@ -199,18 +194,22 @@ class ModuleExtractor:
         # Create .terraformrc file, if configured to do so
         config = Config()
         if config.MANAGE_TERRAFORM_RC_FILE:
-            terraform_rc_file_content = """
-# Cache plugins
-plugin_cache_dir   = "$HOME/.terraform.d/plugin-cache"
+            # Create provider mirror directory, allowing directory to already exist.
+            provider_mirror_directory = ProviderMirror.get().directory
+            os.makedirs(provider_mirror_directory, exist_ok=True)
+
+            terraform_rc_file_content = f"""
 disable_checkpoint = true
 
+# Install providers from provider mirror, falling back to downloading providers
+provider_installation {{
+  filesystem_mirror {{
+    path = "{provider_mirror_directory}"
+  }}
+  direct {{}}
+}}
 """
 
-            # Create .terraform.d/plugin-cache directory tree,
-            # allowing directory to already exist.
-            plugin_cache_directory = os.path.join(os.path.expanduser('~'), '.terraform.d', 'plugin-cache')
-            os.makedirs(plugin_cache_directory, exist_ok=True)
-
             _, domain_name, _ = get_public_url_details()
 
             if domain_name:
@@ -251,23 +250,39 @@ terraform {{
     """)
         return override_filename
 
-    def _run_tf_init(self, module_path):
+    def _get_terraform_env(self) -> Optional[Dict[str, str]]:
+        """Return environment for running terraform, using the generated terraform RC file, if enabled"""
+        if not Config().MANAGE_TERRAFORM_RC_FILE:
+            return None
+        terraform_env = os.environ.copy()
+        terraform_env["TF_CLI_CONFIG_FILE"] = self.terraform_rc_file
+        return terraform_env
+
+    def _run_tf_init(self, module_path, terraform_binary):
         """Perform terraform init"""
         self._create_terraform_rc_file()
         self._override_tf_backend(module_path=module_path)
 
         try:
-            subprocess.check_call([self.terraform_binary(), "init"], cwd=module_path)
+            subprocess.check_call([terraform_binary, "init"], cwd=module_path, env=self._get_terraform_env())
         except subprocess.CalledProcessError:
             return False
+
+        # Add installed providers to provider mirror, for use by subsequent initialisations
+        if Config().MANAGE_TERRAFORM_RC_FILE:
+            try:
+                ProviderMirror.get().add_providers(os.path.join(module_path, ".terraform", "providers"))
+            except OSError as exc:
+                print("Failed to add providers to provider mirror:", str(exc))
         return True
 
-    def _get_graph_data(self, module_path):
+    def _get_graph_data(self, module_path, terraform_binary):
         """Run inframap and generate graphiz"""
         try:
             terraform_graph_data = subprocess.check_output(
-                [self.terraform_binary(), "graph"],
-                cwd=module_path
+                [terraform_binary, "graph"],
+                cwd=module_path,
+                env=self._get_terraform_env()
             )
         except subprocess.CalledProcessError as exc:
             print("Failed to generate Terraform graph data:", str(exc))
@@ -291,12 +306,13 @@ terraform {{
 
         return None
 
-    def _get_terraform_version(self, module_path):
+    def _get_terraform_version(self, module_path, terraform_binary):
         """Run terraform -version and return output"""
         try:
             terraform_version_data = subprocess.check_output(
-                [self.terraform_binary(), "-version", "-json"],
-                cwd=module_path
+                [terraform_binary, "-version", "-json"],
+                cwd=module_path,
+                env=self._get_terraform_env()
             )
         except subprocess.CalledProcessError as exc:
             print("Failed to generate Terraform version data:", str(exc))
@@ -390,68 +406,38 @@ terraform {{
 
         file_storage.make_directory(self._module_version.base_directory)
 
-        pathspec_filter = self._get_pathspec_filter()
-
-        zip_excludes = []
-
-        def tar_filter(tarinfo: tarfile.TarInfo):
-            """Filter files being added to tar archive"""
-            # Do not include .git directory in archive
-            if tarinfo.name == ".git":
-                return None
-
-            if tarinfo.name == self.IGNORE_FILE:
-                return None
-
-            # Check if file is part of ignore pattern
-            if pathspec_filter and pathspec_filter.match_file(tarinfo.name):
-                # Add file to exclude list, to be used to exclude from zip generation
-                zip_excludes.append(tarinfo.name)
-                return None
-
-            return tarinfo
-
-        # Create tar.gz
-        with tempfile.TemporaryDirectory(suffix='generate-archive') as temp_dir:
-            tar_file_path = os.path.join(temp_dir, self._module_version.archive_name_tar_gz)
-            with tarfile.open(tar_file_path, "w:gz") as tar:
-                tar.add(self.archive_source_directory, arcname='', recursive=True, filter=tar_filter)
-
-            # Add tar file to file storage
-            file_storage.upload_file(tar_file_path, self._module_version.base_directory, self._module_version.archive_name_tar_gz)
-
-            # Create zip
-            # Use subprocess to execute zip, rather than shutil.make_archive,
-            # as make_archive is not thread-safe and changes the CWD of the main
-            # process.
-            zip_file_path = os.path.join(temp_dir, self._module_version.archive_name_zip)
-            subprocess.call(
-                [
-                    'zip',
-                    '-r', zip_file_path,
-                    # Exclude .git directory from archive
-                    '--exclude=./.git/*',
-                    f'--exclude={self.IGNORE_FILE}'
-                ] + [
-                    f"--exclude={exclude_file}"
-                    for exclude_file in zip_excludes
-                    # for arg in ("--exclude", exclude_file)
-                ] + [
-                    '.'
-                ],
-                # Use 'cwd' to ensure zip file is generated with directory structure
-                # from the root of the module.
-                cwd=self.archive_source_directory
-            )
-            file_storage.upload_file(zip_file_path, self._module_version.base_directory, self._module_version.archive_name_zip)
+        archive_builder = ModuleArchiveBuilder(
+            source_directory=self.archive_source_directory,
+            ignore_file=self.IGNORE_FILE,
+            pathspec_filter=self._get_pathspec_filter(),
+            compression_level=Config().MODULE_ARCHIVE_COMPRESSION_LEVEL
+        )
+
+        # Generate both archives in a single pass of the source directory,
+        # streaming them into file storage
+        with file_storage.open_write(self._module_version.archive_path_tar_gz) as tar_gz_fh, \
+                file_storage.open_write(self._module_version.archive_path_zip) as zip_fh:
+            archive_builder.build(tar_gz_fh=tar_gz_fh, zip_fh=zip_fh)
 
     def _get_git_commit_sha(self, module_directory: str):
         """Obtain git commit hash for module version"""
         # The git commit hash is only available for Git-based modules
         return None
 
-    def _create_module_details(self, readme_content, terraform_docs, tfsec, terraform_graph, terraform_modules, terraform_version, infracost=None):
+    def _create_module_details(self, readme_content, terraform_docs, tfsec, terraform_graph, terraform_modules, terraform_version, infracost=None, content_digest=None):
         """Create module details row."""
+        # Pre-compute graph JSON, so that it is not generated for each graph request
+        terraform_graph_json = None
+        try:
+            all_graph_json = terrareg.models.ModuleDetails.generate_all_graph_json(
+                terraform_graph=terraform_graph,
+                infracost=infracost
+            )
+            if all_graph_json:
+                terraform_graph_json = json.dumps(all_graph_json)
+        except Exception as exc:
+            print('Unable to generate graph JSON:', str(exc))
+
         module_details = terrareg.models.ModuleDetails.create()
         module_details.update_attributes(
             readme_content=readme_content,
@@ -459,33 +445,31 @@ terraform {{
             tfsec=json.dumps(tfsec),
             infracost=json.dumps(infracost) if infracost else None,
             terraform_graph=terraform_graph,
+            terraform_graph_json=terraform_graph_json,
             terraform_version=terraform_version,
-            terraform_modules=terraform_modules
+            terraform_modules=terraform_modules,
+            content_digest=content_digest
         )
         return module_details
 
+    def _get_module_details(
+        self,
+        module_path: str,
+        analysis_results: Dict[str, dict],
+        module_digests: Dict[str, str],
+        reused_module_details: Dict[str, 'terrareg.models.ModuleDetails']) -> 'terrareg.models.ModuleDetails':
+        """Create module details row for module, copying the module details of a previous extraction, if it is being re-used"""
+        if (module_details := reused_module_details.get(module_path)) is not None:
+            return module_details.copy()
+        return self._create_module_details(content_digest=module_digests.get(module_path), **analysis_results[module_path])
+
     def _insert_database(
         self,
         description: str,
-        readme_content: str,
-        terraform_docs: dict,
-        tfsec: dict,
+        module_details: 'terrareg.models.ModuleDetails',
         terrareg_metadata: dict,
-        terraform_graph: str,
-        terraform_version: str,
-        terraform_modules: str,
         git_sha: Optional[str]) -> None:
         """Insert module into DB, overwrite any pre-existing"""
-        # Create module details row
-        module_details = self._create_module_details(
-            terraform_docs=terraform_docs,
-            readme_content=readme_content,
-            tfsec=tfsec,
-            terraform_graph=terraform_graph,
-            terraform_version=terraform_version,
-            terraform_modules=terraform_modules
-        )
-
         # Update attributes of module_version in database
         self._module_version.update_attributes(
             module_details_id=module_details.pk,
@@ -507,52 +491,132 @@ terraform {{
             archive_git_path=self._module_version.module_provider.archive_git_path,
         )
 
-    def _process_submodule(self, submodule: 'terrareg.models.BaseSubmodule'):
-        """Process submodule."""
-        submodule_dir = safe_join_paths(self.module_directory, submodule.path)
-
-        # Extract example files before performing
-        # any other analysis, as the analysis may modify
-        # files in the repository, which should not
-        # be present in the stored files in the database
-        if isinstance(submodule, terrareg.models.Example):
-            self._extract_example_files(example=submodule)
-
-        tf_docs = self._run_terraform_docs(submodule_dir)
-        tfsec = self._run_tfsec(submodule_dir)
-        readme_content = self._get_readme_content(submodule_dir)
+    @contextmanager
+    def _record_stage_timing(self, stage: str):
+        """Add time taken by block to the total time of extraction stage"""
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            duration = time.monotonic() - start_time
+            with self._stage_timings_lock:
+                self._stage_timings[stage] = self._stage_timings.get(stage, 0.0) + duration
 
+    @property
+    def stage_timings(self) -> Dict[str, float]:
+        """Return total time, in seconds, spent in each extraction stage"""
+        with self._stage_timings_lock:
+            return dict(self._stage_timings)
+
+    def _run_static_analysis(self, module_path: str) -> dict:
+        """Run analysis of module that does not modify the module directory."""
+        with self._record_stage_timing('terraform_docs'):
+            terraform_docs = self._run_terraform_docs(module_path)
+        with self._record_stage_timing('tfsec'):
+            tfsec = self._run_tfsec(module_path)
+        return {
+            'terraform_docs': terraform_docs,
+            'tfsec': tfsec,
+            'readme_content': self._get_readme_content(module_path),
+        }
+
+    def _run_terraform(self, module_path: str) -> dict:
+        """Initialise terraform in module and obtain graph, modules and version."""
         terraform_graph = None
         terraform_modules = None
         terraform_version = None
-        with self._switch_terraform_versions(submodule_dir):
-            if self._run_tf_init(submodule_dir):
-                terraform_graph = self._get_graph_data(submodule_dir)
-                terraform_modules = self._get_terraform_modules(submodule_dir)
-                terraform_version = self._get_terraform_version(submodule_dir)
-
-        infracost = None
-        # Run Infracost on examples, if API key is set
-        if isinstance(submodule, terrareg.models.Example) and Config().INFRACOST_API_KEY:
+        with self._record_stage_timing('terraform'):
+            with self._switch_terraform_versions(module_path) as terraform_binary:
+                if self._run_tf_init(module_path, terraform_binary):
+                    terraform_graph = self._get_graph_data(module_path, terraform_binary)
+                    terraform_modules = self._get_terraform_modules(module_path)
+                    terraform_version = self._get_terraform_version(module_path, terraform_binary)
+        return {
+            'terraform_graph': terraform_graph,
+            'terraform_modules': terraform_modules,
+            'terraform_version': terraform_version,
+        }
+
+    def _run_example_infracost(self, example: 'terrareg.models.Example') -> Optional[dict]:
+        """Run Infracost against example, returning None if it fails."""
+        with self._record_stage_timing('infracost'):
             try:
-                infracost = self._run_infracost(example=submodule)
+                return self._run_infracost(example=example)
             except UnableToProcessTerraformError as exc:
                 print('An error occured whilst running infracost against example')
+        return None
 
-        # Create module details row
-        module_details = self._create_module_details(
-            terraform_docs=tf_docs,
-            readme_content=readme_content,
-            tfsec=tfsec,
-            infracost=infracost,
-            terraform_graph=terraform_graph,
-            terraform_modules=terraform_modules,
-            terraform_version=terraform_version
-        )
+    def _analyse_modules(self, module_paths: List[str], infracost_examples: Dict[str, 'terrareg.models.Example']) -> Dict[str, dict]:
+        """
+        Analyse root module, submodules and examples, returning results for each module path.
 
-        submodule.update_attributes(
-            module_details_id=module_details.pk
-        )
+        terraform-docs and tfsec are run against all modules concurrently, before
+        any modifications are made to the module directories by Terraform.
+        Terraform is then initialised in each module in turn, as modules share the Terraform RC file,
+        whilst Infracost is run concurrently against each example that has been initialised.
+        """
+        results = {module_path: {'infracost': None} for module_path in module_paths}
+
+        executor = ThreadPoolExecutor(max_workers=Config().MODULE_EXTRACTION_CONCURRENCY)
+        try:
+            # Obtain results in order of module paths, so that the first error is
+            # raised deterministically
+            static_analysis_futures = [
+                (module_path, executor.submit(self._run_static_analysis, module_path))
+                for module_path in module_paths
+            ]
+            for module_path, future in static_analysis_futures:
+                results[module_path].update(future.result())
+
+            infracost_futures = []
+            for module_path in module_paths:
+                results[module_path].update(self._run_terraform(module_path))
+
+                if (example := infracost_examples.get(module_path)) is not None:
+                    infracost_futures.append((module_path, executor.submit(self._run_example_infracost, example)))
+
+            for module_path, future in infracost_futures:
+                results[module_path]['infracost'] = future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return results
+
+    def _get_module_digests(self, module_paths: List[str], infracost_examples: Dict[str, 'terrareg.models.Example']) -> Dict[str, str]:
+        """
+        Return digest of each module, if re-use of extraction results is enabled.
+
+        Modules whose digest cannot be determined are omitted.
+        """
+        if not Config().MODULE_EXTRACTION_REUSE:
+            return {}
+
+        extraction_digest = ExtractionDigest(extract_directory=self.extract_directory)
+        module_digests = {}
+        with self._record_stage_timing('digest'):
+            for module_path in module_paths:
+                if (digest := extraction_digest.get_digest(module_path, run_infracost=module_path in infracost_examples)):
+                    module_digests[module_path] = digest
+        return module_digests
+
+    def _get_reusable_module_details(self, module_digests: Dict[str, str]) -> Dict[str, 'terrareg.models.ModuleDetails']:
+        """Return module details of previous extractions of modules with the same digest, by module path"""
+        reused_module_details = {}
+        for module_path, digest in module_digests.items():
+            if (module_details := terrareg.models.ModuleDetails.get_by_content_digest(digest)) is None:
+                continue
+
+            # Load data of previous extraction, ensuring that the module details
+            # have not since been deleted
+            module_details.prefetch('content_digest', *module_details.BLOB_COLUMNS)
+            if module_details.content_digest == digest:
+                reused_module_details[module_path] = module_details
+        return reused_module_details
+
+    @staticmethod
+    def _get_tool_invocation_count(module_path: str, infracost_examples: Dict[str, 'terrareg.models.Example']) -> int:
+        """Return number of tools invoked to extract module: terraform-docs, tfsec, tfswitch, terraform init/graph/version and Infracost"""
+        return 6 + (1 if module_path in infracost_examples else 0)
 
     def _run_infracost(self, example: 'terrareg.models.Example'):
         """Run Infracost to obtain cost of examples."""
@@ -589,8 +653,9 @@ terraform {{
 
         return infracost_result
 
-    def _extract_example_files(self, example: 'terrareg.models.Example'):
-        """Extract all terraform files in example and insert into DB"""
+    def _get_example_files(self, example: 'terrareg.models.Example') -> List[Tuple[str, str]]:
+        """Return path and content of all files in example to be extracted"""
+        example_files = []
         example_base_dir = safe_join_paths(self.module_directory, example.path)
         for extension in Config().EXAMPLE_FILE_EXTENSIONS:
             for tf_file_path in safe_iglob(base_dir=example_base_dir,
@@ -604,21 +669,30 @@ terraform {{
                 with open(tf_file_path, 'r') as file_fd:
                     content = ''.join(file_fd.readlines())
 
-                # Create example file and update content attribute
-                example_file = terrareg.models.ExampleFile.create(example=example, path=tf_file)
-                example_file.update_attributes(
-                    content=content
-                )
+                example_files.append((tf_file, content))
+        return example_files
+
+    def _extract_example_files(self, example: 'terrareg.models.Example', example_files: Optional[List[Tuple[str, str]]]=None):
+        """Extract all terraform files in example and insert into DB"""
+        if example_files is None:
+            example_files = self._get_example_files(example=example)
+
+        for tf_file, content in example_files:
+            # Create example file and update content attribute
+            example_file = terrareg.models.ExampleFile.create(example=example, path=tf_file)
+            example_file.update_attributes(
+                content=content
+            )
 
-    def _scan_submodules(self, subdirectory: str, submodule_class: Type['terrareg.models.BaseSubmodule']):
-        """Scan for submodules and extract details."""
+    def _get_submodule_paths(self, subdirectory: str) -> List[str]:
+        """Return paths of all submodules within subdirectory."""
         try:
             submodule_base_directory = safe_join_paths(self.module_directory, subdirectory, is_dir=True)
         except PathDoesNotExistError:
             # If the modules directory does not exist,
             # ignore and return
             print('No modules directory found')
-            return
+            return []
 
         module_directory_re = re.compile('^{}'.format(
             re.escape(
@@ -646,12 +720,7 @@ terraform {{
             if submodule_name not in submodules:
                 submodules.append(submodule_name)
 
-        # Extract all submodules
-        for submodule_path in submodules:
-            obj = submodule_class.create(
-                module_version=self._module_version,
-                module_path=submodule_path)
-            self._process_submodule(submodule=obj)
+        return submodules
 
     def _extract_description(self, readme_content):
         """Extract description from README"""
@@ -729,21 +798,52 @@ terraform {{
         # Always perform this first before making any modifications to the repo
         if not (self._module_version.get_git_clone_url() and
                 Config().DELETE_EXTERNALLY_HOSTED_ARTIFACTS):
-            self._generate_archive()
+            with self._record_stage_timing('archive'):
+                self._generate_archive()
 
-        # Run terraform-docs on module content and obtain README
-        terraform_docs = self._run_terraform_docs(self.module_directory)
-        tfsec = self._run_tfsec(self.module_directory)
-        readme_content = self._get_readme_content(self.module_directory)
+        config = Config()
+        submodules = [
+            terrareg.models.Submodule(module_version=self._module_version, module_path=submodule_path)
+            for submodule_path in self._get_submodule_paths(config.MODULES_DIRECTORY)
+        ] + [
+            terrareg.models.Example(module_version=self._module_version, module_path=example_path)
+            for example_path in self._get_submodule_paths(config.EXAMPLES_DIRECTORY)
+        ]
+
+        # Obtain example files before performing any analysis,
+        # as the analysis may modify files in the repository,
+        # which should not be present in the stored files in the database
+        example_files = {
+            submodule.path: self._get_example_files(example=submodule)
+            for submodule in submodules
+            if isinstance(submodule, terrareg.models.Example)
+        }
+
+        module_paths = [self.module_directory] + [
+            safe_join_paths(self.module_directory, submodule.path)
+            for submodule in submodules
+        ]
 
-        terraform_graph = None
-        terraform_modules = None
-        terraform_version = None
-        with self._switch_terraform_versions(self.module_directory):
-            if self._run_tf_init(self.module_directory):
-                terraform_graph = self._get_graph_data(self.module_directory)
-                terraform_modules = self._get_terraform_modules(self.module_directory)
-                terraform_version = self._get_terraform_version(self.module_directory)
+        # Run Infracost on examples, if API key is set
+        infracost_examples = {
+            module_path: submodule
+            for module_path, submodule in zip(module_paths[1:], submodules)
+            if isinstance(submodule, terrareg.models.Example) and config.INFRACOST_API_KEY
+        }
+
+        # Obtain digests of modules before any analysis is performed, so that
+        # the results of previous extractions of unchanged modules can be re-used
+        module_digests = self._get_module_digests(module_paths=module_paths, infracost_examples=infracost_examples)
+        reused_module_details = self._get_reusable_module_details(module_digests)
+
+        analysis_results = self._analyse_modules(
+            module_paths=[module_path for module_path in module_paths if module_path not in reused_module_details],
+            infracost_examples=infracost_examples
+        )
+        if (root_module_details := reused_module_details.get(self.module_directory)) is not None:
+            readme_content = Database.decode_blob(root_module_details.readme_content)
+        else:
+            readme_content = analysis_results[self.module_directory]['readme_content']
 
         # Check for any terrareg metadata files
         terrareg_metadata = self._get_terrareg_metadata(self.module_directory)
@@ -756,26 +856,51 @@ terraform {{
 
         git_sha = self._get_git_commit_sha(self.module_directory)
 
-        self._insert_database(
-            description=description,
-            readme_content=readme_content,
-            tfsec=tfsec,
-            terraform_docs=terraform_docs,
-            terrareg_metadata=terrareg_metadata,
-            terraform_graph=terraform_graph,
-            terraform_modules=terraform_modules,
-            terraform_version=terraform_version,
-            git_sha=git_sha,
-        )
+        # Insert results into database from this thread,
+        # in the order that the modules were discovered
+        with self._record_stage_timing('database'):
+            self._insert_database(
+                description=description,
+                module_details=self._get_module_details(
+                    module_path=self.module_directory,
+                    analysis_results=analysis_results,
+                    module_digests=module_digests,
+                    reused_module_details=reused_module_details
+                ),
+                terrareg_metadata=terrareg_metadata,
+                git_sha=git_sha,
+            )
 
-        self._extract_additional_tab_files()
+            self._extract_additional_tab_files()
 
-        self._scan_submodules(
-            submodule_class=terrareg.models.Submodule,
-            subdirectory=Config().MODULES_DIRECTORY)
-        self._scan_submodules(
-            submodule_class=terrareg.models.Example,
-            subdirectory=Config().EXAMPLES_DIRECTORY)
+            for module_path, submodule in zip(module_paths[1:], submodules):
+                obj = submodule.__class__.create(
+                    module_version=self._module_version,
+                    module_path=submodule.path)
+
+                if isinstance(obj, terrareg.models.Example):
+                    self._extract_example_files(example=obj, example_files=example_files[submodule.path])
+
+                module_details = self._get_module_details(
+                    module_path=module_path,
+                    analysis_results=analysis_results,
+                    module_digests=module_digests,
+                    reused_module_details=reused_module_details
+                )
+                obj.update_attributes(
+                    module_details_id=module_details.pk
+                )
+
+        print(f'Extraction stage timings for {self._module_version.id}: ' + ', '.join(
+            f'{stage}: {duration:.2f}s'
+            for stage, duration in self.stage_timings.items()
+        ))
+        if module_digests:
+            print(
+                f'Extraction re-use for {self._module_version.id}: '
+                f're-used results of {len(reused_module_details)} of {len(module_paths)} modules, '
+                f'skipping {sum(self._get_tool_invocation_count(module_path, infracost_examples) for module_path in reused_module_details)} tool invocations'
+            )
 
 
 class ApiUploadModuleExtractor(ModuleExtractor):
@@ -843,6 +968,7 @@ class GitModuleExtractor(ModuleExtractor):
         env['GIT_SSH_COMMAND'] = 'ssh -o StrictHostKeyChecking=accept-new'
 
         git_url = self._module_version._module_provider.get_git_clone_url()
+        clone_url = git_url
 
         # Add credentials to URL, if using http(s) and configured in
         # config
@@ -855,19 +981,29 @@ class GitModuleExtractor(ModuleExtractor):
                 domain = parsed_url.netloc.split('@')[-1]
                 # Replace netloc with username/password prepended authentication
                 parsed_url = parsed_url._replace(netloc=f'{config.UPSTREAM_GIT_CREDENTIALS_USERNAME or ""}:{config.UPSTREAM_GIT_CREDENTIALS_PASSWORD or ""}@' + domain)
-                git_url = urllib.parse.urlunparse(parsed_url)
+                clone_url = urllib.parse.urlunparse(parsed_url)
 
         try:
-            subprocess.check_output([
-                    'git', 'clone', '--single-branch',
-                    '--branch', self._module_version.source_git_tag,
-                    git_url,
-                    self.extract_directory
-                ],
-                stderr=subprocess.STDOUT,
-                env=env,
-                timeout=Config().GIT_CLONE_TIMEOUT
-            )
+            if (git_mirror_cache := GitMirrorCache.get()) is not None:
+                git_mirror_cache.clone(
+                    git_url=git_url,
+                    fetch_url=clone_url,
+                    tag=self._module_version.source_git_tag,
+                    target_directory=self.extract_directory,
+                    env=env,
+                    timeout=Config().GIT_CLONE_TIMEOUT
+                )
+            else:
+                subprocess.check_output([
+                        'git', 'clone', '--single-branch',
+                        '--branch', self._module_version.source_git_tag,
+                        clone_url,
+                        self.extract_directory
+                    ],
+                    stderr=subprocess.STDOUT,
+                    env=env,
+                    timeout=Config().GIT_CLONE_TIMEOUT
+                )
         except subprocess.CalledProcessError as exc:
             error = 'Unknown error occurred during git clone'
             for line in exc.output.decode('utf-8').split('\n'):
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class ModuleImportJobStatus(Enum):
+    """Status of queued module version import job"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
@@ -0,0 +1,386 @@
+
+from collections import Counter
+import datetime
+import threading
+import time
+from typing import Optional
+
+import flask
+import sqlalchemy
+
+from terrareg.config import Config, ModuleImportQueueType
+from terrareg.database import Database
+from terrareg.module_import_job_status import ModuleImportJobStatus
+import terrareg.auth
+import terrareg.errors
+import terrareg.models
+import terrareg.module_extractor
+
+
+class ModuleImportJob:
+    """Queued import of a module version from git"""
+
+    @classmethod
+    def get(cls, job_id: int) -> Optional['ModuleImportJob']:
+        """Return job by ID, if it exists"""
+        obj = cls(job_id=job_id)
+        if obj._get_db_row() is None:
+            return None
+        return obj
+
+    def __init__(self, job_id: int):
+        """Store member variables"""
+        self._job_id = job_id
+        self._cache_db_row = None
+
+    def _get_db_row(self):
+        """Return database row for job"""
+        if self._cache_db_row is None:
+            db = Database.get()
+            select = db.module_import_job.select().where(
+                db.module_import_job.c.id == self._job_id
+            )
+            with db.get_connection() as conn:
+                self._cache_db_row = conn.execute(select).fetchone()
+        return self._cache_db_row
+
+    @property
+    def pk(self) -> int:
+        """Return ID of job"""
+        return self._job_id
+
+    @property
+    def module_provider_id(self) -> int:
+        """Return ID of module provider that the version is imported into"""
+        return self._get_db_row()['module_provider_id']
+
+    @property
+    def version(self) -> str:
+        """Return version being imported"""
+        return self._get_db_row()['version']
+
+    @property
+    def status(self) -> ModuleImportJobStatus:
+        """Return status of job"""
+        return self._get_db_row()['status']
+
+    @property
+    def attempts(self) -> int:
+        """Return number of times that the import has been attempted"""
+        return self._get_db_row()['attempts']
+
+    @property
+    def username(self) -> Optional[str]:
+        """Return username of user that queued the import"""
+        return self._get_db_row()['username']
+
+    @property
+    def error(self) -> Optional[str]:
+        """Return error from most recent failed attempt"""
+        return self._get_db_row()['error']
+
+    @property
+    def bulk_reindex(self) -> bool:
+        """Return whether the job re-extracts an existing module version as part of a bulk re-index"""
+        return bool(self._get_db_row()['bulk_reindex'])
+
+    def update_attributes(self, **kwargs):
+        """Update attributes of job in database"""
+        db = Database.get()
+        update = db.module_import_job.update().where(
+            db.module_import_job.c.id == self._job_id
+        ).values(**kwargs)
+        with db.get_connection() as conn:
+            conn.execute(update)
+
+        # Remove cached row
+        self._cache_db_row = None
+
+    def get_api_outline(self) -> dict:
+        """Return API details of job"""
+        row = self._get_db_row()
+        return {
+            'id': self.pk,
+            'version': row['version'],
+            'status': row['status'].value,
+            'attempts': row['attempts'],
+            'error': row['error'],
+            'created_at': row['created_at'].isoformat(),
+            'started_at': row['started_at'].isoformat() if row['started_at'] else None,
+            'finished_at': row['finished_at'].isoformat() if row['finished_at'] else None,
+        }
+
+
+class ModuleImportQueue:
+    """
+    Database-backed queue of module version imports.
+
+    Jobs are claimed by workers using conditional updates, allowing
+    any number of workers, across multiple instances of Terrareg,
+    to process the queue.
+    """
+
+    # Maximum time that a job can be running, after which it is
+    # assumed that the worker processing it has stopped.
+    JOB_TIMEOUT = datetime.timedelta(hours=1)
+
+    # Delay before retrying a failed job, which doubles for each failed attempt.
+    RETRY_DELAY = datetime.timedelta(seconds=30)
+
+    # Maximum number of pending jobs inspected when claiming a job
+    CLAIM_BATCH_SIZE = 50
+
+    _worker_threads = []
+
+    @classmethod
+    def get(cls) -> Optional['ModuleImportQueue']:
+        """Return queue, if module imports are configured to be queued"""
+        if Config().MODULE_IMPORT_QUEUE is ModuleImportQueueType.DISABLED:
+            return None
+        return cls()
+
+    def enqueue(self, module_provider: 'terrareg.models.ModuleProvider', version: str, bulk_reindex: bool=False) -> ModuleImportJob:
+        """
+        Add import of module version to queue and return job.
+
+        Jobs for bulk re-indexes retain the published state of the existing module version.
+        If an import of the same version is already pending, the pending job is returned.
+        """
+        db = Database.get()
+        with db.get_connection() as conn:
+            existing_job_id = conn.execute(
+                sqlalchemy.select(db.module_import_job.c.id).where(
+                    db.module_import_job.c.module_provider_id == module_provider.pk,
+                    db.module_import_job.c.version == version,
+                    db.module_import_job.c.status == ModuleImportJobStatus.PENDING
+                ).order_by(db.module_import_job.c.id).limit(1)
+            ).scalar()
+            if existing_job_id is not None:
+                return ModuleImportJob(job_id=existing_job_id)
+
+            now = datetime.datetime.now()
+            res = conn.execute(db.module_import_job.insert().values(
+                module_provider_id=module_provider.pk,
+                version=version,
+                status=ModuleImportJobStatus.PENDING,
+                attempts=0,
+                username=terrareg.auth.AuthFactory().get_current_auth_method().get_username(),
+                created_at=now,
+                run_after=now,
+                bulk_reindex=bulk_reindex
+            ))
+            return ModuleImportJob(job_id=res.inserted_primary_key[0])
+
+    def _recover_stale_jobs(self, conn):
+        """Return jobs, which were abandoned by their worker, to the queue"""
+        db = Database.get()
+        stale_jobs = sqlalchemy.and_(
+            db.module_import_job.c.status == ModuleImportJobStatus.RUNNING,
+            db.module_import_job.c.started_at < (datetime.datetime.now() - self.JOB_TIMEOUT)
+        )
+        max_attempts = Config().MODULE_IMPORT_QUEUE_MAX_ATTEMPTS
+        conn.execute(db.module_import_job.update().where(
+            stale_jobs,
+            db.module_import_job.c.attempts >= max_attempts
+        ).values(
+            status=ModuleImportJobStatus.FAILED,
+            error='Import did not complete within the job timeout',
+            finished_at=datetime.datetime.now()
+        ))
+        conn.execute(db.module_import_job.update().where(
+            stale_jobs
+        ).values(
+            status=ModuleImportJobStatus.PENDING,
+            started_at=None
+        ))
+
+    def claim_next_job(self) -> Optional[ModuleImportJob]:
+        """
+        Mark the next runnable job as running and return it.
+
+        Jobs are not claimed whilst an import of the same module version is running,
+        or if the maximum number of concurrent imports for the namespace is reached.
+        """
+        db = Database.get()
+        namespace_concurrency = Config().MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY
+
+        job_select = sqlalchemy.select(
+            db.module_import_job.c.id,
+            db.module_import_job.c.module_provider_id,
+            db.module_import_job.c.version,
+            db.module_provider.c.namespace_id
+        ).select_from(
+            db.module_import_job
+        ).join(
+            db.module_provider,
+            db.module_import_job.c.module_provider_id == db.module_provider.c.id
+        )
+
+        with db.get_connection() as conn:
+            self._recover_stale_jobs(conn)
+
+            running_jobs = conn.execute(job_select.where(
+                db.module_import_job.c.status == ModuleImportJobStatus.RUNNING
+            )).fetchall()
+            running_namespace_counts = Counter(row['namespace_id'] for row in running_jobs)
+            running_versions = set((row['module_provider_id'], row['version']) for row in running_jobs)
+
+            now = datetime.datetime.now()
+            candidate_select = job_select.where(
+                db.module_import_job.c.status == ModuleImportJobStatus.PENDING,
+                db.module_import_job.c.run_after <= now
+            )
+            # Exclude namespaces that have reached the maximum number of concurrent imports,
+            # so that jobs in other namespaces are claimed when a namespace has a large
+            # number of pending jobs, such as during a bulk re-index
+            if (saturated_namespace_ids := [
+                    namespace_id
+                    for namespace_id, count in running_namespace_counts.items()
+                    if count >= namespace_concurrency]):
+                candidate_select = candidate_select.where(
+                    db.module_provider.c.namespace_id.notin_(saturated_namespace_ids)
+                )
+            candidates = conn.execute(candidate_select.order_by(
+                db.module_import_job.c.id
+            ).limit(self.CLAIM_BATCH_SIZE)).fetchall()
+
+            for candidate in candidates:
+                if (running_namespace_counts[candidate['namespace_id']] >= namespace_concurrency or
+                        (candidate['module_provider_id'], candidate['version']) in running_versions):
+                    continue
+
+                # Only claim the job if another worker has not already claimed it
+                res = conn.execute(db.module_import_job.update().where(
+                    db.module_import_job.c.id == candidate['id'],
+                    db.module_import_job.c.status == ModuleImportJobStatus.PENDING
+                ).values(
+                    status=ModuleImportJobStatus.RUNNING,
+                    attempts=db.module_import_job.c.attempts + 1,
+                    started_at=now
+                ))
+                if res.rowcount != 1:
+                    continue
+
+                # Other workers may have claimed jobs in the namespace concurrently,
+                # so only keep the job if it is one of the oldest running jobs in the namespace
+                permitted_job_ids = conn.execute(
+                    sqlalchemy.select(
+                        db.module_import_job.c.id
+                    ).select_from(
+                        db.module_import_job
+                    ).join(
+                        db.module_provider,
+                        db.module_import_job.c.module_provider_id == db.module_provider.c.id
+                    ).where(
+                        db.module_import_job.c.status == ModuleImportJobStatus.RUNNING,
+                        db.module_provider.c.namespace_id == candidate['namespace_id']
+                    ).order_by(
+                        db.module_import_job.c.id
+                    ).limit(namespace_concurrency)
+                ).scalars().all()
+                if candidate['id'] not in permitted_job_ids:
+                    conn.execute(db.module_import_job.update().where(
+                        db.module_import_job.c.id == candidate['id']
+                    ).values(
+                        status=ModuleImportJobStatus.PENDING,
+                        attempts=db.module_import_job.c.attempts - 1,
+                        started_at=None
+                    ))
+                    running_namespace_counts[candidate['namespace_id']] = namespace_concurrency
+                    continue
+
+                return ModuleImportJob(job_id=candidate['id'])
+
+        return None
+
+    def run_job(self, job: ModuleImportJob, app: flask.Flask) -> bool:
+        """
+        Import module version for claimed job and return whether the import succeeded.
+
+        Failed imports are returned to the queue, until the maximum number of attempts is reached.
+        """
+        try:
+            # Run within request context, so that the import uses a
+            # transaction and cache that are local to this thread and
+            # audit events are recorded against the user that queued the job.
+            with app.test_request_context():
+                setattr(flask.g, terrareg.auth.AuthFactory.FLASK_GLOBALS_AUTH_KEY,
+                        terrareg.auth.ModuleImportJobAuthMethod(username=job.username))
+
+                with Database.start_transaction():
+                    module_providers = terrareg.models.ModuleProvider.get_batch([job.module_provider_id])
+                    if not module_providers:
+                        raise terrareg.errors.TerraregError('Module provider does not exist')
+
+                    module_version = terrareg.models.ModuleVersion(module_provider=module_providers[0], version=job.version)
+
+                    # Retain published state of module versions that are re-extracted by a bulk re-index
+                    republish = (
+                        job.bulk_reindex and
+                        (existing_module_version := terrareg.models.ModuleVersion.get(module_provider=module_providers[0], version=job.version)) is not None and
+                        existing_module_version.published
+                    )
+
+                    with module_version.module_create_extraction_wrapper():
+                        with terrareg.module_extractor.GitModuleExtractor(module_version=module_version) as me:
+                            me.process_upload()
+
+                    if republish and not module_version.published:
+                        module_version.publish()
+
+        except Exception as exc:
+            print(f'Failed to import version {job.version} for module import job {job.pk}: {str(exc)}')
+            error = str(exc)[:Database.get().module_import_job.c.error.type.length]
+            if job.attempts >= Config().MODULE_IMPORT_QUEUE_MAX_ATTEMPTS:
+                job.update_attributes(
+                    status=ModuleImportJobStatus.FAILED,
+                    error=error,
+                    finished_at=datetime.datetime.now()
+                )
+            else:
+                job.update_attributes(
+                    status=ModuleImportJobStatus.PENDING,
+                    error=error,
+                    started_at=None,
+                    run_after=datetime.datetime.now() + (self.RETRY_DELAY * (2 ** (job.attempts - 1)))
+                )
+            return False
+
+        job.update_attributes(
+            status=ModuleImportJobStatus.SUCCEEDED,
+            error=None,
+            finished_at=datetime.datetime.now()
+        )
+        return True
+
+    def process_next_job(self, app: flask.Flask) -> bool:
+        """Claim and run next job, returning whether a job was run"""
+        if (job := self.claim_next_job()) is None:
+            return False
+        self.run_job(job=job, app=app)
+        return True
+
+    def run_worker(self, app: flask.Flask):
+        """Continually process jobs from the queue"""
+        while True:
+            try:
+                processed_job = self.process_next_job(app=app)
+            except Exception as exc:
+                print(f'Failed to process module import queue: {str(exc)}')
+                processed_job = False
+
+            if not processed_job:
+                time.sleep(Config().MODULE_IMPORT_QUEUE_POLL_INTERVAL)
+
+    @classmethod
+    def start_workers(cls, app: flask.Flask):
+        """Start background threads to process queued module imports, if configured."""
+        if (queue := cls.get()) is None or cls._worker_threads:
+            return
+
+        for itx in range(Config().MODULE_IMPORT_QUEUE_WORKERS):
+            thread = threading.Thread(
+                target=queue.run_worker, kwargs={'app': app},
+                name=f'module-import-worker-{itx}', daemon=True)
+            thread.start()
+            cls._worker_threads.append(thread)
@@ -8,6 +8,7 @@ from terrareg.database import Database
 import terrareg.models
 from terrareg.filters import NamespaceTrustFilter
 import terrareg.result_data
+from terrareg.module_search_index import ModuleSearchIndexFactory
 
 
 class ModuleSearch(object):
@@ -52,6 +53,12 @@ class ModuleSearch(object):
                     )
                 )
 
+            # Limit search to module providers that the search
+            # index has found to contain all query terms
+            module_provider_ids = ModuleSearchIndexFactory.get().get_matching_module_provider_ids(query.split())
+            if module_provider_ids is not None:
+                wheres.append(db.module_provider.c.id.in_(module_provider_ids))
+
         relevance = sqlalchemy.sql.expression.label('relevance', point_sum)
         select = db.select_module_provider_joined_latest_module_version(
             db.module_provider,
@@ -91,7 +98,8 @@ class ModuleSearch(object):
         providers: list=None,
         verified: bool=False,
         include_internal: bool=False,
-        namespace_trust_filters: list=NamespaceTrustFilter.UNSPECIFIED):
+        namespace_trust_filters: list=NamespaceTrustFilter.UNSPECIFIED,
+        include_module_details: bool=False):
 
         # Limit the limits
         limit = 50 if limit > 50 else limit
@@ -157,11 +165,14 @@ class ModuleSearch(object):
 
             count = count_result.fetchone()['count']
 
-            module_providers = []
-            for r in res:
-                namespace = terrareg.models.Namespace(name=r['namespace'])
-                module = terrareg.models.Module(namespace=namespace, name=r['module'])
-                module_providers.append(terrareg.models.ModuleProvider(module=module, name=r['provider']))
+            module_provider_ids = [r[db.module_provider.c.id] for r in res]
+
+        # Load module providers and their latest versions in bulk,
+        # as the latest version of each is used by the search results
+        module_providers = terrareg.models.ModuleProvider.get_batch(
+            module_provider_ids,
+            include_module_details=include_module_details
+        )
 
         return terrareg.result_data.ResultData(
             offset=offset,
@@ -0,0 +1,282 @@
+"""Provide indexes for obtaining module providers matching module search queries."""
+
+import abc
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import terrareg.config
+from terrareg.database import Database
+
+
+class BaseModuleSearchIndex(abc.ABC):
+    """Base index for module search."""
+
+    TYPE: 'terrareg.config.ModuleSearchIndexType' = None
+
+    @abc.abstractmethod
+    def get_matching_module_provider_ids(self, query_parts: List[str]) -> Optional[Set[int]]:
+        """
+        Return IDs of module providers that may match all query parts.
+
+        The result may contain module providers that do not match the query,
+        as the search query filters and orders the results in the database.
+
+        None is returned if the index cannot limit the module providers being searched.
+        """
+        ...
+
+    def update_module_provider(self, module_provider_id: int) -> None:
+        """Update indexed details of module provider"""
+        pass
+
+    def remove_module_provider(self, module_provider_id: int) -> None:
+        """Remove module provider from index"""
+        pass
+
+    def invalidate(self) -> None:
+        """Invalidate all indexed data"""
+        pass
+
+
+class DatabaseModuleSearchIndex(BaseModuleSearchIndex):
+    """Perform all matching of search terms in the database."""
+
+    TYPE = terrareg.config.ModuleSearchIndexType.DATABASE
+
+    def get_matching_module_provider_ids(self, query_parts: List[str]) -> Optional[Set[int]]:
+        """Do not limit module providers, allowing the database to match all module providers"""
+        return None
+
+
+class InMemoryModuleSearchIndex(BaseModuleSearchIndex):
+    """
+    In-process n-gram index of module providers.
+
+    Each searchable field of the latest version of each module provider is split into
+    all n-grams up to NGRAM_SIZE characters, allowing wildcarded (substring) matches
+    to be found without scanning all module providers.
+    """
+
+    TYPE = terrareg.config.ModuleSearchIndexType.MEMORY
+
+    # Maximum length of n-grams stored in the index
+    NGRAM_SIZE = 3
+
+    # Maximum number of module providers that will be used to filter
+    # the search query. Queries matching more module providers than this
+    # are not selective, so are left for the database to match.
+    # This is kept below the SQLite default maximum number of bind parameters.
+    MAX_FILTER_SIZE = 900
+
+    # Characters that are treated as wildcards or escape characters
+    # by LIKE expressions, which cannot be literally matched in the index
+    _LIKE_SPECIAL_CHARACTERS_RE = re.compile(r'[%_\\]')
+
+    def __init__(self, refresh_interval: int):
+        """Setup empty index"""
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        # Held whilst the index is being built, so that only one thread builds the index
+        self._build_lock = threading.Lock()
+        self._documents: Dict[int, Tuple[str, ...]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._built_at: Optional[float] = None
+
+    @classmethod
+    def _get_ngrams(cls, value: str) -> Set[str]:
+        """Return all n-grams of value, up to the maximum n-gram size"""
+        return {
+            value[start:start + length]
+            for length in range(1, cls.NGRAM_SIZE + 1)
+            for start in range(0, len(value) - length + 1)
+        }
+
+    @staticmethod
+    def _get_select():
+        """Return select for searchable fields of latest version of module providers"""
+        db = Database.get()
+        return db.select_module_provider_joined_latest_module_version(
+            db.module_provider.c.id,
+            db.module_provider.c.module,
+            db.module_provider.c.provider,
+            db.namespace.c.namespace,
+            db.module_version.c.description,
+            db.module_version.c.owner
+        )
+
+    @staticmethod
+    def _row_to_document(row) -> Tuple[str, ...]:
+        """Convert database row to tuple of lower-cased searchable values"""
+        return tuple(
+            row[column].lower()
+            for column in ['module', 'provider', 'namespace', 'description', 'owner']
+            if row[column]
+        )
+
+    def _add_document(self, module_provider_id: int, document: Tuple[str, ...]) -> None:
+        """Add document to index. The lock must be held by the caller."""
+        self._documents[module_provider_id] = document
+        for value in document:
+            for ngram in self._get_ngrams(value):
+                self._postings.setdefault(ngram, set()).add(module_provider_id)
+
+    def _remove_document(self, module_provider_id: int) -> None:
+        """Remove document from index. The lock must be held by the caller."""
+        document = self._documents.pop(module_provider_id, None)
+        if document is None:
+            return
+        for value in document:
+            for ngram in self._get_ngrams(value):
+                if (postings := self._postings.get(ngram)) is not None:
+                    postings.discard(module_provider_id)
+                    if not postings:
+                        del self._postings[ngram]
+
+    def _requires_build(self) -> bool:
+        """Return whether the index must be (re)built from the database"""
+        if self._built_at is None:
+            return True
+        return bool(self._refresh_interval) and (time.time() - self._built_at) >= self._refresh_interval
+
+    def _build_if_required(self) -> None:
+        """
+        Build index if it has not been built or requires refreshing.
+
+        Only one thread builds the index. Whilst the index is being refreshed,
+        other threads continue to use the existing index, but wait for the
+        index to be built if it has not yet been built.
+        """
+        if not self._build_lock.acquire(blocking=self._built_at is None):
+            return
+        try:
+            # Check whether the index has been built by another thread,
+            # whilst waiting for the lock
+            if self._requires_build():
+                self._build()
+        finally:
+            self._build_lock.release()
+
+    def _build(self) -> None:
+        """Build index of all module providers from database"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            rows = conn.execute(self._get_select()).fetchall()
+
+        with self._lock:
+            self._documents = {}
+            self._postings = {}
+            for row in rows:
+                self._add_document(row['id'], self._row_to_document(row))
+            self._built_at = time.time()
+
+    def _match_segment(self, segment: str) -> Set[int]:
+        """Return IDs of module providers containing the literal segment. The lock must be held by the caller."""
+        if len(segment) <= self.NGRAM_SIZE:
+            return set(self._postings.get(segment, set()))
+
+        # Intersect postings of n-grams of the segment, starting with the smallest
+        ngram_postings = sorted(
+            [self._postings.get(segment[start:start + self.NGRAM_SIZE], set())
+             for start in range(0, len(segment) - self.NGRAM_SIZE + 1)],
+            key=len
+        )
+        candidates = set(ngram_postings[0])
+        for postings in ngram_postings[1:]:
+            if not candidates:
+                break
+            candidates &= postings
+
+        # Remove candidates containing all n-grams, but not the segment itself
+        return {
+            module_provider_id
+            for module_provider_id in candidates
+            if any(segment in value for value in self._documents[module_provider_id])
+        }
+
+    def get_matching_module_provider_ids(self, query_parts: List[str]) -> Optional[Set[int]]:
+        """Return IDs of module providers that contain each of the query parts"""
+        if self._requires_build():
+            self._build_if_required()
+
+        matches = None
+        with self._lock:
+            for query_part in query_parts:
+                # Split query part by any LIKE wildcard characters, matching the
+                # remaining literal segments, as these must all be present.
+                segments = [
+                    segment
+                    for segment in self._LIKE_SPECIAL_CHARACTERS_RE.split(query_part.lower())
+                    if segment
+                ]
+                for segment in segments:
+                    segment_matches = self._match_segment(segment)
+                    matches = segment_matches if matches is None else (matches & segment_matches)
+
+        # If the query was not selective enough, allow the database
+        # to match against all module providers
+        if matches is not None and len(matches) > self.MAX_FILTER_SIZE:
+            return None
+        return matches
+
+    def update_module_provider(self, module_provider_id: int) -> None:
+        """Re-index module provider from database, once the current transaction has been committed"""
+        # Changes of the current transaction are not indexed until committed,
+        # so that the index does not contain changes that are rolled back
+        Database.call_after_commit(lambda: self._update_module_provider(module_provider_id))
+
+    def _update_module_provider(self, module_provider_id: int) -> None:
+        """Re-index module provider from database"""
+        # If the index has not yet been built, the module
+        # provider will be indexed when it is built
+        if self._built_at is None:
+            return
+
+        db = Database.get()
+        with db.get_connection() as conn:
+            row = conn.execute(self._get_select().where(
+                db.module_provider.c.id == module_provider_id
+            )).fetchone()
+
+        with self._lock:
+            self._remove_document(module_provider_id)
+            if row is not None:
+                self._add_document(module_provider_id, self._row_to_document(row))
+
+    def remove_module_provider(self, module_provider_id: int) -> None:
+        """Remove module provider from index, once the current transaction has been committed"""
+        Database.call_after_commit(lambda: self._remove_module_provider(module_provider_id))
+
+    def _remove_module_provider(self, module_provider_id: int) -> None:
+        """Remove module provider from index"""
+        with self._lock:
+            self._remove_document(module_provider_id)
+
+    def invalidate(self) -> None:
+        """Mark index to be rebuilt on next search"""
+        self._built_at = None
+
+
+class ModuleSearchIndexFactory:
+    """Obtain configured module search index"""
+
+    _INSTANCE: Optional[BaseModuleSearchIndex] = None
+
+    @classmethod
+    def get(cls) -> BaseModuleSearchIndex:
+        """Return instance of configured module search index"""
+        index_type = terrareg.config.Config().MODULE_SEARCH_INDEX
+        if cls._INSTANCE is None or cls._INSTANCE.TYPE is not index_type:
+            if index_type is terrareg.config.ModuleSearchIndexType.MEMORY:
+                cls._INSTANCE = InMemoryModuleSearchIndex(
+                    refresh_interval=terrareg.config.Config().MODULE_SEARCH_INDEX_REFRESH_INTERVAL
+                )
+            else:
+                cls._INSTANCE = DatabaseModuleSearchIndex()
+        return cls._INSTANCE
+
+    @classmethod
+    def reset(cls) -> None:
+        """Remove instance of module search index"""
+        cls._INSTANCE = None
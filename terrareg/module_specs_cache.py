@@ -0,0 +1,71 @@
+
+from collections import OrderedDict
+import threading
+from typing import Any, Callable, Optional
+
+from terrareg.config import Config
+
+
+class ModuleSpecsCache:
+    """
+    Process-wide LRU cache of values derived from the module details of modules,
+    such as parsed module specs, sanitised inputs/outputs and rendered README
+    and example file HTML.
+
+    The module details of a module version are not modified after extraction,
+    as re-indexing a module version creates new module details.
+    Entries are therefore keyed by module details ID, the generation of the module
+    details and the extraction version of the module version, which is None for
+    values derived only from the module details, such as graph JSON.
+    The generation is unique to each module details row, since IDs of deleted rows
+    may be re-used, so re-indexed module details are never served from entries
+    cached by other processes.
+    Entries for module details are also invalidated when they are updated or
+    deleted by the current process.
+
+    Values are shared between callers and must not be modified.
+    """
+
+    _lock = threading.Lock()
+    # Cached values, by module details ID, generation and extraction version
+    _entries = OrderedDict()
+
+    @classmethod
+    def get(cls, module_details_id: int, generation: Optional[str], extraction_version: Optional[int],
+            name: str, factory: Callable[[], Any]) -> Any:
+        """Return cached value for module details, calling factory to generate the value if it is not cached."""
+        max_size = Config().MODULE_SPECS_CACHE_SIZE
+        if not max_size:
+            return factory()
+
+        key = (module_details_id, generation, extraction_version)
+        with cls._lock:
+            if key in cls._entries and name in cls._entries[key]:
+                cls._entries.move_to_end(key)
+                return cls._entries[key][name]
+
+        value = factory()
+
+        with cls._lock:
+            if key not in cls._entries:
+                cls._entries[key] = {}
+            cls._entries[key][name] = value
+            cls._entries.move_to_end(key)
+
+            # Evict least recently used module details
+            while len(cls._entries) > max_size:
+                cls._entries.popitem(last=False)
+        return value
+
+    @classmethod
+    def invalidate(cls, module_details_id: int) -> None:
+        """Remove all cached values for module details"""
+        with cls._lock:
+            for key in [key for key in cls._entries if key[0] == module_details_id]:
+                del cls._entries[key]
+
+    @classmethod
+    def clear(cls) -> None:
+        """Remove all cached values"""
+        with cls._lock:
+            cls._entries.clear()
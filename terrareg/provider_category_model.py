@@ -6,6 +6,7 @@ from typing import Union, List, Dict
 import sqlalchemy
 
 import terrareg.database
+import terrareg.identity_map
 import terrareg.config
 from terrareg.errors import InvalidProviderCategoryConfigError
 
@@ -66,9 +67,7 @@ class ProviderCategory:
             ).where(
                 db.provider_category.c.id == self._pk
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            self._cache_db_row = terrareg.identity_map.IdentityMap.get_db_row(('provider_category', self._pk), select)
 
         return self._cache_db_row
 
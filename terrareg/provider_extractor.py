@@ -1,5 +1,6 @@
 
-from typing import Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, Optional, Union, Tuple
 from glob import glob
 import json
 import re
@@ -10,6 +11,8 @@ import os
 import tempfile
 import tarfile
 import hashlib
+import threading
+import time
 
 import frontmatter
 
@@ -25,13 +28,17 @@ import terrareg.provider_model
 import terrareg.provider_version_binary_model
 from terrareg.errors import (
     InvalidChecksumFileError, InvalidProviderManifestFileError, InvalidReleaseArtifactChecksumError, MissingReleaseArtifactError, MissingSignureArtifactError,
-    UnableToObtainReleaseSourceError
+    ReleaseArtifactDownloadRejectedError, UnableToObtainReleaseSourceError
 )
 
 
 class ProviderExtractor:
     """Handle extracting data for provider version"""
 
+    # Delay (in seconds) before retrying a failed release artifact download,
+    # which doubles for each subsequent attempt
+    ARTIFACT_DOWNLOAD_RETRY_DELAY = 2
+
     @classmethod
     def obtain_gpg_key(cls,
                        provider: 'terrareg.provider_model.Provider',
@@ -66,20 +73,24 @@ class ProviderExtractor:
 
         return None
 
+    @classmethod
+    def _get_release_artifact_metadata(cls,
+                                       release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata',
+                                       file_name: str) -> 'terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata':
+        """Obtain metadata of release artifact by file name"""
+        for release_artifact in release_metadata.release_artifacts:
+            if release_artifact.name == file_name:
+                return release_artifact
+
+        raise MissingReleaseArtifactError(f"Could not find artifact in metadata: {file_name}")
+
     @classmethod
     def _download_artifact(cls,
                            provider: 'terrareg.provider_model.Provider',
                            release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata',
                            file_name: str) -> bytes:
         """Obtain SHA file content"""
-        artifact = None
-        for release_artifact in release_metadata.release_artifacts:
-            if release_artifact.name == file_name:
-                artifact = release_artifact
-                break
-
-        else:
-            raise MissingReleaseArtifactError(f"Could not find artifact in metadata: {file_name}")
+        artifact = cls._get_release_artifact_metadata(release_metadata=release_metadata, file_name=file_name)
 
         content = provider.repository.get_release_artifact(
             provider=provider,
@@ -106,6 +117,14 @@ class ProviderExtractor:
         self._provider = self._provider_version.provider
         self._repository = self._provider.repository
         self._release_metadata = release_metadata
+        self._artifact_download_timings = {}
+        self._artifact_download_timings_lock = threading.Lock()
+
+    @property
+    def artifact_download_timings(self) -> Dict[str, float]:
+        """Return time, in seconds, taken to download each release artifact"""
+        with self._artifact_download_timings_lock:
+            return dict(self._artifact_download_timings)
 
     def process_version(self):
         """Perform extraction"""
@@ -185,10 +204,12 @@ class ProviderExtractor:
                 if not os.path.isdir(documentation_directory):
                     os.mkdir(documentation_directory)
 
-                    with terrareg.module_extractor.ModuleExtractor._switch_terraform_versions(source_dir):
+                    with terrareg.module_extractor.ModuleExtractor._switch_terraform_versions(source_dir) as terraform_binary:
                         go_env = os.environ.copy()
                         go_env["GOROOT"] = "/usr/local/go"
                         go_env["GOPATH"] = temp_go_package_cache
+                        # Provide terraform binary to tfplugindocs
+                        go_env["PATH"] = os.pathsep.join([os.path.dirname(terraform_binary), go_env.get("PATH", "")])
 
                         # Create documentation directory, if it does not exist
                         if not os.path.isdir(documentation_directory):
@@ -278,31 +299,62 @@ class ProviderExtractor:
                 content=content
             )
 
-    def _process_release_file(self, checksum: str, file_name: str) -> None:
-        """Process file in release"""
-        # Download file
-        content = self._download_artifact(
-            provider=self._provider,
-            release_metadata=self._release_metadata,
-            file_name=file_name
-        )
-        if not content:
-            raise MissingReleaseArtifactError("Invalid artifact file")
-
-        # Verify content against checksum
-        if hashlib.sha256(content).hexdigest() != checksum:
-            raise InvalidReleaseArtifactChecksumError(f"Invalid checksum for {file_name}")
-
-        # Create binary object
-        terrareg.provider_version_binary_model.ProviderVersionBinary.create(
-            provider_version=self._provider_version,
-            name=file_name,
-            checksum=checksum,
-            content=content
-        )
+    def _download_release_file(self,
+                               downloader: Callable[['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata'], Optional[Iterator[bytes]]],
+                               artifact_metadata: 'terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata',
+                               checksum: str,
+                               download_directory: str) -> str:
+        """
+        Stream release artifact to download directory, verifying checksum whilst downloading, returning path to file.
+
+        Failed downloads are retried, unless the artifact does not exist
+        or the download request was rejected.
+        """
+        file_path = os.path.join(download_directory, os.path.basename(artifact_metadata.name))
+        max_attempts = terrareg.config.Config().PROVIDER_ARTIFACT_DOWNLOAD_ATTEMPTS
+        attempt = 0
+        while True:
+            attempt += 1
+            start_time = time.monotonic()
+            try:
+                if (content := downloader(artifact_metadata)) is None:
+                    raise MissingReleaseArtifactError(f"Failed to download artifact file: {artifact_metadata.name}")
+
+                sha256 = hashlib.sha256()
+                size = 0
+                with open(file_path, "wb") as fh:
+                    for chunk in content:
+                        sha256.update(chunk)
+                        fh.write(chunk)
+                        size += len(chunk)
+
+                if not size:
+                    raise MissingReleaseArtifactError("Invalid artifact file")
+
+                # Verify content against checksum
+                if sha256.hexdigest() != checksum:
+                    raise InvalidReleaseArtifactChecksumError(f"Invalid checksum for {artifact_metadata.name}")
+
+            except Exception as exc:
+                if os.path.exists(file_path):
+                    os.unlink(file_path)
+                if isinstance(exc, (MissingReleaseArtifactError, ReleaseArtifactDownloadRejectedError)) or attempt >= max_attempts:
+                    raise
+                print(f"Failed to download release artifact {artifact_metadata.name} (attempt {attempt}/{max_attempts}): {exc}")
+                time.sleep(self.ARTIFACT_DOWNLOAD_RETRY_DELAY * (2 ** (attempt - 1)))
+                continue
+
+            duration = time.monotonic() - start_time
+            with self._artifact_download_timings_lock:
+                self._artifact_download_timings[artifact_metadata.name] = duration
+            print(f"Downloaded release artifact {artifact_metadata.name} ({size} bytes) in {duration:.2f}s")
+            return file_path
 
     def extract_binaries(self) -> None:
-        """Obtain checksum file and download/validate/process each binary"""
+        """
+        Obtain checksum file and download/validate each binary,
+        creating binaries once all have been obtained, uploading them to file storage concurrently
+        """
         shasums = self._download_artifact(
             provider=self._provider,
             release_metadata=self._release_metadata,
@@ -316,6 +368,7 @@ class ProviderExtractor:
         shasum_line_re = re.compile(r"^([a-z0-9]{64})[\t ]+(.*)$")
 
         manifest_file_name = f"{self._provider.full_name}_{self._provider_version.version}_manifest.json"
+        release_files = []
         for line in shasums.decode('utf-8').split("\n"):
             line = line.strip()
 
@@ -330,7 +383,49 @@ class ProviderExtractor:
             file_name = match.group(2)
 
             if file_name != manifest_file_name:
-                self._process_release_file(checksum=checksum, file_name=file_name)
+                release_files.append((checksum, file_name))
+
+        # Obtain artifact metadata and downloader before starting downloads,
+        # as these may access the database, which must not be accessed from worker threads
+        artifacts = [
+            (checksum, self._get_release_artifact_metadata(release_metadata=self._release_metadata, file_name=file_name))
+            for checksum, file_name in release_files
+        ]
+        if not artifacts:
+            return
+        downloader = self._repository.get_release_artifact_downloader(
+            provider=self._provider,
+            release_metadata=self._release_metadata
+        )
+
+        with tempfile.TemporaryDirectory() as download_directory:
+            binaries = []
+            max_workers = min(terrareg.config.Config().PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY, len(artifacts))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='provider-artifact-download') as executor:
+                futures = [
+                    executor.submit(
+                        self._download_release_file,
+                        downloader=downloader,
+                        artifact_metadata=artifact_metadata,
+                        checksum=checksum,
+                        download_directory=download_directory
+                    )
+                    for checksum, artifact_metadata in artifacts
+                ]
+                try:
+                    for itx, ((checksum, artifact_metadata), future) in enumerate(zip(artifacts, futures)):
+                        binaries.append((artifact_metadata.name, checksum, future.result()))
+                        print(f"Obtained release artifact {itx + 1}/{len(artifacts)}: {artifact_metadata.name}")
+                except Exception:
+                    # Avoid starting any further downloads
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+            terrareg.provider_version_binary_model.ProviderVersionBinary.create_many(
+                provider_version=self._provider_version,
+                binaries=binaries
+            )
 
     def extract_manifest_file(self):
         """Extract manifest file"""
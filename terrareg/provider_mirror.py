@@ -0,0 +1,216 @@
+
+from contextlib import contextmanager
+import fcntl
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import List, Tuple
+
+from packaging.version import InvalidVersion
+
+from terrareg.config import Config
+from terrareg.loose_version import LooseVersion
+
+
+class ProviderMirror:
+    """
+    Filesystem mirror of Terraform providers, shared by module extractions.
+
+    The mirror uses the unpacked layout supported by Terraform filesystem mirrors
+    (HOSTNAME/NAMESPACE/TYPE/VERSION/TARGET), which matches the layout of providers
+    installed into the .terraform directory of a module.
+    Providers installed by terraform init are added to the mirror, so that subsequent
+    initialisations of modules, including submodules and examples of the same module
+    version, install providers from the mirror rather than downloading them.
+
+    Providers are copied into a staging directory and renamed into the mirror,
+    so that providers are never partially present in the mirror.
+    Additions to the mirror are serialised using a file lock, and providers that are
+    already being added by another thread of the process are skipped.
+    Old versions of providers and the least recently used providers are removed
+    when the mirror exceeds the maximum number of versions or maximum size.
+    """
+
+    # Minimum time (in seconds) since a provider was last used before it can be removed,
+    # as modules initialised from the mirror link to the provider in the mirror
+    MIN_EVICTION_AGE = 60 * 60
+
+    # Number of directory levels of each provider in the mirror
+    PROVIDER_PATH_DEPTH = 5
+
+    _in_flight_lock = threading.Lock()
+    # Providers that are currently being added to the mirror, by relative path
+    _in_flight = set()
+
+    @classmethod
+    def get(cls) -> 'ProviderMirror':
+        """Return provider mirror"""
+        config = Config()
+        return cls(
+            directory=config.PROVIDER_MIRROR_DIRECTORY,
+            max_size=config.PROVIDER_MIRROR_MAX_SIZE * 1024 * 1024,
+            max_versions=config.PROVIDER_MIRROR_MAX_VERSIONS
+        )
+
+    def __init__(self, directory: str, max_size: int, max_versions: int):
+        """Store member variables"""
+        self._directory = directory
+        self._max_size = max_size
+        self._max_versions = max_versions
+
+    @property
+    def directory(self) -> str:
+        """Return mirror directory"""
+        return self._directory
+
+    @contextmanager
+    def _lock_mirror(self):
+        """
+        Obtain exclusive lock for modifying the mirror.
+
+        The lock file is never removed, as processes waiting for a removed
+        lock file would not exclude processes using a new lock file.
+        """
+        os.makedirs(self._directory, exist_ok=True)
+        with open(os.path.join(self._directory, '.mirror.lock'), 'a') as lock_fh:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    def _get_provider_paths(self, directory: str) -> List[str]:
+        """Return relative paths of providers within directory"""
+        provider_paths = []
+        if not os.path.isdir(directory):
+            return provider_paths
+
+        for root, dirs, _ in os.walk(directory):
+            relative_root = os.path.relpath(root, directory)
+            depth = 0 if relative_root == '.' else len(relative_root.split(os.sep))
+            # Ignore hidden directories, such as staging directories
+            dirs[:] = [dir_ for dir_ in dirs if not dir_.startswith('.')]
+            if depth == self.PROVIDER_PATH_DEPTH - 1:
+                provider_paths += [os.path.join(relative_root, dir_) for dir_ in dirs]
+                dirs[:] = []
+        return sorted(provider_paths)
+
+    def add_providers(self, providers_directory: str):
+        """Add providers installed into providers directory of initialised module to the mirror"""
+        mirror_directory = os.path.realpath(self._directory)
+
+        for provider_path in self._get_provider_paths(providers_directory):
+            source_path = os.path.join(providers_directory, provider_path)
+            mirror_path = os.path.join(self._directory, provider_path)
+
+            # Record usage of providers that are already present in the mirror,
+            # which includes providers linked to the mirror by terraform init
+            if os.path.isdir(mirror_path) or os.path.realpath(source_path).startswith(mirror_directory + os.sep):
+                try:
+                    os.utime(mirror_path)
+                except FileNotFoundError:
+                    pass
+                continue
+
+            # Skip providers that are being added by another thread
+            with self._in_flight_lock:
+                if provider_path in self._in_flight:
+                    continue
+                self._in_flight.add(provider_path)
+
+            try:
+                with self._lock_mirror():
+                    self._add_provider(source_path=source_path, provider_path=provider_path)
+            finally:
+                with self._in_flight_lock:
+                    self._in_flight.discard(provider_path)
+
+        with self._lock_mirror():
+            self._evict()
+
+    def _add_provider(self, source_path: str, provider_path: str):
+        """Copy provider into mirror, via staging directory"""
+        mirror_path = os.path.join(self._directory, provider_path)
+        if os.path.isdir(mirror_path):
+            return
+
+        with tempfile.TemporaryDirectory(dir=self._directory, prefix='.staging-') as staging_directory:
+            staging_path = os.path.join(staging_directory, 'provider')
+            shutil.copytree(source_path, staging_path, symlinks=False)
+            os.makedirs(os.path.dirname(mirror_path), exist_ok=True)
+            os.rename(staging_path, mirror_path)
+
+    def _get_size(self, path: str) -> int:
+        """Return total size of files in directory"""
+        size = 0
+        for root, _, files in os.walk(path):
+            for file_ in files:
+                try:
+                    size += os.lstat(os.path.join(root, file_)).st_size
+                except FileNotFoundError:
+                    pass
+        return size
+
+    @staticmethod
+    def _get_version_sort_key(provider_path: str) -> Tuple[int, LooseVersion]:
+        """Return sort key of version of provider, ordering invalid versions first"""
+        try:
+            return (1, LooseVersion(provider_path.split(os.sep)[3]))
+        except InvalidVersion:
+            return (0, LooseVersion('0'))
+
+    def _remove_provider(self, provider_path: str):
+        """Remove provider from mirror, along with any parent directories that become empty"""
+        shutil.rmtree(os.path.join(self._directory, provider_path), ignore_errors=True)
+
+        parent_path = os.path.dirname(provider_path)
+        while parent_path:
+            try:
+                os.rmdir(os.path.join(self._directory, parent_path))
+            except OSError:
+                break
+            parent_path = os.path.dirname(parent_path)
+
+    def _evict(self):
+        """Remove old versions of providers and least recently used providers, exceeding the limits of the mirror"""
+        now = time.time()
+        providers = []
+        for provider_path in self._get_provider_paths(self._directory):
+            path = os.path.join(self._directory, provider_path)
+            try:
+                providers.append((os.stat(path).st_mtime, provider_path, self._get_size(path)))
+            except FileNotFoundError:
+                pass
+
+        def is_evictable(mtime: float) -> bool:
+            """Return whether provider was last used long enough ago to be removed"""
+            # Recently used providers are retained, as they may be linked to by modules being extracted
+            return now - mtime >= self.MIN_EVICTION_AGE
+
+        to_remove = set()
+
+        # Remove oldest versions of each provider and target, exceeding the maximum number of versions
+        versions_by_provider = {}
+        for provider in providers:
+            parts = provider[1].split(os.sep)
+            versions_by_provider.setdefault((*parts[:3], parts[4]), []).append(provider)
+        for provider_versions in versions_by_provider.values():
+            provider_versions.sort(key=lambda provider: self._get_version_sort_key(provider[1]), reverse=True)
+            for mtime, provider_path, _ in provider_versions[self._max_versions:]:
+                if is_evictable(mtime):
+                    to_remove.add(provider_path)
+
+        # Remove least recently used providers, until mirror is within maximum size
+        total_size = sum(size for _, provider_path, size in providers if provider_path not in to_remove)
+        for mtime, provider_path, size in sorted(providers):
+            if total_size <= self._max_size:
+                break
+            if provider_path in to_remove or not is_evictable(mtime):
+                continue
+            to_remove.add(provider_path)
+            total_size -= size
+
+        for provider_path in sorted(to_remove):
+            self._remove_provider(provider_path)
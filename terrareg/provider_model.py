@@ -11,6 +11,7 @@ from typing import Optional, Union, List
 import sqlalchemy
 
 import terrareg.database
+import terrareg.identity_map
 from terrareg.errors import (
     CouldNotFindGpgKeyForProviderVersionError, DuplicateProviderError, InvalidModuleProviderNameError,
     InvalidRepositoryNameError, MissingSignureArtifactError, NoGithubAppInstallationError,
@@ -28,7 +29,7 @@ import terrareg.provider_category_model
 import terrareg.provider_version_model
 import terrareg.provider_extractor
 import terrareg.utils
-from terrareg.loose_version import LooseVersion
+from terrareg.version_sort_key import VersionSortKey
 
 
 class Provider:
@@ -265,9 +266,7 @@ class Provider:
                 db.namespace.c.id == self._namespace.pk,
                 db.provider.c.name == self.name
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            self._cache_db_row = terrareg.identity_map.IdentityMap.get_db_row(('provider', self._namespace.pk, self.name), select)
 
         return self._cache_db_row
 
@@ -281,45 +280,43 @@ class Provider:
         """Return list of all provider versions"""
         db = terrareg.database.Database.get()
         select = sqlalchemy.select(
-            db.provider_version.c.version
+            db.provider_version.c.version,
+            db.provider_version.c.version_major,
+            db.provider_version.c.version_minor,
+            db.provider_version.c.version_patch,
+            db.provider_version.c.version_prerelease
         ).where(
             db.provider_version.c.provider_id==self.pk
         )
         with db.get_connection() as conn:
             rows = conn.execute(select).all()
-        return sorted([
+        rows.sort(key=VersionSortKey.get_key, reverse=True)
+        return [
             terrareg.provider_version_model.ProviderVersion(provider=self, version=row["version"])
             for row in rows
-        ], reverse=True)
+        ]
 
 
     def calculate_latest_version(self):
-        """Obtain all versions of provider and sort by semantic version numbers to obtain latest version."""
+        """Obtain latest non-beta version of provider, by semantic version."""
         db = terrareg.database.Database.get()
         select = sqlalchemy.select(
             db.provider_version.c.version
-        ).join(
-            db.provider,
-            db.provider_version.c.provider_id==db.provider.c.id
         ).where(
-            db.provider.c.id==self.pk,
+            db.provider_version.c.provider_id==self.pk,
             db.provider_version.c.beta==False
-        )
+        ).order_by(
+            *VersionSortKey.get_order_by(db.provider_version)
+        ).limit(1)
         with db.get_connection() as conn:
-            res = conn.execute(select)
-
-            # Convert to list
-            rows = [r for r in res]
-
-        # Sort rows by semantic versioning
-        rows.sort(key=lambda x: LooseVersion(x['version']), reverse=True)
+            row = conn.execute(select).first()
 
         # Ensure at least one row
-        if not rows:
+        if not row:
             return None
 
         # Obtain latest row
-        return terrareg.provider_version_model.ProviderVersion(provider=self, version=rows[0]['version'])
+        return terrareg.provider_version_model.ProviderVersion(provider=self, version=row['version'])
 
     def index_version(self, version: str) -> 'terrareg.provider_version_model.ProviderVersion':
         """Index single version of a provider and create new provider version"""
@@ -1,5 +1,5 @@
 
-from typing import Dict, Union, List, Tuple, Optional
+from typing import Callable, Dict, Iterator, Union, List, Tuple, Optional
 import json
 
 import terrareg.database
@@ -88,6 +88,19 @@ class BaseProviderSource:
         """Return release artifact file content"""
         raise NotImplementedError
 
+    def get_release_artifact_downloader(self,
+                                        provider: 'terrareg.provider_model.Provider',
+                                        release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata'
+                                        ) -> Callable[['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata'], Optional[Iterator[bytes]]]:
+        """
+        Return function that downloads release artifacts, returning an iterator of chunks of the artifact content,
+        or None if the artifact does not exist.
+
+        Any database access is performed when obtaining the downloader,
+        so that the downloader can be called from worker threads.
+        """
+        raise NotImplementedError
+
     def get_release_archive(self,
                             provider: 'terrareg.provider_model.Provider',
                             release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata') -> Tuple[Union[bytes, None], Union[None, str]]:
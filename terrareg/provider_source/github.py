@@ -1,7 +1,7 @@
 
 import os
 import time
-from typing import Dict, Union, List, Tuple, Optional
+from typing import Callable, Dict, Iterator, Union, List, Tuple, Optional
 from urllib.parse import parse_qs
 
 from cryptography.hazmat.primitives import serialization
@@ -10,8 +10,9 @@ import jwt
 
 import requests
 
-from terrareg.errors import GithubEntityDoesNotExistError, InvalidGithubAppMetadataError, InvalidProviderSourceConfigError, ProviderSourceDefaultAccessTokenNotConfiguredError, UnableToGenerateGithubInstallationAccessTokenError
+from terrareg.errors import GithubEntityDoesNotExistError, InvalidGithubAppMetadataError, InvalidProviderSourceConfigError, ProviderSourceDefaultAccessTokenNotConfiguredError, ReleaseArtifactDownloadError, ReleaseArtifactDownloadRejectedError, UnableToGenerateGithubInstallationAccessTokenError
 from .base import BaseProviderSource
+from .github_api_client import GithubApiClient
 import terrareg.provider_source_type
 import terrareg.repository_model
 import terrareg.provider_version_model
@@ -56,6 +57,11 @@ class GithubProviderSource(BaseProviderSource):
         super().__init__(*args, **kwargs)
         self._private_key_content = None
 
+    @property
+    def _api_client(self) -> GithubApiClient:
+        """Return client for requests to Github"""
+        return GithubApiClient.get_shared()
+
     @property
     def _client_id(self) -> Union[None, str]:
         """Return client ID"""
@@ -129,7 +135,7 @@ class GithubProviderSource(BaseProviderSource):
         if not code:
             return None
 
-        res = requests.post(
+        res = self._api_client.post(
             f"{self._base_url}/login/oauth/access_token",
             data={
                 "client_id": self._client_id,
@@ -147,7 +153,7 @@ class GithubProviderSource(BaseProviderSource):
         if not access_token:
             return None
 
-        res = requests.get(
+        res = self._api_client.get(
             f"{self._api_url}/user",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -163,7 +169,7 @@ class GithubProviderSource(BaseProviderSource):
         if not access_token:
             return []
 
-        res = requests.get(
+        res = self._api_client.get(
             f"{self._api_url}/user/memberships/orgs",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -210,7 +216,7 @@ class GithubProviderSource(BaseProviderSource):
         """Refresh list of repositories"""
         page = 1
         while True:
-            res = requests.get(
+            res = self._api_client.get(
                 f"{self._api_url}/user/repos",
                 params={
                     "visibility": "public",
@@ -245,7 +251,7 @@ class GithubProviderSource(BaseProviderSource):
                              tag_name: str,
                              access_token: str):
         """Return commit hash for tag name"""
-        res = requests.get(
+        res = self._api_client.get(
             f"{self._api_url}/repos/{repository.owner}/{repository.name}/git/ref/tags/{tag_name}",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -324,7 +330,7 @@ class GithubProviderSource(BaseProviderSource):
 
         # Obtain release ID
         repository = provider.repository
-        release_res = requests.get(
+        release_res = self._api_client.get(
             f"{self._api_url}/repos/{repository.owner}/{repository.name}/releases/tags/{tag}",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -365,7 +371,7 @@ class GithubProviderSource(BaseProviderSource):
         access_token = self._get_access_token_for_provider(provider=provider)
 
         while obtain_results:
-            res = requests.get(
+            res = self._api_client.get(
                 f"{self._api_url}/repos/{repository.owner}/{repository.name}/releases",
                 params={
                     "per_page": "100",
@@ -408,7 +414,7 @@ class GithubProviderSource(BaseProviderSource):
     def _get_release_artifacts_metadata(self, repository: 'terrareg.repository_model.Repository',
                                         release_id: int, access_token: str) -> List['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata']:
         """Obtain list of release artifact metadata for a given release"""
-        res = requests.get(
+        res = self._api_client.get(
             f"{self._api_url}/repos/{repository.owner}/{repository.name}/releases/{release_id}/assets",
             params={
                 "per_page": "100",
@@ -434,30 +440,64 @@ class GithubProviderSource(BaseProviderSource):
             if asset.get("name") and asset.get("id")
         ]
 
+    # Size of chunks yielded when downloading release artifacts
+    ARTIFACT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
     def get_release_artifact(self,
                              provider: 'terrareg.provider_model.Provider',
                              artifact_metadata: 'terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata',
                              release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata') -> str:
         """Return release artifact file content"""
-        repository = provider.repository
+        content = self.get_release_artifact_downloader(provider=provider, release_metadata=release_metadata)(artifact_metadata)
+        if content is None:
+            return None
+        return b"".join(content) or None
 
+    def get_release_artifact_downloader(self,
+                                        provider: 'terrareg.provider_model.Provider',
+                                        release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata'
+                                        ) -> Callable[['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata'], Optional[Iterator[bytes]]]:
+        """Return function that streams release artifacts from Github"""
+        repository = provider.repository
+        assets_url = f"{self._api_url}/repos/{repository.owner}/{repository.name}/releases/assets"
         access_token = self._get_access_token_for_provider(provider=provider)
-        if not access_token:
-            return None
 
-        res = requests.get(
-            f"{self._api_url}/repos/{repository.owner}/{repository.name}/releases/assets/{artifact_metadata.provider_id}",
-            headers={
-                "X-GitHub-Api-Version": "2022-11-28",
-                "Accept": "application/octet-stream",
-                "Authorization": f"Bearer {access_token}"
-            },
-            allow_redirects=True
-        )
-        if res.status_code == 404:
-            print("get_release_artifact returned 404")
-            return None
-        return res.content
+        def iter_response_content(res: requests.Response) -> Iterator[bytes]:
+            """Yield chunks of response content, closing response once complete"""
+            with res:
+                yield from res.iter_content(chunk_size=self.ARTIFACT_DOWNLOAD_CHUNK_SIZE)
+
+        def download_artifact(artifact_metadata: 'terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata') -> Optional[Iterator[bytes]]:
+            """Download release artifact, returning iterator of content"""
+            if not access_token:
+                return None
+
+            res = self._api_client.get(
+                f"{assets_url}/{artifact_metadata.provider_id}",
+                headers={
+                    "X-GitHub-Api-Version": "2022-11-28",
+                    "Accept": "application/octet-stream",
+                    "Authorization": f"Bearer {access_token}"
+                },
+                allow_redirects=True,
+                stream=True
+            )
+            if res.status_code == 404:
+                res.close()
+                print("get_release_artifact returned 404")
+                return None
+            if res.status_code >= 400:
+                res.close()
+                # Only timeouts, rate limits and server errors may succeed if retried
+                error_class = (
+                    ReleaseArtifactDownloadError
+                    if res.status_code in (408, 429) or res.status_code >= 500 else
+                    ReleaseArtifactDownloadRejectedError
+                )
+                raise error_class(f"Failed to download release artifact {artifact_metadata.name}: Github returned {res.status_code}")
+            return iter_response_content(res)
+
+        return download_artifact
 
     def get_release_archive(self,
                             provider: 'terrareg.provider_model.Provider',
@@ -471,19 +511,22 @@ class GithubProviderSource(BaseProviderSource):
         if not access_token:
             return None, archive_id
 
-        res = requests.get(
+        res = self._api_client.get(
             f"{self._api_url}/repos/{repository.owner}/{repository.name}/tarball/{release_metadata.tag}",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
                 "Accept": "application/json",
                 "Authorization": f"Bearer {access_token}"
             },
-            allow_redirects=True
+            allow_redirects=True,
+            stream=True
         )
-        if res.status_code == 404:
-            print("get_release_artifact returned 404")
-        else:
-            content = res.content
+        with res:
+            if res.status_code == 404:
+                print("get_release_artifact returned 404")
+            else:
+                # Stream archive, so that it is not retained by the API client cache
+                content = b"".join(res.iter_content(chunk_size=self.ARTIFACT_DOWNLOAD_CHUNK_SIZE))
 
         return content, archive_id
 
@@ -504,7 +547,7 @@ class GithubProviderSource(BaseProviderSource):
 
         if installation_id not in self.__class__.INSTALLATION_ID_TOKENS:
 
-            res = requests.post(
+            res = self._api_client.post(
                 f"{self._api_url}/app/installations/{installation_id}/access_tokens",
                 headers={
                     "X-GitHub-Api-Version": "2022-11-28",
@@ -543,7 +586,7 @@ class GithubProviderSource(BaseProviderSource):
 
     def _get_app_metadata(self) -> dict:
         """Return app metadata"""
-        res = requests.get(
+        res = self._api_client.get(
             f"{self._api_url}/app",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -572,7 +615,7 @@ class GithubProviderSource(BaseProviderSource):
             # Otherwise is namespace is not based on a github user/org, return None
             return None
 
-        res = requests.get(
+        res = self._api_client.get(
             url,
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -591,7 +634,7 @@ class GithubProviderSource(BaseProviderSource):
 
     def _is_entity_org_or_user(self, identity: str, access_token: str):
         """Determine if an entity is a user or organisation"""
-        res = requests.get(
+        res = self._api_client.get(
             f"{self._api_url}/users/{identity}",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -625,7 +668,7 @@ class GithubProviderSource(BaseProviderSource):
 
         page = 1
         while True:
-            res = requests.get(
+            res = self._api_client.get(
                 url,
                 params={
                     "sort": "created",
@@ -0,0 +1,281 @@
+
+import collections
+import hashlib
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+import requests.adapters
+import requests.structures
+
+from terrareg.config import Config
+
+
+class GithubApiClient:
+    """
+    HTTP client for requests to the Github API, shared by Github provider sources.
+
+    Connections are pooled and kept alive between requests.
+    JSON responses containing an ETag or Last-Modified header are cached, so that
+    subsequent requests are made conditionally and an unchanged (304) response,
+    which does not count against the rate limit, returns the cached response.
+    The cache is bounded by both the number of responses and their total size.
+
+    Requests are delayed whilst the rate limit of the access token is exhausted
+    and requests rejected by the primary or secondary rate limit are retried,
+    provided the wait does not exceed GITHUB_API_MAX_RATE_LIMIT_WAIT.
+    """
+
+    _INSTANCE: Optional['GithubApiClient'] = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    _STATS_LOCK = threading.Lock()
+    # Process-wide request statistics, shared by all clients
+    _STATS: Dict[str, float] = {}
+
+    # Maximum number of times a rate limited request is retried
+    MAX_RATE_LIMIT_RETRIES = 3
+
+    # Maximum size (in bytes) of an individual cached response
+    MAX_CACHED_RESPONSE_SIZE = 1024 * 1024
+
+    @classmethod
+    def get_shared(cls) -> 'GithubApiClient':
+        """Return client shared by all provider sources"""
+        with cls._INSTANCE_LOCK:
+            if cls._INSTANCE is None:
+                config = Config()
+                cls._INSTANCE = cls(
+                    pool_size=config.GITHUB_API_CONNECTION_POOL_SIZE,
+                    cache_size=config.GITHUB_API_CACHE_SIZE,
+                    cache_max_size=config.GITHUB_API_CACHE_MAX_SIZE * 1024 * 1024,
+                    max_rate_limit_wait=config.GITHUB_API_MAX_RATE_LIMIT_WAIT,
+                )
+            return cls._INSTANCE
+
+    @classmethod
+    def reset(cls) -> None:
+        """Close connections of shared client and remove it"""
+        with cls._INSTANCE_LOCK:
+            if cls._INSTANCE is not None:
+                cls._INSTANCE.close()
+            cls._INSTANCE = None
+
+    @classmethod
+    def _record(cls, stat: str, value: float=1) -> None:
+        """Add value to request statistic"""
+        with cls._STATS_LOCK:
+            cls._STATS[stat] = cls._STATS.get(stat, 0) + value
+
+    @classmethod
+    def _set(cls, stat: str, value: float) -> None:
+        """Set value of request statistic"""
+        with cls._STATS_LOCK:
+            cls._STATS[stat] = value
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, float]:
+        """Return copy of request statistics"""
+        with cls._STATS_LOCK:
+            return dict(cls._STATS)
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """Remove all recorded statistics"""
+        with cls._STATS_LOCK:
+            cls._STATS = {}
+
+    def __init__(self, pool_size: int, cache_size: int, cache_max_size: int, max_rate_limit_wait: int):
+        """Create session and store member variables"""
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        self._cache_size = cache_size
+        # Maximum total size (in bytes) of cached responses
+        self._cache_max_size = cache_max_size
+        self._max_rate_limit_wait = max_rate_limit_wait
+
+        self._cache_lock = threading.Lock()
+        # Cached responses, by request, in order of use
+        self._cache: collections.OrderedDict = collections.OrderedDict()
+        # Total size of content of cached responses
+        self._cache_content_size = 0
+
+        self._rate_limit_lock = threading.Lock()
+        # Time at which the exhausted rate limit is reset, by access token
+        self._rate_limit_resets: Dict[str, float] = {}
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self._session.close()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Perform GET request, accepting the same arguments as requests.get"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Perform POST request, accepting the same arguments as requests.post"""
+        return self.request('POST', url, **kwargs)
+
+    @staticmethod
+    def _get_rate_limit_key(headers: Dict[str, str]) -> str:
+        """Return key for the rate limit that a request is counted against, based on the access token"""
+        return hashlib.sha256(headers.get('Authorization', '').encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _get_cache_key(url: str, params: Optional[Dict[str, str]], headers: Dict[str, str], rate_limit_key: str) -> Tuple:
+        """Return key of cached response for a request"""
+        # Responses are cached per access token, since the response
+        # is dependent on the resources available to the token
+        return (url, tuple(sorted((params or {}).items())), headers.get('Accept'), rate_limit_key)
+
+    def _get_cached_response(self, cache_key: Tuple) -> Optional[dict]:
+        """Return cached response, marking it as recently used"""
+        with self._cache_lock:
+            if (cached_response := self._cache.get(cache_key)) is not None:
+                self._cache.move_to_end(cache_key)
+            return cached_response
+
+    def _cache_response(self, cache_key: Tuple, response: requests.Response) -> None:
+        """Cache JSON response, if it can be validated by a conditional request and is within the size limits"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        # Only cache API responses, rather than archives or other downloads
+        if 'json' not in response.headers.get('Content-Type', ''):
+            return
+
+        content = response.content
+        if len(content) > min(self.MAX_CACHED_RESPONSE_SIZE, self._cache_max_size):
+            return
+
+        with self._cache_lock:
+            if (previous_response := self._cache.pop(cache_key, None)) is not None:
+                self._cache_content_size -= len(previous_response['content'])
+            self._cache[cache_key] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': dict(response.headers),
+                'content': content,
+                'encoding': response.encoding,
+            }
+            self._cache_content_size += len(content)
+            while len(self._cache) > self._cache_size or self._cache_content_size > self._cache_max_size:
+                _, removed_response = self._cache.popitem(last=False)
+                self._cache_content_size -= len(removed_response['content'])
+
+    @staticmethod
+    def _build_cached_response(cached_response: dict, not_modified_response: requests.Response) -> requests.Response:
+        """Return response containing cached content, for a not modified response"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = requests.structures.CaseInsensitiveDict(cached_response['headers'])
+        # Use rate limit headers from latest response
+        response.headers.update(not_modified_response.headers)
+        response._content = cached_response['content']
+        response.encoding = cached_response['encoding']
+        response.url = not_modified_response.url
+        response.request = not_modified_response.request
+        response.elapsed = not_modified_response.elapsed
+        not_modified_response.close()
+        return response
+
+    def _update_rate_limit(self, rate_limit_key: str, response: requests.Response) -> None:
+        """Store reset time of rate limit, if the response indicates the rate limit has been exhausted"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        if remaining.isdigit():
+            self._set('rate_limit_remaining', int(remaining))
+
+        with self._rate_limit_lock:
+            reset = response.headers.get('X-RateLimit-Reset', '')
+            if remaining == '0' and reset.isdigit():
+                self._rate_limit_resets[rate_limit_key] = float(reset)
+            else:
+                self._rate_limit_resets.pop(rate_limit_key, None)
+
+    def _get_rate_limit_wait(self, rate_limit_key: str) -> float:
+        """Return time until exhausted rate limit of access token is reset"""
+        with self._rate_limit_lock:
+            reset = self._rate_limit_resets.get(rate_limit_key)
+        if reset is None:
+            return 0
+        return max(reset - time.time(), 0)
+
+    def _get_retry_wait(self, rate_limit_key: str, response: requests.Response) -> Optional[float]:
+        """Return time to wait before retrying a request, if it was rejected by a rate limit"""
+        if response.status_code not in (403, 429):
+            return None
+
+        # Secondary rate limits provide the time to wait
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return float(retry_after)
+
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            return self._get_rate_limit_wait(rate_limit_key)
+
+        # Otherwise, the request was forbidden
+        return None
+
+    def _wait(self, duration: float) -> bool:
+        """Wait for rate limit, returning False if the wait exceeds the maximum wait"""
+        if duration > self._max_rate_limit_wait:
+            return False
+        self._record('rate_limit_wait_count')
+        self._record('rate_limit_wait_seconds_total', duration)
+        time.sleep(duration)
+        return True
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, str]]=None,
+                headers: Optional[Dict[str, str]]=None, stream: bool=False, **kwargs) -> requests.Response:
+        """Perform request, returning response"""
+        headers = dict(headers or {})
+        rate_limit_key = self._get_rate_limit_key(headers)
+
+        cache_key = None
+        cached_response = None
+        # Streamed responses, such as release artifacts, are not cached
+        if method == 'GET' and not stream and self._cache_size > 0:
+            cache_key = self._get_cache_key(url, params, headers, rate_limit_key)
+            if (cached_response := self._get_cached_response(cache_key)) is not None:
+                if cached_response['etag']:
+                    headers['If-None-Match'] = cached_response['etag']
+                if cached_response['last_modified']:
+                    headers['If-Modified-Since'] = cached_response['last_modified']
+
+        # Wait for exhausted rate limit to be reset, rather than
+        # making a request that will be rejected
+        if wait := self._get_rate_limit_wait(rate_limit_key):
+            self._wait(wait)
+
+        attempt = 0
+        while True:
+            response = self._session.request(method, url, params=params, headers=headers, stream=stream, **kwargs)
+            self._record('request_count')
+            self._update_rate_limit(rate_limit_key, response)
+
+            if (retry_wait := self._get_retry_wait(rate_limit_key, response)) is None:
+                break
+            self._record('rate_limited_count')
+            if attempt >= self.MAX_RATE_LIMIT_RETRIES or not self._wait(retry_wait):
+                print(f"Github API rate limit exceeded for {url}: {response.status_code}")
+                return response
+            response.close()
+            attempt += 1
+
+        if cache_key is not None:
+            if response.status_code == 304 and cached_response is not None:
+                self._record('not_modified_count')
+                return self._build_cached_response(cached_response, response)
+            elif response.status_code == 200:
+                self._cache_response(cache_key, response)
+
+        return response
@@ -2,7 +2,7 @@
 from glob import escape
 import os
 import re
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Tuple
 
 import sqlalchemy
 from terrareg.errors import InvalidProviderBinaryArchitectureError, InvalidProviderBinaryNameError, InvalidProviderBinaryOperatingSystemError, ProviderVersionBinaryAlreadyExistsError
@@ -22,8 +22,12 @@ class ProviderVersionBinary:
                provider_version: 'terrareg.provider_version_model.ProviderVersion',
                name: str,
                checksum: str,
-               content: bytes) -> Union[None, 'ProviderVersionBinary']:
-        """Create provider version document"""
+               content: Optional[bytes]) -> Union[None, 'ProviderVersionBinary']:
+        """
+        Create provider version binary.
+
+        If content is not provided, the binary file must be stored separately (see create_many).
+        """
         # Extract OS and arch from name and ensure filename matches an expected type
         name_re = re.compile(
             # terraform-provider-jmon_2.1.1_linux_386.zip
@@ -64,10 +68,34 @@ class ProviderVersionBinary:
 
         # Store binary
         obj = cls(pk=pk)
-        obj.create_local_binary(content=content)
+        if content is not None:
+            obj.create_local_binary(content=content)
 
         return obj
 
+    @classmethod
+    def create_many(cls,
+                    provider_version: 'terrareg.provider_version_model.ProviderVersion',
+                    binaries: List[Tuple[str, str, str]]) -> List['ProviderVersionBinary']:
+        """
+        Create multiple provider version binaries from local files,
+        uploading binary files to file storage concurrently.
+
+        Each binary is a tuple of name, checksum and path of local file.
+        """
+        objs = [
+            cls.create(provider_version=provider_version, name=name, checksum=checksum, content=None)
+            for name, checksum, _ in binaries
+        ]
+
+        file_storage = terrareg.file_storage.FileStorageFactory().get_file_storage()
+        file_storage.make_directory(provider_version.base_directory)
+        file_storage.upload_files([
+            (source_path, provider_version.base_directory, name)
+            for name, _, source_path in binaries
+        ])
+        return objs
+
     @classmethod
     def _insert_db_row(cls,
                        provider_version: 'terrareg.provider_version_model.ProviderVersion',
@@ -14,12 +14,14 @@ from terrareg.errors import InvalidVersionError, ReindexingExistingProviderVersi
 import terrareg.utils
 import terrareg.provider_model
 import terrareg.database
+import terrareg.identity_map
 import terrareg.audit
 import terrareg.audit_action
 import terrareg.models
 import terrareg.provider_version_documentation_model
 import terrareg.provider_version_binary_model
 import terrareg.analytics
+from terrareg.version_sort_key import VersionSortKey
 
 
 class ProviderVersion:
@@ -182,9 +184,7 @@ class ProviderVersion:
                 db.provider.c.id == self._provider.pk,
                 db.provider_version.c.version == self.version
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            self._cache_db_row = terrareg.identity_map.IdentityMap.get_db_row(('provider_version', self._provider.pk, self.version), select)
         return self._cache_db_row
 
     def generate_file_name_from_suffix(self, suffix: str) -> str:
@@ -219,8 +219,8 @@ class ProviderVersion:
         # Calculate latest version will take beta flag into account and will only match
         # the current version if the current version is latest and is capable of being the
         # latest version.
-        if (self._provider.calculate_latest_version() is not None and
-                self._provider.calculate_latest_version().version == self.version):
+        latest_version = self._provider.calculate_latest_version()
+        if latest_version is not None and latest_version.version == self.version:
             self._provider.update_attributes(latest_version_id=self.pk)
             self.update_attributes(published_at=datetime.now())
 
@@ -350,6 +350,7 @@ class ProviderVersion:
                 version=self.version,
                 git_tag=git_tag,
                 beta=self._extracted_beta_flag,
-                gpg_key_id=gpg_key.pk
+                gpg_key_id=gpg_key.pk,
+                **VersionSortKey.get_column_values(self.version)
             )
             conn.execute(insert_statement)
@@ -9,6 +9,7 @@ import terrareg.provider_source.factory
 import terrareg.audit
 import terrareg.audit_action
 import terrareg.database
+import terrareg.identity_map
 import terrareg.repository_kind
 import terrareg.provider_source.repository_release_metadata
 import terrareg.provider_model
@@ -182,9 +183,7 @@ class Repository:
             select = db.repository.select().where(
                 db.repository.c.id==self.pk
             )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._row_cache = res.fetchone()
+            self._row_cache = terrareg.identity_map.IdentityMap.get_db_row(('repository', self.pk), select)
         return self._row_cache
 
     def update_attributes(self, **kwargs):
@@ -233,6 +232,15 @@ class Repository:
             release_metadata=release_metadata
         )
 
+    def get_release_artifact_downloader(self,
+                                        provider: 'terrareg.provider_model.Provider',
+                                        release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata'):
+        """Return function to download release artifacts from provider source, injecting access token"""
+        return self.provider_source.get_release_artifact_downloader(
+            provider=provider,
+            release_metadata=release_metadata
+        )
+
     def get_release_archive(self,
                             provider: 'terrareg.provider_model.Provider',
                             release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata') -> Tuple[Union[bytes, None], Union[None, str]]:
@@ -10,6 +10,9 @@ from waitress import serve
 
 import terrareg.config
 import terrareg.database
+import terrareg.identity_map
+import terrareg.analytics
+import terrareg.module_import_queue
 import terrareg.models
 import terrareg.errors
 import terrareg.auth
@@ -156,8 +159,17 @@ class Server(BaseHandler):
         terrareg.provider_source.factory.ProviderSourceFactory.get().initialise_from_config()
         terrareg.provider_category_model.ProviderCategoryFactory.get().initialise_from_config()
 
+        self._app.after_request(self._add_query_count_header)
+
         self._register_routes()
 
+    @staticmethod
+    def _add_query_count_header(response):
+        """Add header with number of database queries performed by request, if debug is enabled"""
+        if terrareg.config.Config().DEBUG:
+            response.headers['X-Terrareg-Query-Count'] = str(terrareg.identity_map.IdentityMap.get_query_count())
+        return response
+
     def _get_upload_directory(self):
         return os.path.join(terrareg.config.Config().DATA_DIRECTORY, 'upload')
 
@@ -611,6 +623,10 @@ class Server(BaseHandler):
             ApiModuleVersionImport,
             '/v1/terrareg/modules/<string:namespace>/<string:name>/<string:provider>/import'
         )
+        self._api.add_resource(
+            ApiTerraregModuleImportJob,
+            '/v1/terrareg/modules/<string:namespace>/<string:name>/<string:provider>/import-jobs/<int:job_id>'
+        )
         self._api.add_resource(
             ApiModuleVersionSourceDownload,
             '/v1/terrareg/modules/<string:namespace>/<string:name>/<string:provider>/<string:version>/source.zip',
@@ -722,12 +738,18 @@ class Server(BaseHandler):
 
         self._app.secret_key = terrareg.config.Config().SECRET_KEY
 
+        terrareg.analytics.AnalyticsRollup.start_scheduled_compaction()
+        terrareg.module_import_queue.ModuleImportQueue.start_workers(app=self._app)
+
         self._app.run(**kwargs)
 
     def run_waitress(self):
         """Run waitress server"""
         self._app.secret_key = terrareg.config.Config().SECRET_KEY
 
+        terrareg.analytics.AnalyticsRollup.start_scheduled_compaction()
+        terrareg.module_import_queue.ModuleImportQueue.start_workers(app=self._app)
+
         serve(self._app, host=self.host, port=self.port)
 
     def _namespace_404(self, namespace_name: str):
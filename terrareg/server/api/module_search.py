@@ -79,7 +79,9 @@ class ApiModuleSearch(ErrorCatchingResource):
             verified=args.verified,
             namespace_trust_filters=namespace_trust_filters,
             offset=args.offset,
-            limit=args.limit
+            limit=args.limit,
+            # Module details are required to determine compatibility with Terraform version
+            include_module_details=args.target_terraform_version is not None
         )
 
         res = {
@@ -10,6 +10,7 @@ import terrareg.database
 import terrareg.config
 import terrareg.models
 import terrareg.module_extractor
+import terrareg.module_import_queue
 import terrareg.errors
 
 
@@ -50,6 +51,7 @@ class ApiModuleVersionCreateBitBucketHook(ErrorCatchingResource):
             if not ('changes' in bitbucket_data and type(bitbucket_data['changes']) == list):
                 return {'message': 'List of changes not found in payload'}, 400
 
+            module_import_queue = terrareg.module_import_queue.ModuleImportQueue.get()
             imported_versions = {}
             error = False
 
@@ -82,6 +84,15 @@ class ApiModuleVersionCreateBitBucketHook(ErrorCatchingResource):
                 if not version:
                     continue
 
+                # Queue import from git, if enabled
+                if module_import_queue is not None:
+                    job = module_import_queue.enqueue(module_provider=module_provider, version=version)
+                    imported_versions[version] = {
+                        'status': 'Queued',
+                        'job_id': job.pk
+                    }
+                    continue
+
                 # Create module version
                 module_version = terrareg.models.ModuleVersion(module_provider=module_provider, version=version)
 
@@ -114,6 +125,12 @@ class ApiModuleVersionCreateBitBucketHook(ErrorCatchingResource):
                     'message': 'One or more tags failed to import',
                     'tags': imported_versions
                 }, 500
+            if module_import_queue is not None:
+                return {
+                    'status': 'Queued',
+                    'message': 'Queued import of all provided tags',
+                    'tags': imported_versions
+                }, 202
             return {
                 'status': 'Success',
                 'message': 'Imported all provided tags',
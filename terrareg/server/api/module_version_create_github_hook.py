@@ -10,6 +10,7 @@ import terrareg.database
 import terrareg.config
 import terrareg.models
 import terrareg.module_extractor
+import terrareg.module_import_queue
 import terrareg.errors
 
 
@@ -82,6 +83,15 @@ class ApiModuleVersionCreateGitHubHook(ErrorCatchingResource):
                 return {
                     'status': 'Success'
                 }
+            elif (module_import_queue := terrareg.module_import_queue.ModuleImportQueue.get()) is not None:
+                # Queue import from git
+                job = module_import_queue.enqueue(module_provider=module_provider, version=version)
+                return {
+                    'status': 'Queued',
+                    'message': 'Queued import of provided tag',
+                    'tag': tag_ref,
+                    'job_id': job.pk
+                }, 202
             else:
                 # Perform import from git
                 try:
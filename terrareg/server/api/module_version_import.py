@@ -6,6 +6,7 @@ import terrareg.auth_wrapper
 import terrareg.models
 import terrareg.database
 import terrareg.module_extractor
+import terrareg.module_import_queue
 
 
 class ApiModuleVersionImport(ErrorCatchingResource):
@@ -76,6 +77,14 @@ class ApiModuleVersionImport(ErrorCatchingResource):
                                 'Ensure it matches the git_tag_format template for this module provider'
                     }, 400
 
+            # Queue import, if enabled
+            if (module_import_queue := terrareg.module_import_queue.ModuleImportQueue.get()) is not None:
+                job = module_import_queue.enqueue(module_provider=module_provider, version=version)
+                return {
+                    'status': 'Queued',
+                    'job_id': job.pk
+                }, 202
+
             module_version = terrareg.models.ModuleVersion(module_provider=module_provider, version=version)
 
             with module_version.module_create_extraction_wrapper():
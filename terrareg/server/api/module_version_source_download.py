@@ -43,8 +43,50 @@ class ApiModuleVersionSourceDownload(ErrorCatchingResource):
             return error
 
         file_storage = terrareg.file_storage.FileStorageFactory().get_file_storage()
-        return flask.send_file(
-            file_storage.read_file(os.path.join(module_version.base_directory, module_version.archive_name_zip), bytes_mode=True),
-            download_name=module_version.archive_name_zip,
-            mimetype='application/zip'
+        archive_path = os.path.join(module_version.base_directory, module_version.archive_name_zip)
+
+        # Redirect to storage backend, if supported
+        if config.S3_PRESIGNED_DOWNLOAD_REDIRECT:
+            presigned_url = file_storage.get_presigned_download_url(
+                archive_path,
+                expiry=config.S3_PRESIGNED_DOWNLOAD_EXPIRY_SECONDS,
+                download_name=module_version.archive_name_zip
+            )
+            if presigned_url:
+                return flask.redirect(presigned_url)
+
+        file_details = file_storage.get_file_details(archive_path)
+        if file_details is None:
+            return {'message': 'Module version source archive does not exist'}, 404
+
+        if flask.request.if_none_match.contains_weak(file_details.etag):
+            response = flask.Response(status=304)
+            response.set_etag(file_details.etag)
+            return response
+
+        status = 200
+        start, end = 0, file_details.size
+        # Only honour range if If-Range matches the current ETag
+        if_range = flask.request.if_range
+        if flask.request.range and ((if_range.etag is None and if_range.date is None) or if_range.etag == file_details.etag):
+            byte_range = flask.request.range.range_for_length(file_details.size)
+            if byte_range is None:
+                response = flask.Response(status=416)
+                response.headers['Content-Range'] = f'bytes */{file_details.size}'
+                return response
+            start, end = byte_range
+            status = 206
+
+        response = flask.Response(
+            file_storage.stream_file(archive_path, start=start, end=end),
+            status=status,
+            mimetype='application/zip',
+            direct_passthrough=True
         )
+        response.content_length = end - start
+        if status == 206:
+            response.headers['Content-Range'] = f'bytes {start}-{end - 1}/{file_details.size}'
+        response.set_etag(file_details.etag)
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.headers['Content-Disposition'] = f'inline; filename={module_version.archive_name_zip}'
+        return response
@@ -13,7 +13,6 @@ class ApiTerraregInitialSetupData(ErrorCatchingResource):
         """Return information for steps for setting up Terrareg."""
         # Get first namespace, if present
         namespace = None
-        module = None
         module_provider = None
         namespaces = terrareg.models.Namespace.get_all(only_published=False).rows
         version = None
@@ -21,13 +20,9 @@ class ApiTerraregInitialSetupData(ErrorCatchingResource):
         if namespaces:
             namespace = namespaces[0]
         if namespace:
-            modules = namespace.get_all_modules()
-            if modules:
-                module = modules[0]
-        if module:
-            providers = module.get_providers()
-            if providers:
-                module_provider = providers[0]
+            module_providers = namespace.get_module_providers(limit=1).rows
+            if module_providers:
+                module_provider = module_providers[0]
                 integrations = module_provider.get_integrations()
 
         if module_provider:
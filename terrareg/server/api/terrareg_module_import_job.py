@@ -0,0 +1,21 @@
+from terrareg.server.error_catching_resource import ErrorCatchingResource
+import terrareg.auth_wrapper
+import terrareg.module_import_queue
+
+
+class ApiTerraregModuleImportJob(ErrorCatchingResource):
+    """Provide interface to obtain status of queued module version import."""
+
+    method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')]
+
+    def _get(self, namespace, name, provider, job_id):
+        """Return details of module import job."""
+        _, _, module_provider, error = self.get_module_provider_by_names(namespace, name, provider)
+        if error:
+            return error
+
+        job = terrareg.module_import_queue.ModuleImportJob.get(job_id=job_id)
+        if job is None or job.module_provider_id != module_provider.pk:
+            return {'message': 'Module import job does not exist'}, 404
+
+        return job.get_api_outline()
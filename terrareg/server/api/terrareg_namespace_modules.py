@@ -30,27 +30,14 @@ class ApiTerraregNamespaceModules(ErrorCatchingResource):
         if namespace_obj is None:
             return self._get_404_response()
 
-        module_providers = [
-            module_provider
-            for module in namespace_obj.get_all_modules()
-            for module_provider in module.get_providers()
-        ]
-
-        meta = {
-            'limit': args.limit,
-            'current_offset': args.offset
-        }
-        if len(module_providers) > (args.offset + args.limit):
-            meta['next_offset'] = (args.offset + args.limit)
-        if args.offset > 0:
-            meta['prev_offset'] = max(args.offset - args.limit, 0)
+        module_providers = namespace_obj.get_module_providers(offset=args.offset, limit=args.limit)
 
         return {
-            "meta": meta,
+            "meta": module_providers.meta,
             "modules": [
                 module_provider.get_api_outline()
-                if module_provider.get_latest_version() is None else
-                module_provider.get_latest_version().get_api_outline()
-                for module_provider in module_providers[args.offset:args.offset + args.limit]
+                if (latest_version := module_provider.get_latest_version()) is None else
+                latest_version.get_api_outline()
+                for module_provider in module_providers.rows
             ]
         }
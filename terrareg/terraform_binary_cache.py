@@ -0,0 +1,119 @@
+
+from contextlib import contextmanager
+import fcntl
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, List
+
+from terrareg.config import Config
+import terrareg.terraform_product
+
+
+class TerraformBinaryCache:
+    """
+    Local cache of Terraform/OpenTofu binaries, containing one binary for each version.
+
+    tfswitch resolves the version required by a module and installs it into the cache,
+    only downloading versions that are not already present.
+    Each caller is provided with its own hard link to the binary of the resolved version,
+    so that Terraform can be run concurrently for modules that require different versions
+    and binaries remain available whilst in use, if the version is removed from the cache.
+
+    Installation of versions is locked using a file lock, so that concurrent first-time
+    downloads across threads and processes sharing the cache directory are safe.
+    The least recently used versions are removed when the cache exceeds the maximum
+    number of versions.
+    """
+
+    # Directory that tfswitch installs versions into, within the install directory
+    VERSIONS_DIRECTORY = '.terraform.versions'
+
+    @classmethod
+    def get(cls) -> 'TerraformBinaryCache':
+        """Return binary cache"""
+        config = Config()
+        return cls(directory=config.TERRAFORM_BINARY_CACHE_DIRECTORY, max_versions=config.TERRAFORM_BINARY_CACHE_MAX_VERSIONS)
+
+    def __init__(self, directory: str, max_versions: int):
+        """Store member variables"""
+        self._directory = directory
+        self._max_versions = max_versions
+
+    @property
+    def versions_directory(self) -> str:
+        """Return directory containing binary for each version"""
+        return os.path.join(self._directory, self.VERSIONS_DIRECTORY)
+
+    @contextmanager
+    def _lock_install(self):
+        """
+        Obtain exclusive lock for installing versions.
+
+        The lock file is never removed, as processes waiting for a removed
+        lock file would not exclude processes using a new lock file.
+        """
+        os.makedirs(self._directory, exist_ok=True)
+        with open(os.path.join(self._directory, 'install.lock'), 'a') as lock_fh:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    @contextmanager
+    def get_binary(self, module_path: str, tfswitch_args: List[str], env: Dict[str, str]):
+        """
+        Install version of Terraform required by module, yielding path to binary.
+
+        Raises subprocess.CalledProcessError if tfswitch fails.
+        """
+        product = terrareg.terraform_product.ProductFactory.get_product()
+
+        # Create binary directory within cache directory, so that binaries can be hard linked
+        os.makedirs(self._directory, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self._directory, prefix='bin-') as binary_directory:
+            binary_path = os.path.join(binary_directory, product.get_executable_name())
+
+            with self._lock_install():
+                subprocess.check_output(
+                    ["tfswitch", "--bin", binary_path, "--install", self._directory, *tfswitch_args],
+                    env=env,
+                    cwd=module_path
+                )
+
+                # Replace symlink to installed version with hard link,
+                # so that the binary is retained if the version is evicted whilst in use
+                if os.path.islink(binary_path):
+                    version_path = os.path.realpath(binary_path)
+                    os.unlink(binary_path)
+                    os.link(version_path, binary_path)
+
+                    # Update modification time of version to record last usage
+                    os.utime(version_path)
+
+                self._evict()
+
+            yield binary_path
+
+    def _evict(self):
+        """Remove least recently used versions until the cache is within the maximum number of versions"""
+        if not os.path.isdir(self.versions_directory):
+            return
+
+        versions = []
+        for entry in os.scandir(self.versions_directory):
+            try:
+                versions.append((entry.stat(follow_symlinks=False).st_mtime, entry.path, entry.is_dir(follow_symlinks=False)))
+            except FileNotFoundError:
+                pass
+
+        for _, path, is_dir in sorted(versions, reverse=True)[self._max_versions:]:
+            if is_dir:
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,228 @@
+
+import re
+from typing import Dict, Iterator, List, Tuple
+
+
+class DotParseError(Exception):
+    """DOT content could not be parsed."""
+
+    pass
+
+
+class DirectedGraph:
+    """
+    Minimal directed multigraph of named nodes.
+
+    Nodes and edges are iterated in the order in which they were added,
+    with edges grouped by source node.
+    """
+
+    def __init__(self):
+        """Setup member variables"""
+        # Number of edges between each pair of nodes, by source and destination node
+        self._adjacency: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def nodes(self) -> List[str]:
+        """Return list of nodes"""
+        return list(self._adjacency)
+
+    @property
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        """Yield source and destination of each edge"""
+        for source, destinations in self._adjacency.items():
+            for destination, count in destinations.items():
+                for _ in range(count):
+                    yield source, destination
+
+    def add_node(self, node: str) -> None:
+        """Add node, if it does not already exist"""
+        if node not in self._adjacency:
+            self._adjacency[node] = {}
+
+    def add_edge(self, source: str, destination: str) -> None:
+        """Add edge between nodes, adding the nodes if they do not exist"""
+        self.add_node(source)
+        self.add_node(destination)
+        self._adjacency[source][destination] = self._adjacency[source].get(destination, 0) + 1
+
+    def remove_node(self, node: str) -> None:
+        """Remove node and all edges to and from the node"""
+        self._adjacency.pop(node, None)
+        for destinations in self._adjacency.values():
+            destinations.pop(node, None)
+
+    def relabel_nodes(self, mapping: Dict[str, str]) -> 'DirectedGraph':
+        """
+        Return copy of graph with nodes renamed using mapping.
+
+        Nodes that are renamed to the same name are merged, retaining the largest
+        number of edges between each pair of the original nodes.
+        """
+        graph = DirectedGraph()
+        for node in self._adjacency:
+            graph.add_node(mapping.get(node, node))
+        for source, destinations in self._adjacency.items():
+            new_source = mapping.get(source, source)
+            for destination, count in destinations.items():
+                new_destination = mapping.get(destination, destination)
+                graph._adjacency[new_source][new_destination] = max(
+                    graph._adjacency[new_source].get(new_destination, 0), count)
+        return graph
+
+
+class DotParser:
+    """
+    Parser for the subset of the DOT language generated by `terraform graph`.
+
+    Node and edge statements, attribute lists, graph attributes and named subgraphs
+    are supported. DotParseError is raised for unsupported syntax, such as ports
+    and anonymous subgraphs.
+    """
+
+    _TOKEN_RE = re.compile(r'''
+        (?P<whitespace>\s+)
+        |(?P<comment>//[^\n]*|\#[^\n]*|/\*.*?\*/)
+        |"(?P<quoted>(?:[^"\\]|\\.)*)"
+        |(?P<id>[A-Za-z_\u0080-\uffff][A-Za-z0-9_\u0080-\uffff]*|-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?))
+        |(?P<edge_op>->|--)
+        |(?P<punctuation>[{}\[\]=;,:])
+    ''', re.VERBOSE | re.DOTALL)
+
+    # Keywords are case-insensitive in DOT
+    _KEYWORDS = {'strict', 'graph', 'digraph', 'subgraph', 'node', 'edge'}
+
+    def __init__(self, content: str):
+        """Tokenise content"""
+        self._tokens = list(self._tokenise(content))
+        self._position = 0
+
+    @classmethod
+    def _tokenise(cls, content: str) -> Iterator[Tuple[str, str]]:
+        """Yield type and value of each token"""
+        position = 0
+        while position < len(content):
+            match = cls._TOKEN_RE.match(content, position)
+            if not match:
+                raise DotParseError(f'Unexpected character at position {position}')
+            position = match.end()
+
+            if match.group('quoted') is not None:
+                # Only escaped quotes are unescaped, as per DOT specification
+                yield 'id', match.group('quoted').replace('\\"', '"')
+            elif (value := match.group('id')) is not None:
+                if value.lower() in cls._KEYWORDS:
+                    yield 'keyword', value.lower()
+                else:
+                    yield 'id', value
+            elif (value := match.group('edge_op')) is not None:
+                yield 'edge_op', value
+            elif (value := match.group('punctuation')) is not None:
+                yield value, value
+
+    def _peek(self) -> Tuple[str, str]:
+        """Return next token, without consuming it"""
+        if self._position >= len(self._tokens):
+            return None, None
+        return self._tokens[self._position]
+
+    def _next(self, expected_type: str=None) -> str:
+        """Consume next token, returning its value"""
+        token_type, value = self._peek()
+        if token_type is None or (expected_type is not None and token_type != expected_type):
+            raise DotParseError(f'Expected {expected_type or "token"}, found {value!r}')
+        self._position += 1
+        return value
+
+    def _skip_attribute_lists(self) -> None:
+        """Consume any attribute lists"""
+        while self._peek()[0] == '[':
+            self._next('[')
+            while self._peek()[0] != ']':
+                self._next('id')
+                if self._peek()[0] == '=':
+                    self._next('=')
+                    self._next('id')
+                if self._peek()[0] in [',', ';']:
+                    self._next()
+            self._next(']')
+
+    def _parse_statements(self, graph: DirectedGraph) -> None:
+        """Parse statements until the end of the current graph or subgraph"""
+        while (token_type := self._peek()[0]) != '}':
+            if token_type == ';':
+                self._next()
+
+            elif token_type == 'keyword':
+                keyword = self._next()
+                if keyword == 'subgraph':
+                    if self._peek()[0] == 'id':
+                        self._next()
+                    self._next('{')
+                    self._parse_statements(graph)
+                    self._next('}')
+                elif keyword in ['graph', 'node', 'edge']:
+                    # Default attributes
+                    self._skip_attribute_lists()
+                else:
+                    raise DotParseError(f'Unexpected keyword {keyword!r}')
+
+            elif token_type == 'id':
+                node = self._next()
+                if self._peek()[0] == '=':
+                    # Graph attribute
+                    self._next('=')
+                    self._next('id')
+                    continue
+
+                # Node or edge statement
+                graph.add_node(node)
+                while self._peek()[0] == 'edge_op':
+                    self._next()
+                    destination = self._next('id')
+                    graph.add_edge(node, destination)
+                    node = destination
+                self._skip_attribute_lists()
+
+            else:
+                raise DotParseError(f'Unsupported statement starting with {self._peek()[1]!r}')
+
+    def parse(self) -> DirectedGraph:
+        """Parse graph"""
+        graph = DirectedGraph()
+        if self._peek() == ('keyword', 'strict'):
+            raise DotParseError('Strict graphs are not supported')
+        if self._next('keyword') not in ['digraph', 'graph']:
+            raise DotParseError('Expected graph')
+        if self._peek()[0] == 'id':
+            self._next()
+        self._next('{')
+        self._parse_statements(graph)
+        self._next('}')
+        if self._peek()[0] is not None:
+            raise DotParseError('Unexpected content after graph')
+        return graph
+
+
+def parse_dot(content: str) -> DirectedGraph:
+    """
+    Parse nodes and edges from DOT graph.
+
+    Graphs are parsed using DotParser, falling back to pygraphviz
+    for graphs that contain syntax that is not supported by DotParser.
+    """
+    try:
+        return DotParser(content).parse()
+    except DotParseError:
+        pass
+
+    # Import pygraphviz only when required, as it is slow to import
+    import pygraphviz
+
+    agraph = pygraphviz.AGraph(content)
+    graph = DirectedGraph()
+    for node in agraph.nodes():
+        graph.add_node(str(node))
+    for source, destination in agraph.edges():
+        graph.add_edge(str(source), str(destination))
+    return graph
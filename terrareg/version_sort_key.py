@@ -0,0 +1,72 @@
+import re
+from typing import Optional
+
+import semantic_version
+import sqlalchemy
+
+
+class VersionSortKey:
+    """
+    Semantic version components of module and provider versions.
+
+    The components are stored in indexed columns alongside the version,
+    allowing versions to be ordered by the database, without
+    loading and parsing all versions of a module/provider.
+    """
+
+    # Match:
+    # - group 1 - major version
+    # - group 2 - minor version
+    # - group 3 - patch version
+    # - group 4 - pre-release (optional)
+    RE_VERSION = re.compile(r'^([0-9]+)\.([0-9]+)\.([0-9]+)(?:-([a-z0-9]+))?$')
+
+    @classmethod
+    def get_column_values(cls, version: str) -> dict:
+        """Return values of version columns for version"""
+        match = cls.RE_VERSION.match(version)
+        if not match:
+            # Versions are validated before being created,
+            # so this only handles pre-existing invalid versions,
+            # which are ordered below all valid versions.
+            return {
+                'version_major': -1,
+                'version_minor': -1,
+                'version_patch': -1,
+                'version_prerelease': None,
+            }
+        return {
+            'version_major': int(match.group(1)),
+            'version_minor': int(match.group(2)),
+            'version_patch': int(match.group(3)),
+            'version_prerelease': match.group(4),
+        }
+
+    @staticmethod
+    def get_order_by(table: sqlalchemy.Table) -> list:
+        """
+        Return clauses to order rows of table from highest to lowest version.
+
+        Pre-release versions are ordered below the associated release,
+        but are not ordered against each other.
+        """
+        return [
+            table.c.version_major.desc(),
+            table.c.version_minor.desc(),
+            table.c.version_patch.desc(),
+            table.c.version_prerelease.is_(None).desc(),
+        ]
+
+    @staticmethod
+    def get_key(row) -> tuple:
+        """Return key for sorting row containing version columns, by semantic version."""
+        prerelease: Optional[str] = row['version_prerelease']
+        return (
+            row['version_major'],
+            row['version_minor'],
+            row['version_patch'],
+            prerelease is None,
+            # Only pre-releases of the same version require parsing
+            # to be compared with each other
+            semantic_version.Version(row['version']) if prerelease is not None else None
+        )
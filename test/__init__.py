@@ -14,6 +14,7 @@ from terrareg.models import (
     ModuleVersion, GitProvider, Submodule, UserGroup, UserGroupNamespacePermission
 )
 from terrareg.database import Database
+from terrareg.module_specs_cache import ModuleSpecsCache
 from terrareg.server import Server
 import terrareg.config
 from terrareg.user_group_namespace_permission_type import UserGroupNamespacePermissionType
@@ -26,6 +27,7 @@ import terrareg.provider_version_documentation_model
 import terrareg.provider_model
 import terrareg.provider_version_model
 import terrareg.provider_tier
+from terrareg.version_sort_key import VersionSortKey
 
 
 @pytest.fixture
@@ -118,6 +120,8 @@ class BaseTest:
         Database.get().get_meta().create_all(Database.get().get_engine())
 
         Database.reset()
+        # Remove cached module specs, as module details IDs are re-used by the new database
+        ModuleSpecsCache.clear()
 
         cls.SERVER = Server()
 
@@ -245,7 +249,8 @@ class BaseTest:
                                 'published_at': datetime.now(),
                                 'internal': False,
                                 'module_details_id': module_details.pk,
-                                'extraction_version': version_data.get('extraction_version', EXTRACTION_VERSION)
+                                'extraction_version': version_data.get('extraction_version', EXTRACTION_VERSION),
+                                **VersionSortKey.get_column_values(version_number)
                             }
 
                             insert = Database.get().module_version.insert().values(
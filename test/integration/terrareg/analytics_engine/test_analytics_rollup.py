@@ -0,0 +1,238 @@
+
+import datetime
+import threading
+from unittest import mock
+
+import pytest
+import sqlalchemy
+
+import terrareg.models
+from terrareg.analytics import AnalyticsEngine, ModuleAnalyticsRollup, ProviderAnalyticsRollup
+from terrareg.database import Database
+from . import AnalyticsIntegrationTest
+
+
+class TestAnalyticsRollup(AnalyticsIntegrationTest):
+    """Test aggregation of analytics into rollup tables."""
+
+    _TEST_ANALYTICS_DATA = {}
+
+    # Timestamps of downloads, relative to current time
+    _DOWNLOAD_AGES = [
+        datetime.timedelta(minutes=1),
+        datetime.timedelta(hours=12),
+        datetime.timedelta(days=6, hours=23),
+        datetime.timedelta(days=7, minutes=-1),
+        datetime.timedelta(days=7, minutes=1),
+        datetime.timedelta(days=7, hours=5),
+        datetime.timedelta(days=20),
+        datetime.timedelta(days=31, seconds=-1),
+        datetime.timedelta(days=31, seconds=1),
+        datetime.timedelta(days=200),
+        datetime.timedelta(days=365, hours=-1),
+        datetime.timedelta(days=365, hours=1),
+        datetime.timedelta(days=900),
+    ]
+
+    _NOW = datetime.datetime(year=2023, month=6, day=15, hour=10, minute=30, second=12)
+
+    def setup_method(self, method):
+        """Remove any existing rollup data"""
+        super(TestAnalyticsRollup, self).setup_method(method)
+        self._delete_rollups()
+
+    def teardown_method(self, method):
+        """Remove any rollup data"""
+        self._delete_rollups()
+        super(TestAnalyticsRollup, self).teardown_method(method)
+
+    @staticmethod
+    def _delete_rollups():
+        """Delete all rollup data"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.analytics_daily_rollup.delete())
+            conn.execute(db.provider_analytics_daily_rollup.delete())
+            conn.execute(db.analytics_rollup_checkpoint.delete())
+
+    @staticmethod
+    def _get_module_provider(name='publishedmodule', provider='testprovider'):
+        """Return test module provider"""
+        namespace = terrareg.models.Namespace.get('testnamespace')
+        module = terrareg.models.Module(namespace, name)
+        return terrareg.models.ModuleProvider.get(module, provider)
+
+    def _record_downloads(self, module_version, ages):
+        """Record download of module version for each of the given ages"""
+        for age in ages:
+            with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now',
+                            mock.MagicMock(return_value=self._NOW - age)):
+                AnalyticsEngine.record_module_version_download(
+                    namespace_name='testnamespace', module_name=module_version.module_provider.module.name,
+                    provider_name=module_version.module_provider.name,
+                    module_version=module_version, terraform_version='1.5.3',
+                    analytics_token='rollup-test', user_agent='Terraform/1.5.3',
+                    auth_token=None
+                )
+
+    def _get_raw_download_stats(self, module_provider):
+        """Return download stats, calculated from analytics table"""
+        db = Database.get()
+        stats = {}
+        for days, name in [(7, 'week'), (31, 'month'), (365, 'year'), (None, 'total')]:
+            select = sqlalchemy.select([sqlalchemy.func.count()]).select_from(db.analytics)
+            select = AnalyticsEngine._join_filter_analytics_table_by_module_provider(
+                db=db, query=select, module_provider=module_provider)
+            if days:
+                select = select.where(db.analytics.c.timestamp >= (self._NOW - datetime.timedelta(days=days)))
+            with db.get_connection() as conn:
+                stats[name] = conn.execute(select).scalar()
+        return stats
+
+    def _get_download_stats(self, module_provider):
+        """Return download stats using rollup"""
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now',
+                        mock.MagicMock(return_value=self._NOW)):
+            return AnalyticsEngine.get_module_provider_download_stats(module_provider)
+
+    def _compact(self, batch_size=10000):
+        """Aggregate module analytics"""
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now',
+                        mock.MagicMock(return_value=self._NOW)):
+            return ModuleAnalyticsRollup.compact_all(batch_size=batch_size)
+
+    @pytest.mark.parametrize('batch_size', [1, 4, 10000])
+    def test_download_stats_match_analytics(self, batch_size):
+        """Test download stats match stats calculated from analytics table, before and after aggregation"""
+        module_provider = self._get_module_provider()
+        module_version = terrareg.models.ModuleVersion.get(module_provider, '1.4.0')
+        other_module_version = terrareg.models.ModuleVersion.get(self._get_module_provider(provider='secondprovider'), '1.0.0')
+        AnalyticsEngine.delete_analytics_for_module_version(module_version)
+        AnalyticsEngine.delete_analytics_for_module_version(other_module_version)
+
+        self._record_downloads(module_version, self._DOWNLOAD_AGES)
+        self._record_downloads(other_module_version, self._DOWNLOAD_AGES[:3])
+
+        expected_stats = {'week': 4, 'month': 8, 'year': 11, 'total': 13}
+        assert self._get_raw_download_stats(module_provider) == expected_stats
+        assert self._get_download_stats(module_provider) == expected_stats
+
+        # Aggregate analytics
+        assert self._compact(batch_size=batch_size) == 16
+        assert self._get_download_stats(module_provider) == expected_stats
+
+        # Ensure additional downloads are counted after aggregation
+        self._record_downloads(module_version, [datetime.timedelta(days=3), datetime.timedelta(days=400)])
+        expected_stats = {'week': 5, 'month': 9, 'year': 12, 'total': 15}
+        assert self._get_raw_download_stats(module_provider) == expected_stats
+        assert self._get_download_stats(module_provider) == expected_stats
+
+        assert self._compact(batch_size=batch_size) == 2
+        assert self._get_download_stats(module_provider) == expected_stats
+        assert self._compact(batch_size=batch_size) == 0
+
+        # Ensure later aggregations update existing rollup rows
+        db = Database.get()
+        with db.get_connection() as conn:
+            rollup_days = conn.execute(sqlalchemy.select(
+                [db.analytics_daily_rollup.c.day]
+            ).where(
+                db.analytics_daily_rollup.c.module_version_id == module_version.pk
+            )).fetchall()
+        assert len(rollup_days) == len(set(rollup_days))
+
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now',
+                        mock.MagicMock(return_value=self._NOW)):
+            assert AnalyticsEngine.get_module_version_total_downloads(module_version) == 15
+            assert AnalyticsEngine.get_module_version_total_downloads(other_module_version) == 3
+
+    def test_delete_analytics_for_module_version(self):
+        """Test deleting analytics removes aggregated download counts"""
+        module_provider = self._get_module_provider()
+        module_version = terrareg.models.ModuleVersion.get(module_provider, '1.4.0')
+        AnalyticsEngine.delete_analytics_for_module_version(module_version)
+
+        self._record_downloads(module_version, self._DOWNLOAD_AGES)
+        self._compact()
+        assert AnalyticsEngine.get_module_version_total_downloads(module_version) == 13
+
+        AnalyticsEngine.delete_analytics_for_module_version(module_version)
+        assert AnalyticsEngine.get_module_version_total_downloads(module_version) == 0
+
+    def test_migrate_analytics_to_new_module_version(self):
+        """Test migrating analytics migrates aggregated download counts"""
+        module_provider = self._get_module_provider()
+        module_version = terrareg.models.ModuleVersion.get(module_provider, '1.4.0')
+        new_module_version = terrareg.models.ModuleVersion.get(module_provider, '1.5.0')
+        AnalyticsEngine.delete_analytics_for_module_version(module_version)
+        AnalyticsEngine.delete_analytics_for_module_version(new_module_version)
+
+        self._record_downloads(module_version, self._DOWNLOAD_AGES)
+        self._compact()
+
+        AnalyticsEngine.migrate_analytics_to_new_module_version(
+            old_version_version_pk=module_version.pk,
+            new_module_version=new_module_version
+        )
+        assert AnalyticsEngine.get_module_version_total_downloads(module_version) == 0
+        assert AnalyticsEngine.get_module_version_total_downloads(new_module_version) == 13
+
+    def test_provider_analytics_rollup(self):
+        """Test aggregation of provider analytics"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.provider_analytics.delete())
+            for age in self._DOWNLOAD_AGES:
+                conn.execute(db.provider_analytics.insert().values(
+                    provider_version_id=1, timestamp=self._NOW - age, terraform_version='1.5.3',
+                    namespace_name='testnamespace', provider_name='testprovider'
+                ))
+
+        intervals = [(7, 'week'), (31, 'month'), (365, 'year'), (None, 'total')]
+        expected_stats = {'week': 4, 'month': 8, 'year': 11, 'total': 13}
+        try:
+            with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now',
+                            mock.MagicMock(return_value=self._NOW)):
+                assert ProviderAnalyticsRollup.get_download_counts(version_id_query=None, intervals=intervals) == expected_stats
+                assert ProviderAnalyticsRollup.compact_all() == 13
+                assert ProviderAnalyticsRollup.get_download_counts(version_id_query=None, intervals=intervals) == expected_stats
+        finally:
+            with db.get_connection() as conn:
+                conn.execute(db.provider_analytics.delete())
+
+    def test_compaction_concurrent_request(self):
+        """Test requests and other threads do not use the transaction of a compaction in progress"""
+        module_version = terrareg.models.ModuleVersion.get(self._get_module_provider(), '1.4.0')
+        AnalyticsEngine.delete_analytics_for_module_version(module_version)
+        self._record_downloads(module_version, self._DOWNLOAD_AGES[:3])
+
+        in_transaction = threading.Event()
+        resume_compaction = threading.Event()
+        compaction_results = []
+
+        def get_datetime_now():
+            """Pause compaction thread, once its transaction has been started"""
+            if threading.current_thread() is compaction_thread:
+                in_transaction.set()
+                assert resume_compaction.wait(timeout=10)
+            return self._NOW
+
+        compaction_thread = threading.Thread(target=lambda: compaction_results.append(ModuleAnalyticsRollup.compact()))
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', side_effect=get_datetime_now):
+            compaction_thread.start()
+            try:
+                assert in_transaction.wait(timeout=10)
+
+                # Ensure compaction transaction is not shared with other threads
+                assert Database.get_current_transaction() is None
+
+                res = self.SERVER._app.test_client().get('/v1/terrareg/namespaces')
+                assert res.status_code == 200
+            finally:
+                resume_compaction.set()
+                compaction_thread.join()
+
+        # Ensure compaction completed and committed
+        assert len(compaction_results) == 1
+        assert compaction_results[0] >= 3
+        assert self._compact() == 0
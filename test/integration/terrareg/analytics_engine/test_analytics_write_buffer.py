@@ -0,0 +1,194 @@
+
+import threading
+from unittest import mock
+
+import pytest
+
+import terrareg.config
+import terrareg.models
+from terrareg.analytics import AnalyticsEngine, AnalyticsWriteBuffer
+from . import AnalyticsIntegrationTest
+
+
+class TestAnalyticsWriteBuffer(AnalyticsIntegrationTest):
+    """Test buffered writing of analytics."""
+
+    _TEST_ANALYTICS_DATA = {}
+
+    def setup_method(self, method):
+        """Reset write buffer before each test"""
+        AnalyticsWriteBuffer.reset()
+        super(TestAnalyticsWriteBuffer, self).setup_method(method)
+
+    def teardown_method(self, method):
+        """Reset write buffer after each test"""
+        AnalyticsWriteBuffer.reset()
+        super(TestAnalyticsWriteBuffer, self).teardown_method(method)
+
+    @staticmethod
+    def _get_module_version():
+        """Return test module version, removing any existing analytics"""
+        namespace = terrareg.models.Namespace.get('testnamespace')
+        module = terrareg.models.Module(namespace, 'publishedmodule')
+        module_provider = terrareg.models.ModuleProvider.get(module, 'testprovider')
+        module_version = terrareg.models.ModuleVersion.get(module_provider, '1.4.0')
+        AnalyticsEngine.delete_analytics_for_module_version(module_version)
+        return module_version
+
+    @staticmethod
+    def _record_download(module_version, analytics_token):
+        """Record download of module version"""
+        AnalyticsEngine.record_module_version_download(
+            namespace_name='testnamespace', module_name='publishedmodule', provider_name='testprovider',
+            module_version=module_version, terraform_version='1.5.3',
+            analytics_token=analytics_token, user_agent='Terraform/1.5.3',
+            auth_token=None
+        )
+
+    @staticmethod
+    def _create_buffer(max_size=10, batch_size=5, flush_interval=300,
+                       overflow_policy=terrareg.config.AnalyticsWriteBufferOverflowPolicy.SYNCHRONOUS):
+        """Create write buffer and patch it to be used by analytics engine"""
+        write_buffer = AnalyticsWriteBuffer(
+            max_size=max_size, batch_size=batch_size,
+            flush_interval=flush_interval, overflow_policy=overflow_policy
+        )
+        AnalyticsWriteBuffer._INSTANCE = write_buffer
+        return write_buffer
+
+    def test_get_disabled(self):
+        """Test write buffer is not used by default"""
+        with mock.patch('terrareg.config.Config.ANALYTICS_WRITE_BUFFER_SIZE', 0):
+            assert AnalyticsWriteBuffer.get() is None
+
+    def test_get_enabled(self):
+        """Test write buffer instance is created using configuration"""
+        with mock.patch('terrareg.config.Config.ANALYTICS_WRITE_BUFFER_SIZE', 50), \
+                mock.patch('terrareg.config.Config.ANALYTICS_WRITE_BUFFER_BATCH_SIZE', 10), \
+                mock.patch('terrareg.config.Config.ANALYTICS_WRITE_BUFFER_FLUSH_INTERVAL', 2):
+            write_buffer = AnalyticsWriteBuffer.get()
+            assert isinstance(write_buffer, AnalyticsWriteBuffer)
+            assert write_buffer._max_size == 50
+            assert write_buffer._batch_size == 10
+            assert write_buffer._flush_interval == 2
+            assert AnalyticsWriteBuffer.get() is write_buffer
+
+    def test_flush_on_stop(self):
+        """Test buffered records are written when buffer is stopped"""
+        module_version = self._get_module_version()
+
+        with mock.patch('terrareg.config.Config.ANALYTICS_WRITE_BUFFER_SIZE', 10):
+            write_buffer = self._create_buffer()
+
+            self._record_download(module_version, 'buffered-application')
+            self._record_download(module_version, 'second-buffered-application')
+
+            assert write_buffer.queue_depth == 2
+            assert AnalyticsEngine.get_module_provider_token_versions(module_version.module_provider) == {}
+
+            write_buffer.stop()
+
+        assert write_buffer.queue_depth == 0
+        assert write_buffer.flushed_count == 2
+        assert write_buffer.last_flush_duration is not None
+        assert sorted(AnalyticsEngine.get_module_provider_token_versions(module_version.module_provider)) == [
+            'buffered-application', 'second-buffered-application'
+        ]
+
+    def test_flush_on_batch_size(self):
+        """Test background thread writes records once batch size is reached"""
+        module_version = self._get_module_version()
+
+        with mock.patch('terrareg.config.Config.ANALYTICS_WRITE_BUFFER_SIZE', 10):
+            write_buffer = self._create_buffer(batch_size=2)
+
+            with mock.patch.object(write_buffer, 'flush', wraps=write_buffer.flush) as mock_flush:
+                self._record_download(module_version, 'batch-application')
+                self._record_download(module_version, 'batch-application')
+
+                # Wait for background thread to write batch
+                for _ in range(100):
+                    if write_buffer.flushed_count == 2:
+                        break
+                    write_buffer._thread.join(timeout=0.05)
+
+                assert write_buffer.flushed_count == 2
+                mock_flush.assert_called()
+
+        assert write_buffer.queue_depth == 0
+        assert list(AnalyticsEngine.get_module_provider_token_versions(module_version.module_provider)) == [
+            'batch-application'
+        ]
+
+    @pytest.mark.parametrize('overflow_policy, expected_written, expected_dropped', [
+        (terrareg.config.AnalyticsWriteBufferOverflowPolicy.SYNCHRONOUS, 3, 0),
+        (terrareg.config.AnalyticsWriteBufferOverflowPolicy.DROP, 2, 1),
+    ])
+    def test_overflow_policy(self, overflow_policy, expected_written, expected_dropped):
+        """Test handling of records when buffer is full"""
+        module_version = self._get_module_version()
+
+        with mock.patch('terrareg.config.Config.ANALYTICS_WRITE_BUFFER_SIZE', 2):
+            write_buffer = self._create_buffer(max_size=2, batch_size=5, overflow_policy=overflow_policy)
+
+            # Prevent the background thread from flushing records
+            with mock.patch.object(write_buffer, '_run'):
+                for itx in range(3):
+                    self._record_download(module_version, f'overflow-application-{itx}')
+
+            assert write_buffer.queue_depth == 2
+            assert write_buffer.dropped_count == expected_dropped
+
+            write_buffer._thread = None
+            write_buffer.stop()
+
+        assert len(AnalyticsEngine.get_module_provider_token_versions(module_version.module_provider)) == expected_written
+
+    def test_overflow_drop_concurrent(self):
+        """Test dropped records are counted when records are added by concurrent threads"""
+        write_buffer = self._create_buffer(
+            max_size=1, batch_size=5,
+            overflow_policy=terrareg.config.AnalyticsWriteBufferOverflowPolicy.DROP)
+
+        def add_records():
+            """Add records to full buffer"""
+            for _ in range(500):
+                write_buffer.add('analytics', {})
+
+        # Prevent the background thread from flushing records
+        with mock.patch.object(write_buffer, '_run'):
+            threads = [threading.Thread(target=add_records) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert write_buffer.queue_depth == 1
+        assert write_buffer.dropped_count == (8 * 500) - 1
+
+        # Remove buffered record, which is not valid for insertion
+        write_buffer._records.clear()
+        write_buffer._thread = None
+
+    def test_provider_analytics_record(self):
+        """Test provider analytics records are buffered"""
+        write_buffer = self._create_buffer()
+        with mock.patch('terrareg.config.Config.ANALYTICS_WRITE_BUFFER_SIZE', 10), \
+                mock.patch.object(write_buffer, '_insert_records') as mock_insert_records:
+            AnalyticsEngine.insert_analytics_record(
+                table_name='provider_analytics',
+                values={'provider_version_id': 1}
+            )
+            assert write_buffer.queue_depth == 1
+            write_buffer.stop()
+
+        mock_insert_records.assert_called_once_with([('provider_analytics', {'provider_version_id': 1})])
+
+    def test_prometheus_metrics(self):
+        """Test write buffer metrics are included in Prometheus metrics"""
+        write_buffer = self._create_buffer()
+        with mock.patch('terrareg.config.Config.ANALYTICS_WRITE_BUFFER_SIZE', 10):
+            metrics = AnalyticsEngine.get_prometheus_metrics()
+
+        assert '# TYPE analytics_write_buffer_queue_depth gauge\nanalytics_write_buffer_queue_depth 0' in metrics
+        assert '# TYPE analytics_write_buffer_dropped_count counter\nanalytics_write_buffer_dropped_count 0' in metrics
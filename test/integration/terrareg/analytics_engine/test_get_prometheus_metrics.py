@@ -2,12 +2,20 @@
 
 from unittest import mock
 from terrareg.analytics import AnalyticsEngine
+from terrareg.file_storage import FileStorageMetrics
+from terrareg.provider_source.github_api_client import GithubApiClient
 from . import AnalyticsIntegrationTest
 
 
 class TestGetPrometheusMetrics(AnalyticsIntegrationTest):
     """Test get_prometheus_metrics method."""
 
+    def setup_method(self, method):
+        """Remove file storage and Github API metrics recorded by other tests"""
+        super().setup_method(method)
+        FileStorageMetrics.reset()
+        GithubApiClient.reset_stats()
+
     def test_get_prometheus_with_no_modules(self):
         """Test function with no analytics recorded or module providers."""
         get_total_count_mock = mock.MagicMock(return_value=0)
@@ -81,3 +89,57 @@ module_provider_usage{module_provider_id="testnamespace/publishedmodule/testprov
 module_provider_usage{module_provider_id="testnamespace/secondmodule/testprovider", analytics_token="duplicate-application"} 1
 module_provider_usage{module_provider_id="testnamespace/secondmodule/testprovider", analytics_token="test-app-using-second-module"} 1
 """.strip()
+
+    def test_get_prometheus_file_storage_metrics(self):
+        """Test file storage metrics are included, once file storage operations have been performed."""
+        FileStorageMetrics.record(storage_type='s3', operation='read_file', duration=0.5, error=False)
+        FileStorageMetrics.record(storage_type='s3', operation='read_file', duration=1.5, error=True)
+        FileStorageMetrics.record(storage_type='local', operation='file_exists', duration=0.25, error=False)
+
+        assert AnalyticsEngine.get_prometheus_metrics().endswith("""
+# HELP file_storage_operation_count Total number of file storage operations
+# TYPE file_storage_operation_count counter
+file_storage_operation_count{storage_type="local", operation="file_exists"} 1
+file_storage_operation_count{storage_type="s3", operation="read_file"} 2
+# HELP file_storage_operation_error_count Total number of file storage operations that raised an error
+# TYPE file_storage_operation_error_count counter
+file_storage_operation_error_count{storage_type="local", operation="file_exists"} 0
+file_storage_operation_error_count{storage_type="s3", operation="read_file"} 1
+# HELP file_storage_operation_duration_seconds_total Total duration of file storage operations
+# TYPE file_storage_operation_duration_seconds_total counter
+file_storage_operation_duration_seconds_total{storage_type="local", operation="file_exists"} 0.25
+file_storage_operation_duration_seconds_total{storage_type="s3", operation="read_file"} 2.0
+# HELP file_storage_operation_duration_seconds_max Maximum duration of a file storage operation
+# TYPE file_storage_operation_duration_seconds_max gauge
+file_storage_operation_duration_seconds_max{storage_type="local", operation="file_exists"} 0.25
+file_storage_operation_duration_seconds_max{storage_type="s3", operation="read_file"} 1.5
+""".rstrip())
+
+    def test_get_prometheus_github_api_metrics(self):
+        """Test Github API metrics are included, once requests to the Github API have been made."""
+        with GithubApiClient._STATS_LOCK:
+            GithubApiClient._STATS.update({
+                'request_count': 5,
+                'not_modified_count': 2,
+                'rate_limited_count': 1,
+                'rate_limit_wait_seconds_total': 1.5,
+                'rate_limit_remaining': 4998,
+            })
+
+        assert AnalyticsEngine.get_prometheus_metrics().endswith("""
+# HELP github_api_request_count Total number of requests to the Github API
+# TYPE github_api_request_count counter
+github_api_request_count 5
+# HELP github_api_not_modified_count Total number of Github API requests answered from the response cache
+# TYPE github_api_not_modified_count counter
+github_api_not_modified_count 2
+# HELP github_api_rate_limited_count Total number of Github API requests rejected by a rate limit
+# TYPE github_api_rate_limited_count counter
+github_api_rate_limited_count 1
+# HELP github_api_rate_limit_wait_seconds_total Total duration of waits for Github API rate limits
+# TYPE github_api_rate_limit_wait_seconds_total counter
+github_api_rate_limit_wait_seconds_total 1.5
+# HELP github_api_rate_limit_remaining Remaining Github API rate limit, from the most recent response
+# TYPE github_api_rate_limit_remaining gauge
+github_api_rate_limit_remaining 4998
+""".rstrip())
@@ -178,3 +178,28 @@ module "test-module" {
                 unittest.mock.patch('terrareg.config.Config.DOMAIN_NAME', None), \
                 unittest.mock.patch('terrareg.config.Config.PUBLIC_URL', None):
             assert example_file.get_content(server_hostname='example.com') == expected_output
+
+    def test_content_cached(self):
+        """Test example file content is only rendered once for each source URL and version"""
+        module_version = ModuleVersion(ModuleProvider(Module(Namespace('moduledetails'), 'readme-tests'), 'provider'), '1.0.0')
+        example = Example(module_version, 'examples/testreadmeexample')
+        example_file = ExampleFile(example, 'examples/testreadmeexample/main.tf')
+        example_file.update_attributes(content='module "test" {\n  source = "../../"\n}\n')
+
+        with unittest.mock.patch('terrareg.config.Config.TERRAFORM_EXAMPLE_VERSION_TEMPLATE', '>= {major}.{minor}.{patch}'), \
+                unittest.mock.patch('terrareg.config.Config.DOMAIN_NAME', None), \
+                unittest.mock.patch('terrareg.config.Config.PUBLIC_URL', None), \
+                unittest.mock.patch('terrareg.models.BaseSubmodule.replace_source_in_file',
+                                    side_effect=Example.replace_source_in_file, autospec=True) as mock_replace_source:
+            for _ in range(2):
+                assert 'version = ">= 1.0.0"' in ExampleFile(example, 'examples/testreadmeexample/main.tf').get_content(server_hostname='example.com')
+            assert mock_replace_source.call_count == 1
+
+            # Ensure content is re-rendered for a different hostname
+            assert 'source  = "other.example.com/' in example_file.get_content(server_hostname='other.example.com')
+            assert mock_replace_source.call_count == 2
+
+            # Ensure content is re-rendered after being updated
+            example_file.update_attributes(content='module "updated" {\n  source = "../../"\n}\n')
+            assert 'module "updated"' in example_file.get_content(server_hostname='example.com')
+            assert mock_replace_source.call_count == 3
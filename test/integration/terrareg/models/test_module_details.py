@@ -1,6 +1,7 @@
 
 from datetime import datetime
 import json
+from unittest import mock
 
 import pytest
 import sqlalchemy
@@ -8,6 +9,7 @@ import sqlalchemy
 from terrareg.database import Database
 from terrareg.models import Example, ExampleFile, Module, ModuleDetails, Namespace, ModuleProvider, ModuleVersion
 import terrareg.errors
+from terrareg.identity_map import IdentityMap
 from test.integration.terrareg import TerraregIntegrationTest
 
 
@@ -55,6 +57,82 @@ class TestModuleDetails(TerraregIntegrationTest):
         assert module_details.tfsec == json.loads(test_tfsec)
         assert module_details.infracost == json.loads(test_infracost)
 
+    def test_column_loaded_on_access(self):
+        """Test only accessed columns are loaded from the database"""
+        module_details = ModuleDetails.create()
+        module_details.update_attributes(readme_content='test readme', terraform_docs='{"inputs": []}')
+
+        module_details = ModuleDetails(id=module_details.pk)
+        with mock.patch.object(module_details, '_load_columns', wraps=module_details._load_columns) as mock_load_columns:
+            assert module_details.readme_content == Database.encode_blob('test readme')
+            mock_load_columns.assert_called_once_with(['readme_content'])
+
+            # Ensure column is not loaded again
+            assert module_details.readme_content == Database.encode_blob('test readme')
+            mock_load_columns.assert_called_once_with(['readme_content'])
+
+            assert module_details.terraform_docs == Database.encode_blob('{"inputs": []}')
+            mock_load_columns.assert_called_with(['terraform_docs'])
+            assert mock_load_columns.call_count == 2
+
+    def test_prefetch(self):
+        """Test prefetching multiple columns in a single query"""
+        module_details = ModuleDetails.create()
+        module_details.update_attributes(readme_content='test readme', infracost='{"totalMonthlyCost": "1.00"}')
+
+        module_details = ModuleDetails(id=module_details.pk)
+        with mock.patch.object(module_details, '_load_columns', wraps=module_details._load_columns) as mock_load_columns:
+            module_details.prefetch('readme_content', 'infracost')
+            mock_load_columns.assert_called_once_with(['readme_content', 'infracost'])
+
+            # Only columns that have not been loaded are selected
+            module_details.prefetch('readme_content', 'terraform_graph')
+            mock_load_columns.assert_called_with(['terraform_graph'])
+            assert mock_load_columns.call_count == 2
+
+            assert module_details.readme_content == Database.encode_blob('test readme')
+            assert module_details.infracost == {"totalMonthlyCost": "1.00"}
+            assert module_details.terraform_graph is None
+            assert mock_load_columns.call_count == 2
+
+    def test_prefetch_non_existent(self):
+        """Test accessing columns of non-existent module details"""
+        module_details = ModuleDetails(id=999999)
+        module_details.prefetch()
+        assert module_details.readme_content is None
+        assert module_details.tfsec == {'results': None}
+        assert module_details.infracost == {}
+        assert module_details.terraform_modules is None
+
+    def test_column_cached_for_request(self):
+        """Test columns loaded by one instance are used by other instances within the same request"""
+        module_details = ModuleDetails.create()
+        module_details.update_attributes(readme_content='test readme')
+
+        with self.SERVER._app.test_request_context():
+            ModuleDetails(id=module_details.pk).prefetch('readme_content', 'terraform_docs')
+            query_count = IdentityMap.get_query_count()
+
+            new_module_details = ModuleDetails(id=module_details.pk)
+            assert new_module_details.readme_content == Database.encode_blob('test readme')
+            assert new_module_details.terraform_docs is None
+            assert IdentityMap.get_query_count() == query_count
+
+    def test_prefetch_batch(self):
+        """Test loading columns of multiple module details in a single query"""
+        first_module_details = ModuleDetails.create()
+        first_module_details.update_attributes(terraform_docs='{"first": true}')
+        second_module_details = ModuleDetails.create()
+        second_module_details.update_attributes(terraform_docs='{"second": true}')
+
+        with self.SERVER._app.test_request_context():
+            ModuleDetails.prefetch_batch([first_module_details.pk, second_module_details.pk], ['terraform_docs'])
+            query_count = IdentityMap.get_query_count()
+
+            assert ModuleDetails(id=first_module_details.pk).terraform_docs == Database.encode_blob('{"first": true}')
+            assert ModuleDetails(id=second_module_details.pk).terraform_docs == Database.encode_blob('{"second": true}')
+            assert IdentityMap.get_query_count() == query_count
+
     def test_delete(self):
         """Test delete method of ModuleDetails"""
         module_details = ModuleDetails.create()
@@ -122,3 +200,126 @@ class TestModuleDetails(TerraregIntegrationTest):
                 {"classes": ["module.main_call-root"], "data": {"id": "root.module.main_call", "source": "module.main_call", "target": "root"}}
             ]
         }
+
+    def test_graph_json_pre_computed(self):
+        """Test pre-computed graph JSON is returned without parsing terraform graph"""
+        module_details = ModuleDetails.create()
+        try:
+            module_details.update_attributes(
+                terraform_graph='digraph {}',
+                terraform_graph_json=json.dumps({
+                    '00': {'nodes': [], 'edges': [], 'variant': '00'},
+                    '01': {'nodes': [], 'edges': [], 'variant': '01'},
+                    '10': {'nodes': [], 'edges': [], 'variant': '10'},
+                    '11': {'nodes': [], 'edges': [], 'variant': '11'},
+                })
+            )
+
+            with mock.patch('terrareg.terraform_graph.parse_dot') as mock_parse_dot:
+                assert module_details.get_graph_json()['variant'] == '00'
+                assert module_details.get_graph_json(full_module_names=True)['variant'] == '01'
+                assert module_details.get_graph_json(full_resource_names=True)['variant'] == '10'
+                assert module_details.get_graph_json(full_resource_names=True, full_module_names=True)['variant'] == '11'
+                mock_parse_dot.assert_not_called()
+
+            # Ensure pre-computed graph JSON is removed when terraform graph is modified
+            module_details.update_attributes(terraform_graph='digraph { "[root] root" }')
+            assert module_details.get_graph_json() == {
+                'nodes': [
+                    {"data": {"child_count": 0, "id": "root", "label": "Root Module"}, "style": {"background-color": "#F8F7F9", "color": "#000000", "font-weight": "bold", "text-valign": "top"}}
+                ],
+                'edges': []
+            }
+        finally:
+            module_details.delete()
+
+    def test_graph_json_cache_reused_module_details_id(self):
+        """Test cached graph JSON is not returned for new module details re-using the ID of deleted module details"""
+        old_module_details = ModuleDetails.create()
+        old_module_details.update_attributes(terraform_graph_json=json.dumps({
+            variant: {'nodes': [], 'edges': [], 'variant': 'old'} for variant in ['00', '01', '10', '11']
+        }))
+        assert old_module_details.get_graph_json()['variant'] == 'old'
+
+        # Replace module details, without invalidating cache of current process,
+        # as occurs when module details are re-created by another process
+        with mock.patch('terrareg.module_specs_cache.ModuleSpecsCache.invalidate'):
+            old_module_details.delete()
+            new_module_details = ModuleDetails.create()
+            new_module_details.update_attributes(terraform_graph_json=json.dumps({
+                variant: {'nodes': [], 'edges': [], 'variant': 'new'} for variant in ['00', '01', '10', '11']
+            }))
+        try:
+            if Database.get_engine().dialect.name == 'sqlite':
+                # Ensure ID of deleted module details has been re-used
+                assert new_module_details.pk == old_module_details.pk
+
+            assert ModuleDetails(id=new_module_details.pk).get_graph_json()['variant'] == 'new'
+        finally:
+            new_module_details.delete()
+
+    def test_generate_all_graph_json(self):
+        """Test generating graph JSON for all combinations of full resource/module names"""
+        module_version = ModuleVersion.get(ModuleProvider.get(Module(Namespace.get("moduledetails"), "graph-test"), "provider"), "1.0.0")
+        module_details = module_version.module_details
+
+        all_graph_json = ModuleDetails.generate_all_graph_json(
+            terraform_graph=module_details.terraform_graph,
+            infracost=module_details.infracost
+        )
+        assert all_graph_json == {
+            '00': module_details.get_graph_json(),
+            '01': module_details.get_graph_json(full_module_names=True),
+            '10': module_details.get_graph_json(full_resource_names=True),
+            '11': module_details.get_graph_json(full_resource_names=True, full_module_names=True),
+        }
+        assert all_graph_json['11']['nodes'][2]['data']['label'] == 'module.submodule-call.aws_ec2_instance.test_instance'
+        assert all_graph_json['01']['nodes'][3]['data']['label'] == 'module.submodule-call'
+
+        assert ModuleDetails.generate_all_graph_json(terraform_graph=None, infracost=None) is None
+
+    def test_get_by_content_digest(self):
+        """Test obtaining latest module details by content digest"""
+        first_module_details = ModuleDetails.create()
+        second_module_details = ModuleDetails.create()
+        other_module_details = ModuleDetails.create()
+        try:
+            first_module_details.update_attributes(content_digest='unittest-digest')
+            second_module_details.update_attributes(content_digest='unittest-digest')
+            other_module_details.update_attributes(content_digest='unittest-other-digest')
+
+            assert ModuleDetails.get_by_content_digest('unittest-digest').pk == second_module_details.pk
+            assert ModuleDetails.get_by_content_digest('unittest-other-digest').pk == other_module_details.pk
+            assert ModuleDetails.get_by_content_digest('unittest-does-not-exist') is None
+        finally:
+            first_module_details.delete()
+            second_module_details.delete()
+            other_module_details.delete()
+
+    def test_copy(self):
+        """Test copying module details to new row"""
+        module_details = ModuleDetails.create()
+        module_details.update_attributes(
+            readme_content='test readme content',
+            terraform_docs='{"test": "output"}',
+            tfsec='{"results": [{"test_result": 0}]}',
+            terraform_graph='digraph { "[root] root" }',
+            terraform_graph_json='{"00": {"nodes": [], "edges": []}}',
+            content_digest='unittest-copy-digest'
+        )
+        copied_module_details = module_details.copy()
+        try:
+            assert copied_module_details.pk != module_details.pk
+
+            copied_module_details = ModuleDetails(id=copied_module_details.pk)
+            assert copied_module_details.content_digest == 'unittest-copy-digest'
+            for column in ModuleDetails.BLOB_COLUMNS:
+                assert copied_module_details._get_column(column) == module_details._get_column(column)
+            assert copied_module_details.readme_content == Database.encode_blob('test readme content')
+
+            # Ensure copy is retained when original module details are deleted
+            module_details.delete()
+            assert ModuleDetails(id=copied_module_details.pk).terraform_docs == Database.encode_blob('{"test": "output"}')
+        finally:
+            module_details.delete()
+            copied_module_details.delete()
@@ -0,0 +1,84 @@
+
+from unittest import mock
+
+import pytest
+
+import terrareg.models
+from terrareg.identity_map import IdentityMap
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestModuleProviderGetBatch(TerraregIntegrationTest):
+    """Test bulk loading of module providers."""
+
+    @staticmethod
+    def _get_module_provider(namespace, module, provider):
+        """Return module provider"""
+        namespace = terrareg.models.Namespace.get(namespace)
+        module = terrareg.models.Module(namespace, module)
+        return terrareg.models.ModuleProvider.get(module, provider)
+
+    def test_get_batch(self):
+        """Test module providers are returned in order of IDs"""
+        module_providers = [
+            self._get_module_provider('testnamespace', 'wrongversionorder', 'testprovider'),
+            self._get_module_provider('moduleextraction', 'gitextraction', 'staticrepourl'),
+            self._get_module_provider('modulesearch', 'contributedmodule-oneversion', 'aws'),
+        ]
+
+        with self.SERVER._app.test_request_context():
+            res = terrareg.models.ModuleProvider.get_batch(
+                [module_provider.pk for module_provider in reversed(module_providers)] + [99999]
+            )
+
+            assert [module_provider.id for module_provider in res] == [
+                'modulesearch/contributedmodule-oneversion/aws',
+                'moduleextraction/gitextraction/staticrepourl',
+                'testnamespace/wrongversionorder/testprovider',
+            ]
+            assert [module_provider.pk for module_provider in res] == [
+                module_provider.pk for module_provider in reversed(module_providers)
+            ]
+
+    def test_get_batch_empty(self):
+        """Test empty list of IDs"""
+        assert terrareg.models.ModuleProvider.get_batch([]) == []
+
+    @pytest.mark.parametrize('include_module_details', [False, True])
+    def test_get_batch_primes_request_cache(self, include_module_details):
+        """Test attributes used by module provider listings do not require further queries"""
+        module_provider = self._get_module_provider('testnamespace', 'wrongversionorder', 'testprovider')
+        expected_latest_version = module_provider.get_latest_version().version
+        expected_downloads = module_provider.get_latest_version().get_total_downloads()
+
+        with self.SERVER._app.test_request_context():
+            res = terrareg.models.ModuleProvider.get_batch([module_provider.pk], include_module_details=include_module_details)
+            query_count = IdentityMap.get_query_count()
+
+            latest_version = res[0].get_latest_version()
+            assert latest_version.version == expected_latest_version
+            assert latest_version.get_total_downloads() == expected_downloads
+            assert res[0].get_git_provider() is None
+            if include_module_details:
+                assert latest_version.module_details.terraform_docs is not None
+
+            assert IdentityMap.get_query_count() == query_count
+
+    @pytest.mark.parametrize('url', [
+        '/v1/modules?limit={limit}',
+        '/v1/modules/search?q=a&limit={limit}',
+        '/v1/modules/search?q=a&target_terraform_version=1.0.0&limit={limit}',
+        '/v1/terrareg/modules/modulesearch?limit={limit}',
+    ])
+    def test_listing_query_count_independent_of_limit(self, url):
+        """Test number of queries used for module listings does not depend on number of results"""
+        client = self.SERVER._app.test_client()
+        query_counts = []
+        with mock.patch('terrareg.config.Config.DEBUG', True):
+            for limit in [1, 10, 50]:
+                res = client.get(url.format(limit=limit))
+                assert res.status_code == 200
+                assert len(res.json['modules']) > 1 or limit == 1
+                query_counts.append(int(res.headers['X-Terrareg-Query-Count']))
+
+        assert len(set(query_counts)) == 1
@@ -11,7 +11,8 @@ from terrareg.analytics import AnalyticsEngine
 from terrareg.config import ModuleVersionReindexMode
 from terrareg.database import Database
 
-from terrareg.models import Example, ExampleFile, Module, Namespace, ModuleProvider, ModuleVersion
+from terrareg.models import Example, ExampleFile, Module, ModuleDetails, Namespace, ModuleProvider, ModuleVersion
+from terrareg.version_sort_key import VersionSortKey
 import terrareg.config
 import terrareg.errors
 from test.integration.terrareg import TerraregIntegrationTest
@@ -164,7 +165,8 @@ class TestModuleVersion(TerraregIntegrationTest):
                     version='1.1.0',
                     published=previous_publish_state,
                     beta=False,
-                    internal=False
+                    internal=False,
+                    **VersionSortKey.get_column_values('1.1.0')
                 ))
 
                 # Create submodules
@@ -581,6 +583,103 @@ class TestModuleVersion(TerraregIntegrationTest):
         finally:
             shutil.rmtree(data_directory)
 
+    def test_module_specs_cached(self):
+        """Test parsed module specs and sanitised inputs are cached between instances and invalidated on update."""
+        module_provider = ModuleProvider.get(Module(Namespace('moduledetails'), 'readme-tests'), 'provider')
+        module_version = ModuleVersion.get(module_provider, '1.0.0')
+        module_version.module_details.update_attributes(
+            terraform_docs='{"inputs": [{"name": "test_input", "description": "Test *markdown*"}]}'
+        )
+
+        with unittest.mock.patch('terrareg.models.convert_markdown_to_html',
+                                 unittest.mock.MagicMock(side_effect=terrareg.models.convert_markdown_to_html)) as mock_convert:
+            for _ in range(2):
+                module_version = ModuleVersion.get(module_provider, '1.0.0')
+                inputs = module_version.get_terraform_inputs(html=True)
+                assert inputs == [{'name': 'test_input', 'description': '<p>Test <em>markdown</em></p>'}]
+                # Ensure modifying the returned inputs does not modify the cached inputs
+                inputs[0]['description'] = 'Modified'
+            mock_convert.assert_called_once()
+
+            # Ensure non-HTML inputs are cached separately and original specs are not modified
+            assert module_version.get_terraform_inputs() == [{'name': 'test_input', 'description': 'Test *markdown*'}]
+            assert module_version.get_module_specs() == {'inputs': [{'name': 'test_input', 'description': 'Test *markdown*'}]}
+
+        module_version.module_details.update_attributes(
+            terraform_docs='{"inputs": [{"name": "updated_input", "description": "Updated"}]}'
+        )
+        module_version = ModuleVersion.get(module_provider, '1.0.0')
+        assert module_version.get_terraform_inputs(html=True) == [{'name': 'updated_input', 'description': '<p>Updated</p>'}]
+
+    def test_module_specs_cache_reused_module_details_id(self):
+        """
+        Test cached values are not returned for new module details re-using the ID of deleted module details,
+        which occurs when the module details are re-created by another process.
+        """
+        module_provider = ModuleProvider.get(Module(Namespace('moduledetails'), 'readme-tests'), 'provider')
+        module_version = ModuleVersion.get(module_provider, '1.0.0')
+        original_module_details_id = module_version._get_db_row()['module_details_id']
+
+        old_module_details = ModuleDetails.create()
+        old_module_details.update_attributes(terraform_docs='{"inputs": [{"name": "old_input"}]}')
+        # Module details to remove once complete
+        created_module_details = old_module_details
+        try:
+            module_version.update_attributes(module_details_id=old_module_details.pk)
+            assert ModuleVersion.get(module_provider, '1.0.0').get_module_specs() == {'inputs': [{'name': 'old_input'}]}
+
+            # Replace module details, without invalidating cache of current process
+            with unittest.mock.patch('terrareg.module_specs_cache.ModuleSpecsCache.invalidate'):
+                module_version.update_attributes(module_details_id=original_module_details_id)
+                old_module_details.delete()
+                new_module_details = created_module_details = ModuleDetails.create()
+                new_module_details.update_attributes(terraform_docs='{"inputs": [{"name": "new_input"}]}')
+                module_version.update_attributes(module_details_id=new_module_details.pk)
+
+            if Database.get_engine().dialect.name == 'sqlite':
+                # Ensure ID of deleted module details has been re-used
+                assert new_module_details.pk == old_module_details.pk
+
+            module_version = ModuleVersion.get(module_provider, '1.0.0')
+            assert module_version.get_module_specs() == {'inputs': [{'name': 'new_input'}]}
+            assert module_version.get_terraform_inputs() == [{'name': 'new_input'}]
+        finally:
+            module_version.update_attributes(module_details_id=original_module_details_id)
+            created_module_details.delete()
+
+    def test_readme_html_cache_reused_module_details_id(self):
+        """Test cached README HTML is not returned for new module details re-using the ID of deleted module details"""
+        module_provider = ModuleProvider.get(Module(Namespace('moduledetails'), 'readme-tests'), 'provider')
+        module_version = ModuleVersion.get(module_provider, '1.0.0')
+        original_module_details_id = module_version._get_db_row()['module_details_id']
+
+        old_module_details = ModuleDetails.create()
+        old_module_details.update_attributes(readme_content='# Old README')
+        # Module details to remove once complete
+        created_module_details = old_module_details
+        try:
+            module_version.update_attributes(module_details_id=old_module_details.pk)
+            assert 'Old README' in ModuleVersion.get(module_provider, '1.0.0').get_readme_html(server_hostname='localhost')
+
+            # Replace module details, without invalidating cache of current process
+            with unittest.mock.patch('terrareg.module_specs_cache.ModuleSpecsCache.invalidate'):
+                module_version.update_attributes(module_details_id=original_module_details_id)
+                old_module_details.delete()
+                new_module_details = created_module_details = ModuleDetails.create()
+                new_module_details.update_attributes(readme_content='# New README')
+                module_version.update_attributes(module_details_id=new_module_details.pk)
+
+            if Database.get_engine().dialect.name == 'sqlite':
+                # Ensure ID of deleted module details has been re-used
+                assert new_module_details.pk == old_module_details.pk
+
+            readme_html = ModuleVersion.get(module_provider, '1.0.0').get_readme_html(server_hostname='localhost')
+            assert 'New README' in readme_html
+            assert 'Old README' not in readme_html
+        finally:
+            module_version.update_attributes(module_details_id=original_module_details_id)
+            created_module_details.delete()
+
     def test_variable_template(self):
         """Test variable template of module version."""
 
@@ -1031,6 +1130,27 @@ module &quot;test-usage3&quot; {
 
             assert module_version.get_readme_html(server_hostname='example.com').strip() == expected_output.strip()
 
+    def test_get_readme_html_cached(self):
+        """Test README HTML is only rendered once, until the latest version of the module changes."""
+        module_provider = ModuleProvider(Module(Namespace('moduledetails'), 'readme-tests'), 'provider')
+        ModuleVersion(module_provider, '1.0.0').module_details.update_attributes(
+            readme_content='module "test" {\n  source = "./modules/example"\n}\n'
+        )
+
+        with unittest.mock.patch('terrareg.config.Config.TERRAFORM_EXAMPLE_VERSION_TEMPLATE', '>= {major}.{minor}.{patch}'), \
+                unittest.mock.patch('terrareg.models.convert_markdown_to_html',
+                                    unittest.mock.MagicMock(side_effect=terrareg.models.convert_markdown_to_html)) as mock_convert:
+            for _ in range(2):
+                readme_html = ModuleVersion(module_provider, '1.0.0').get_readme_html(server_hostname='example.com')
+                assert 'version = "&gt;= 1.0.0"' in readme_html
+            mock_convert.assert_called_once()
+
+            # Ensure README is re-rendered when the version is no longer the latest version
+            with unittest.mock.patch('terrareg.models.ModuleVersion.is_latest_version', new_callable=unittest.mock.PropertyMock, return_value=False):
+                readme_html = ModuleVersion(module_provider, '1.0.0').get_readme_html(server_hostname='example.com')
+                assert 'version = "1.0.0"' in readme_html
+            assert mock_convert.call_count == 2
+
     def test_git_path(self):
         """Test git_path property"""
         # Create module provider with git path
@@ -340,6 +340,10 @@ class TestProviderVersion(TerraregIntegrationTest):
             'provider_id': 1,
             'published_at': datetime(2023, 11, 13, 5, 43, 30, 897287),
             'version': '1.5.0',
+            'version_major': 1,
+            'version_minor': 5,
+            'version_patch': 0,
+            'version_prerelease': None,
         }
 
     def test_generate_file_name_from_suffix(self):
@@ -489,6 +493,10 @@ class TestProviderVersion(TerraregIntegrationTest):
             'provider_id': provider_obj.pk,
             'published_at': datetime(2023, 2, 3, 23, 0, 6),
             'version': '1.0.0',
+            'version_major': 1,
+            'version_minor': 0,
+            'version_patch': 0,
+            'version_prerelease': None,
         }
 
     def test_get_api_binaries_outline(self):
@@ -660,4 +668,8 @@ class TestProviderVersion(TerraregIntegrationTest):
             'provider_id': provider_obj.pk,
             'published_at': None,
             'version': '10.20.30',
+            'version_major': 10,
+            'version_minor': 20,
+            'version_patch': 30,
+            'version_prerelease': None,
         }
@@ -1888,22 +1888,12 @@ resource "aws_s3_bucket" "test" {
             temp_dir = tempfile.mkdtemp()
             os.mkdir(os.path.join(temp_dir, 'modules'))
 
-            # Mock tempfile to obtain temporary directory used for generating archives
-            generate_archive_temp_dir = None
-            def mock_temporary_directory(suffix=None, *args, **kwargs):
-                nonlocal generate_archive_temp_dir
-                temp_dir_ret = TemporaryDirectory(suffix=suffix, *args, **kwargs)
-                if suffix == "generate-archive":
-                    generate_archive_temp_dir = temp_dir_ret.name
-                return temp_dir_ret
-
             try:
                 local_storage = terrareg.file_storage.LocalFileStorage(base_directory=temp_dir)
                 mock_local_file_storage = mock.MagicMock(wraps=local_storage)
                 with mock.patch('terrareg.config.Config.DELETE_EXTERNALLY_HOSTED_ARTIFACTS', False), \
                         mock.patch('terrareg.config.Config.DATA_DIRECTORY', temp_dir), \
-                        mock.patch('terrareg.file_storage.FileStorageFactory.get_file_storage', return_value=mock_local_file_storage), \
-                        mock.patch('tempfile.TemporaryDirectory', side_effect=mock_temporary_directory):
+                        mock.patch('terrareg.file_storage.FileStorageFactory.get_file_storage', return_value=mock_local_file_storage):
 
                     UploadTestModule.upload_module_version(module_version=module_version, zip_file=zip_file)
 
@@ -1950,10 +1940,11 @@ resource "aws_s3_bucket" "test" {
                         }
 
                     mock_local_file_storage.make_directory.assert_called_once_with("/modules/testprocessupload/test-module/aws/21.0.0")
-                    mock_local_file_storage.upload_file.assert_has_calls(calls=[
-                        mock.call(os.path.join(generate_archive_temp_dir, "source.tar.gz"), '/modules/testprocessupload/test-module/aws/21.0.0', 'source.tar.gz'),
-                        mock.call(os.path.join(generate_archive_temp_dir, "source.zip"), '/modules/testprocessupload/test-module/aws/21.0.0', 'source.zip')
-                    ])
+                    mock_local_file_storage.open_write.assert_has_calls(calls=[
+                        mock.call('/modules/testprocessupload/test-module/aws/21.0.0/source.tar.gz'),
+                        mock.call('/modules/testprocessupload/test-module/aws/21.0.0/source.zip')
+                    ], any_order=True)
+                    mock_local_file_storage.upload_file.assert_not_called()
 
             finally:
                 shutil.rmtree(temp_dir)
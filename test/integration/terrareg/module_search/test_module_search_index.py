@@ -0,0 +1,265 @@
+
+import threading
+from unittest import mock
+import pytest
+
+import terrareg.config
+from terrareg.database import Database
+from terrareg.models import Module, ModuleProvider, ModuleVersion, Namespace
+from terrareg.module_search import ModuleSearch
+from terrareg.module_search_index import (
+    DatabaseModuleSearchIndex, InMemoryModuleSearchIndex, ModuleSearchIndexFactory
+)
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestModuleSearchIndex(TerraregIntegrationTest):
+
+    def setup_method(self, method):
+        """Reset search index before each test"""
+        ModuleSearchIndexFactory.reset()
+        super(TestModuleSearchIndex, self).setup_method(method)
+
+    def teardown_method(self, method):
+        """Reset search index after each test"""
+        ModuleSearchIndexFactory.reset()
+        super(TestModuleSearchIndex, self).teardown_method(method)
+
+    @staticmethod
+    def _search_with_index(index_type, **kwargs):
+        """Perform search using the given search index type"""
+        with mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX', index_type):
+            result = ModuleSearch.search_module_providers(offset=0, limit=50, **kwargs)
+        return result.count, [module_provider.id for module_provider in result.rows]
+
+    @pytest.mark.parametrize('index_type, expected_class', [
+        (terrareg.config.ModuleSearchIndexType.DATABASE, DatabaseModuleSearchIndex),
+        (terrareg.config.ModuleSearchIndexType.MEMORY, InMemoryModuleSearchIndex),
+    ])
+    def test_factory(self, index_type, expected_class):
+        """Test factory returns configured index type"""
+        with mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX', index_type):
+            index = ModuleSearchIndexFactory.get()
+            assert isinstance(index, expected_class)
+            # Ensure the same instance is returned
+            assert ModuleSearchIndexFactory.get() is index
+
+    @pytest.mark.parametrize('query', [
+        'mixedsearch',
+        'contributedmodule-oneversion',
+        'searchbynamesp',
+        'modulesearch',
+        'DESCRIPTION-Search',
+        'DESCRIPTION-Search-OLDVERSION',
+        'aws',
+        'AWS',
+        'mixedsearch aws',
+        'mixed search',
+        'contributedmodule_oneversion',
+        'a',
+        'ws',
+        'doesnotexist',
+        '%',
+        '_',
+    ])
+    def test_results_match_database_search(self, query):
+        """Test in-memory index returns the same results and ordering as the database search"""
+        database_results = self._search_with_index(terrareg.config.ModuleSearchIndexType.DATABASE, query=query)
+        memory_results = self._search_with_index(terrareg.config.ModuleSearchIndexType.MEMORY, query=query)
+        assert memory_results == database_results
+
+    def test_results_match_database_search_filters(self):
+        """Test in-memory index returns the same search filters as the database search"""
+        with mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX', terrareg.config.ModuleSearchIndexType.DATABASE):
+            database_filters = ModuleSearch.get_search_filters(query='mixedsearch')
+        with mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX', terrareg.config.ModuleSearchIndexType.MEMORY):
+            memory_filters = ModuleSearch.get_search_filters(query='mixedsearch')
+        assert memory_filters == database_filters
+
+    def test_get_matching_module_provider_ids(self):
+        """Test obtaining matching module providers from in-memory index"""
+        index = InMemoryModuleSearchIndex(refresh_interval=0)
+
+        module_provider = ModuleProvider(
+            module=Module(namespace=Namespace(name='modulesearch'), name='contributedmodule-oneversion'),
+            name='aws'
+        )
+        assert module_provider.pk in index.get_matching_module_provider_ids(['contributedmodule-oneversion'])
+        assert module_provider.pk in index.get_matching_module_provider_ids(['CONTRIBUTEDMODULE', 'aws'])
+        assert module_provider.pk not in index.get_matching_module_provider_ids(['contributedmodule-oneversion', 'doesnotexist'])
+        assert index.get_matching_module_provider_ids(['doesnotexist']) == set()
+
+        # Ensure query parts containing only wildcard characters do not limit the search
+        assert index.get_matching_module_provider_ids(['%']) is None
+
+    def test_max_filter_size(self):
+        """Test index does not limit search when query is not selective"""
+        index = InMemoryModuleSearchIndex(refresh_interval=0)
+        assert index.get_matching_module_provider_ids(['a'])
+
+        with mock.patch('terrareg.module_search_index.InMemoryModuleSearchIndex.MAX_FILTER_SIZE', 0):
+            assert index.get_matching_module_provider_ids(['a']) is None
+
+    def test_refresh_interval(self):
+        """Test index is rebuilt after refresh interval"""
+        index = InMemoryModuleSearchIndex(refresh_interval=300)
+        with mock.patch('time.time', return_value=1000):
+            index.get_matching_module_provider_ids(['aws'])
+
+        with mock.patch.object(index, '_build', wraps=index._build) as mock_build:
+            with mock.patch('time.time', return_value=1299):
+                index.get_matching_module_provider_ids(['aws'])
+            mock_build.assert_not_called()
+
+            with mock.patch('time.time', return_value=1300):
+                index.get_matching_module_provider_ids(['aws'])
+            mock_build.assert_called_once_with()
+
+    def test_concurrent_refresh(self):
+        """Test index is only rebuilt by one thread, whilst other threads use the existing index"""
+        index = InMemoryModuleSearchIndex(refresh_interval=300)
+        with mock.patch('time.time', return_value=1000):
+            expected_matches = index.get_matching_module_provider_ids(['contributedmodule-oneversion'])
+        assert expected_matches
+
+        build_started = threading.Event()
+        release_build = threading.Event()
+        original_build = index._build
+
+        def blocking_build():
+            build_started.set()
+            assert release_build.wait(timeout=10)
+            original_build()
+
+        with mock.patch('time.time', return_value=1300), \
+                mock.patch.object(index, '_build', side_effect=blocking_build) as mock_build:
+            build_thread = threading.Thread(target=index.get_matching_module_provider_ids, args=(['aws'],))
+            build_thread.start()
+            assert build_started.wait(timeout=10)
+
+            # Ensure other searches use the existing index, without waiting for the build
+            results = []
+            search_threads = [
+                threading.Thread(target=lambda: results.append(index.get_matching_module_provider_ids(['contributedmodule-oneversion'])))
+                for _ in range(5)
+            ]
+            for thread in search_threads:
+                thread.start()
+            for thread in search_threads:
+                thread.join(timeout=10)
+            assert results == [expected_matches] * 5
+
+            release_build.set()
+            build_thread.join(timeout=10)
+            mock_build.assert_called_once_with()
+
+    def test_concurrent_initial_build(self):
+        """Test concurrent searches wait for the index to be built once, when it has not been built"""
+        index = InMemoryModuleSearchIndex(refresh_interval=0)
+        barrier = threading.Barrier(5)
+        results = []
+
+        def search():
+            barrier.wait(timeout=10)
+            results.append(index.get_matching_module_provider_ids(['contributedmodule-oneversion']))
+
+        with mock.patch.object(index, '_build', wraps=index._build) as mock_build:
+            threads = [threading.Thread(target=search) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=10)
+            mock_build.assert_called_once_with()
+
+        assert len(results) == 5
+        assert all(result and result == results[0] for result in results)
+
+    def test_publish_and_delete_update_index(self):
+        """Test publishing and deleting module versions updates in-memory index"""
+        with self._patch_audit_event_creation(), \
+                mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX', terrareg.config.ModuleSearchIndexType.MEMORY), \
+                mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX_REFRESH_INTERVAL', 0):
+
+            namespace = Namespace.get(name='test', create=True)
+            module = Module(namespace=namespace, name='searchindexupdate')
+            module_provider = ModuleProvider.get(module=module, name='aws', create=True)
+            try:
+                # Build index, ensuring module provider is not present
+                assert ModuleSearch.search_module_providers(offset=0, limit=10, query='searchindexupdate').count == 0
+
+                module_version = ModuleVersion(module_provider=module_provider, version='1.0.0')
+                module_version.prepare_module()
+                module_version.update_attributes(description='unittest-index-description')
+                module_version.publish()
+
+                for query in ['searchindexupdate', 'unittest-index-description']:
+                    result = ModuleSearch.search_module_providers(offset=0, limit=10, query=query)
+                    assert [row.id for row in result.rows] == ['test/searchindexupdate/aws']
+
+                # Ensure module provider is removed from index after latest version is deleted
+                module_version.delete()
+                assert ModuleSearch.search_module_providers(offset=0, limit=10, query='searchindexupdate').count == 0
+                assert module_provider.pk not in ModuleSearchIndexFactory.get()._documents
+
+            finally:
+                module_provider.delete()
+
+    @pytest.mark.parametrize('commit', [True, False])
+    def test_transaction_updates_index_on_commit(self, commit):
+        """Test changes made within a transaction are only indexed once the transaction is committed"""
+        with self._patch_audit_event_creation(), \
+                mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX', terrareg.config.ModuleSearchIndexType.MEMORY), \
+                mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX_REFRESH_INTERVAL', 0):
+
+            module_provider = ModuleProvider(
+                module=Module(namespace=Namespace(name='modulesearch'), name='contributedmodule-oneversion'),
+                name='aws'
+            )
+            module_version = module_provider.get_latest_version()
+            original_description = module_version.description
+
+            # Build index
+            index = ModuleSearchIndexFactory.get()
+            assert index.get_matching_module_provider_ids(['unittest-transaction-description']) == set()
+
+            try:
+                with Database.start_transaction() as transaction:
+                    module_version.update_attributes(description='unittest-transaction-description')
+
+                    # Ensure uncommitted changes are not indexed
+                    assert index.get_matching_module_provider_ids(['unittest-transaction-description']) == set()
+
+                    if not commit:
+                        transaction.transaction.rollback()
+
+                expected_matches = {module_provider.pk} if commit else set()
+                assert index.get_matching_module_provider_ids(['unittest-transaction-description']) == expected_matches
+
+                # Ensure index matches database search
+                assert (
+                    self._search_with_index(terrareg.config.ModuleSearchIndexType.MEMORY, query='unittest-transaction-description') ==
+                    self._search_with_index(terrareg.config.ModuleSearchIndexType.DATABASE, query='unittest-transaction-description')
+                )
+            finally:
+                module_version.update_attributes(description=original_description)
+
+    def test_transaction_exception_does_not_update_index(self):
+        """Test changes made within a transaction that raises an exception are not indexed"""
+        with mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX', terrareg.config.ModuleSearchIndexType.MEMORY), \
+                mock.patch('terrareg.config.Config.MODULE_SEARCH_INDEX_REFRESH_INTERVAL', 0):
+
+            module_provider = ModuleProvider(
+                module=Module(namespace=Namespace(name='modulesearch'), name='contributedmodule-oneversion'),
+                name='aws'
+            )
+            index = ModuleSearchIndexFactory.get()
+            assert module_provider.pk in index.get_matching_module_provider_ids(['contributedmodule-oneversion'])
+
+            with pytest.raises(Exception, match='Unittest error'):
+                with Database.start_transaction():
+                    module_provider.delete()
+                    raise Exception('Unittest error')
+
+            # Ensure deleted module provider, which was restored by rollback, remains in index
+            assert module_provider.pk in index.get_matching_module_provider_ids(['contributedmodule-oneversion'])
+            assert ModuleProvider.get(module=module_provider._module, name='aws') is not None
@@ -0,0 +1,53 @@
+
+from unittest import mock
+
+import sqlalchemy
+
+from terrareg.blob_reencoder import BlobReencoder
+from terrareg.database import Database
+import terrareg.models
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestBlobReencoder(TerraregIntegrationTest):
+    """Test re-encoding of blobs stored in the database."""
+
+    README_CONTENT = 'Repeated README content\n' * 100
+
+    def _get_raw_readme_content(self, module_details_id):
+        """Return raw readme_content column of module details"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            return conn.execute(sqlalchemy.select([db.module_details.c.readme_content]).where(
+                db.module_details.c.id == module_details_id
+            )).scalar()
+
+    def test_reencode_table(self):
+        """Test re-encoding legacy blobs and decompressing blobs after disabling compression"""
+        # Create module details with uncompressed blob, as stored before compression was introduced
+        with mock.patch('terrareg.config.Config.BLOB_COMPRESSION_MIN_SIZE', 0):
+            module_details = terrareg.models.ModuleDetails.create()
+            module_details.update_attributes(readme_content=self.README_CONTENT, terraform_docs='{}')
+        assert self._get_raw_readme_content(module_details.pk) == self.README_CONTENT.encode('utf-8')
+
+        progress = list(BlobReencoder.reencode_table('module_details', batch_size=2))
+        assert len(progress) > 1
+        assert progress[-1]['last_id'] >= module_details.pk
+        assert sum(batch['reencoded_count'] for batch in progress) >= 1
+        assert sum(batch['size_difference'] for batch in progress) < 0
+
+        raw_readme_content = self._get_raw_readme_content(module_details.pk)
+        assert raw_readme_content[:2] == Database.BLOB_CODEC_MARKER + Database.BLOB_CODEC_ZLIB
+        module_details = terrareg.models.ModuleDetails(id=module_details.pk)
+        assert Database.decode_blob(module_details.readme_content) == self.README_CONTENT
+        assert Database.decode_blob(module_details.terraform_docs) == '{}'
+
+        # Ensure blobs that are already encoded are not modified
+        assert sum(batch['reencoded_count'] for batch in BlobReencoder.reencode_table('module_details')) == 0
+
+        # Disable compression and ensure blobs are decompressed
+        with mock.patch('terrareg.config.Config.BLOB_COMPRESSION_MIN_SIZE', 0):
+            assert sum(batch['reencoded_count'] for batch in BlobReencoder.reencode_table('module_details')) >= 1
+        assert self._get_raw_readme_content(module_details.pk) == self.README_CONTENT.encode('utf-8')
+
+        module_details.delete()
@@ -0,0 +1,189 @@
+
+import datetime
+import unittest.mock
+
+import pytest
+
+from terrareg.bulk_reindex import BulkReindex
+from terrareg.constants import EXTRACTION_VERSION
+from terrareg.database import Database
+from terrareg.module_import_job_status import ModuleImportJobStatus
+from terrareg.module_import_queue import ModuleImportJob, ModuleImportQueue
+import terrareg.models
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestBulkReindex(TerraregIntegrationTest):
+    """Test bulk re-index of stale module versions."""
+
+    # Module versions, by namespace, module, provider and version, that are marked as stale
+    STALE_MODULE_VERSIONS = [
+        ('testnamespace', 'wrongversionorder', 'testprovider', '1.5.4', 1),
+        ('testnamespace', 'wrongversionorder', 'testprovider', '2.1.0', None),
+        ('testnamespace', 'onlybeta', 'testprovider', '2.5.0-beta', 1),
+    ]
+
+    def setup_method(self, method):
+        """Remove any pre-existing jobs and mark module versions as stale"""
+        super(TestBulkReindex, self).setup_method(method)
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.module_import_job.delete())
+
+        for namespace, module, provider, version, extraction_version in self.STALE_MODULE_VERSIONS:
+            self._get_module_version(namespace, module, provider, version).update_attributes(extraction_version=extraction_version)
+
+    def teardown_method(self, method):
+        """Restore extraction version of stale module versions"""
+        for namespace, module, provider, version, _ in self.STALE_MODULE_VERSIONS:
+            self._get_module_version(namespace, module, provider, version).update_attributes(extraction_version=EXTRACTION_VERSION)
+        super(TestBulkReindex, self).teardown_method(method)
+
+    def _get_module_provider(self, namespace, module, provider):
+        """Return module provider from test data"""
+        return terrareg.models.ModuleProvider.get(
+            terrareg.models.Module(terrareg.models.Namespace.get(namespace), module),
+            provider
+        )
+
+    def _get_module_version(self, namespace, module, provider, version):
+        """Return module version from test data"""
+        return terrareg.models.ModuleVersion(self._get_module_provider(namespace, module, provider), version)
+
+    @pytest.mark.parametrize('namespace, expected_ids', [
+        (None, [
+            'testnamespace/onlybeta/testprovider/2.5.0-beta',
+            'testnamespace/wrongversionorder/testprovider/1.5.4',
+            'testnamespace/wrongversionorder/testprovider/2.1.0',
+        ]),
+        ('testnamespace', [
+            'testnamespace/onlybeta/testprovider/2.5.0-beta',
+            'testnamespace/wrongversionorder/testprovider/1.5.4',
+            'testnamespace/wrongversionorder/testprovider/2.1.0',
+        ]),
+        ('moduleextraction', []),
+    ])
+    def test_get_stale_module_versions(self, namespace, expected_ids):
+        """Test obtaining module versions extracted using a previous extraction version"""
+        module_versions = BulkReindex(app=self.SERVER._app, namespace=namespace).get_stale_module_versions()
+        assert sorted(module_version.id for module_version in module_versions) == expected_ids
+
+    def test_get_stale_module_versions_active_job(self):
+        """Test stale module versions with a pending or running import job are not returned"""
+        queue = ModuleImportQueue()
+        queue.enqueue(module_provider=self._get_module_provider('testnamespace', 'wrongversionorder', 'testprovider'), version='1.5.4')
+        onlybeta_job = queue.enqueue(module_provider=self._get_module_provider('testnamespace', 'onlybeta', 'testprovider'), version='2.5.0-beta')
+        onlybeta_job.update_attributes(status=ModuleImportJobStatus.FAILED)
+
+        module_versions = BulkReindex(app=self.SERVER._app).get_stale_module_versions()
+        assert sorted(module_version.id for module_version in module_versions) == [
+            'testnamespace/onlybeta/testprovider/2.5.0-beta',
+            'testnamespace/wrongversionorder/testprovider/2.1.0',
+        ]
+
+    def test_enqueue_stale_module_versions(self):
+        """Test bulk re-index jobs are queued for stale module versions imported from git"""
+        def mock_get_git_clone_url(module_version):
+            """Return git clone URL for all versions, except 2.1.0"""
+            return None if module_version.version == '2.1.0' else 'ssh://example.com/repo.git'
+
+        with unittest.mock.patch('terrareg.models.ModuleVersion.get_git_clone_url', autospec=True, side_effect=mock_get_git_clone_url):
+            assert BulkReindex(app=self.SERVER._app).enqueue_stale_module_versions() == {'queued': 2, 'skipped': 1}
+
+        db = Database.get()
+        with db.get_connection() as conn:
+            jobs = [
+                ModuleImportJob.get(row['id'])
+                for row in conn.execute(db.module_import_job.select().order_by(db.module_import_job.c.id)).fetchall()
+            ]
+
+        assert [(job.module_provider_id, job.version) for job in jobs] == [
+            (self._get_module_provider('testnamespace', 'wrongversionorder', 'testprovider').pk, '1.5.4'),
+            (self._get_module_provider('testnamespace', 'onlybeta', 'testprovider').pk, '2.5.0-beta'),
+        ]
+        for job in jobs:
+            assert job.bulk_reindex is True
+            assert job.status is ModuleImportJobStatus.PENDING
+
+        # Ensure queued versions are not returned whilst jobs are pending
+        assert [module_version.id for module_version in BulkReindex(app=self.SERVER._app).get_stale_module_versions()] == [
+            'testnamespace/wrongversionorder/testprovider/2.1.0'
+        ]
+
+    def test_get_progress(self):
+        """Test progress only includes active bulk re-index jobs and jobs finished since start time"""
+        start_time = datetime.datetime.now()
+        queue = ModuleImportQueue()
+        module_provider = self._get_module_provider('testnamespace', 'noversions', 'testprovider')
+        jobs = [
+            queue.enqueue(module_provider=module_provider, version=f'1.0.{itx}', bulk_reindex=True)
+            for itx in range(6)
+        ]
+        # Job that is not part of bulk re-index
+        queue.enqueue(module_provider=module_provider, version='2.0.0')
+
+        jobs[0].update_attributes(status=ModuleImportJobStatus.RUNNING)
+        jobs[1].update_attributes(status=ModuleImportJobStatus.SUCCEEDED, finished_at=datetime.datetime.now())
+        jobs[2].update_attributes(status=ModuleImportJobStatus.FAILED, finished_at=datetime.datetime.now(), error='Unable to clone')
+        # Job that finished before start time
+        jobs[3].update_attributes(status=ModuleImportJobStatus.SUCCEEDED, finished_at=start_time - datetime.timedelta(hours=1))
+
+        bulk_reindex = BulkReindex(app=self.SERVER._app)
+        assert bulk_reindex.get_progress(since=start_time) == {
+            'pending': 2,
+            'running': 1,
+            'succeeded': 1,
+            'failed': 1,
+        }
+        assert bulk_reindex.get_failed_jobs(since=start_time) == [
+            {'id': 'testnamespace/noversions/testprovider/1.0.2', 'error': 'Unable to clone'}
+        ]
+
+    @pytest.mark.parametrize('progress, elapsed, expected_message', [
+        (
+            {'pending': 20, 'running': 4, 'succeeded': 10, 'failed': 2},
+            datetime.timedelta(minutes=2),
+            '10 succeeded, 2 failed, 4 running, 20 pending (6.0 versions/min, estimated 0:04:00 remaining)'
+        ),
+        (
+            {'pending': 5, 'running': 0, 'succeeded': 0, 'failed': 0},
+            datetime.timedelta(seconds=30),
+            '0 succeeded, 0 failed, 0 running, 5 pending (0.0 versions/min)'
+        ),
+        (
+            {'pending': 0, 'running': 0, 'succeeded': 3, 'failed': 0},
+            datetime.timedelta(0),
+            '3 succeeded, 0 failed, 0 running, 0 pending (180.0 versions/min)'
+        ),
+    ])
+    def test_format_progress(self, progress, elapsed, expected_message):
+        """Test formatting progress and throughput of bulk re-index"""
+        assert BulkReindex.format_progress(progress, elapsed) == expected_message
+
+    def test_run(self):
+        """Test workers process bulk re-index jobs until all have finished"""
+        queue = ModuleImportQueue()
+        module_provider = self._get_module_provider('testnamespace', 'noversions', 'testprovider')
+        for itx in range(4):
+            queue.enqueue(module_provider=module_provider, version=f'1.0.{itx}', bulk_reindex=True)
+
+        def mock_run_job(job, app):
+            """Mark job as succeeded, failing version 1.0.3"""
+            success = job.version != '1.0.3'
+            job.update_attributes(
+                status=ModuleImportJobStatus.SUCCEEDED if success else ModuleImportJobStatus.FAILED,
+                finished_at=datetime.datetime.now(),
+                error=None if success else 'Unable to clone'
+            )
+            return success
+
+        with unittest.mock.patch('terrareg.module_import_queue.ModuleImportQueue.run_job', side_effect=mock_run_job) as mock_run_job_call:
+            progress = BulkReindex(app=self.SERVER._app).run(workers=2, report_interval=1)
+
+        assert mock_run_job_call.call_count == 4
+        assert progress == {
+            'pending': 0,
+            'running': 0,
+            'succeeded': 3,
+            'failed': 1,
+        }
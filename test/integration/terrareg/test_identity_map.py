@@ -0,0 +1,77 @@
+
+from unittest import mock
+
+import terrareg.models
+from terrareg.identity_map import IdentityMap
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestIdentityMap(TerraregIntegrationTest):
+    """Test request-scoped identity map of model database rows."""
+
+    def _get_module_version(self):
+        """Return new instance of module version from test data"""
+        namespace = terrareg.models.Namespace.get('testnamespace')
+        module = terrareg.models.Module(namespace, 'wrongversionorder')
+        module_provider = terrareg.models.ModuleProvider.get(module, 'testprovider')
+        return terrareg.models.ModuleVersion.get(module_provider, '1.5.4')
+
+    def test_rows_shared_within_request(self):
+        """Test rows are only obtained once for each object within a request"""
+        with self.SERVER._app.test_request_context():
+            self._get_module_version()
+            query_count = IdentityMap.get_query_count()
+            assert query_count > 0
+
+            for _ in range(5):
+                module_version = self._get_module_version()
+                assert module_version.pk
+                assert module_version.module_provider.pk
+                assert module_version.module_provider.module.namespace.pk
+
+            assert IdentityMap.get_query_count() == query_count
+
+    def test_rows_not_shared_between_requests(self):
+        """Test rows are obtained in each request"""
+        for _ in range(2):
+            with self.SERVER._app.test_request_context():
+                self._get_module_version()
+                assert IdentityMap.get_query_count() > 0
+
+    def test_not_used_outside_of_request(self):
+        """Test rows are not cached outside of request"""
+        module_version = self._get_module_version()
+        assert module_version.pk
+        assert IdentityMap._get_rows() is None
+        assert IdentityMap.get_query_count() == 0
+
+    def test_cleared_on_update(self):
+        """Test cached rows are removed when database is modified"""
+        with self.SERVER._app.test_request_context():
+            namespace = terrareg.models.Namespace.get('testnamespace')
+            original_display_name = namespace.display_name
+            try:
+                namespace.update_attributes(display_name='Identity Map Test')
+                assert terrareg.models.Namespace.get('testnamespace').display_name == 'Identity Map Test'
+            finally:
+                namespace.update_attributes(display_name=original_display_name)
+            assert terrareg.models.Namespace.get('testnamespace').display_name == original_display_name
+
+    def test_non_existent_rows_not_cached(self):
+        """Test rows that do not exist are not cached"""
+        with self.SERVER._app.test_request_context():
+            assert terrareg.models.Namespace.get('identitymapdoesnotexist') is None
+            query_count = IdentityMap.get_query_count()
+            assert terrareg.models.Namespace.get('identitymapdoesnotexist', include_redirect=False) is None
+            assert IdentityMap.get_query_count() > query_count
+
+    def test_query_count_header(self):
+        """Test query count header is returned in debug mode"""
+        client = self.SERVER._app.test_client()
+        with mock.patch('terrareg.config.Config.DEBUG', True):
+            res = client.get('/v1/modules/testnamespace/wrongversionorder/testprovider/1.5.4')
+        assert res.status_code == 200
+        assert int(res.headers['X-Terrareg-Query-Count']) > 0
+
+        res = client.get('/v1/modules/testnamespace/wrongversionorder/testprovider/1.5.4')
+        assert 'X-Terrareg-Query-Count' not in res.headers
@@ -0,0 +1,318 @@
+
+import collections
+import datetime
+import unittest.mock
+
+import pytest
+
+from terrareg.config import ModuleImportQueueType
+from terrareg.database import Database
+from terrareg.module_import_job_status import ModuleImportJobStatus
+from terrareg.module_import_queue import ModuleImportJob, ModuleImportQueue
+import terrareg.errors
+import terrareg.models
+from test import client
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestModuleImportQueue(TerraregIntegrationTest):
+    """Test database-backed queue of module version imports."""
+
+    def setup_method(self, method):
+        """Remove any pre-existing jobs"""
+        super(TestModuleImportQueue, self).setup_method(method)
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.module_import_job.delete())
+
+    def _get_module_provider(self, namespace, module, provider):
+        """Return module provider from test data"""
+        return terrareg.models.ModuleProvider.get(
+            terrareg.models.Module(terrareg.models.Namespace.get(namespace), module),
+            provider
+        )
+
+    def test_get(self):
+        """Test queue is only returned when enabled"""
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE', ModuleImportQueueType.DISABLED):
+            assert ModuleImportQueue.get() is None
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE', ModuleImportQueueType.DATABASE):
+            assert isinstance(ModuleImportQueue.get(), ModuleImportQueue)
+
+    def test_enqueue(self):
+        """Test adding job to queue"""
+        module_provider = self._get_module_provider('testnamespace', 'noversions', 'testprovider')
+
+        job = ModuleImportQueue().enqueue(module_provider=module_provider, version='1.2.3')
+
+        job = ModuleImportJob.get(job.pk)
+        assert job.module_provider_id == module_provider.pk
+        assert job.version == '1.2.3'
+        assert job.status is ModuleImportJobStatus.PENDING
+        assert job.attempts == 0
+        assert job.username == 'Built-in admin'
+        assert job.error is None
+        assert job.bulk_reindex is False
+
+    def test_enqueue_deduplicates_pending_jobs(self):
+        """Test identical pending imports are only queued once"""
+        queue = ModuleImportQueue()
+        module_provider = self._get_module_provider('testnamespace', 'noversions', 'testprovider')
+        other_module_provider = self._get_module_provider('testnamespace', 'onlybeta', 'testprovider')
+
+        job = queue.enqueue(module_provider=module_provider, version='1.2.3')
+        assert queue.enqueue(module_provider=module_provider, version='1.2.3').pk == job.pk
+        assert queue.enqueue(module_provider=module_provider, version='1.2.4').pk != job.pk
+        assert queue.enqueue(module_provider=other_module_provider, version='1.2.3').pk != job.pk
+
+        # Once job has started, a new import of the version is queued
+        job.update_attributes(status=ModuleImportJobStatus.RUNNING)
+        assert queue.enqueue(module_provider=module_provider, version='1.2.3').pk != job.pk
+
+    def test_get_non_existent(self):
+        """Test obtaining non-existent job"""
+        assert ModuleImportJob.get(1234) is None
+
+    def test_claim_next_job(self):
+        """Test jobs are claimed in order they were queued"""
+        queue = ModuleImportQueue()
+        module_provider = self._get_module_provider('testnamespace', 'noversions', 'testprovider')
+        first_job = queue.enqueue(module_provider=module_provider, version='1.0.0')
+        second_job = queue.enqueue(module_provider=module_provider, version='2.0.0')
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY', 2):
+            claimed_job = queue.claim_next_job()
+            assert claimed_job.pk == first_job.pk
+            assert claimed_job.status is ModuleImportJobStatus.RUNNING
+            assert claimed_job.attempts == 1
+
+            assert queue.claim_next_job().pk == second_job.pk
+            assert queue.claim_next_job() is None
+
+    def test_claim_next_job_namespace_concurrency(self):
+        """Test concurrent jobs are limited per namespace"""
+        queue = ModuleImportQueue()
+        first_job = queue.enqueue(
+            module_provider=self._get_module_provider('testnamespace', 'noversions', 'testprovider'),
+            version='1.0.0')
+        second_job = queue.enqueue(
+            module_provider=self._get_module_provider('testnamespace', 'onlybeta', 'testprovider'),
+            version='1.0.0')
+        other_namespace_job = queue.enqueue(
+            module_provider=self._get_module_provider('moduleextraction', 'test-module', 'testprovider'),
+            version='1.0.0')
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY', 1):
+            assert queue.claim_next_job().pk == first_job.pk
+            assert queue.claim_next_job().pk == other_namespace_job.pk
+            assert queue.claim_next_job() is None
+
+            # Once the running job has completed, the next job in the namespace is claimed
+            first_job.update_attributes(status=ModuleImportJobStatus.SUCCEEDED)
+            assert queue.claim_next_job().pk == second_job.pk
+
+    def test_claim_next_job_saturated_namespace(self):
+        """Test jobs in other namespaces are claimed when pending jobs of a saturated namespace exceed the claim batch size"""
+        queue = ModuleImportQueue()
+        module_provider = self._get_module_provider('testnamespace', 'noversions', 'testprovider')
+        namespace_jobs = [
+            queue.enqueue(module_provider=module_provider, version=f'1.0.{itx}')
+            for itx in range(3)
+        ]
+        other_namespace_job = queue.enqueue(
+            module_provider=self._get_module_provider('moduleextraction', 'test-module', 'testprovider'),
+            version='1.0.0')
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY', 1), \
+                unittest.mock.patch.object(ModuleImportQueue, 'CLAIM_BATCH_SIZE', 2):
+            assert queue.claim_next_job().pk == namespace_jobs[0].pk
+            assert queue.claim_next_job().pk == other_namespace_job.pk
+            assert queue.claim_next_job() is None
+
+    def test_claim_next_job_concurrent_claim(self):
+        """Test job is returned to the queue if another worker concurrently claimed a job in the namespace"""
+        queue = ModuleImportQueue()
+        first_job = queue.enqueue(
+            module_provider=self._get_module_provider('testnamespace', 'noversions', 'testprovider'),
+            version='1.0.0')
+        second_job = queue.enqueue(
+            module_provider=self._get_module_provider('testnamespace', 'onlybeta', 'testprovider'),
+            version='1.0.0')
+        first_job.update_attributes(status=ModuleImportJobStatus.RUNNING, attempts=1, started_at=datetime.datetime.now())
+
+        # Simulate first job being claimed by another worker after
+        # running jobs have been counted.
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY', 1), \
+                unittest.mock.patch('terrareg.module_import_queue.Counter', return_value=collections.Counter()):
+            assert queue.claim_next_job() is None
+
+        second_job = ModuleImportJob.get(second_job.pk)
+        assert second_job.status is ModuleImportJobStatus.PENDING
+        assert second_job.attempts == 0
+        assert ModuleImportJob.get(first_job.pk).status is ModuleImportJobStatus.RUNNING
+
+    def test_claim_next_job_version_already_running(self):
+        """Test job is not claimed whilst an import of the same version is running"""
+        queue = ModuleImportQueue()
+        module_provider = self._get_module_provider('testnamespace', 'noversions', 'testprovider')
+        running_job = queue.enqueue(module_provider=module_provider, version='1.0.0')
+        running_job.update_attributes(status=ModuleImportJobStatus.RUNNING, started_at=datetime.datetime.now())
+        queue.enqueue(module_provider=module_provider, version='1.0.0')
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY', 5):
+            assert queue.claim_next_job() is None
+
+    def test_claim_next_job_run_after(self):
+        """Test jobs are not claimed before their retry time"""
+        queue = ModuleImportQueue()
+        job = queue.enqueue(
+            module_provider=self._get_module_provider('testnamespace', 'noversions', 'testprovider'),
+            version='1.0.0')
+        job.update_attributes(run_after=datetime.datetime.now() + datetime.timedelta(minutes=5))
+
+        assert queue.claim_next_job() is None
+
+        job.update_attributes(run_after=datetime.datetime.now() - datetime.timedelta(minutes=5))
+        assert queue.claim_next_job().pk == job.pk
+
+    @pytest.mark.parametrize('attempts, expected_status, expected_claimed', [
+        (1, ModuleImportJobStatus.RUNNING, True),
+        (3, ModuleImportJobStatus.FAILED, False),
+    ])
+    def test_claim_next_job_stale_jobs(self, attempts, expected_status, expected_claimed):
+        """Test jobs abandoned by workers are retried"""
+        queue = ModuleImportQueue()
+        job = queue.enqueue(
+            module_provider=self._get_module_provider('testnamespace', 'noversions', 'testprovider'),
+            version='1.0.0')
+        job.update_attributes(
+            status=ModuleImportJobStatus.RUNNING,
+            attempts=attempts,
+            started_at=datetime.datetime.now() - queue.JOB_TIMEOUT - datetime.timedelta(minutes=1)
+        )
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE_MAX_ATTEMPTS', 3):
+            claimed_job = queue.claim_next_job()
+
+        assert (claimed_job is not None) == expected_claimed
+        assert ModuleImportJob.get(job.pk).status is expected_status
+
+    def test_run_job(self):
+        """Test running job successfully"""
+        queue = ModuleImportQueue()
+        module_provider = self._get_module_provider('moduleextraction', 'test-module', 'testprovider')
+        queue.enqueue(module_provider=module_provider, version='1.0.0')
+        job = queue.claim_next_job()
+
+        with unittest.mock.patch('terrareg.models.ModuleVersion.prepare_module', return_value=False) as mock_prepare_module, \
+                unittest.mock.patch('terrareg.module_extractor.GitModuleExtractor') as mock_git_module_extractor:
+            assert queue.run_job(job=job, app=self.SERVER._app) is True
+
+        mock_prepare_module.assert_called_once_with()
+        module_version = mock_git_module_extractor.call_args.kwargs['module_version']
+        assert module_version.version == '1.0.0'
+        assert module_version.module_provider.pk == module_provider.pk
+        mock_git_module_extractor.return_value.__enter__.return_value.process_upload.assert_called_once_with()
+
+        job = ModuleImportJob.get(job.pk)
+        assert job.status is ModuleImportJobStatus.SUCCEEDED
+        assert job.error is None
+        assert job._get_db_row()['finished_at'] is not None
+
+    @pytest.mark.parametrize('bulk_reindex, expected_published', [
+        (True, True),
+        (False, False),
+    ])
+    def test_run_job_bulk_reindex(self, bulk_reindex, expected_published):
+        """Test bulk re-index jobs retain the published state of the existing module version"""
+        queue = ModuleImportQueue()
+        module_provider = self._get_module_provider('testnamespace', 'wrongversionorder', 'testprovider')
+        queue.enqueue(module_provider=module_provider, version='1.5.4', bulk_reindex=bulk_reindex)
+        job = queue.claim_next_job()
+        assert job.bulk_reindex is bulk_reindex
+
+        def mock_prepare_module(module_version):
+            """Replace module version with unpublished module version"""
+            module_version.update_attributes(published=False)
+            return False
+
+        try:
+            with unittest.mock.patch('terrareg.models.ModuleVersion.prepare_module', autospec=True, side_effect=mock_prepare_module), \
+                    unittest.mock.patch('terrareg.module_extractor.GitModuleExtractor'):
+                assert queue.run_job(job=job, app=self.SERVER._app) is True
+
+            assert terrareg.models.ModuleVersion.get(module_provider=module_provider, version='1.5.4').published is expected_published
+        finally:
+            terrareg.models.ModuleVersion(module_provider=module_provider, version='1.5.4').update_attributes(published=True)
+
+    @pytest.mark.parametrize('attempts, expected_status', [
+        (1, ModuleImportJobStatus.PENDING),
+        (2, ModuleImportJobStatus.PENDING),
+        (3, ModuleImportJobStatus.FAILED),
+    ])
+    def test_run_job_failure(self, attempts, expected_status):
+        """Test failed jobs are retried until maximum attempts is reached"""
+        queue = ModuleImportQueue()
+        job = queue.enqueue(
+            module_provider=self._get_module_provider('moduleextraction', 'test-module', 'testprovider'),
+            version='1.0.0')
+        job.update_attributes(attempts=attempts, status=ModuleImportJobStatus.RUNNING)
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE_MAX_ATTEMPTS', 3), \
+                unittest.mock.patch('terrareg.models.ModuleVersion.prepare_module', return_value=False), \
+                unittest.mock.patch('terrareg.module_extractor.GitModuleExtractor') as mock_git_module_extractor:
+            mock_git_module_extractor.return_value.__enter__.return_value.process_upload.side_effect = terrareg.errors.GitCloneError('Unittest clone error')
+            assert queue.run_job(job=job, app=self.SERVER._app) is False
+
+        job = ModuleImportJob.get(job.pk)
+        assert job.status is expected_status
+        assert job.error == 'Unittest clone error'
+        if expected_status is ModuleImportJobStatus.PENDING:
+            expected_delay = queue.RETRY_DELAY * (2 ** (attempts - 1))
+            assert job._get_db_row()['run_after'] > datetime.datetime.now() + expected_delay - datetime.timedelta(seconds=10)
+            assert job._get_db_row()['finished_at'] is None
+        else:
+            assert job._get_db_row()['finished_at'] is not None
+
+    def test_import_api_queues_job(self, client):
+        """Test import API queues import and returns job"""
+        module_provider = self._get_module_provider('moduleextraction', 'test-module', 'testprovider')
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_IMPORT_QUEUE', ModuleImportQueueType.DATABASE), \
+                unittest.mock.patch('terrareg.module_extractor.GitModuleExtractor') as mock_git_module_extractor:
+            res = client.post(
+                '/v1/terrareg/modules/moduleextraction/test-module/testprovider/import',
+                json={'version': '1.0.0'}
+            )
+
+        assert res.status_code == 202
+        assert res.json == {'status': 'Queued', 'job_id': res.json['job_id']}
+        mock_git_module_extractor.assert_not_called()
+
+        job = ModuleImportJob.get(res.json['job_id'])
+        assert job.module_provider_id == module_provider.pk
+        assert job.version == '1.0.0'
+        assert job.status is ModuleImportJobStatus.PENDING
+
+        res = client.get(f'/v1/terrareg/modules/moduleextraction/test-module/testprovider/import-jobs/{job.pk}')
+        assert res.status_code == 200
+        assert res.json == {
+            'id': job.pk,
+            'version': '1.0.0',
+            'status': 'pending',
+            'attempts': 0,
+            'error': None,
+            'created_at': job._get_db_row()['created_at'].isoformat(),
+            'started_at': None,
+            'finished_at': None,
+        }
+
+    def test_import_job_api_other_module_provider(self, client):
+        """Test import job API does not return jobs of other module providers"""
+        job = ModuleImportQueue().enqueue(
+            module_provider=self._get_module_provider('moduleextraction', 'test-module', 'testprovider'),
+            version='1.0.0')
+
+        res = client.get(f'/v1/terrareg/modules/testnamespace/noversions/testprovider/import-jobs/{job.pk}')
+        assert res.status_code == 404
+        assert res.json == {'message': 'Module import job does not exist'}
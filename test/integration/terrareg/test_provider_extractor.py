@@ -551,6 +551,7 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  ./requirements
             mock_obtain_source_code = unittest.mock.MagicMock(side_effect=mock_obtain_source_code_side_effect)
 
             mock_switch_terraform_versions = unittest.mock.MagicMock()
+            mock_switch_terraform_versions.return_value.__enter__.return_value = '/tmp/terraform-binary/terraform'
 
             mock_subprocess = unittest.mock.MagicMock()
             mock_collect_markdown_documentation = unittest.mock.MagicMock()
@@ -580,6 +581,8 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  ./requirements
                     env_vars = mock_subprocess.call.call_args_list[0].kwargs["env"]
                     # Ensure parent env variables are passed
                     assert "PATH" in env_vars
+                    # Ensure terraform binary directory is added to PATH
+                    assert env_vars["PATH"].startswith("/tmp/terraform-binary:")
                     # Ensure GO env vars are injected
                     assert "GOROOT" in env_vars
                     assert env_vars["GOROOT"] == "/usr/local/go"
@@ -766,75 +769,95 @@ Test Markdown content: {file_}""")
                         }
 
 
-    def test__process_release_file(self, test_provider_version_wrapper):
-        """Test _process_release_file"""
+    def _get_artifact_metadata(self, provider_extractor, file_name):
+        """Return release artifact metadata for file name"""
+        return provider_extractor._get_release_artifact_metadata(release_metadata=provider_extractor._release_metadata, file_name=file_name)
 
-        mock_get_release_artifact = unittest.mock.MagicMock(return_value=b"Some binary value of artifact file")
+    def test__download_release_file(self, test_provider_version_wrapper):
+        """Test _download_release_file"""
 
-        with unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource.get_release_artifact', mock_get_release_artifact), \
-                test_provider_version_wrapper() as provider_extractor:
+        mock_downloader = unittest.mock.MagicMock(return_value=iter([b"Some binary value ", b"of artifact file"]))
+
+        with test_provider_version_wrapper() as provider_extractor, \
+                TemporaryDirectory() as download_directory:
 
-            provider_extractor._process_release_file(
+            artifact_metadata = self._get_artifact_metadata(provider_extractor, "terraform-provider-multiple-versions_1.9.4_linux_amd64.zip")
+            file_path = provider_extractor._download_release_file(
+                downloader=mock_downloader,
+                artifact_metadata=artifact_metadata,
                 checksum="a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc",
-                file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip"
+                download_directory=download_directory
             )
 
-            # Obtain DB row for release binary
-            db = terrareg.database.Database.get()
-            with db.get_connection() as conn:
-                res = conn.execute(db.provider_version_binary.select().where(
-                    db.provider_version_binary.c.provider_version_id==provider_extractor._provider_version.pk
-                )).all()
-                assert len(res) == 1
-                row = dict(res[0])
-                assert row['architecture'] == ProviderBinaryArchitectureType.AMD64
-                assert row['checksum'] == 'a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc'
-                assert row['name'] == 'terraform-provider-multiple-versions_1.9.4_linux_amd64.zip'
-                assert row['operating_system'] == ProviderBinaryOperatingSystemType.LINUX
-
-    def test__process_release_file_invalid_checksum(self, test_provider_version_wrapper):
-        """Test _process_release_file with invalid checksum"""
+            assert file_path == os.path.join(download_directory, "terraform-provider-multiple-versions_1.9.4_linux_amd64.zip")
+            with open(file_path, "rb") as fh:
+                assert fh.read() == b"Some binary value of artifact file"
+
+            mock_downloader.assert_called_once_with(artifact_metadata)
+            assert list(provider_extractor.artifact_download_timings) == ["terraform-provider-multiple-versions_1.9.4_linux_amd64.zip"]
+
+    @pytest.mark.parametrize('artifact_contents, expected_exception, expected_call_count', [
+        # Checksum mismatch is retried
+        ([[b"Some other binary value that does not match"]] * 3, terrareg.errors.InvalidReleaseArtifactChecksumError, 3),
+        # Non-existent and empty files are not retried
+        ([None], terrareg.errors.MissingReleaseArtifactError, 1),
+        ([[]], terrareg.errors.MissingReleaseArtifactError, 1),
+        # Server errors are retried
+        ([terrareg.errors.ReleaseArtifactDownloadError("Github returned 502")] * 3, terrareg.errors.ReleaseArtifactDownloadError, 3),
+        # Rejected requests are not retried
+        ([terrareg.errors.ReleaseArtifactDownloadRejectedError("Github returned 401")], terrareg.errors.ReleaseArtifactDownloadRejectedError, 1),
+    ])
+    def test__download_release_file_invalid(self, artifact_contents, expected_exception, expected_call_count, test_provider_version_wrapper):
+        """Test _download_release_file with invalid checksum or non-existent file"""
 
-        mock_get_release_artifact = unittest.mock.MagicMock(return_value=b"Some other binary value that does not match")
+        mock_downloader = unittest.mock.MagicMock(side_effect=[
+            content if content is None or isinstance(content, Exception) else iter(content)
+            for content in artifact_contents
+        ])
 
-        with unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource.get_release_artifact', mock_get_release_artifact), \
-                test_provider_version_wrapper() as provider_extractor:
+        with test_provider_version_wrapper() as provider_extractor, \
+                TemporaryDirectory() as download_directory, \
+                unittest.mock.patch('time.sleep') as mock_sleep:
 
-            with pytest.raises(terrareg.errors.InvalidReleaseArtifactChecksumError):
-                provider_extractor._process_release_file(
+            with pytest.raises(expected_exception):
+                provider_extractor._download_release_file(
+                    downloader=mock_downloader,
+                    artifact_metadata=self._get_artifact_metadata(provider_extractor, "terraform-provider-multiple-versions_1.9.4_linux_amd64.zip"),
                     checksum="a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc",
-                    file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip"
+                    download_directory=download_directory
                 )
 
-            # Obtain DB row for release binary
-            db = terrareg.database.Database.get()
-            with db.get_connection() as conn:
-                res = conn.execute(db.provider_version_binary.select().where(
-                    db.provider_version_binary.c.provider_version_id==provider_extractor._provider_version.pk
-                )).all()
-                assert len(res) == 0
+            assert os.listdir(download_directory) == []
+            assert mock_downloader.call_count == expected_call_count
+            assert mock_sleep.call_args_list == [
+                unittest.mock.call(provider_extractor.ARTIFACT_DOWNLOAD_RETRY_DELAY * (2 ** itx))
+                for itx in range(expected_call_count - 1)
+            ]
 
-    def test__process_release_file_non_existent_file(self, test_provider_version_wrapper):
-        """Test _process_release_file with non-existent file"""
+    def test__download_release_file_retry(self, test_provider_version_wrapper):
+        """Test _download_release_file retries failed downloads"""
 
-        mock_get_release_artifact = unittest.mock.MagicMock(return_value=None)
+        def failed_download():
+            yield b"Partial content"
+            raise ConnectionError("Unittest connection error")
 
-        with unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource.get_release_artifact', mock_get_release_artifact), \
-                test_provider_version_wrapper() as provider_extractor:
+        mock_downloader = unittest.mock.MagicMock(side_effect=[failed_download(), iter([b"Some binary value of artifact file"])])
 
-            with pytest.raises(terrareg.errors.MissingReleaseArtifactError):
-                provider_extractor._process_release_file(
-                    checksum="a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc",
-                    file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip"
-                )
+        with test_provider_version_wrapper() as provider_extractor, \
+                TemporaryDirectory() as download_directory, \
+                unittest.mock.patch('time.sleep') as mock_sleep:
 
-            # Obtain DB row for release binary
-            db = terrareg.database.Database.get()
-            with db.get_connection() as conn:
-                res = conn.execute(db.provider_version_binary.select().where(
-                    db.provider_version_binary.c.provider_version_id==provider_extractor._provider_version.pk
-                )).all()
-                assert len(res) == 0
+            file_path = provider_extractor._download_release_file(
+                downloader=mock_downloader,
+                artifact_metadata=self._get_artifact_metadata(provider_extractor, "terraform-provider-multiple-versions_1.9.4_linux_amd64.zip"),
+                checksum="a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc",
+                download_directory=download_directory
+            )
+
+            with open(file_path, "rb") as fh:
+                assert fh.read() == b"Some binary value of artifact file"
+            assert mock_downloader.call_count == 2
+            mock_sleep.assert_called_once_with(provider_extractor.ARTIFACT_DOWNLOAD_RETRY_DELAY)
 
     def test_extract_binaries(self, test_provider_version_wrapper):
         """Test extract_binaries"""
@@ -849,12 +872,36 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  terraform-prov
 8720fafebf4e5ab4affc7426d78b23ce2f2b54a8dfbda4d45abf8051b4558b51  terraform-provider-multiple-versions_1.9.4_manifest.json
 0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d  terraform-provider-multiple-versions_1.9.4_windows_amd64.zip
 """)
-        mock_process_release_file = unittest.mock.MagicMock()
+        def download_release_file(downloader, artifact_metadata, checksum, download_directory):
+            file_path = os.path.join(download_directory, artifact_metadata.name)
+            with open(file_path, "w") as fh:
+                fh.write(f"Content of {artifact_metadata.name}")
+            return file_path
+        mock_download_release_file = unittest.mock.MagicMock(side_effect=download_release_file)
+        mock_downloader = unittest.mock.MagicMock()
+        mock_get_release_artifact_downloader = unittest.mock.MagicMock(return_value=mock_downloader)
+
+        uploaded_files = {}
+        def upload_files(uploads):
+            for source_path, dest_directory, dest_filename in uploads:
+                with open(source_path, "r") as fh:
+                    uploaded_files[os.path.join(dest_directory, dest_filename)] = fh.read()
+        mock_file_storage = unittest.mock.MagicMock()
+        mock_file_storage.upload_files = unittest.mock.MagicMock(side_effect=upload_files)
 
         with unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_artifact', mock_download_artifact), \
-                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._process_release_file', mock_process_release_file), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_release_file', mock_download_release_file), \
+                unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource.get_release_artifact_downloader', mock_get_release_artifact_downloader), \
+                unittest.mock.patch('terrareg.file_storage.FileStorageFactory.get_file_storage', unittest.mock.MagicMock(return_value=mock_file_storage)), \
+                unittest.mock.patch('terrareg.config.Config.PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY', 2), \
+                unittest.mock.patch('terrareg.provider_extractor.ThreadPoolExecutor', wraps=terrareg.provider_extractor.ThreadPoolExecutor) as mock_executor, \
                 test_provider_version_wrapper() as provider_extractor:
 
+            provider_extractor._release_metadata.release_artifacts.extend([
+                terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata(name="terraform-provider-multiple-versions_1.9.4_linux_arm64.zip", provider_id="linux-arm64-id"),
+                terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata(name="terraform-provider-multiple-versions_1.9.4_windows_amd64.zip", provider_id="windows-amd64-id"),
+            ])
+
             provider_extractor.extract_binaries()
 
             mock_download_artifact.assert_called_once_with(
@@ -863,11 +910,81 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  terraform-prov
                 file_name="terraform-provider-multiple-versions_1.9.4_SHA256SUMS"
             )
 
-            mock_process_release_file.assert_has_calls(calls=[
-                unittest.mock.call(checksum='aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657', file_name='terraform-provider-multiple-versions_1.9.4_linux_arm64.zip'),
-                unittest.mock.call(checksum='5bf710f5427bafae2a01103ebb48271fedd0ab784e04d11ef95bc057dce8cf7f', file_name='terraform-provider-multiple-versions_1.9.4_windows_arm64.zip'),
-                unittest.mock.call(checksum='0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d', file_name='terraform-provider-multiple-versions_1.9.4_windows_amd64.zip')
-            ], any_order=False)
+            mock_get_release_artifact_downloader.assert_called_once_with(
+                provider=provider_extractor._provider,
+                release_metadata=provider_extractor._release_metadata
+            )
+            mock_executor.assert_called_once_with(max_workers=2, thread_name_prefix='provider-artifact-download')
+
+            mock_download_release_file.assert_has_calls(calls=[
+                unittest.mock.call(downloader=mock_downloader, artifact_metadata=self._get_artifact_metadata(provider_extractor, file_name), checksum=checksum, download_directory=unittest.mock.ANY)
+                for checksum, file_name in [
+                    ('aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657', 'terraform-provider-multiple-versions_1.9.4_linux_arm64.zip'),
+                    ('5bf710f5427bafae2a01103ebb48271fedd0ab784e04d11ef95bc057dce8cf7f', 'terraform-provider-multiple-versions_1.9.4_windows_arm64.zip'),
+                    ('0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d', 'terraform-provider-multiple-versions_1.9.4_windows_amd64.zip'),
+                ]
+            ], any_order=True)
+
+            # Ensure all binaries are uploaded in a single batch
+            mock_file_storage.upload_files.assert_called_once()
+            base_directory = provider_extractor._provider_version.base_directory
+            assert uploaded_files == {
+                os.path.join(base_directory, file_name): f"Content of {file_name}"
+                for file_name in [
+                    'terraform-provider-multiple-versions_1.9.4_linux_arm64.zip',
+                    'terraform-provider-multiple-versions_1.9.4_windows_arm64.zip',
+                    'terraform-provider-multiple-versions_1.9.4_windows_amd64.zip',
+                ]
+            }
+
+            db = terrareg.database.Database.get()
+            with db.get_connection() as conn:
+                res = conn.execute(db.provider_version_binary.select().where(
+                    db.provider_version_binary.c.provider_version_id==provider_extractor._provider_version.pk
+                )).all()
+            assert sorted((row['name'], row['checksum']) for row in res) == [
+                ('terraform-provider-multiple-versions_1.9.4_linux_arm64.zip', 'aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657'),
+                ('terraform-provider-multiple-versions_1.9.4_windows_amd64.zip', '0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d'),
+                ('terraform-provider-multiple-versions_1.9.4_windows_arm64.zip', '5bf710f5427bafae2a01103ebb48271fedd0ab784e04d11ef95bc057dce8cf7f'),
+            ]
+
+    def test_extract_binaries_download_error(self, test_provider_version_wrapper):
+        """Test extract_binaries does not create binaries when a download fails"""
+
+        mock_download_artifact = unittest.mock.MagicMock(return_value=b"""
+5bf710f5427bafae2a01103ebb48271fedd0ab784e04d11ef95bc057dce8cf7f  terraform-provider-multiple-versions_1.9.4_windows_arm64.zip
+0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d  terraform-provider-multiple-versions_1.9.4_linux_amd64.zip
+""")
+        mock_download_release_file = unittest.mock.MagicMock(side_effect=terrareg.errors.InvalidReleaseArtifactChecksumError("Invalid checksum"))
+        mock_create_many = unittest.mock.MagicMock()
+
+        with unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_artifact', mock_download_artifact), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_release_file', mock_download_release_file), \
+                unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource.get_release_artifact_downloader', unittest.mock.MagicMock()), \
+                unittest.mock.patch('terrareg.provider_version_binary_model.ProviderVersionBinary.create_many', mock_create_many), \
+                test_provider_version_wrapper() as provider_extractor:
+
+            with pytest.raises(terrareg.errors.InvalidReleaseArtifactChecksumError):
+                provider_extractor.extract_binaries()
+
+        mock_create_many.assert_not_called()
+
+    def test_extract_binaries_missing_artifact_metadata(self, test_provider_version_wrapper):
+        """Test extract_binaries with binary that is not present in release artifacts"""
+
+        mock_download_artifact = unittest.mock.MagicMock(return_value=b"""
+aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  terraform-provider-multiple-versions_1.9.4_linux_arm64.zip
+""")
+        mock_get_release_artifact_downloader = unittest.mock.MagicMock()
+
+        with unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_artifact', mock_download_artifact), \
+                unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource.get_release_artifact_downloader', mock_get_release_artifact_downloader), \
+                test_provider_version_wrapper() as provider_extractor:
+
+            with pytest.raises(terrareg.errors.MissingReleaseArtifactError):
+                provider_extractor.extract_binaries()
+
+        mock_get_release_artifact_downloader.assert_not_called()
 
     def test_extract_binaries_invalid_checksum(self, test_provider_version_wrapper):
         """Test extract_binaries with invalid checksum file"""
@@ -878,10 +995,10 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  terraform-prov
 this is a random line
 0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d  terraform-provider-multiple-versions_1.9.4_windows_amd64.zip
 """.strip())
-        mock_process_release_file = unittest.mock.MagicMock()
+        mock_download_release_file = unittest.mock.MagicMock()
 
         with unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_artifact', mock_download_artifact), \
-                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._process_release_file', mock_process_release_file), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_release_file', mock_download_release_file), \
                 test_provider_version_wrapper() as provider_extractor:
 
             with pytest.raises(terrareg.errors.InvalidChecksumFileError):
@@ -10,6 +10,7 @@ import pytest
 from terrareg.database import Database
 from terrareg.errors import DuplicateNamespaceDisplayNameError, NamespaceAlreadyExistsError
 import terrareg.models
+import terrareg.module_specs_cache
 from terrareg.server import Server
 import terrareg.config
 import terrareg.result_data
@@ -62,6 +63,8 @@ def setup_test_data(test_data=None, user_group_data=None, namespace_redirects=No
             global TEST_MODULE_PROVIDER_REDIRECTS
             TEST_MODULE_DATA = deepcopy(test_data if test_data else test_data_full)
             TEST_MODULE_DETAILS = {}
+            # Remove cached module specs, as module details IDs are re-used between tests
+            terrareg.module_specs_cache.ModuleSpecsCache.clear()
             USER_GROUP_CONFIG = deepcopy(user_group_data if user_group_data else test_user_group_data_full)
             TEST_NAMESPACE_REDIRECTS = deepcopy(namespace_redirects if namespace_redirects else {})
             TEST_MODULE_PROVIDER_REDIRECTS = deepcopy(module_provider_redirects if module_provider_redirects else {})
@@ -201,11 +204,16 @@ def mock_module_details(request):
 
     def update_attributes(self, **kwargs):
         TEST_MODULE_DETAILS[str(self._id)].update(**kwargs)
+        self._column_cache = {}
+        terrareg.module_specs_cache.ModuleSpecsCache.invalidate(self._id)
     mock_method(request, 'terrareg.models.ModuleDetails.update_attributes', update_attributes)
 
-    def _get_db_row(self):
-        return dict(TEST_MODULE_DETAILS[str(self._id)])
-    mock_method(request, 'terrareg.models.ModuleDetails._get_db_row', _get_db_row)
+    def _load_columns(self, columns):
+        return {
+            column: TEST_MODULE_DETAILS[str(self._id)].get(column)
+            for column in columns
+        }
+    mock_method(request, 'terrareg.models.ModuleDetails._load_columns', _load_columns)
 
 
 def mock_module_version(request):
@@ -622,6 +630,19 @@ def mock_namespace(request):
         ]
     mock_method(request, 'terrareg.models.Namespace.get_all_modules', get_all_modules)
 
+    def get_module_providers(self, offset=0, limit=None, include_module_details=False):
+        """Return module providers in namespace."""
+        module_providers = [
+            module_provider
+            for module in self.get_all_modules()
+            for module_provider in module.get_providers()
+        ]
+        return terrareg.result_data.ResultData(
+            offset=offset, limit=limit, count=len(module_providers),
+            rows=(module_providers[offset:] if limit is None else module_providers[offset:offset + limit])
+        )
+    mock_method(request, 'terrareg.models.Namespace.get_module_providers', get_module_providers)
+
 MOCK_SESSIONS = {}
 
 def mock_session(request):
@@ -19,7 +19,8 @@ def mocked_search_module_providers(request):
             namespaces: list=None,
             providers: list=None,
             verified: bool=False,
-            namespace_trust_filters: list=terrareg.filters.NamespaceTrustFilter.UNSPECIFIED):
+            namespace_trust_filters: list=terrareg.filters.NamespaceTrustFilter.UNSPECIFIED,
+            include_module_details: bool=False):
         return terrareg.result_data.ResultData(offset=offset, limit=limit, count=0, rows=[])
 
     magic_mock = unittest.mock.MagicMock(
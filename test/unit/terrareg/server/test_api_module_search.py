@@ -31,7 +31,7 @@ class TestApiModuleSearch(TerraregUnitTest):
         ModuleSearch.search_module_providers.assert_called_with(
             query='unittestteststring', namespaces=None, providers=None, verified=False,
             namespace_trust_filters=NamespaceTrustFilter.UNSPECIFIED,
-            offset=0, limit=10)
+            offset=0, limit=10, include_module_details=False)
 
     def test_with_limit_offset(self, client, mocked_search_module_providers, mock_models):
         """Call with limit and offset"""
@@ -44,7 +44,7 @@ class TestApiModuleSearch(TerraregUnitTest):
         ModuleSearch.search_module_providers.assert_called_with(
             query='test', namespaces=None, providers=None, verified=False,
             namespace_trust_filters=NamespaceTrustFilter.UNSPECIFIED,
-            offset=23, limit=12)
+            offset=23, limit=12, include_module_details=False)
 
     def test_with_provider(self, client, mocked_search_module_providers, mock_models):
         """Call with provider filter"""
@@ -57,7 +57,7 @@ class TestApiModuleSearch(TerraregUnitTest):
         ModuleSearch.search_module_providers.assert_called_with(
             query='test', namespaces=None, providers=['testprovider'], verified=False,
             namespace_trust_filters=NamespaceTrustFilter.UNSPECIFIED,
-            offset=0, limit=10)
+            offset=0, limit=10, include_module_details=False)
 
     def test_with_multiple_providers(self, client, mocked_search_module_providers):
         """Call with multiple provider filters."""
@@ -70,7 +70,7 @@ class TestApiModuleSearch(TerraregUnitTest):
         ModuleSearch.search_module_providers.assert_called_with(
             query='test', namespaces=None, providers=['testprovider1', 'unittestprovider2'], verified=False,
             namespace_trust_filters=NamespaceTrustFilter.UNSPECIFIED,
-            offset=0, limit=10)
+            offset=0, limit=10, include_module_details=False)
 
     def test_with_namespace(self, client, mocked_search_module_providers, mock_models):
         """Call with namespace filter"""
@@ -83,7 +83,7 @@ class TestApiModuleSearch(TerraregUnitTest):
         ModuleSearch.search_module_providers.assert_called_with(
             query='test', namespaces=['testnamespace'], providers=None, verified=False,
             namespace_trust_filters=NamespaceTrustFilter.UNSPECIFIED,
-            offset=0, limit=10)
+            offset=0, limit=10, include_module_details=False)
 
     def test_with_multiple_namespaces(self, client, mocked_search_module_providers, mock_models):
         """Call with namespace filter"""
@@ -96,7 +96,7 @@ class TestApiModuleSearch(TerraregUnitTest):
         ModuleSearch.search_module_providers.assert_called_with(
             query='test', namespaces=['testnamespace', 'unittestnamespace2'], providers=None, verified=False,
             namespace_trust_filters=NamespaceTrustFilter.UNSPECIFIED,
-            offset=0, limit=10)
+            offset=0, limit=10, include_module_details=False)
 
     def test_with_namespace_trust_filters(self, client, mocked_search_module_providers, mock_models):
         """Call with trusted namespace/contributed filters"""
@@ -118,7 +118,7 @@ class TestApiModuleSearch(TerraregUnitTest):
             ModuleSearch.search_module_providers.assert_called_with(
                 query='test', namespaces=None, providers=None, verified=False,
                 namespace_trust_filters=namespace_filter[1],
-                offset=0, limit=10)
+                offset=0, limit=10, include_module_details=False)
 
     def test_with_verified_false(self, client, mocked_search_module_providers, mock_models):
         """Call with verified flag as false"""
@@ -131,7 +131,7 @@ class TestApiModuleSearch(TerraregUnitTest):
         ModuleSearch.search_module_providers.assert_called_with(
             query='test', namespaces=None, providers=None, verified=False,
             namespace_trust_filters=NamespaceTrustFilter.UNSPECIFIED,
-            offset=0, limit=10)
+            offset=0, limit=10, include_module_details=False)
 
     def test_with_verified_true(self, client, mocked_search_module_providers, mock_models):
         """Test call with verified as true"""
@@ -144,7 +144,7 @@ class TestApiModuleSearch(TerraregUnitTest):
         ModuleSearch.search_module_providers.assert_called_with(
             query='test', namespaces=None, providers=None, verified=True,
             namespace_trust_filters=NamespaceTrustFilter.UNSPECIFIED,
-            offset=0, limit=10)
+            offset=0, limit=10, include_module_details=False)
 
     @setup_test_data()
     def test_with_single_module_response(self, client, mocked_search_module_providers, mock_models):
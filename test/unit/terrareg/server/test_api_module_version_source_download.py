@@ -1,4 +1,7 @@
 
+import contextlib
+import os
+import tempfile
 import unittest.mock
 
 import pytest
@@ -11,6 +14,7 @@ from test.unit.terrareg import (
 )
 import terrareg.models
 import terrareg.config
+import terrareg.file_storage
 from test import client, mock_create_audit_event
 from . import mock_record_module_version_download
 
@@ -18,6 +22,20 @@ from . import mock_record_module_version_download
 class TestApiModuleVersionSourceDownload(TerraregUnitTest):
     """Test ApiModuleVersionDownload resource."""
 
+    ARCHIVE_CONTENT = b'UNIT TEST BINARY OUTPUT' * 10000
+
+    @contextlib.contextmanager
+    def _local_file_storage(self, create_archive=True):
+        """Patch file storage with local file storage, containing module version archive"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_storage = terrareg.file_storage.LocalFileStorage(temp_dir)
+            if create_archive:
+                with file_storage.open_write('/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip') as fh:
+                    fh.write(self.ARCHIVE_CONTENT)
+            with unittest.mock.patch('terrareg.file_storage.FileStorageFactory.get_file_storage',
+                                     unittest.mock.MagicMock(return_value=file_storage)):
+                yield file_storage
+
             # '/v1/terrareg/modules/<string:namespace>/<string:name>/<string:provider>/<string:version>/source.zip',
             # '/v1/terrareg/modules/<string:namespace>/<string:name>/<string:provider>/<string:version>/<string:presign>/source.zip'
 
@@ -84,19 +102,15 @@ class TestApiModuleVersionSourceDownload(TerraregUnitTest):
         def raise_exception(*args, **kwargs):
             raise terrareg.errors.InvalidPresignedUrlKeyError('Invalid pre-sign key')
 
-        mock_get_file_storage = unittest.mock.MagicMock()
-        mock_send_file = unittest.mock.MagicMock(return_value="UNIT TEST BINARY OUTPUT")
-
         mock_validate_presigned_key = unittest.mock.MagicMock(side_effect=raise_exception)
         with unittest.mock.patch('terrareg.config.Config.ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode.ALLOW), \
                 unittest.mock.patch('terrareg.config.Config.ALLOW_UNAUTHENTICATED_ACCESS', True), \
                 unittest.mock.patch('terrareg.presigned_url.TerraformSourcePresignedUrl.validate_presigned_key', mock_validate_presigned_key), \
-                unittest.mock.patch('flask.send_file', mock_send_file), \
-                unittest.mock.patch('terrareg.file_storage.FileStorageFactory.get_file_storage', mock_get_file_storage):
+                self._local_file_storage():
             res = client.get(url)
 
         assert res.status_code == 200
-        assert res.json == "UNIT TEST BINARY OUTPUT"
+        assert res.data == self.ARCHIVE_CONTENT
 
         mock_validate_presigned_key.assert_not_called()
 
@@ -113,32 +127,131 @@ class TestApiModuleVersionSourceDownload(TerraregUnitTest):
         ('/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip?presign=unittest-presign-key', True),
     ])
     def test_send_file(self, url, allow_unauthenticated_access, client, mock_models):
-        """Ensure send file and file storage is handled correctly"""
-        mock_file_storage = unittest.mock.MagicMock()
-        mock_get_file_storage = unittest.mock.MagicMock(return_value=mock_file_storage)
-        mock_read_file_response = unittest.mock.MagicMock()
-        mock_read_file = unittest.mock.MagicMock(return_value=mock_read_file_response)
-        mock_file_storage.read_file = mock_read_file
-
+        """Ensure archive is streamed from file storage"""
         mock_validate_presigned_key = unittest.mock.MagicMock()
 
-        mock_send_file = unittest.mock.MagicMock(return_value="UNIT TEST BINARY OUTPUT")
-
         with unittest.mock.patch('terrareg.config.Config.ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode.ALLOW), \
                 unittest.mock.patch('terrareg.config.Config.ALLOW_UNAUTHENTICATED_ACCESS', allow_unauthenticated_access), \
-                unittest.mock.patch('flask.send_file', mock_send_file), \
                 unittest.mock.patch('terrareg.presigned_url.TerraformSourcePresignedUrl.validate_presigned_key', mock_validate_presigned_key), \
-                unittest.mock.patch('terrareg.file_storage.FileStorageFactory.get_file_storage', mock_get_file_storage):
-            res = client.get(url)
+                self._local_file_storage() as file_storage:
+            mock_stream_file = unittest.mock.MagicMock(side_effect=file_storage.stream_file)
+            with unittest.mock.patch.object(file_storage, 'stream_file', mock_stream_file):
+                res = client.get(url)
+
+            expected_etag = file_storage.get_file_details('/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip').etag
 
         assert res.status_code == 200
-        assert res.json == "UNIT TEST BINARY OUTPUT"
+        assert res.data == self.ARCHIVE_CONTENT
+        assert res.headers['Content-Type'] == 'application/zip'
+        assert res.headers['Content-Length'] == str(len(self.ARCHIVE_CONTENT))
+        assert res.headers['Content-Disposition'] == 'inline; filename=source.zip'
+        assert res.headers['Accept-Ranges'] == 'bytes'
+        assert res.headers['ETag'] == f'"{expected_etag}"'
 
-        mock_get_file_storage.assert_called_once()
-        mock_read_file.assert_called_once_with('/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip', bytes_mode=True)
-        mock_send_file.assert_called_once_with(mock_read_file_response, download_name='source.zip', mimetype='application/zip')
+        mock_stream_file.assert_called_once_with(
+            '/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip',
+            start=0, end=len(self.ARCHIVE_CONTENT)
+        )
 
         if not allow_unauthenticated_access:
             mock_validate_presigned_key.assert_called_once_with(url='/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1', payload='unittest-presign-key')
         else:
             mock_validate_presigned_key.assert_not_called()
+
+    @setup_test_data()
+    def test_non_existent_archive(self, client, mock_models):
+        """Ensure missing archive returns 404"""
+        with unittest.mock.patch('terrareg.config.Config.ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode.ALLOW), \
+                self._local_file_storage(create_archive=False):
+            res = client.get('/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip')
+
+        assert res.status_code == 404
+        assert res.json == {'message': 'Module version source archive does not exist'}
+
+    @setup_test_data()
+    def test_if_none_match(self, client, mock_models):
+        """Ensure matching If-None-Match returns not modified response"""
+        with unittest.mock.patch('terrareg.config.Config.ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode.ALLOW), \
+                self._local_file_storage():
+            res = client.get('/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip')
+            assert res.status_code == 200
+            etag = res.headers['ETag']
+
+            res = client.get('/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip',
+                             headers={'If-None-Match': etag})
+            assert res.status_code == 304
+            assert res.data == b''
+            assert res.headers['ETag'] == etag
+
+            res = client.get('/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip',
+                             headers={'If-None-Match': '"does-not-match"'})
+            assert res.status_code == 200
+            assert res.data == self.ARCHIVE_CONTENT
+
+    @setup_test_data()
+    @pytest.mark.parametrize('range_header, expected_start, expected_end', [
+        ('bytes=0-9', 0, 10),
+        ('bytes=100-', 100, len(ARCHIVE_CONTENT)),
+        ('bytes=-50', len(ARCHIVE_CONTENT) - 50, len(ARCHIVE_CONTENT)),
+    ])
+    def test_range(self, range_header, expected_start, expected_end, client, mock_models):
+        """Ensure range requests return partial content"""
+        with unittest.mock.patch('terrareg.config.Config.ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode.ALLOW), \
+                self._local_file_storage():
+            res = client.get('/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip',
+                             headers={'Range': range_header})
+
+        assert res.status_code == 206
+        assert res.data == self.ARCHIVE_CONTENT[expected_start:expected_end]
+        assert res.headers['Content-Length'] == str(expected_end - expected_start)
+        assert res.headers['Content-Range'] == f'bytes {expected_start}-{expected_end - 1}/{len(self.ARCHIVE_CONTENT)}'
+
+    @setup_test_data()
+    def test_range_not_satisfiable(self, client, mock_models):
+        """Ensure range outside of archive returns error"""
+        with unittest.mock.patch('terrareg.config.Config.ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode.ALLOW), \
+                self._local_file_storage():
+            res = client.get('/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip',
+                             headers={'Range': f'bytes={len(self.ARCHIVE_CONTENT) + 10}-'})
+
+        assert res.status_code == 416
+        assert res.headers['Content-Range'] == f'bytes */{len(self.ARCHIVE_CONTENT)}'
+
+    @setup_test_data()
+    def test_range_if_range_mismatch(self, client, mock_models):
+        """Ensure range is ignored when If-Range does not match current ETag"""
+        with unittest.mock.patch('terrareg.config.Config.ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode.ALLOW), \
+                self._local_file_storage():
+            res = client.get('/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip',
+                             headers={'Range': 'bytes=0-9', 'If-Range': '"previous-etag"'})
+
+        assert res.status_code == 200
+        assert res.data == self.ARCHIVE_CONTENT
+
+    @setup_test_data()
+    @pytest.mark.parametrize('presigned_url, expected_status', [
+        ('https://s3.example.com/presigned-url', 302),
+        # Storage does not support presigned URLs
+        (None, 200),
+    ])
+    def test_presigned_download_redirect(self, presigned_url, expected_status, client, mock_models):
+        """Ensure download redirects to presigned URL of storage, when enabled"""
+        with unittest.mock.patch('terrareg.config.Config.ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode.ALLOW), \
+                unittest.mock.patch('terrareg.config.Config.S3_PRESIGNED_DOWNLOAD_REDIRECT', True), \
+                unittest.mock.patch('terrareg.config.Config.S3_PRESIGNED_DOWNLOAD_EXPIRY_SECONDS', 123), \
+                self._local_file_storage() as file_storage:
+            mock_get_presigned_download_url = unittest.mock.MagicMock(return_value=presigned_url)
+            with unittest.mock.patch.object(file_storage, 'get_presigned_download_url', mock_get_presigned_download_url):
+                res = client.get('/v1/terrareg/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip')
+
+        assert res.status_code == expected_status
+        if presigned_url:
+            assert res.headers['Location'] == presigned_url
+        else:
+            assert res.data == self.ARCHIVE_CONTENT
+
+        mock_get_presigned_download_url.assert_called_once_with(
+            '/modules/testnamespace/testmodulename/testprovider/2.4.1/source.zip',
+            expiry=123,
+            download_name='source.zip'
+        )
@@ -0,0 +1,187 @@
+
+import io
+import os
+import stat
+import tarfile
+import tempfile
+import zipfile
+
+import pathspec
+import pytest
+
+from terrareg.archive_builder import ModuleArchiveBuilder
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestModuleArchiveBuilder(TerraregUnitTest):
+    """Test ModuleArchiveBuilder class."""
+
+    SOURCE_FILES = {
+        'main.tf': '# Main file',
+        '.hidden-file.tf': '# Hidden file',
+        '.tfignore': 'ignored_file.txt\n**/glob_ignore.*\nignored_dir\n',
+        'ignored_file.txt': 'ignored',
+        '.git/config': '# Git config',
+        'ignored_dir/file.tf': '# Ignored directory',
+        'modules/submodule/main.tf': '# Submodule',
+        'modules/submodule/glob_ignore.txt': 'ignored',
+        'modules/submodule/.tfignore': '# Not root ignore file',
+        'modules/submodule/.git': 'gitdir: ../../.git/modules/submodule',
+    }
+
+    EXPECTED_FILES = {
+        '.hidden-file.tf': b'# Hidden file',
+        'main.tf': b'# Main file',
+        'modules/submodule/.git': b'gitdir: ../../.git/modules/submodule',
+        'modules/submodule/.tfignore': b'# Not root ignore file',
+        'modules/submodule/main.tf': b'# Submodule',
+    }
+
+    EXPECTED_DIRECTORIES = ['modules', 'modules/submodule']
+
+    @pytest.fixture
+    def source_directory(self):
+        """Create source directory containing test files"""
+        with tempfile.TemporaryDirectory() as source_directory:
+            for path, content in self.SOURCE_FILES.items():
+                full_path = os.path.join(source_directory, path)
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                with open(full_path, 'w') as fh:
+                    fh.write(content)
+            yield source_directory
+
+    def _get_builder(self, source_directory, compression_level=6):
+        """Return archive builder for source directory"""
+        with open(os.path.join(source_directory, '.tfignore'), 'r') as fh:
+            pathspec_filter = pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, fh)
+        return ModuleArchiveBuilder(
+            source_directory=source_directory,
+            ignore_file='.tfignore',
+            pathspec_filter=pathspec_filter,
+            compression_level=compression_level
+        )
+
+    def _get_tar_contents(self, tar_gz_fh):
+        """Return files and directories in tar archive"""
+        tar_gz_fh.seek(0)
+        with tarfile.open(fileobj=tar_gz_fh, mode='r:gz') as tar:
+            files = {
+                member.name: tar.extractfile(member).read()
+                for member in tar.getmembers()
+                if member.isfile()
+            }
+            directories = [member.name for member in tar.getmembers() if member.isdir()]
+        return files, directories
+
+    def _get_zip_contents(self, zip_fh):
+        """Return files and directories in zip archive"""
+        zip_fh.seek(0)
+        with zipfile.ZipFile(zip_fh) as zip_file:
+            files = {
+                member.filename: zip_file.read(member)
+                for member in zip_file.infolist()
+                if not member.is_dir()
+            }
+            directories = [member.filename.rstrip('/') for member in zip_file.infolist() if member.is_dir()]
+        return files, directories
+
+    def test_build(self, source_directory):
+        """Test generating both archives"""
+        tar_gz_fh = io.BytesIO()
+        zip_fh = io.BytesIO()
+        self._get_builder(source_directory).build(tar_gz_fh=tar_gz_fh, zip_fh=zip_fh)
+
+        assert self._get_tar_contents(tar_gz_fh) == (self.EXPECTED_FILES, self.EXPECTED_DIRECTORIES)
+        assert self._get_zip_contents(zip_fh) == (self.EXPECTED_FILES, self.EXPECTED_DIRECTORIES)
+
+    def test_build_tar_gz_only(self, source_directory):
+        """Test generating only tar.gz archive"""
+        tar_gz_fh = io.BytesIO()
+        self._get_builder(source_directory).build(tar_gz_fh=tar_gz_fh)
+
+        assert self._get_tar_contents(tar_gz_fh) == (self.EXPECTED_FILES, self.EXPECTED_DIRECTORIES)
+
+    def test_build_zip_only(self, source_directory):
+        """Test generating only zip archive"""
+        zip_fh = io.BytesIO()
+        self._get_builder(source_directory).build(zip_fh=zip_fh)
+
+        assert self._get_zip_contents(zip_fh) == (self.EXPECTED_FILES, self.EXPECTED_DIRECTORIES)
+
+    def test_build_without_ignore_file(self, source_directory):
+        """Test generating archives without pathspec filter"""
+        zip_fh = io.BytesIO()
+        ModuleArchiveBuilder(
+            source_directory=source_directory,
+            ignore_file='.tfignore',
+            pathspec_filter=None,
+            compression_level=6
+        ).build(zip_fh=zip_fh)
+
+        files, _ = self._get_zip_contents(zip_fh)
+        assert sorted(files) == sorted([
+            path
+            for path in self.SOURCE_FILES
+            if path not in ['.tfignore', '.git/config']
+        ])
+
+    @pytest.mark.parametrize('compression_level, expected_compress_type', [
+        (0, zipfile.ZIP_DEFLATED),
+        (9, zipfile.ZIP_DEFLATED),
+    ])
+    def test_build_compression_level(self, source_directory, compression_level, expected_compress_type):
+        """Test compression level is used for archives"""
+        with open(os.path.join(source_directory, 'large.tf'), 'w') as fh:
+            fh.write('# Repeated content\n' * 10000)
+
+        zip_fh = io.BytesIO()
+        tar_gz_fh = io.BytesIO()
+        self._get_builder(source_directory, compression_level=compression_level).build(tar_gz_fh=tar_gz_fh, zip_fh=zip_fh)
+
+        zip_fh.seek(0)
+        with zipfile.ZipFile(zip_fh) as zip_file:
+            zip_info = zip_file.getinfo('large.tf')
+            assert zip_info.compress_type == expected_compress_type
+            if compression_level == 0:
+                assert zip_info.compress_size >= zip_info.file_size
+            else:
+                assert zip_info.compress_size < zip_info.file_size / 10
+
+        tar_size = len(tar_gz_fh.getvalue())
+        if compression_level == 0:
+            assert tar_size > 10000 * len('# Repeated content\n')
+        else:
+            assert tar_size < 10000 * len('# Repeated content\n') / 10
+
+    def test_build_symlink(self, source_directory):
+        """Test symlinks are stored as symlinks"""
+        os.symlink('/etc/passwd', os.path.join(source_directory, 'link.tf'))
+
+        tar_gz_fh = io.BytesIO()
+        zip_fh = io.BytesIO()
+        self._get_builder(source_directory).build(tar_gz_fh=tar_gz_fh, zip_fh=zip_fh)
+
+        tar_gz_fh.seek(0)
+        with tarfile.open(fileobj=tar_gz_fh, mode='r:gz') as tar:
+            member = tar.getmember('link.tf')
+            assert member.issym()
+            assert member.linkname == '/etc/passwd'
+
+        zip_fh.seek(0)
+        with zipfile.ZipFile(zip_fh) as zip_file:
+            zip_info = zip_file.getinfo('link.tf')
+            assert stat.S_ISLNK(zip_info.external_attr >> 16)
+            assert zip_file.read(zip_info) == b'/etc/passwd'
+
+    def test_build_file_permissions(self, source_directory):
+        """Test file permissions are stored in zip archive"""
+        os.chmod(os.path.join(source_directory, 'main.tf'), 0o755)
+
+        zip_fh = io.BytesIO()
+        self._get_builder(source_directory).build(zip_fh=zip_fh)
+
+        zip_fh.seek(0)
+        with zipfile.ZipFile(zip_fh) as zip_file:
+            mode = zip_file.getinfo('main.tf').external_attr >> 16
+            assert stat.S_ISREG(mode)
+            assert stat.S_IMODE(mode) == 0o755
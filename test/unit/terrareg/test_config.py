@@ -4,6 +4,7 @@ import re
 
 import pytest
 
+import terrareg.errors
 import terrareg.config
 
 
@@ -96,6 +97,9 @@ class TestConfig:
         ('GITHUB_APP_CLIENT_SECRET', None),
         ('GITHUB_LOGIN_TEXT', None),
         ('GO_PACKAGE_CACHE_DIRECTORY', None),
+        ('TERRAFORM_BINARY_CACHE_DIRECTORY', None),
+        ('PROVIDER_MIRROR_DIRECTORY', None),
+        ('GIT_MIRROR_CACHE_DIRECTORY', None),
         ('PROVIDER_CATEGORIES', None),
         ('PROVIDER_SOURCES', None),
         ('SITE_WARNING', None),
@@ -124,7 +128,28 @@ class TestConfig:
             assert getattr(terrareg.config.Config(), config_name) == ""
 
     @pytest.mark.parametrize('config_name, test_value, test_expected', [
-        ('SENTRY_TRACES_SAMPLE_RATE', '1.523', 1.523)
+        ('SENTRY_TRACES_SAMPLE_RATE', '1.523', 1.523),
+        ('MODULE_ARCHIVE_COMPRESSION_LEVEL', '3', 3),
+        ('MODULE_ARCHIVE_COMPRESSION_LEVEL', '15', 9),
+        ('MODULE_ARCHIVE_COMPRESSION_LEVEL', '-1', 0),
+        ('BLOB_COMPRESSION_MIN_SIZE', '0', 0),
+        ('BLOB_COMPRESSION_MIN_SIZE', '-1', 0),
+        ('BLOB_COMPRESSION_LEVEL', '3', 3),
+        ('BLOB_COMPRESSION_LEVEL', '0', 1),
+        ('BLOB_COMPRESSION_LEVEL', '15', 9),
+        ('MODULE_SPECS_CACHE_SIZE', '-1', 0),
+        ('S3_MULTIPART_PART_SIZE', '2', 5),
+        ('S3_MULTIPART_CONCURRENCY', '0', 1),
+        ('FILE_STORAGE_UPLOAD_CONCURRENCY', '0', 1),
+        ('PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY', '0', 1),
+        ('PROVIDER_ARTIFACT_DOWNLOAD_ATTEMPTS', '0', 1),
+        ('TERRAFORM_BINARY_CACHE_MAX_VERSIONS', '0', 1),
+        ('PROVIDER_MIRROR_MAX_SIZE', '-1', 0),
+        ('PROVIDER_MIRROR_MAX_VERSIONS', '0', 1),
+        ('GITHUB_API_CACHE_SIZE', '-1', 0),
+        ('GITHUB_API_CACHE_MAX_SIZE', '-1', 0),
+        ('GITHUB_API_CONNECTION_POOL_SIZE', '0', 1),
+        ('GITHUB_API_MAX_RATE_LIMIT_WAIT', '-1', 0),
     ])
     def test_custom_string_configs(self, config_name, test_value, test_expected):
         """Test string configs with custom values to ensure they are overridden with environment variables."""
@@ -139,6 +164,33 @@ class TestConfig:
         'REDIRECT_DELETION_LOOKBACK_DAYS',
         'TERRAFORM_OIDC_IDP_SESSION_EXPIRY',
         'TERRAFORM_PRESIGNED_URL_EXPIRY_SECONDS',
+        'MODULE_SEARCH_INDEX_REFRESH_INTERVAL',
+        'ANALYTICS_WRITE_BUFFER_SIZE',
+        'ANALYTICS_WRITE_BUFFER_BATCH_SIZE',
+        'ANALYTICS_WRITE_BUFFER_FLUSH_INTERVAL',
+        'ANALYTICS_ROLLUP_COMPACTION_INTERVAL',
+        'MODULE_EXTRACTION_CONCURRENCY',
+        'MODULE_IMPORT_QUEUE_WORKERS',
+        'MODULE_IMPORT_QUEUE_MAX_ATTEMPTS',
+        'MODULE_IMPORT_QUEUE_NAMESPACE_CONCURRENCY',
+        'MODULE_IMPORT_QUEUE_POLL_INTERVAL',
+        'GIT_MIRROR_CACHE_MAX_SIZE',
+        'S3_PRESIGNED_DOWNLOAD_EXPIRY_SECONDS',
+        'S3_MAX_POOL_CONNECTIONS',
+        'S3_MULTIPART_PART_SIZE',
+        'S3_MULTIPART_CONCURRENCY',
+        'FILE_STORAGE_UPLOAD_CONCURRENCY',
+        'PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY',
+        'PROVIDER_ARTIFACT_DOWNLOAD_ATTEMPTS',
+        'BLOB_COMPRESSION_MIN_SIZE',
+        'MODULE_SPECS_CACHE_SIZE',
+        'TERRAFORM_BINARY_CACHE_MAX_VERSIONS',
+        'PROVIDER_MIRROR_MAX_SIZE',
+        'PROVIDER_MIRROR_MAX_VERSIONS',
+        'GITHUB_API_CACHE_SIZE',
+        'GITHUB_API_CACHE_MAX_SIZE',
+        'GITHUB_API_CONNECTION_POOL_SIZE',
+        'GITHUB_API_MAX_RATE_LIMIT_WAIT',
     ])
     def test_integer_configs(self, config_name):
         """Test integer configs to ensure they are overridden with environment variables."""
@@ -183,6 +235,9 @@ class TestConfig:
         ('ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode, terrareg.config.ModuleHostingMode.ALLOW),
         ('DEFAULT_UI_DETAILS_VIEW', terrareg.config.DefaultUiInputOutputView, terrareg.config.DefaultUiInputOutputView.TABLE),
         ('PRODUCT', terrareg.config.Product, terrareg.config.Product.TERRAFORM),
+        ('MODULE_SEARCH_INDEX', terrareg.config.ModuleSearchIndexType, terrareg.config.ModuleSearchIndexType.DATABASE),
+        ('MODULE_IMPORT_QUEUE', terrareg.config.ModuleImportQueueType, terrareg.config.ModuleImportQueueType.DISABLED),
+        ('ANALYTICS_WRITE_BUFFER_OVERFLOW_POLICY', terrareg.config.AnalyticsWriteBufferOverflowPolicy, terrareg.config.AnalyticsWriteBufferOverflowPolicy.SYNCHRONOUS),
     ])
     def test_enum_configs(self, config_name, enum, expected_default):
         """Test enum configs to ensure they are overridden with environment variables."""
@@ -234,6 +289,8 @@ class TestConfig:
         'ALLOW_UNAUTHENTICATED_ACCESS',
         'AUTO_GENERATE_GITHUB_ORGANISATION_NAMESPACES',
         'MODULE_VERSION_USE_GIT_COMMIT',
+        'S3_PRESIGNED_DOWNLOAD_REDIRECT',
+        'MODULE_EXTRACTION_REUSE',
     ])
     def test_boolean_configs(self, config_name, test_value, expected_value):
         """Test boolean configs to ensure they are overridden with environment variables."""
@@ -242,3 +299,35 @@ class TestConfig:
         with unittest.mock.patch('os.environ', {config_name: test_value}):
             assert getattr(terrareg.config.Config(), config_name) is expected_value
 
+
+    def test_snapshot(self):
+        """Test configs are parsed once and re-parsed after reload or replacing environment"""
+        environ = {'ALLOWED_PROVIDERS': 'aws,gcp'}
+        with unittest.mock.patch('os.environ', environ):
+            config = terrareg.config.Config()
+            allowed_providers = config.ALLOWED_PROVIDERS
+            assert allowed_providers == ['aws', 'gcp']
+            # Ensure parsed value is shared by config instances
+            assert terrareg.config.Config().ALLOWED_PROVIDERS is allowed_providers
+
+            # Modify environment in-place, ensuring value is only updated after reload
+            environ['ALLOWED_PROVIDERS'] = 'azure'
+            assert terrareg.config.Config().ALLOWED_PROVIDERS == ['aws', 'gcp']
+            terrareg.config.Config.reload()
+            assert terrareg.config.Config().ALLOWED_PROVIDERS == ['azure']
+
+        with unittest.mock.patch('os.environ', {'ALLOWED_PROVIDERS': 'github'}):
+            assert terrareg.config.Config().ALLOWED_PROVIDERS == ['github']
+
+    def test_snapshot_derived_configs(self):
+        """Test configs derived from other configs reflect changes to the configs they are derived from"""
+        with unittest.mock.patch('os.environ', {'TERRAFORM_EXAMPLE_VERSION_TEMPLATE': '>= {major}'}):
+            assert terrareg.config.Config().TERRAFORM_EXAMPLE_VERSION_TEMPLATE_PRE_MAJOR == '>= {major}'
+            with unittest.mock.patch('terrareg.config.Config.TERRAFORM_EXAMPLE_VERSION_TEMPLATE', '<= {major}'):
+                assert terrareg.config.Config().TERRAFORM_EXAMPLE_VERSION_TEMPLATE_PRE_MAJOR == '<= {major}'
+
+    def test_reload_invalid_config(self):
+        """Test reload raises exception for invalid config values"""
+        with unittest.mock.patch('os.environ', {'DEBUG': 'notaboolean'}):
+            with pytest.raises(terrareg.errors.InvalidBooleanConfigurationError):
+                terrareg.config.Config.reload()
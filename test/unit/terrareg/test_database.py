@@ -0,0 +1,60 @@
+
+import unittest.mock
+import zlib
+
+import pytest
+
+from terrareg.database import Database
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestDatabaseBlobEncoding(TerraregUnitTest):
+    """Test encoding and decoding of blobs."""
+
+    LARGE_VALUE = 'Repeated README content\n' * 100
+
+    @pytest.mark.parametrize('value, expected', [
+        (None, b''),
+        ('', b''),
+        ('Short value', b'Short value'),
+        ('Unicode ✓', 'Unicode ✓'.encode('utf-8')),
+    ])
+    def test_encode_blob_below_threshold(self, value, expected):
+        """Test values smaller than the compression threshold are stored uncompressed"""
+        assert Database.encode_blob(value) == expected
+
+    def test_encode_blob_compressed(self):
+        """Test values exceeding the compression threshold are compressed"""
+        encoded = Database.encode_blob(self.LARGE_VALUE)
+
+        assert encoded[:2] == Database.BLOB_CODEC_MARKER + Database.BLOB_CODEC_ZLIB
+        assert len(encoded) < len(self.LARGE_VALUE) / 10
+        assert zlib.decompress(encoded[2:]).decode('utf-8') == self.LARGE_VALUE
+        assert Database.decode_blob(encoded) == self.LARGE_VALUE
+
+    def test_encode_blob_compression_disabled(self):
+        """Test values are not compressed when compression is disabled"""
+        with unittest.mock.patch('terrareg.config.Config.BLOB_COMPRESSION_MIN_SIZE', 0):
+            assert Database.encode_blob(self.LARGE_VALUE) == self.LARGE_VALUE.encode('utf-8')
+
+    def test_encode_blob_incompressible(self):
+        """Test values that do not reduce in size are stored uncompressed"""
+        with unittest.mock.patch('terrareg.config.Config.BLOB_COMPRESSION_MIN_SIZE', 1):
+            assert Database.encode_blob('abc') == b'abc'
+
+    @pytest.mark.parametrize('value, expected', [
+        (None, None),
+        (b'', ''),
+        # Legacy uncompressed blobs
+        (b'Legacy value', 'Legacy value'),
+        ('Unicode ✓'.encode('utf-8'), 'Unicode ✓'),
+        (b'\xff\x01' + zlib.compress(b'Compressed value'), 'Compressed value'),
+    ])
+    def test_decode_blob(self, value, expected):
+        """Test decoding legacy and compressed blobs"""
+        assert Database.decode_blob(value) == expected
+
+    def test_decode_blob_unknown_codec(self):
+        """Test decoding blob with unknown codec"""
+        with pytest.raises(ValueError):
+            Database.decode_blob(b'\xff\x99data')
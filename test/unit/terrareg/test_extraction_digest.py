@@ -0,0 +1,120 @@
+
+import os
+import subprocess
+import tempfile
+import unittest.mock
+
+import pytest
+
+from terrareg.extraction_digest import ExtractionDigest
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestExtractionDigest(TerraregUnitTest):
+    """Test ExtractionDigest class."""
+
+    @pytest.fixture(autouse=True)
+    def mock_tool_versions(self):
+        """Mock versions of extraction tools"""
+        with unittest.mock.patch('terrareg.extraction_digest.ExtractionDigest._tool_versions', {
+                    'terraform-docs': 'terraform-docs version v0.16.0',
+                    'tfsec': 'v1.28.1',
+                    'tfswitch': 'Version: 0.13.1308',
+                    'infracost': 'Infracost v0.10.18',
+                }):
+            yield
+
+    def _write_file(self, path, content):
+        """Create file with content"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fh:
+            fh.write(content)
+
+    def _create_module(self, extract_directory):
+        """Create module with submodule and example"""
+        self._write_file(os.path.join(extract_directory, 'main.tf'), 'module "submodule" {\n  source = "./modules/submodule"\n}\n')
+        self._write_file(os.path.join(extract_directory, 'README.md'), '# Test module')
+        self._write_file(os.path.join(extract_directory, 'modules', 'submodule', 'main.tf'), 'resource "null_resource" "test" {}\n')
+        self._write_file(os.path.join(extract_directory, 'modules', 'other', 'main.tf'), 'resource "null_resource" "other" {}\n')
+        self._write_file(os.path.join(extract_directory, 'examples', 'test', 'main.tf'), 'module "root" {\n  source = "../../"\n}\n')
+
+    def _get_digests(self, extract_directory, run_infracost=False):
+        """Return digests of root module, submodules and example"""
+        extraction_digest = ExtractionDigest(extract_directory=extract_directory)
+        return {
+            path: extraction_digest.get_digest(os.path.join(extract_directory, path) if path else extract_directory, run_infracost=run_infracost)
+            for path in ['', 'modules/submodule', 'modules/other', 'examples/test']
+        }
+
+    def test_get_digest_unchanged(self):
+        """Test digests are consistent for modules with the same content"""
+        with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+            self._create_module(first_dir)
+            self._create_module(second_dir)
+            first_digests = self._get_digests(first_dir)
+            assert first_digests == self._get_digests(second_dir)
+            # Ensure each module has a different digest
+            assert len(set(first_digests.values())) == 4
+
+    def test_get_digest_ignores_generated_directories(self):
+        """Test digests ignore files generated by terraform init"""
+        with tempfile.TemporaryDirectory() as extract_dir:
+            self._create_module(extract_dir)
+            digests = self._get_digests(extract_dir)
+            self._write_file(os.path.join(extract_dir, '.terraform', 'modules', 'modules.json'), '{}')
+            self._write_file(os.path.join(extract_dir, '.git', 'HEAD'), 'ref: refs/heads/main')
+            assert self._get_digests(extract_dir) == digests
+
+    @pytest.mark.parametrize('modified_file, changed_digests', [
+        # Root module contains all files and example references the root module
+        ('README.md', ['', 'examples/test']),
+        # Root module and example reference the submodule
+        ('modules/submodule/main.tf', ['', 'modules/submodule', 'examples/test']),
+        ('modules/other/main.tf', ['', 'modules/other']),
+        ('examples/test/main.tf', ['', 'examples/test']),
+        ('examples/test/variables.tf', ['', 'examples/test']),
+    ])
+    def test_get_digest_modified_file(self, modified_file, changed_digests):
+        """Test digests of modules that contain or reference a modified file are changed"""
+        with tempfile.TemporaryDirectory() as extract_dir:
+            self._create_module(extract_dir)
+            digests = self._get_digests(extract_dir)
+
+            with open(os.path.join(extract_dir, modified_file), 'a') as fh:
+                fh.write('\n# Modified\n')
+
+            new_digests = self._get_digests(extract_dir)
+            assert sorted(path for path in digests if digests[path] != new_digests[path]) == sorted(changed_digests)
+
+    def test_get_digest_configuration(self):
+        """Test digests are changed by tool versions, infracost and configuration"""
+        with tempfile.TemporaryDirectory() as extract_dir:
+            self._create_module(extract_dir)
+            digest = self._get_digests(extract_dir)['examples/test']
+
+            assert self._get_digests(extract_dir, run_infracost=True)['examples/test'] != digest
+
+            with unittest.mock.patch('terrareg.config.Config.DEFAULT_TERRAFORM_VERSION', '1.5.0'):
+                assert self._get_digests(extract_dir)['examples/test'] != digest
+
+            with unittest.mock.patch.dict(ExtractionDigest._tool_versions, {'tfsec': 'v1.28.2'}):
+                assert self._get_digests(extract_dir)['examples/test'] != digest
+
+            with unittest.mock.patch('terrareg.extraction_digest.EXTRACTION_VERSION', 1000):
+                assert self._get_digests(extract_dir)['examples/test'] != digest
+
+            assert self._get_digests(extract_dir)['examples/test'] == digest
+
+    def test_get_digest_unknown_tool_version(self):
+        """Test digest is not generated if the version of a tool cannot be obtained"""
+        with tempfile.TemporaryDirectory() as extract_dir, \
+                unittest.mock.patch('terrareg.extraction_digest.ExtractionDigest._tool_versions', {}), \
+                unittest.mock.patch('terrareg.extraction_digest.subprocess.check_output',
+                                    side_effect=subprocess.CalledProcessError(returncode=1, cmd=[])) as mock_check_output:
+            self._create_module(extract_dir)
+            extraction_digest = ExtractionDigest(extract_directory=extract_dir)
+            assert extraction_digest.get_digest(extract_dir, run_infracost=False) is None
+            assert extraction_digest.get_digest(extract_dir, run_infracost=False) is None
+
+            # Ensure version of each tool is only requested once
+            assert mock_check_output.call_count == len(ExtractionDigest.TOOLS)
@@ -10,7 +10,7 @@ from test import skipif_unless_ci
 
 from test.unit.terrareg import TerraregUnitTest
 import terrareg.file_storage
-from terrareg.errors import InvalidDataDirectoryError
+from terrareg.errors import FileUploadError, InvalidDataDirectoryError
 
 
 class TestFileStorageFactory(TerraregUnitTest):
@@ -37,6 +37,89 @@ class TestFileStorageFactory(TerraregUnitTest):
             else:
                 raise Exception('Unhandled storage type')
 
+    def test_get_file_storage_cached(self):
+        """Test file storage instance is re-used for the same data directory"""
+        factory = terrareg.file_storage.FileStorageFactory()
+
+        with unittest.mock.patch('terrareg.config.Config.DATA_DIRECTORY', '/tmp/unittest-cache'):
+            storage_instance = factory.get_file_storage()
+            assert terrareg.file_storage.FileStorageFactory().get_file_storage() is storage_instance
+
+        with unittest.mock.patch('terrareg.config.Config.DATA_DIRECTORY', '/tmp/unittest-other'):
+            assert factory.get_file_storage() is not storage_instance
+
+        terrareg.file_storage.FileStorageFactory.reset()
+
+        with unittest.mock.patch('terrareg.config.Config.DATA_DIRECTORY', '/tmp/unittest-cache'):
+            assert factory.get_file_storage() is not storage_instance
+
+    def test_get_file_storage_s3_shared_client(self):
+        """Test s3 client is shared between s3 storage instances"""
+        terrareg.file_storage.FileStorageFactory.reset()
+        with unittest.mock.patch('terrareg.config.Config.S3_MAX_POOL_CONNECTIONS', 27):
+            first_instance = terrareg.file_storage.S3FileStorage(s3_url='s3://first-bucket')
+            second_instance = terrareg.file_storage.S3FileStorage(s3_url='s3://second-bucket/path')
+
+        assert first_instance._s3_client is second_instance._s3_client
+        assert first_instance._session is second_instance._session
+        assert first_instance._s3_client.meta.config.max_pool_connections == 27
+
+        terrareg.file_storage.FileStorageFactory.reset()
+        assert terrareg.file_storage.S3FileStorage(s3_url='s3://first-bucket')._s3_client is not first_instance._s3_client
+
+
+class TestFileStorageMetrics(TerraregUnitTest):
+    """Test FileStorageMetrics class."""
+
+    def test_record_latency(self):
+        """Test latency of storage operations is recorded"""
+        terrareg.file_storage.FileStorageMetrics.reset()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+            instance.write_file('test_file', 'Test content', binary=False)
+            assert instance.file_exists('test_file') is True
+            assert instance.file_exists('does_not_exist') is False
+            with pytest.raises(FileNotFoundError):
+                instance.delete_file('does_not_exist')
+            assert b''.join(instance.stream_file('test_file')) == b'Test content'
+            with instance.open_write('another_file') as fh:
+                fh.write(b'Test content')
+
+        operation_stats = terrareg.file_storage.FileStorageMetrics.get_operation_stats()
+        assert {
+            key: (stats['count'], stats['error_count'])
+            for key, stats in operation_stats.items()
+        } == {
+            ('local', 'write_file'): (1, 0),
+            ('local', 'make_directory'): (2, 0),
+            ('local', 'file_exists'): (2, 0),
+            ('local', 'delete_file'): (1, 1),
+            ('local', 'stream_file'): (1, 0),
+            ('local', 'open_write'): (1, 0),
+        }
+        for stats in operation_stats.values():
+            assert 0 <= stats['duration_max'] <= stats['duration_total']
+
+        terrareg.file_storage.FileStorageMetrics.reset()
+        assert terrareg.file_storage.FileStorageMetrics.get_operation_stats() == {}
+
+    def test_record_latency_generator(self):
+        """Test duration of generator operations covers iteration of generator"""
+        terrareg.file_storage.FileStorageMetrics.reset()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+            with open(os.path.join(temp_dir, 'test_file'), 'wb') as fh:
+                fh.write(b'Test content')
+
+            stream = instance.stream_file('test_file')
+            assert terrareg.file_storage.FileStorageMetrics.get_operation_stats() == {}
+            with unittest.mock.patch('time.monotonic', unittest.mock.MagicMock(side_effect=[10.0, 12.5])):
+                assert list(stream) == [b'Test content']
+
+        assert terrareg.file_storage.FileStorageMetrics.get_operation_stats() == {
+            ('local', 'stream_file'): {'count': 1, 'error_count': 0, 'duration_total': 2.5, 'duration_max': 2.5}
+        }
+
 class TestLocalFileStorage(TerraregUnitTest):
     """Handle local file storage."""
 
@@ -302,6 +385,113 @@ class TestLocalFileStorage(TerraregUnitTest):
             with open(os.path.join(temp_dir, file), "r") as fh:
                 assert fh.read() == "Test write content"
 
+    def test_open_write(self):
+        """Test open_write method"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+
+            with instance.open_write(path='/some/directory/test_file') as fh:
+                fh.write(b'Test write content')
+                # Ensure file is not created until writing is complete
+                assert not os.path.exists(os.path.join(temp_dir, 'some', 'directory', 'test_file'))
+
+            with open(os.path.join(temp_dir, 'some', 'directory', 'test_file'), 'r') as fh:
+                assert fh.read() == 'Test write content'
+            assert os.listdir(os.path.join(temp_dir, 'some', 'directory')) == ['test_file']
+
+    def test_open_write_error(self):
+        """Test open_write method does not replace file when an error occurs"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+            with open(os.path.join(temp_dir, 'test_file'), 'w') as fh:
+                fh.write('Original content')
+
+            with pytest.raises(Exception, match='Unittest error'):
+                with instance.open_write(path='test_file') as fh:
+                    fh.write(b'Partial content')
+                    raise Exception('Unittest error')
+
+            with open(os.path.join(temp_dir, 'test_file'), 'r') as fh:
+                assert fh.read() == 'Original content'
+            assert os.listdir(temp_dir) == ['test_file']
+
+    def test_get_file_details(self):
+        """Test get_file_details method"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+            assert instance.get_file_details('test_file') is None
+
+            with open(os.path.join(temp_dir, 'test_file'), 'w') as fh:
+                fh.write('Test content')
+
+            file_details = instance.get_file_details('/test_file')
+            assert file_details.size == 12
+            assert file_details.etag
+
+            # Ensure ETag changes when file is modified
+            stat_result = os.stat(os.path.join(temp_dir, 'test_file'))
+            os.utime(os.path.join(temp_dir, 'test_file'), ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1000))
+            assert instance.get_file_details('/test_file').etag != file_details.etag
+
+    @pytest.mark.parametrize('start, end, expected_content', [
+        (0, None, b'0123456789' * 10000),
+        (0, 100000, b'0123456789' * 10000),
+        (5, 15, b'5678901234'),
+        (99995, None, b'56789'),
+        (10, 10, b''),
+    ])
+    def test_stream_file(self, start, end, expected_content):
+        """Test stream_file method"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+            with open(os.path.join(temp_dir, 'test_file'), 'wb') as fh:
+                fh.write(b'0123456789' * 10000)
+
+            chunks = list(instance.stream_file('/test_file', start=start, end=end))
+            assert b''.join(chunks) == expected_content
+            assert all(len(chunk) <= instance.STREAM_CHUNK_SIZE for chunk in chunks)
+
+    def test_upload_files(self):
+        """Test upload_files method"""
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as source_dir:
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+            uploads = []
+            for itx in range(10):
+                source_path = os.path.join(source_dir, f'source_{itx}')
+                with open(source_path, 'w') as fh:
+                    fh.write(f'Test content {itx}')
+                uploads.append((source_path, '/some/directory', f'dest_{itx}'))
+
+            with unittest.mock.patch('terrareg.config.Config.FILE_STORAGE_UPLOAD_CONCURRENCY', 3), \
+                    unittest.mock.patch('terrareg.file_storage.ThreadPoolExecutor', wraps=terrareg.file_storage.ThreadPoolExecutor) as mock_executor:
+                instance.upload_files(uploads)
+
+            mock_executor.assert_called_once_with(max_workers=3, thread_name_prefix='file-storage-upload')
+            for itx in range(10):
+                with open(os.path.join(temp_dir, 'some', 'directory', f'dest_{itx}'), 'r') as fh:
+                    assert fh.read() == f'Test content {itx}'
+
+    def test_upload_files_error(self):
+        """Test upload_files method raises error after attempting all uploads"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+            mock_upload_file = unittest.mock.MagicMock(side_effect=[None, FileUploadError('Unittest error'), None])
+
+            with unittest.mock.patch.object(instance, 'upload_file', mock_upload_file):
+                with pytest.raises(FileUploadError, match='Unittest error'):
+                    instance.upload_files([
+                        ('/source/first', '/dest', 'first'),
+                        ('/source/second', '/dest', 'second'),
+                        ('/source/third', '/dest', 'third'),
+                    ])
+
+            assert mock_upload_file.call_count == 3
+
+    def test_get_presigned_download_url(self):
+        """Test get_presigned_download_url method is not supported"""
+        instance = terrareg.file_storage.LocalFileStorage('/tmp/unittest')
+        assert instance.get_presigned_download_url('/test_file', expiry=300, download_name='source.zip') is None
+
 
 @contextlib.contextmanager
 def create_s3_file_storage_with_bucket(bucket_name, bucket_path):
@@ -367,14 +557,6 @@ class TestS3FileStorage(TerraregUnitTest):
         with pytest.raises(InvalidDataDirectoryError):
             instance._get_path_details(s3_url=s3_url)
 
-    def test__get_bucket(self):
-        """Get bucket object"""
-        instance = terrareg.file_storage.S3FileStorage(s3_url="s3://unittest-bucket-name/some_path/for-ut")
-        bucket = instance._get_bucket()
-        assert bucket
-        assert bucket.name == "unittest-bucket-name"
-        assert bucket.__class__.__name__ == "s3.Bucket"
-
     @pytest.mark.parametrize('s3_url, paths, expected_key', [
         ('s3://test-bucket', ['path1'], '/path1'),
         ('s3://test-bucket', ['path1', 'path2'], '/path1/path2'),
@@ -444,6 +626,89 @@ class TestS3FileStorage(TerraregUnitTest):
             )
             assert res['Body'].read() == "Test Write content".encode('utf-8')
 
+    @skipif_unless_ci(not os.environ.get('AWS_ENDPOINT_URL'), reason="Skipping due to minio not configured")
+    def test_open_write(self):
+        """Test open_write method"""
+        with create_s3_file_storage_with_bucket(bucket_name="test-bucket", bucket_path="/test-base-dir/") as instance:
+            with instance.open_write(path="/some-test/file-to-write") as fh:
+                fh.write(b"Test Write content")
+
+            res = instance._s3_client.get_object(
+                Bucket="test-bucket",
+                Key="/test-base-dir/some-test/file-to-write"
+            )
+            assert res['Body'].read() == "Test Write content".encode('utf-8')
+
+    @staticmethod
+    def _patch_part_size(part_size):
+        """Patch part size of multipart writer, which is otherwise limited to the minimum size supported by s3"""
+        writer_class = terrareg.file_storage.S3MultipartWriter
+        return unittest.mock.patch(
+            'terrareg.file_storage.S3MultipartWriter',
+            side_effect=lambda **kwargs: writer_class(**{**kwargs, 'part_size': part_size})
+        )
+
+    @pytest.mark.parametrize('writes, expected_parts', [
+        # Content smaller than a part is uploaded in a single request
+        ([b'abc'], None),
+        ([], None),
+        # Content is uploaded in parts, as each part is filled
+        ([b'abcdefgh', b'ij'], [b'abcd', b'efgh', b'ij']),
+        ([b'ab', b'cd', b'efgh'], [b'abcd', b'efgh']),
+    ])
+    def test_open_write_multipart(self, writes, expected_parts):
+        """Test open_write streams content using multipart upload, when larger than the part size"""
+        instance = terrareg.file_storage.S3FileStorage(s3_url="s3://test-bucket/test-base-dir")
+        mock_s3_client = unittest.mock.MagicMock()
+        mock_s3_client.create_multipart_upload.return_value = {'UploadId': 'test-upload-id'}
+        mock_s3_client.upload_part.side_effect = lambda **kwargs: {'ETag': f'etag-{kwargs["PartNumber"]}'}
+        instance._s3_client = mock_s3_client
+
+        uploaded_parts = []
+        with self._patch_part_size(4):
+            with instance.open_write(path="/some-test/file-to-write") as fh:
+                for data in writes:
+                    fh.write(data)
+                    # Ensure parts are uploaded whilst content is being written
+                    uploaded_parts = [call.kwargs['Body'] for call in mock_s3_client.upload_part.call_args_list]
+                    assert len(fh._buffer) < 4
+
+        if expected_parts is None:
+            mock_s3_client.put_object.assert_called_once_with(
+                Bucket='test-bucket', Key='/test-base-dir/some-test/file-to-write', Body=b''.join(writes))
+            mock_s3_client.create_multipart_upload.assert_not_called()
+        else:
+            mock_s3_client.put_object.assert_not_called()
+            assert uploaded_parts == [part for part in expected_parts if len(part) == 4]
+            assert [call.kwargs['Body'] for call in mock_s3_client.upload_part.call_args_list] == expected_parts
+            mock_s3_client.complete_multipart_upload.assert_called_once_with(
+                Bucket='test-bucket', Key='/test-base-dir/some-test/file-to-write', UploadId='test-upload-id',
+                MultipartUpload={'Parts': [
+                    {'ETag': f'etag-{part_number}', 'PartNumber': part_number}
+                    for part_number in range(1, len(expected_parts) + 1)
+                ]}
+            )
+        mock_s3_client.abort_multipart_upload.assert_not_called()
+
+    def test_open_write_error(self):
+        """Test open_write aborts multipart upload when an error occurs"""
+        instance = terrareg.file_storage.S3FileStorage(s3_url="s3://test-bucket")
+        mock_s3_client = unittest.mock.MagicMock()
+        mock_s3_client.create_multipart_upload.return_value = {'UploadId': 'test-upload-id'}
+        mock_s3_client.upload_part.return_value = {'ETag': 'etag'}
+        instance._s3_client = mock_s3_client
+
+        with self._patch_part_size(4):
+            with pytest.raises(Exception, match='Test error'):
+                with instance.open_write(path="/file-to-write") as fh:
+                    fh.write(b'abcdefgh')
+                    raise Exception('Test error')
+
+        mock_s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket='test-bucket', Key='/file-to-write', UploadId='test-upload-id')
+        mock_s3_client.complete_multipart_upload.assert_not_called()
+        mock_s3_client.put_object.assert_not_called()
+
     def test_delete_directory(self):
         """Test delete_directory method"""
         instance = terrareg.file_storage.S3FileStorage(s3_url='s3://test-bucket')
@@ -454,8 +719,8 @@ class TestS3FileStorage(TerraregUnitTest):
         """Test delete_file method"""
         with create_s3_file_storage_with_bucket(bucket_name="test-bucket", bucket_path="/test-base-dir/") as instance:
             # Upload file to s3
-            bucket = instance._s3_resource.Bucket("test-bucket")
-            bucket.put_object(
+            instance._s3_client.put_object(
+                Bucket="test-bucket",
                 Key="/test-base-dir/some-test/file-to-delete",
                 Body="Test Content"
             )
@@ -473,8 +738,8 @@ class TestS3FileStorage(TerraregUnitTest):
         """Test read_file method"""
         with create_s3_file_storage_with_bucket(bucket_name="test-bucket", bucket_path="/another-base-dir/") as instance:
             # Upload file to s3
-            bucket = instance._s3_resource.Bucket("test-bucket")
-            bucket.put_object(
+            instance._s3_client.put_object(
+                Bucket="test-bucket",
                 Key="/another-base-dir/some-test/file-to-read",
                 Body="Test Content To Read"
             )
@@ -490,8 +755,8 @@ class TestS3FileStorage(TerraregUnitTest):
         """Test read_file method"""
         with create_s3_file_storage_with_bucket(bucket_name="test-bucket", bucket_path="/another-base-dir/") as instance:
             # Upload file to s3
-            bucket = instance._s3_resource.Bucket("test-bucket")
-            bucket.put_object(
+            instance._s3_client.put_object(
+                Bucket="test-bucket",
                 Key="/another-base-dir/some-test/file-to-read",
                 Body="Test Content To Read"
             )
@@ -515,14 +780,100 @@ class TestS3FileStorage(TerraregUnitTest):
         with create_s3_file_storage_with_bucket(bucket_name="test-bucket", bucket_path="/exists-base-dir/") as instance:
             # Upload file to s3
             if exists:
-                bucket = instance._s3_resource.Bucket("test-bucket")
-                bucket.put_object(
+                instance._s3_client.put_object(
+                    Bucket="test-bucket",
                     Key="/exists-base-dir/some-test/file-to-exist",
                     Body="Test Content To Read"
                 )
 
             assert instance.file_exists("/some-test/file-to-exist") is exists
 
+    @skipif_unless_ci(not os.environ.get('AWS_ENDPOINT_URL'), reason="Skipping due to minio not configured")
+    def test_get_file_details(self):
+        """Test get_file_details method"""
+        with create_s3_file_storage_with_bucket(bucket_name="test-bucket", bucket_path="/details-base-dir/") as instance:
+            assert instance.get_file_details("/some-test/file-details") is None
+
+            instance._s3_client.put_object(
+                Bucket="test-bucket",
+                Key="/details-base-dir/some-test/file-details",
+                Body="Test Content"
+            )
+
+            file_details = instance.get_file_details("/some-test/file-details")
+            assert file_details.size == 12
+            assert file_details.etag and '"' not in file_details.etag
+
+    @pytest.mark.parametrize('start, end, expected_range, expected_content', [
+        (0, None, None, b'0123456789'),
+        (2, 5, 'bytes=2-4', b'234'),
+        (5, None, 'bytes=5-', b'56789'),
+        (5, 5, False, b''),
+    ])
+    def test_stream_file(self, start, end, expected_range, expected_content):
+        """Test stream_file method only requests required range of object"""
+        instance = terrareg.file_storage.S3FileStorage(s3_url='s3://test-bucket/base-dir')
+        content = expected_content
+        mock_body = unittest.mock.MagicMock()
+        mock_body.iter_chunks.return_value = iter([content[:2], content[2:]])
+        mock_get_object = unittest.mock.MagicMock(return_value={'Body': mock_body})
+
+        with unittest.mock.patch.object(instance._s3_client, 'get_object', mock_get_object):
+            assert b''.join(instance.stream_file('/some-test/file', start=start, end=end)) == expected_content
+
+        if expected_range is False:
+            mock_get_object.assert_not_called()
+            return
+
+        expected_kwargs = {'Bucket': 'test-bucket', 'Key': '/base-dir/some-test/file'}
+        if expected_range:
+            expected_kwargs['Range'] = expected_range
+        mock_get_object.assert_called_once_with(**expected_kwargs)
+        mock_body.iter_chunks.assert_called_once_with(chunk_size=instance.STREAM_CHUNK_SIZE)
+        mock_body.close.assert_called_once_with()
+
+    def test_upload_file_multipart_config(self):
+        """Test upload_file uses configured multipart transfer config"""
+        instance = terrareg.file_storage.S3FileStorage(s3_url='s3://test-bucket/base-dir')
+        mock_upload_file = unittest.mock.MagicMock()
+
+        with unittest.mock.patch.object(instance._s3_client, 'upload_file', mock_upload_file), \
+                unittest.mock.patch('terrareg.config.Config.S3_MULTIPART_PART_SIZE', 16), \
+                unittest.mock.patch('terrareg.config.Config.S3_MULTIPART_CONCURRENCY', 6):
+            instance.upload_file(source_path='/tmp/source-file', dest_directory='/some/dir/', dest_filename='dest-file')
+
+        mock_upload_file.assert_called_once_with(
+            Filename='/tmp/source-file',
+            Bucket='test-bucket',
+            Key='/base-dir/some/dir/dest-file',
+            Config=unittest.mock.ANY
+        )
+        transfer_config = mock_upload_file.call_args.kwargs['Config']
+        assert transfer_config.multipart_threshold == 16 * 1024 * 1024
+        assert transfer_config.multipart_chunksize == 16 * 1024 * 1024
+        assert transfer_config.max_concurrency == 6
+        assert transfer_config.use_threads is True
+
+    def test_get_presigned_download_url(self):
+        """Test get_presigned_download_url method"""
+        instance = terrareg.file_storage.S3FileStorage(s3_url='s3://test-bucket/base-dir')
+        mock_generate_presigned_url = unittest.mock.MagicMock(return_value='https://s3.example.com/presigned')
+
+        with unittest.mock.patch.object(instance._s3_client, 'generate_presigned_url', mock_generate_presigned_url):
+            assert instance.get_presigned_download_url(
+                '/some-test/source.zip', expiry=120, download_name='source.zip'
+            ) == 'https://s3.example.com/presigned'
+
+        mock_generate_presigned_url.assert_called_once_with(
+            'get_object',
+            Params={
+                'Bucket': 'test-bucket',
+                'Key': '/base-dir/some-test/source.zip',
+                'ResponseContentDisposition': 'inline; filename="source.zip"',
+            },
+            ExpiresIn=120
+        )
+
     def test_directory_exists(self):
         """Test test_directory_exists"""
         instance = terrareg.file_storage.S3FileStorage(s3_url='s3://test-bucket')
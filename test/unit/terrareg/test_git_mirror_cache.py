@@ -0,0 +1,120 @@
+
+import os
+import subprocess
+import tempfile
+import unittest.mock
+
+import pytest
+
+from terrareg.git_mirror_cache import GitMirrorCache
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestGitMirrorCache(TerraregUnitTest):
+    """Test GitMirrorCache class."""
+
+    GIT_ENV = dict(
+        os.environ,
+        GIT_AUTHOR_NAME='Unittest', GIT_AUTHOR_EMAIL='unittest@example.com',
+        GIT_COMMITTER_NAME='Unittest', GIT_COMMITTER_EMAIL='unittest@example.com'
+    )
+
+    @pytest.fixture
+    def source_repository(self):
+        """Create source repository with tags for each version"""
+        with tempfile.TemporaryDirectory() as repo_dir:
+            subprocess.check_call(['git', 'init', '--quiet', repo_dir], env=self.GIT_ENV)
+            for version in ['1.0.0', '1.1.0']:
+                with open(os.path.join(repo_dir, 'main.tf'), 'w') as fh:
+                    fh.write(f'# {version}\n')
+                subprocess.check_call(['git', 'add', 'main.tf'], cwd=repo_dir, env=self.GIT_ENV)
+                subprocess.check_call(['git', 'commit', '--quiet', '-m', version], cwd=repo_dir, env=self.GIT_ENV)
+                subprocess.check_call(['git', 'tag', f'v{version}'], cwd=repo_dir, env=self.GIT_ENV)
+            yield repo_dir
+
+    def _clone(self, cache, source_repository, tag, target_directory, git_url=None):
+        """Clone tag using cache"""
+        cache.clone(
+            git_url=git_url or source_repository, fetch_url=source_repository, tag=tag,
+            target_directory=target_directory, env=self.GIT_ENV, timeout=None
+        )
+
+    def test_get(self):
+        """Test cache is only returned when enabled"""
+        with unittest.mock.patch('terrareg.config.Config.GIT_MIRROR_CACHE_DIRECTORY', ''):
+            assert GitMirrorCache.get() is None
+        with unittest.mock.patch('terrareg.config.Config.GIT_MIRROR_CACHE_DIRECTORY', '/tmp/unittest-mirrors'), \
+                unittest.mock.patch('terrareg.config.Config.GIT_MIRROR_CACHE_MAX_SIZE', 5):
+            cache = GitMirrorCache.get()
+            assert cache._directory == '/tmp/unittest-mirrors'
+            assert cache._max_size == 5 * 1024 * 1024
+
+    def test_clone(self, source_repository):
+        """Test cloning tags using mirror"""
+        with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as clone_dir:
+            cache = GitMirrorCache(directory=cache_dir, max_size=1024 * 1024 * 1024)
+
+            for version in ['1.0.0', '1.1.0']:
+                target_directory = os.path.join(clone_dir, version)
+                self._clone(cache, source_repository, f'v{version}', target_directory)
+
+                with open(os.path.join(target_directory, 'main.tf'), 'r') as fh:
+                    assert fh.read() == f'# {version}\n'
+
+                # Ensure clone is shallow and independent of the mirror
+                assert subprocess.check_output(
+                    ['git', 'rev-list', '--count', 'HEAD'], cwd=target_directory
+                ).decode('utf-8').strip() == '1'
+                assert not os.path.exists(os.path.join(target_directory, '.git', 'objects', 'info', 'alternates'))
+
+            # Ensure a single mirror was created for the repository
+            mirror_path = cache._get_mirror_path(cache._get_mirror_name(source_repository))
+            assert [entry for entry in os.listdir(cache_dir) if entry.endswith('.git')] == [os.path.basename(mirror_path)]
+            assert subprocess.check_output(
+                ['git', 'tag'], cwd=mirror_path
+            ).decode('utf-8').split() == ['v1.0.0', 'v1.1.0']
+
+    def test_clone_fetch_url_not_stored(self, source_repository):
+        """Test URL used for fetching is not stored in mirror"""
+        with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as clone_dir:
+            cache = GitMirrorCache(directory=cache_dir, max_size=1024 * 1024 * 1024)
+            self._clone(cache, source_repository, 'v1.0.0', os.path.join(clone_dir, 'clone'),
+                        git_url='https://example.com/repo.git')
+
+            mirror_path = cache._get_mirror_path(cache._get_mirror_name('https://example.com/repo.git'))
+            with open(os.path.join(mirror_path, 'config'), 'r') as fh:
+                assert source_repository not in fh.read()
+
+    def test_clone_invalid_tag(self, source_repository):
+        """Test cloning non-existent tag"""
+        with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as clone_dir:
+            cache = GitMirrorCache(directory=cache_dir, max_size=1024 * 1024 * 1024)
+
+            with pytest.raises(subprocess.CalledProcessError) as exc:
+                self._clone(cache, source_repository, 'v9.9.9', os.path.join(clone_dir, 'clone'))
+            assert 'fatal:' in exc.value.output.decode('utf-8')
+
+            # Ensure empty mirror is removed
+            assert not os.path.exists(cache._get_mirror_path(cache._get_mirror_name(source_repository)))
+
+    def test_evict(self, source_repository):
+        """Test least recently used mirrors are removed when cache exceeds maximum size"""
+        with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as clone_dir:
+            cache = GitMirrorCache(directory=cache_dir, max_size=1024 * 1024 * 1024)
+            git_urls = ['https://example.com/first.git', 'https://example.com/second.git', 'https://example.com/third.git']
+            for itx, git_url in enumerate(git_urls):
+                self._clone(cache, source_repository, 'v1.0.0', os.path.join(clone_dir, str(itx)), git_url=git_url)
+                mirror_path = cache._get_mirror_path(cache._get_mirror_name(git_url))
+                os.utime(mirror_path, (1000 + itx, 1000 + itx))
+
+            mirror_size = cache._get_size(cache._get_mirror_path(cache._get_mirror_name(git_urls[0])))
+
+            # Lock second mirror, to ensure mirrors in use are not removed
+            with cache._lock_mirror(cache._get_mirror_name(git_urls[1])):
+                cache._max_size = mirror_size
+                cache._evict(exclude_mirror_name=cache._get_mirror_name(git_urls[2]))
+
+            assert [
+                os.path.exists(cache._get_mirror_path(cache._get_mirror_name(git_url)))
+                for git_url in git_urls
+            ] == [False, True, True]
@@ -0,0 +1,340 @@
+
+import http.server
+import json
+import threading
+import time
+import unittest.mock
+
+import pytest
+
+from terrareg.provider_source.github_api_client import GithubApiClient
+from test.unit.terrareg import TerraregUnitTest
+
+
+class MockGithubRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Mock Github API, returning queued responses and recording requests"""
+
+    # Keep connections alive between requests
+    protocol_version = 'HTTP/1.1'
+
+    # Responses to return, as tuple of status code, headers and JSON or bytes body
+    responses = []
+    # Requests received, as dictionary of path, headers and client port
+    requests = []
+
+    def do_GET(self):
+        """Return next queued response"""
+        MockGithubRequestHandler.requests.append({
+            'path': self.path,
+            'headers': dict(self.headers),
+            'client_port': self.client_address[1],
+        })
+        status_code, headers, body = (
+            MockGithubRequestHandler.responses.pop(0)
+            if MockGithubRequestHandler.responses else
+            (200, {}, [])
+        )
+        if status_code == 304:
+            content = b''
+        elif isinstance(body, bytes):
+            content = body
+        else:
+            content = json.dumps(body).encode('utf-8')
+
+        self.send_response(status_code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if 'Content-Type' not in headers:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        """Disable logging of requests"""
+        pass
+
+
+class TestGithubApiClient(TerraregUnitTest):
+    """Test GithubApiClient class."""
+
+    @pytest.fixture(scope='class')
+    def mock_github_url(self):
+        """Run mock Github API server"""
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), MockGithubRequestHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture(autouse=True)
+    def reset_mock_github(self):
+        """Remove responses and requests of previous tests"""
+        MockGithubRequestHandler.responses = []
+        MockGithubRequestHandler.requests = []
+        GithubApiClient.reset_stats()
+        yield
+        GithubApiClient.reset_stats()
+
+    @pytest.fixture
+    def mock_sleep(self):
+        """Mock sleep whilst waiting for rate limits"""
+        with unittest.mock.patch('terrareg.provider_source.github_api_client.time.sleep') as mock_sleep:
+            yield mock_sleep
+
+    def _get_client(self, cache_size=10, cache_max_size=1024 * 1024, max_rate_limit_wait=60):
+        """Return client"""
+        return GithubApiClient(pool_size=2, cache_size=cache_size, cache_max_size=cache_max_size,
+                               max_rate_limit_wait=max_rate_limit_wait)
+
+    def test_get_shared(self):
+        """Test shared client is created from config and re-used"""
+        try:
+            with unittest.mock.patch('terrareg.config.Config.GITHUB_API_CACHE_SIZE', 5), \
+                    unittest.mock.patch('terrareg.config.Config.GITHUB_API_CACHE_MAX_SIZE', 2), \
+                    unittest.mock.patch('terrareg.config.Config.GITHUB_API_CONNECTION_POOL_SIZE', 3), \
+                    unittest.mock.patch('terrareg.config.Config.GITHUB_API_MAX_RATE_LIMIT_WAIT', 7):
+                GithubApiClient.reset()
+                client = GithubApiClient.get_shared()
+                assert client._cache_size == 5
+                assert client._cache_max_size == 2 * 1024 * 1024
+                assert client._max_rate_limit_wait == 7
+                assert GithubApiClient.get_shared() is client
+        finally:
+            GithubApiClient.reset()
+
+    def test_connection_reuse(self, mock_github_url):
+        """Test connections are re-used between requests"""
+        client = self._get_client()
+        for _ in range(3):
+            assert client.get(f'{mock_github_url}/user/repos', headers={'Authorization': 'Bearer test-token'}).status_code == 200
+
+        assert len(MockGithubRequestHandler.requests) == 3
+        assert len(set(request['client_port'] for request in MockGithubRequestHandler.requests)) == 1
+        assert GithubApiClient.get_stats() == {'request_count': 3}
+
+    @pytest.mark.parametrize('response_headers, expected_request_headers', [
+        ({'ETag': '"abcdef"'}, {'If-None-Match': '"abcdef"'}),
+        ({'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}, {'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'}),
+        ({'ETag': '"abcdef"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'},
+         {'If-None-Match': '"abcdef"', 'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'}),
+    ])
+    def test_conditional_request(self, response_headers, expected_request_headers, mock_github_url):
+        """Test cached responses are re-validated and returned for not modified responses"""
+        MockGithubRequestHandler.responses = [
+            (200, response_headers, [{'id': 1}]),
+            (304, {'X-RateLimit-Remaining': '4999'}, None),
+        ]
+        client = self._get_client()
+        headers = {'Accept': 'application/vnd.github+json', 'Authorization': 'Bearer test-token'}
+
+        first_response = client.get(f'{mock_github_url}/repos/owner/name/releases', params={'page': '1'}, headers=headers)
+        assert first_response.status_code == 200
+        assert first_response.json() == [{'id': 1}]
+
+        second_response = client.get(f'{mock_github_url}/repos/owner/name/releases', params={'page': '1'}, headers=headers)
+        assert second_response.status_code == 200
+        assert second_response.json() == [{'id': 1}]
+        assert second_response.headers['X-RateLimit-Remaining'] == '4999'
+
+        assert 'If-None-Match' not in MockGithubRequestHandler.requests[0]['headers']
+        assert 'If-Modified-Since' not in MockGithubRequestHandler.requests[0]['headers']
+        for name, value in expected_request_headers.items():
+            assert MockGithubRequestHandler.requests[1]['headers'][name] == value
+
+        # Ensure headers passed by caller are not modified
+        assert headers == {'Accept': 'application/vnd.github+json', 'Authorization': 'Bearer test-token'}
+        assert GithubApiClient.get_stats() == {'request_count': 2, 'not_modified_count': 1, 'rate_limit_remaining': 4999}
+
+    def test_conditional_request_modified(self, mock_github_url):
+        """Test modified responses replace cached response"""
+        MockGithubRequestHandler.responses = [
+            (200, {'ETag': '"first"'}, [{'id': 1}]),
+            (200, {'ETag': '"second"'}, [{'id': 2}]),
+            (304, {}, None),
+        ]
+        client = self._get_client()
+
+        assert client.get(f'{mock_github_url}/user/repos').json() == [{'id': 1}]
+        assert client.get(f'{mock_github_url}/user/repos').json() == [{'id': 2}]
+        assert client.get(f'{mock_github_url}/user/repos').json() == [{'id': 2}]
+        assert MockGithubRequestHandler.requests[2]['headers']['If-None-Match'] == '"second"'
+
+    @pytest.mark.parametrize('second_request_kwargs', [
+        # Different access token
+        {'headers': {'Authorization': 'Bearer other-token'}},
+        # Different query parameters
+        {'headers': {'Authorization': 'Bearer test-token'}, 'params': {'page': '2'}},
+        # Different accept header
+        {'headers': {'Authorization': 'Bearer test-token', 'Accept': 'application/octet-stream'}},
+        # Streamed response
+        {'headers': {'Authorization': 'Bearer test-token'}, 'stream': True},
+    ])
+    def test_request_not_cached(self, second_request_kwargs, mock_github_url):
+        """Test cached responses are only used for identical requests"""
+        MockGithubRequestHandler.responses = [(200, {'ETag': '"abcdef"'}, [])]
+        client = self._get_client()
+
+        client.get(f'{mock_github_url}/user/repos', headers={'Authorization': 'Bearer test-token'})
+        client.get(f'{mock_github_url}/user/repos', **second_request_kwargs).close()
+
+        assert 'If-None-Match' not in MockGithubRequestHandler.requests[1]['headers']
+
+    def test_cache_size(self, mock_github_url):
+        """Test least recently used responses are removed from cache"""
+        MockGithubRequestHandler.responses = [
+            (200, {'ETag': '"first"'}, []),
+            (200, {'ETag': '"second"'}, []),
+        ]
+        client = self._get_client(cache_size=1)
+
+        client.get(f'{mock_github_url}/first')
+        client.get(f'{mock_github_url}/second')
+        client.get(f'{mock_github_url}/first')
+
+        assert 'If-None-Match' not in MockGithubRequestHandler.requests[2]['headers']
+
+    def test_cache_max_size(self, mock_github_url):
+        """Test least recently used responses are removed from cache when the total size is exceeded"""
+        MockGithubRequestHandler.responses = [
+            (200, {'ETag': '"first"'}, ['a' * 40]),
+            (200, {'ETag': '"second"'}, ['b' * 40]),
+            (304, {}, None),
+        ]
+        client = self._get_client(cache_max_size=80)
+
+        client.get(f'{mock_github_url}/first')
+        client.get(f'{mock_github_url}/second')
+        assert client.get(f'{mock_github_url}/second').json() == ['b' * 40]
+        client.get(f'{mock_github_url}/first')
+
+        assert MockGithubRequestHandler.requests[2]['headers']['If-None-Match'] == '"second"'
+        assert 'If-None-Match' not in MockGithubRequestHandler.requests[3]['headers']
+        assert client._cache_content_size == 44
+
+    @pytest.mark.parametrize('response_headers, body', [
+        # Non-JSON response, such as a release archive
+        ({'ETag': '"abcdef"', 'Content-Type': 'application/x-gzip'}, b'archive-content'),
+        # Response exceeding maximum cached response size
+        ({'ETag': '"abcdef"'}, ['a' * GithubApiClient.MAX_CACHED_RESPONSE_SIZE]),
+    ])
+    def test_response_not_cached(self, response_headers, body, mock_github_url):
+        """Test non-JSON and large responses are not cached"""
+        MockGithubRequestHandler.responses = [(200, response_headers, body)]
+        client = self._get_client(cache_max_size=10 * 1024 * 1024)
+
+        client.get(f'{mock_github_url}/repos/owner/name/tarball/v1.0.0')
+        client.get(f'{mock_github_url}/repos/owner/name/tarball/v1.0.0')
+
+        assert 'If-None-Match' not in MockGithubRequestHandler.requests[1]['headers']
+        assert client._cache_content_size == 0
+
+    def test_cache_disabled(self, mock_github_url):
+        """Test responses are not cached when cache size is 0"""
+        MockGithubRequestHandler.responses = [(200, {'ETag': '"abcdef"'}, [])]
+        client = self._get_client(cache_size=0)
+
+        client.get(f'{mock_github_url}/user/repos')
+        client.get(f'{mock_github_url}/user/repos')
+
+        assert 'If-None-Match' not in MockGithubRequestHandler.requests[1]['headers']
+
+    def test_secondary_rate_limit(self, mock_github_url, mock_sleep):
+        """Test requests rejected by secondary rate limit are retried after the requested time"""
+        MockGithubRequestHandler.responses = [
+            (403, {'Retry-After': '30'}, {'message': 'You have exceeded a secondary rate limit'}),
+            (429, {'Retry-After': '10'}, {'message': 'You have exceeded a secondary rate limit'}),
+            (200, {}, [{'id': 1}]),
+        ]
+        client = self._get_client()
+
+        response = client.get(f'{mock_github_url}/user/repos')
+        assert response.status_code == 200
+        assert response.json() == [{'id': 1}]
+
+        assert mock_sleep.call_args_list == [unittest.mock.call(30.0), unittest.mock.call(10.0)]
+        assert GithubApiClient.get_stats() == {
+            'request_count': 3,
+            'rate_limited_count': 2,
+            'rate_limit_wait_count': 2,
+            'rate_limit_wait_seconds_total': 40.0,
+        }
+
+    def test_secondary_rate_limit_exceeds_max_wait(self, mock_github_url, mock_sleep):
+        """Test rate limited response is returned if the requested time exceeds the maximum wait"""
+        MockGithubRequestHandler.responses = [
+            (403, {'Retry-After': '61'}, {'message': 'You have exceeded a secondary rate limit'}),
+        ]
+        client = self._get_client(max_rate_limit_wait=60)
+
+        assert client.get(f'{mock_github_url}/user/repos').status_code == 403
+
+        mock_sleep.assert_not_called()
+        assert len(MockGithubRequestHandler.requests) == 1
+
+    def test_rate_limit_max_retries(self, mock_github_url, mock_sleep):
+        """Test rate limited requests are retried a limited number of times"""
+        MockGithubRequestHandler.responses = [
+            (429, {'Retry-After': '1'}, {})
+            for _ in range(GithubApiClient.MAX_RATE_LIMIT_RETRIES + 2)
+        ]
+        client = self._get_client()
+
+        assert client.get(f'{mock_github_url}/user/repos').status_code == 429
+
+        assert len(MockGithubRequestHandler.requests) == GithubApiClient.MAX_RATE_LIMIT_RETRIES + 1
+
+    def test_forbidden_not_retried(self, mock_github_url, mock_sleep):
+        """Test forbidden responses that are not rate limited are not retried"""
+        MockGithubRequestHandler.responses = [
+            (403, {'X-RateLimit-Remaining': '4000'}, {'message': 'Resource not accessible by integration'}),
+        ]
+        client = self._get_client()
+
+        assert client.get(f'{mock_github_url}/user/repos').status_code == 403
+
+        mock_sleep.assert_not_called()
+        assert len(MockGithubRequestHandler.requests) == 1
+
+    def test_primary_rate_limit(self, mock_github_url, mock_sleep):
+        """Test requests are delayed until the exhausted rate limit of the access token is reset"""
+        reset = str(int(time.time()) + 30)
+        MockGithubRequestHandler.responses = [
+            (200, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset}, []),
+            (200, {'X-RateLimit-Remaining': '5000'}, []),
+            (200, {'X-RateLimit-Remaining': '4999'}, []),
+        ]
+        client = self._get_client()
+
+        client.get(f'{mock_github_url}/user/repos', headers={'Authorization': 'Bearer test-token'})
+        mock_sleep.assert_not_called()
+
+        # Ensure requests using other access tokens are not delayed
+        client.get(f'{mock_github_url}/user/repos', headers={'Authorization': 'Bearer other-token'})
+        mock_sleep.assert_not_called()
+
+        client.get(f'{mock_github_url}/user/repos', headers={'Authorization': 'Bearer test-token'})
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args[0][0] == pytest.approx(30, abs=2)
+
+        # Ensure rate limit is no longer considered exhausted
+        client.get(f'{mock_github_url}/user/repos', headers={'Authorization': 'Bearer test-token'})
+        mock_sleep.assert_called_once()
+
+    def test_primary_rate_limit_rejected(self, mock_github_url, mock_sleep):
+        """Test requests rejected by the primary rate limit are retried once the rate limit is reset"""
+        reset = str(int(time.time()) + 20)
+        MockGithubRequestHandler.responses = [
+            (403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset}, {'message': 'API rate limit exceeded'}),
+            (200, {'X-RateLimit-Remaining': '4999'}, [{'id': 1}]),
+        ]
+        client = self._get_client()
+
+        response = client.get(f'{mock_github_url}/user/repos')
+        assert response.status_code == 200
+        assert response.json() == [{'id': 1}]
+
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args[0][0] == pytest.approx(20, abs=2)
+        assert GithubApiClient.get_stats()['rate_limit_remaining'] == 4999
@@ -0,0 +1,67 @@
+
+import unittest.mock
+
+from terrareg.module_specs_cache import ModuleSpecsCache
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestModuleSpecsCache(TerraregUnitTest):
+    """Test ModuleSpecsCache class."""
+
+    def setup_method(self, method):
+        """Clear cache before each test"""
+        super(TestModuleSpecsCache, self).setup_method(method)
+        ModuleSpecsCache.clear()
+
+    def test_get(self):
+        """Test values are only generated once"""
+        factory = unittest.mock.MagicMock(return_value={'inputs': []})
+
+        assert ModuleSpecsCache.get(1, 'gen-1', 2, 'specs', factory) == {'inputs': []}
+        assert ModuleSpecsCache.get(1, 'gen-1', 2, 'specs', factory) == {'inputs': []}
+        factory.assert_called_once_with()
+
+        # Ensure values are cached independently by name and extraction version
+        other_factory = unittest.mock.MagicMock(return_value=[])
+        ModuleSpecsCache.get(1, 'gen-1', 2, 'inputs', other_factory)
+        ModuleSpecsCache.get(1, 'gen-1', 3, 'inputs', other_factory)
+        assert other_factory.call_count == 2
+
+    def test_get_generation(self):
+        """Test values are cached independently for module details with a re-used ID"""
+        assert ModuleSpecsCache.get(1, 'first-generation', 2, 'specs', lambda: 'first') == 'first'
+        assert ModuleSpecsCache.get(1, 'second-generation', 2, 'specs', lambda: 'second') == 'second'
+        assert ModuleSpecsCache.get(1, None, 2, 'specs', lambda: 'legacy') == 'legacy'
+
+    def test_get_disabled(self):
+        """Test values are not cached when cache is disabled"""
+        factory = unittest.mock.MagicMock(return_value={})
+        with unittest.mock.patch('terrareg.config.Config.MODULE_SPECS_CACHE_SIZE', 0):
+            ModuleSpecsCache.get(1, 'gen-1', 2, 'specs', factory)
+            ModuleSpecsCache.get(1, 'gen-1', 2, 'specs', factory)
+        assert factory.call_count == 2
+
+    def test_eviction(self):
+        """Test least recently used module details are evicted"""
+        with unittest.mock.patch('terrareg.config.Config.MODULE_SPECS_CACHE_SIZE', 2):
+            ModuleSpecsCache.get(1, 'gen-1', 2, 'specs', lambda: 'first')
+            ModuleSpecsCache.get(2, 'gen-2', 2, 'specs', lambda: 'second')
+            # Access first, making second the least recently used
+            ModuleSpecsCache.get(1, 'gen-1', 2, 'specs', lambda: 'unused')
+            ModuleSpecsCache.get(3, 'gen-3', 2, 'specs', lambda: 'third')
+
+            assert ModuleSpecsCache.get(1, 'gen-1', 2, 'specs', lambda: 'new') == 'first'
+            assert ModuleSpecsCache.get(3, 'gen-3', 2, 'specs', lambda: 'new') == 'third'
+            assert ModuleSpecsCache.get(2, 'gen-2', 2, 'specs', lambda: 'new') == 'new'
+
+    def test_invalidate(self):
+        """Test invalidating module details"""
+        ModuleSpecsCache.get(1, 'gen-1', 2, 'specs', lambda: 'first')
+        ModuleSpecsCache.get(1, 'gen-1', 3, 'specs', lambda: 'first')
+        ModuleSpecsCache.get(2, 'gen-2', 2, 'specs', lambda: 'second')
+
+        ModuleSpecsCache.invalidate(1)
+
+        assert ModuleSpecsCache.get(1, 'gen-1', 2, 'specs', lambda: 'new') == 'new'
+        assert ModuleSpecsCache.get(1, 'gen-1', 3, 'specs', lambda: 'new') == 'new'
+        assert ModuleSpecsCache.get(2, 'gen-2', 2, 'specs', lambda: 'new') == 'second'
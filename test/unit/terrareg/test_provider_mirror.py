@@ -0,0 +1,113 @@
+
+import os
+import tempfile
+import time
+import unittest.mock
+
+from terrareg.provider_mirror import ProviderMirror
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestProviderMirror(TerraregUnitTest):
+    """Test ProviderMirror class."""
+
+    TARGET = 'linux_amd64'
+
+    def _install_provider(self, providers_directory, name, version, content='provider', size=8):
+        """Create provider in providers directory, as installed by terraform init"""
+        provider_directory = os.path.join(providers_directory, 'registry.terraform.io', 'hashicorp', name, version, self.TARGET)
+        os.makedirs(provider_directory)
+        with open(os.path.join(provider_directory, f'terraform-provider-{name}_v{version}'), 'w') as fh:
+            fh.write(content.ljust(size))
+        return provider_directory
+
+    def _get_mirror_providers(self, mirror):
+        """Return name and version of providers in mirror"""
+        return [
+            tuple(provider_path.split(os.sep)[2:4])
+            for provider_path in mirror._get_provider_paths(mirror.directory)
+        ]
+
+    def _age_providers(self, mirror, age):
+        """Set last usage of all providers in mirror"""
+        for provider_path in mirror._get_provider_paths(mirror.directory):
+            mtime = time.time() - age
+            os.utime(os.path.join(mirror.directory, provider_path), (mtime, mtime))
+
+    def test_get(self):
+        """Test mirror is created using config"""
+        with unittest.mock.patch('terrareg.config.Config.PROVIDER_MIRROR_DIRECTORY', '/tmp/unittest-provider-mirror'), \
+                unittest.mock.patch('terrareg.config.Config.PROVIDER_MIRROR_MAX_SIZE', 5), \
+                unittest.mock.patch('terrareg.config.Config.PROVIDER_MIRROR_MAX_VERSIONS', 2):
+            mirror = ProviderMirror.get()
+            assert mirror.directory == '/tmp/unittest-provider-mirror'
+            assert mirror._max_size == 5 * 1024 * 1024
+            assert mirror._max_versions == 2
+
+    def test_add_providers(self):
+        """Test adding providers installed into module to mirror"""
+        with tempfile.TemporaryDirectory() as mirror_dir, tempfile.TemporaryDirectory() as module_dir:
+            mirror = ProviderMirror(directory=mirror_dir, max_size=1024 * 1024, max_versions=5)
+            providers_directory = os.path.join(module_dir, '.terraform', 'providers')
+            self._install_provider(providers_directory, 'aws', '5.0.0', content='aws')
+            self._install_provider(providers_directory, 'random', '3.5.1', content='random')
+
+            mirror.add_providers(providers_directory)
+
+            assert self._get_mirror_providers(mirror) == [('aws', '5.0.0'), ('random', '3.5.1')]
+            with open(os.path.join(mirror_dir, 'registry.terraform.io', 'hashicorp', 'aws', '5.0.0', self.TARGET, 'terraform-provider-aws_v5.0.0'), 'r') as fh:
+                assert fh.read().strip() == 'aws'
+            # Ensure no staging directories remain
+            assert sorted(os.listdir(mirror_dir)) == ['.mirror.lock', 'registry.terraform.io']
+
+    def test_add_providers_existing(self):
+        """Test providers already present in the mirror are not replaced and their usage is recorded"""
+        with tempfile.TemporaryDirectory() as mirror_dir, tempfile.TemporaryDirectory() as module_dir:
+            mirror = ProviderMirror(directory=mirror_dir, max_size=1024 * 1024, max_versions=5)
+            self._install_provider(mirror_dir, 'aws', '5.0.0', content='original')
+            self._age_providers(mirror, 100)
+
+            # Create provider linked to the mirror, as installed by terraform init from the mirror
+            providers_directory = os.path.join(module_dir, '.terraform', 'providers')
+            os.makedirs(os.path.join(providers_directory, 'registry.terraform.io', 'hashicorp', 'aws', '5.0.0'))
+            os.symlink(
+                os.path.join(mirror_dir, 'registry.terraform.io', 'hashicorp', 'aws', '5.0.0', self.TARGET),
+                os.path.join(providers_directory, 'registry.terraform.io', 'hashicorp', 'aws', '5.0.0', self.TARGET)
+            )
+
+            mirror.add_providers(providers_directory)
+
+            mirror_path = os.path.join(mirror_dir, 'registry.terraform.io', 'hashicorp', 'aws', '5.0.0', self.TARGET)
+            assert time.time() - os.stat(mirror_path).st_mtime < 10
+            with open(os.path.join(mirror_path, 'terraform-provider-aws_v5.0.0'), 'r') as fh:
+                assert fh.read().strip() == 'original'
+
+    def test_evict_old_versions(self):
+        """Test oldest versions of providers are removed, retaining recently used versions"""
+        with tempfile.TemporaryDirectory() as mirror_dir, tempfile.TemporaryDirectory() as module_dir:
+            mirror = ProviderMirror(directory=mirror_dir, max_size=1024 * 1024, max_versions=2)
+            for version in ['4.9.0', '4.10.0', '5.0.0']:
+                self._install_provider(mirror_dir, 'aws', version)
+
+            # Ensure recently used versions are retained
+            mirror.add_providers(os.path.join(module_dir, 'does-not-exist'))
+            assert len(self._get_mirror_providers(mirror)) == 3
+
+            self._age_providers(mirror, ProviderMirror.MIN_EVICTION_AGE + 10)
+            mirror.add_providers(os.path.join(module_dir, 'does-not-exist'))
+            assert self._get_mirror_providers(mirror) == [('aws', '4.10.0'), ('aws', '5.0.0')]
+            # Ensure empty directories of removed version are removed
+            assert sorted(os.listdir(os.path.join(mirror_dir, 'registry.terraform.io', 'hashicorp', 'aws'))) == ['4.10.0', '5.0.0']
+
+    def test_evict_max_size(self):
+        """Test least recently used providers are removed when mirror exceeds maximum size"""
+        with tempfile.TemporaryDirectory() as mirror_dir, tempfile.TemporaryDirectory() as module_dir:
+            mirror = ProviderMirror(directory=mirror_dir, max_size=250, max_versions=5)
+            for itx, name in enumerate(['aws', 'google', 'random']):
+                provider_directory = self._install_provider(mirror_dir, name, '1.0.0', size=100)
+                mtime = time.time() - ProviderMirror.MIN_EVICTION_AGE - 100 + itx
+                os.utime(provider_directory, (mtime, mtime))
+
+            mirror.add_providers(os.path.join(module_dir, 'does-not-exist'))
+
+            assert self._get_mirror_providers(mirror) == [('google', '1.0.0'), ('random', '1.0.0')]
@@ -0,0 +1,93 @@
+
+import os
+import tempfile
+import time
+import unittest.mock
+
+from terrareg.terraform_binary_cache import TerraformBinaryCache
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestTerraformBinaryCache(TerraregUnitTest):
+    """Test TerraformBinaryCache class."""
+
+    def _mock_tfswitch(self, versions, downloads):
+        """Return mock check_output, which installs version of module and creates symlink, as performed by tfswitch"""
+        def check_output(args, env, cwd):
+            binary_path = args[args.index('--bin') + 1]
+            versions_directory = os.path.join(args[args.index('--install') + 1], TerraformBinaryCache.VERSIONS_DIRECTORY)
+            version_path = os.path.join(versions_directory, f'terraform_{versions[cwd]}')
+            if not os.path.exists(version_path):
+                downloads.append(versions[cwd])
+                os.makedirs(versions_directory, exist_ok=True)
+                with open(version_path, 'w') as fh:
+                    fh.write(versions[cwd])
+            os.symlink(version_path, binary_path)
+            return b''
+        return check_output
+
+    def _get_binary_content(self, cache, module_path):
+        """Obtain binary for module and return content"""
+        with cache.get_binary(module_path=module_path, tfswitch_args=[], env={}) as binary_path:
+            assert not os.path.islink(binary_path)
+            with open(binary_path, 'r') as fh:
+                return fh.read()
+
+    def test_get(self):
+        """Test cache is created using config"""
+        with unittest.mock.patch('terrareg.config.Config.TERRAFORM_BINARY_CACHE_DIRECTORY', '/tmp/unittest-binaries'), \
+                unittest.mock.patch('terrareg.config.Config.TERRAFORM_BINARY_CACHE_MAX_VERSIONS', 5):
+            cache = TerraformBinaryCache.get()
+            assert cache._directory == '/tmp/unittest-binaries'
+            assert cache._max_versions == 5
+
+    def test_get_binary(self):
+        """Test obtaining binary for versions required by modules"""
+        versions = {'/module/a': '1.5.0', '/module/b': '1.6.0', '/module/c': '1.5.0'}
+        downloads = []
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                unittest.mock.patch('terrareg.terraform_binary_cache.subprocess.check_output', self._mock_tfswitch(versions, downloads)):
+            cache = TerraformBinaryCache(directory=cache_dir, max_versions=10)
+
+            with cache.get_binary(module_path='/module/a', tfswitch_args=[], env={}) as binary_a, \
+                    cache.get_binary(module_path='/module/b', tfswitch_args=[], env={}) as binary_b:
+                # Ensure each caller is provided with its own binary of the required version
+                assert binary_a != binary_b
+                with open(binary_a, 'r') as fh:
+                    assert fh.read() == '1.5.0'
+                with open(binary_b, 'r') as fh:
+                    assert fh.read() == '1.6.0'
+
+            assert self._get_binary_content(cache, '/module/c') == '1.5.0'
+
+            # Ensure versions are only downloaded once
+            assert downloads == ['1.5.0', '1.6.0']
+            assert sorted(os.listdir(cache.versions_directory)) == ['terraform_1.5.0', 'terraform_1.6.0']
+
+    def test_evict(self):
+        """Test least recently used versions are removed"""
+        versions = {'/module/a': '1.5.0', '/module/b': '1.6.0', '/module/c': '1.7.0'}
+        downloads = []
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                unittest.mock.patch('terrareg.terraform_binary_cache.subprocess.check_output', self._mock_tfswitch(versions, downloads)):
+            cache = TerraformBinaryCache(directory=cache_dir, max_versions=2)
+
+            self._get_binary_content(cache, '/module/a')
+            time.sleep(0.01)
+            self._get_binary_content(cache, '/module/b')
+            time.sleep(0.01)
+            # Use first version, making second version the least recently used
+            self._get_binary_content(cache, '/module/a')
+            time.sleep(0.01)
+
+            # Ensure binary remains available whilst in use, after version has been evicted
+            with cache.get_binary(module_path='/module/b', tfswitch_args=[], env={}) as binary_b:
+                time.sleep(0.01)
+                self._get_binary_content(cache, '/module/a')
+                time.sleep(0.01)
+                self._get_binary_content(cache, '/module/c')
+                with open(binary_b, 'r') as fh:
+                    assert fh.read() == '1.6.0'
+
+            assert sorted(os.listdir(cache.versions_directory)) == ['terraform_1.5.0', 'terraform_1.7.0']
+            assert downloads == ['1.5.0', '1.6.0', '1.7.0']
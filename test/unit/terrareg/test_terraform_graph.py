@@ -0,0 +1,95 @@
+
+from unittest import mock
+
+import pytest
+
+from terrareg.terraform_graph import DirectedGraph, DotParseError, DotParser, parse_dot
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestDirectedGraph(TerraregUnitTest):
+    """Test DirectedGraph class."""
+
+    def test_relabel_nodes(self):
+        """Test renaming nodes, merging nodes renamed to the same name"""
+        graph = DirectedGraph()
+        graph.add_node('a (expand)')
+        graph.add_edge('b', 'a (expand)')
+        graph.add_edge('b', 'a (close)')
+        graph.add_edge('c', 'b')
+        graph.add_edge('c', 'b')
+
+        graph = graph.relabel_nodes({'a (expand)': 'a', 'a (close)': 'a'})
+
+        assert graph.nodes == ['a', 'b', 'c']
+        assert list(graph.edges) == [('b', 'a'), ('c', 'b'), ('c', 'b')]
+
+    def test_remove_node(self):
+        """Test removing node and its edges"""
+        graph = DirectedGraph()
+        graph.add_edge('a', 'b')
+        graph.add_edge('b', 'c')
+
+        graph.remove_node('b')
+        # Ensure removing non-existent nodes is ignored
+        graph.remove_node('d')
+
+        assert graph.nodes == ['a', 'c']
+        assert list(graph.edges) == []
+
+
+class TestDotParser(TerraregUnitTest):
+    """Test DotParser class."""
+
+    def test_parse(self):
+        """Test parsing terraform graph output"""
+        graph = DotParser('''
+digraph {
+\tcompound = "true"
+\tnewrank = "true"
+\tsubgraph "root" {
+\t\t"[root] aws_s3_bucket.test (expand)" [label = "aws_s3_bucket.test", shape = "box"]
+\t\t"[root] provider[\\"registry.terraform.io/hashicorp/aws\\"]" [label = "provider", shape = "diamond"]
+\t\t// Comment
+\t\t"[root] aws_s3_bucket.test (expand)" -> "[root] provider[\\"registry.terraform.io/hashicorp/aws\\"]"
+\t\t"[root] root" -> "[root] aws_s3_bucket.test (expand)" -> unquoted_node;
+\t}
+}
+''').parse()
+
+        assert graph.nodes == [
+            '[root] aws_s3_bucket.test (expand)',
+            '[root] provider["registry.terraform.io/hashicorp/aws"]',
+            '[root] root',
+            'unquoted_node',
+        ]
+        assert list(graph.edges) == [
+            ('[root] aws_s3_bucket.test (expand)', '[root] provider["registry.terraform.io/hashicorp/aws"]'),
+            ('[root] aws_s3_bucket.test (expand)', 'unquoted_node'),
+            ('[root] root', '[root] aws_s3_bucket.test (expand)'),
+        ]
+
+    @pytest.mark.parametrize('content', [
+        'strict digraph { a -> b }',
+        'digraph { a:port -> b }',
+        'digraph { { a } -> b }',
+        'digraph { a -> b',
+        'digraph { a -> b } extra',
+        'digraph { a -> "b }',
+    ])
+    def test_parse_unsupported(self, content):
+        """Test unsupported or invalid graphs raise DotParseError"""
+        with pytest.raises(DotParseError):
+            DotParser(content).parse()
+
+    def test_parse_dot_fallback(self):
+        """Test parse_dot falls back to pygraphviz for unsupported syntax"""
+        graph = parse_dot('strict digraph { a -> b; a -> b }')
+        assert graph.nodes == ['a', 'b']
+        assert list(graph.edges) == [('a', 'b')]
+
+    def test_parse_dot_does_not_use_pygraphviz(self):
+        """Test parse_dot does not import pygraphviz for supported graphs"""
+        with mock.patch.dict('sys.modules', {'pygraphviz': None}):
+            graph = parse_dot('digraph { a -> b }')
+        assert list(graph.edges) == [('a', 'b')]
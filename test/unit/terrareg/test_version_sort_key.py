@@ -0,0 +1,44 @@
+
+import random
+
+import pytest
+
+from terrareg.version_sort_key import VersionSortKey
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestVersionSortKey(TerraregUnitTest):
+
+    @pytest.mark.parametrize('version, expected_values', [
+        ('1.2.3', {'version_major': 1, 'version_minor': 2, 'version_patch': 3, 'version_prerelease': None}),
+        ('10.0.250', {'version_major': 10, 'version_minor': 0, 'version_patch': 250, 'version_prerelease': None}),
+        ('1.2.3-beta', {'version_major': 1, 'version_minor': 2, 'version_patch': 3, 'version_prerelease': 'beta'}),
+        ('1.2.2-123', {'version_major': 1, 'version_minor': 2, 'version_patch': 2, 'version_prerelease': '123'}),
+        ('invalid', {'version_major': -1, 'version_minor': -1, 'version_patch': -1, 'version_prerelease': None}),
+    ])
+    def test_get_column_values(self, version, expected_values):
+        """Test conversion of version to column values"""
+        assert VersionSortKey.get_column_values(version) == expected_values
+
+    def test_get_key(self):
+        """Test sorting versions by key"""
+        expected_versions = [
+            '10.0.0',
+            '2.10.0',
+            '2.9.10',
+            '2.9.9',
+            '2.9.9-rc2',
+            '2.9.9-rc10',
+            '2.9.9-beta',
+            '2.9.9-100',
+            '2.9.9-20',
+            '0.0.1',
+        ]
+        rows = [
+            dict(version=version, **VersionSortKey.get_column_values(version))
+            for version in expected_versions
+        ]
+        random.Random(1).shuffle(rows)
+        rows.sort(key=VersionSortKey.get_key, reverse=True)
+
+        assert [row['version'] for row in rows] == expected_versions